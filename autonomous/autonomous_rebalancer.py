@@ -659,6 +659,14 @@ class AutonomousRebalancer:
 
         executed_trades = []
 
+        # Authenticate once per batch; place_order re-checks the cached token
+        # in memory before each request
+        authenticated = True
+        if not self.dry_run and self.schwab:
+            authenticated = self.schwab.authenticate()
+            if not authenticated:
+                logger.error("Failed to authenticate with Schwab")
+
         for trade in trades:
             logger.info(
                 f"  {'[DRY RUN] ' if self.dry_run else ''}{trade['side']:4s} {trade['quantity']:8.2f} {trade['ticker']:6s} @ ${trade['price']:.2f} = ${trade['dollar_amount']:,.2f}"
@@ -669,8 +677,7 @@ class AutonomousRebalancer:
             # Execute via Schwab connector if not in dry run
             if not self.dry_run and self.schwab:
                 try:
-                    # Authenticate
-                    if not self.schwab.authenticate():
+                    if not authenticated:
                         logger.error(f"Failed to authenticate with Schwab for {trade['ticker']}")
                         continue
 
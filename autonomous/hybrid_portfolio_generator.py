@@ -25,10 +25,8 @@ import pandas as pd
 # ML imports
 import xgboost as xgb
 
-# RL imports
-from stable_baselines3 import PPO
-
 from portfolio.ml_portfolio_manager import MLPortfolioManager
+from portfolio.model_registry import model_registry
 from utils import get_logger
 from utils.db_config import engine
 
@@ -155,19 +153,16 @@ class HybridPortfolioGenerator:
         logger.info(f"  [ML] Running XGBoost model: {strategy_type}_{market_cap or ''}")
 
         try:
-            # Initialize ML Portfolio Manager
+            # Initialize ML Portfolio Manager (model comes from the shared registry)
             ml_manager = MLPortfolioManager(strategy=strategy_type, market_cap_segment=market_cap)
 
-            # Get latest features from database
-            features_df = ml_manager.get_latest_features(as_of_date=as_of_date)
+            # Predictions for the latest feature date (read through the prediction store)
+            predictions = ml_manager.get_predictions(as_of_date=as_of_date)
 
-            if len(features_df) == 0:
+            if len(predictions) == 0:
                 logger.warning("No features available from database")
                 return None
 
-            # Generate predictions
-            predictions = ml_manager.generate_predictions(features_df)
-
             # Filter to top N with positive predictions
             predictions = predictions[predictions["predicted_return"] > 0].head(top_n * 2)
 
@@ -218,9 +213,9 @@ class HybridPortfolioGenerator:
                     ml_predictions, len(ml_predictions), max_position
                 )
 
-            # Load RL agent
-            logger.info(f"  [RL] Loading model from: {rl_model_path}")
-            rl_agent = PPO.load(str(rl_model_path))
+            # Load RL agent (cached process-wide, reloaded when the file changes)
+            logger.info(f"  [RL] Using model: {rl_model_path}")
+            rl_agent = model_registry.get_ppo(str(rl_model_path))
 
             # Prepare observation (state) for RL agent
             # State includes: ML predictions, market indicators, portfolio metrics
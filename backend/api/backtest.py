@@ -1,5 +1,10 @@
 """
 Backtesting API Endpoints
+
+Backtests run as jobs on a process pool (services/backtest_jobs.py): submit,
+poll status, fetch the result or cancel. Results are cached by config, model
+version and data watermark, so a repeated request returns immediately.
+/run and /quick-metrics keep their synchronous contract by awaiting the job.
 """
 
 import sys
@@ -13,7 +18,8 @@ from typing import List, Optional
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
-from portfolio.backtest_engine import BacktestEngine
+from backend.api.database.blocking import run_blocking
+from backend.api.services.backtest_jobs import get_backtest_jobs
 
 router = APIRouter(prefix="/api/backtest", tags=["backtest"])
 
@@ -40,6 +46,81 @@ class BacktestResponse(BaseModel):
     config: dict
 
 
+def _validate(config: BacktestConfig):
+    try:
+        start_date = date.fromisoformat(config.start_date)
+        end_date = date.fromisoformat(config.end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date format: {str(e)}")
+    if start_date >= end_date:
+        raise HTTPException(status_code=400, detail="Start date must be before end date")
+
+
+async def _submit(config: BacktestConfig):
+    _validate(config)
+    # Computing the cache key reads the data watermark from the database
+    return await run_blocking(get_backtest_jobs().submit, config.model_dump())
+
+
+@router.post("/jobs")
+async def submit_backtest_job(config: BacktestConfig):
+    """
+    Submit a backtest job
+
+    Args:
+        config: Backtest configuration
+
+    Returns:
+        Job status; "completed" right away if the result is cached, and the
+        running job if the same backtest was already submitted
+    """
+    try:
+        job = await _submit(config)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Backtest submit failed: {str(e)}")
+    return job.to_dict()
+
+
+@router.get("/jobs/{job_id}")
+def get_backtest_job(job_id: str):
+    """Get a backtest job's status"""
+    job = get_backtest_jobs().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Backtest job {job_id} not found")
+    return job.to_dict()
+
+
+@router.get("/jobs/{job_id}/result", response_model=BacktestResponse)
+def get_backtest_job_result(job_id: str):
+    """Get a completed backtest job's results (409 while it isn't completed)"""
+    jobs = get_backtest_jobs()
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Backtest job {job_id} not found")
+    results = jobs.result(job_id)
+    if results is None:
+        detail = f"Backtest job {job_id} is {job.status}"
+        if job.error:
+            detail += f": {job.error}"
+        raise HTTPException(status_code=409, detail=detail)
+    return BacktestResponse(
+        performance_metrics=results["performance_metrics"],
+        rebalance_history=results["rebalance_history"],
+        config=results["config"],
+    )
+
+
+@router.delete("/jobs/{job_id}")
+def cancel_backtest_job(job_id: str):
+    """Cancel a queued or running backtest job"""
+    job = get_backtest_jobs().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Backtest job {job_id} not found")
+    return job.to_dict()
+
+
 @router.post("/run", response_model=BacktestResponse)
 async def run_backtest(config: BacktestConfig):
     """
@@ -52,29 +133,8 @@ async def run_backtest(config: BacktestConfig):
         Backtest results with performance metrics
     """
     try:
-        # Parse dates
-        start_date = date.fromisoformat(config.start_date)
-        end_date = date.fromisoformat(config.end_date)
-
-        # Validate dates
-        if start_date >= end_date:
-            raise HTTPException(status_code=400, detail="Start date must be before end date")
-
-        # Initialize backtest engine
-        engine = BacktestEngine(
-            rebalance_frequency=config.rebalance_frequency, transaction_cost=config.transaction_cost
-        )
-
-        # Run backtest
-        results = engine.run_backtest(
-            start_date=start_date,
-            end_date=end_date,
-            initial_capital=config.initial_capital,
-            top_n=config.top_n,
-            weighting=config.weighting,
-            max_position=config.max_position,
-            min_market_cap=config.min_market_cap,
-        )
+        job = await _submit(config)
+        results = await get_backtest_jobs().wait(job)
 
         return BacktestResponse(
             performance_metrics=results["performance_metrics"],
@@ -82,8 +142,8 @@ async def run_backtest(config: BacktestConfig):
             config=results["config"],
         )
 
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=f"Invalid date format: {str(e)}")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Backtest failed: {str(e)}")
 
@@ -102,24 +162,19 @@ async def get_quick_metrics(start_date: str, end_date: str, min_market_cap: Opti
         Quick performance summary
     """
     try:
-        # Parse dates
-        start = date.fromisoformat(start_date)
-        end = date.fromisoformat(end_date)
-
-        # Run quick backtest
-        engine = BacktestEngine()
-        results = engine.run_backtest(
-            start_date=start,
-            end_date=end,
-            initial_capital=100000.0,
-            top_n=50,
-            min_market_cap=min_market_cap,
+        # Default configuration: shares cached results with /run
+        config = BacktestConfig(
+            start_date=start_date, end_date=end_date, min_market_cap=min_market_cap
         )
+        job = await _submit(config)
+        results = await get_backtest_jobs().wait(job)
 
         return {
             "metrics": results["performance_metrics"],
             "num_rebalances": len(results["rebalance_history"]),
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
@@ -0,0 +1,91 @@
+"""
+Offloading blocking work from async routes
+
+The API's data access is synchronous (SQLAlchemy sessions, psycopg2, pandas
+read_sql, PortfolioAnalyzer, model inference). Run on the event loop, a single
+slow query stalls every concurrent request. All of it goes through one bounded
+worker-thread pool instead - the same AnyIO thread limiter FastAPI uses for
+plain `def` routes and dependencies such as get_db:
+
+- routes that only do blocking work are declared `def` (FastAPI runs them in
+  the pool)
+- async routes and services await blocking calls through run_blocking(), or
+  define the blocking helper with @blocking so existing `await` call sites
+  keep working
+
+    @blocking
+    def _get_market_price(self, symbol): ...       # await self._get_market_price(s)
+
+    rows = await run_blocking(db_query, client_id)
+    row = await fetch_one(db, text("SELECT ..."), {"client_id": client_id})
+
+The pool size comes from API_THREAD_POOL_SIZE (see configure_thread_pool);
+thread_pool_stats() reports occupancy and queueing for monitoring.
+"""
+
+import functools
+import os
+from typing import Any, Callable, Dict, TypeVar
+
+import anyio.to_thread
+
+T = TypeVar("T")
+
+DEFAULT_THREAD_POOL_SIZE = int(os.getenv("API_THREAD_POOL_SIZE", "40"))
+
+
+async def run_blocking(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run fn(*args, **kwargs) in the shared worker pool and await its result"""
+    return await anyio.to_thread.run_sync(functools.partial(fn, *args, **kwargs))
+
+
+def blocking(fn: Callable[..., T]) -> Callable[..., Any]:
+    """Decorator: turn a blocking function into an awaitable that runs in the pool"""
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        return await run_blocking(fn, *args, **kwargs)
+
+    wrapper.sync = fn  # direct synchronous access (scripts, tests)
+    return wrapper
+
+
+def configure_thread_pool(size: int = DEFAULT_THREAD_POOL_SIZE) -> None:
+    """Set the worker pool size; call from inside the event loop (app startup)"""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = size
+
+
+def thread_pool_stats() -> Dict[str, Any]:
+    """Worker pool size, threads in use and callers waiting for a thread"""
+    stats = anyio.to_thread.current_default_thread_limiter().statistics()
+    return {
+        "size": stats.total_tokens,
+        "in_use": stats.borrowed_tokens,
+        "waiting": stats.tasks_waiting,
+    }
+
+
+# Session helpers for async routes (the session itself is only ever used by
+# one thread at a time: the request awaits each call before the next)
+
+
+async def fetch_one(db, statement, params: Dict[str, Any] = None):
+    """db.execute(statement, params).fetchone() in the worker pool"""
+    return await run_blocking(lambda: db.execute(statement, params or {}).fetchone())
+
+
+async def fetch_all(db, statement, params: Dict[str, Any] = None):
+    """db.execute(statement, params).fetchall() in the worker pool"""
+    return await run_blocking(lambda: db.execute(statement, params or {}).fetchall())
+
+
+async def execute(db, statement, params: Dict[str, Any] = None, commit: bool = False):
+    """db.execute(statement, params) (and optionally db.commit()) in the worker pool"""
+
+    def _execute():
+        result = db.execute(statement, params or {})
+        if commit:
+            db.commit()
+        return result
+
+    return await run_blocking(_execute)
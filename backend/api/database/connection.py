@@ -10,7 +10,14 @@ from pathlib import Path
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
-from utils.db_config import SessionLocal, engine, get_psycopg2_connection
+from utils.db_config import (
+    SessionLocal,
+    connection_pool,
+    engine,
+    get_pool_stats,
+    get_psycopg2_connection,
+    get_psycopg2_cursor,
+)
 
 
 # SQLAlchemy session dependency for FastAPI
@@ -32,4 +39,12 @@ def get_db():
 
 
 # Export for convenience
-__all__ = ["engine", "SessionLocal", "get_db", "get_psycopg2_connection"]
+__all__ = [
+    "engine",
+    "SessionLocal",
+    "get_db",
+    "connection_pool",
+    "get_pool_stats",
+    "get_psycopg2_connection",
+    "get_psycopg2_cursor",
+]
@@ -5,6 +5,7 @@ Main application entry point for the web platform API.
 """
 
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -14,6 +15,8 @@ from fastapi.middleware.cors import CORSMiddleware
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from backend.api import backtest, ml_models, ml_portfolio
+from backend.api.database.blocking import configure_thread_pool, thread_pool_stats
+from backend.api.database.connection import connection_pool, get_pool_stats
 from backend.api.routers import (
     auth,
     autonomous,
@@ -26,6 +29,19 @@ from backend.api.routers import (
     system_admin,
     trading,
 )
+from backend.api.services.backtest_jobs import get_backtest_jobs
+from backend.api.services.schwab_api import close_http_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Size the worker pool for blocking work; close the shared pools on shutdown"""
+    configure_thread_pool()
+    yield
+    await close_http_client()
+    get_backtest_jobs().shutdown()
+    connection_pool.closeall()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -34,6 +50,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    lifespan=lifespan,
 )
 
 # CORS middleware (allow frontend to connect)
@@ -94,6 +111,18 @@ async def health_check():
     return {"status": "healthy", "service": "acis-ai-platform", "database": "connected"}
 
 
+@app.get("/api/health/thread-pool")
+async def thread_pool_health():
+    """Worker pool occupancy (blocking routes and offloaded database calls)"""
+    return thread_pool_stats()
+
+
+@app.get("/api/health/db-pool")
+async def db_pool_health():
+    """Shared psycopg2 pool sizing, occupancy and checkout wait times"""
+    return get_pool_stats()
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -95,7 +95,7 @@ def get_model_created_time(model_dir: Path) -> str:
 
 
 @router.get("/list", response_model=List[ModelInfo])
-async def list_models():
+def list_models():
     """List all trained models"""
     models = []
 
@@ -123,7 +123,7 @@ async def list_models():
 
 
 @router.get("/{model_name}/details")
-async def get_model_details(model_name: str):
+def get_model_details(model_name: str):
     """Get detailed information about a specific model"""
     model_dir = MODELS_DIR / model_name
 
@@ -152,7 +152,7 @@ async def get_model_details(model_name: str):
 
 
 @router.post("/{model_name}/set-production")
-async def set_production_model(model_name: str, reason: Optional[str] = None):
+def set_production_model(model_name: str, reason: Optional[str] = None):
     """Set a model as the production model"""
     try:
         conn = psycopg2.connect(**DB_CONFIG)
@@ -201,7 +201,7 @@ async def set_production_model(model_name: str, reason: Optional[str] = None):
 
 
 @router.get("/production")
-async def get_production_models():
+def get_production_models():
     """Get all current production models"""
     try:
         conn = psycopg2.connect(**DB_CONFIG)
@@ -235,7 +235,7 @@ async def get_production_models():
 
 
 @router.delete("/{model_name}")
-async def delete_model(model_name: str):
+def delete_model(model_name: str):
     """Delete a trained model (only if not in production)"""
     try:
         conn = psycopg2.connect(**DB_CONFIG)
@@ -391,7 +391,7 @@ def run_training_job(job_id: str, config: TrainingConfig):
 
 
 @router.post("/train")
-async def start_training(config: TrainingConfig, background_tasks: BackgroundTasks):
+def start_training(config: TrainingConfig, background_tasks: BackgroundTasks):
     """Start a new model training job"""
     job_id = datetime.now().strftime("%Y%m%d_%H%M%S")
 
@@ -412,13 +412,13 @@ async def start_training(config: TrainingConfig, background_tasks: BackgroundTas
 
 
 @router.get("/jobs", response_model=List[TrainingJob])
-async def list_training_jobs():
+def list_training_jobs():
     """List all training jobs"""
     return list(training_jobs.values())
 
 
 @router.get("/jobs/{job_id}")
-async def get_job_status(job_id: str):
+def get_job_status(job_id: str):
     """Get status of a specific training job"""
     if job_id not in training_jobs:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -437,7 +437,7 @@ async def get_job_status(job_id: str):
 
 
 @router.delete("/jobs/{job_id}")
-async def delete_training_job(job_id: str):
+def delete_training_job(job_id: str):
     """Delete a training job (removes from tracking, optionally deletes log file)"""
     if job_id not in training_jobs:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -461,7 +461,7 @@ async def delete_training_job(job_id: str):
 
 
 @router.get("/jobs/{job_id}/logs")
-async def get_job_logs(job_id: str, lines: int = 100):
+def get_job_logs(job_id: str, lines: int = 100):
     """Get recent logs from a training job"""
     if job_id not in training_jobs:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -14,6 +14,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from portfolio.ml_portfolio_manager import MLPortfolioManager
+from portfolio.model_registry import model_registry
 
 router = APIRouter(prefix="/api/ml-portfolio", tags=["ml-portfolio"])
 
@@ -42,7 +43,7 @@ class PortfolioResponse(BaseModel):
 
 
 @router.post("/generate", response_model=PortfolioResponse)
-async def generate_portfolio(config: PortfolioConfig):
+def generate_portfolio(config: PortfolioConfig):
     """
     Generate ML-based portfolio recommendations
 
@@ -102,7 +103,7 @@ async def generate_portfolio(config: PortfolioConfig):
 
 
 @router.get("/model-info")
-async def get_model_info():
+def get_model_info():
     """Get trained model information"""
     try:
         manager = MLPortfolioManager()
@@ -121,7 +122,7 @@ async def get_model_info():
 
 
 @router.get("/feature-importance")
-async def get_feature_importance():
+def get_feature_importance():
     """Get feature importance from trained model"""
     try:
         import pandas as pd
@@ -136,22 +137,25 @@ async def get_feature_importance():
 
 
 @router.get("/predictions")
-async def get_latest_predictions(limit: int = 100):
+def get_latest_predictions(limit: int = 100):
     """Get latest stock predictions"""
     try:
         manager = MLPortfolioManager()
 
-        # Load latest features
-        features_df = manager.get_latest_features()
-
-        # Generate predictions
-        predictions = manager.generate_predictions(features_df)
+        # Latest predictions (scored once per model version and date, then stored)
+        predictions = manager.get_predictions()
 
         return {
             "predictions": predictions.head(limit).to_dict("records"),
             "total_count": len(predictions),
-            "date": str(features_df["date"].iloc[0]) if len(features_df) > 0 else None,
+            "date": str(predictions["date"].iloc[0]) if len(predictions) > 0 else None,
         }
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting predictions: {str(e)}")
+
+
+@router.get("/model-registry")
+async def get_model_registry_stats():
+    """Get model registry load/hit/miss counters and resident models"""
+    return model_registry.stats()
@@ -54,7 +54,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 
 @router.post("/login")
-async def login(credentials: HTTPBasicCredentials = Depends(security)):
+def login(credentials: HTTPBasicCredentials = Depends(security)):
     """
     Simple login endpoint using HTTP Basic Auth
 
@@ -88,7 +88,7 @@ async def login(credentials: HTTPBasicCredentials = Depends(security)):
 
 
 @router.get("/me")
-async def get_current_user(credentials: HTTPBasicCredentials = Depends(security)):
+def get_current_user(credentials: HTTPBasicCredentials = Depends(security)):
     """Get current user info"""
     if credentials.username != ADMIN_EMAIL or not verify_password(
         credentials.password, ADMIN_PASSWORD_HASH
@@ -17,7 +17,7 @@ router = APIRouter(prefix="/api/autonomous", tags=["autonomous"])
 
 
 @router.get("/status")
-async def get_autonomous_status(db: Session = Depends(get_db)):
+def get_autonomous_status(db: Session = Depends(get_db)):
     """
     Get current status of the autonomous trading system
 
@@ -135,7 +135,7 @@ async def get_autonomous_status(db: Session = Depends(get_db)):
 
 
 @router.get("/rebalances")
-async def get_rebalances(limit: int = 10, offset: int = 0, db: Session = Depends(get_db)):
+def get_rebalances(limit: int = 10, offset: int = 0, db: Session = Depends(get_db)):
     """
     Get recent rebalancing events
 
@@ -185,7 +185,7 @@ async def get_rebalances(limit: int = 10, offset: int = 0, db: Session = Depends
 
 
 @router.get("/rebalances/{rebalance_id}")
-async def get_rebalance_detail(rebalance_id: int, db: Session = Depends(get_db)):
+def get_rebalance_detail(rebalance_id: int, db: Session = Depends(get_db)):
     """
     Get detailed information about a specific rebalancing event
 
@@ -239,7 +239,7 @@ async def get_rebalance_detail(rebalance_id: int, db: Session = Depends(get_db))
 
 
 @router.get("/portfolio")
-async def get_autonomous_portfolio(db: Session = Depends(get_db)):
+def get_autonomous_portfolio(db: Session = Depends(get_db)):
     """
     Get current autonomous fund portfolio positions
 
@@ -283,7 +283,7 @@ async def get_autonomous_portfolio(db: Session = Depends(get_db)):
 
 
 @router.get("/market-regime")
-async def get_market_regime_history(days: int = 30, db: Session = Depends(get_db)):
+def get_market_regime_history(days: int = 30, db: Session = Depends(get_db)):
     """
     Get market regime history
 
@@ -317,7 +317,7 @@ async def get_market_regime_history(days: int = 30, db: Session = Depends(get_db
 
 
 @router.post("/rebalance/trigger")
-async def trigger_rebalance(force: bool = False, dry_run: bool = True, db=Depends(get_db)):
+def trigger_rebalance(force: bool = False, dry_run: bool = True, db=Depends(get_db)):
     """
     Manually trigger a rebalance (admin only)
 
@@ -340,7 +340,7 @@ async def trigger_rebalance(force: bool = False, dry_run: bool = True, db=Depend
 
 
 @router.get("/performance/metrics")
-async def get_performance_metrics(db: Session = Depends(get_db)):
+def get_performance_metrics(db: Session = Depends(get_db)):
     """
     Get autonomous fund performance metrics
 
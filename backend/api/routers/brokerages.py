@@ -15,7 +15,7 @@ router = APIRouter(prefix="/api/brokerages", tags=["Brokerages"])
 
 
 @router.get("/", response_model=List[schemas.Brokerage])
-async def get_brokerages(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def get_brokerages(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """Get all brokerages"""
     # Validate pagination parameters
     if skip < 0:
@@ -64,7 +64,7 @@ async def get_brokerages(skip: int = 0, limit: int = 100, db: Session = Depends(
 
 
 @router.get("/{brokerage_id}", response_model=schemas.Brokerage)
-async def get_brokerage(brokerage_id: int, db: Session = Depends(get_db)):
+def get_brokerage(brokerage_id: int, db: Session = Depends(get_db)):
     """Get a specific brokerage by ID"""
     query = text(
         """
@@ -102,7 +102,7 @@ async def get_brokerage(brokerage_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/", response_model=schemas.Brokerage)
-async def create_brokerage(brokerage: schemas.BrokerageCreate, db: Session = Depends(get_db)):
+def create_brokerage(brokerage: schemas.BrokerageCreate, db: Session = Depends(get_db)):
     """Create a new brokerage"""
     query = text(
         """
@@ -148,7 +148,7 @@ async def create_brokerage(brokerage: schemas.BrokerageCreate, db: Session = Dep
 
 
 @router.put("/{brokerage_id}", response_model=schemas.Brokerage)
-async def update_brokerage(
+def update_brokerage(
     brokerage_id: int, brokerage: schemas.BrokerageUpdate, db: Session = Depends(get_db)
 ):
     """Update an existing brokerage"""
@@ -217,7 +217,7 @@ async def update_brokerage(
 
 
 @router.delete("/{brokerage_id}")
-async def delete_brokerage(brokerage_id: int, db: Session = Depends(get_db)):
+def delete_brokerage(brokerage_id: int, db: Session = Depends(get_db)):
     """Delete a brokerage"""
     # Check if brokerage has associated accounts
     check_query = text(
@@ -258,7 +258,7 @@ async def delete_brokerage(brokerage_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/client/{client_id}/accounts", response_model=List[schemas.ClientBrokerageAccount])
-async def get_client_accounts(client_id: int, db: Session = Depends(get_db)):
+def get_client_accounts(client_id: int, db: Session = Depends(get_db)):
     """Get all brokerage accounts for a client"""
     query = text(
         """
@@ -302,7 +302,7 @@ async def get_client_accounts(client_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/accounts/{account_id}", response_model=schemas.ClientBrokerageAccount)
-async def get_account(account_id: int, db: Session = Depends(get_db)):
+def get_account(account_id: int, db: Session = Depends(get_db)):
     """Get a specific brokerage account by ID"""
     query = text(
         """
@@ -342,9 +342,7 @@ async def get_account(account_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/accounts", response_model=schemas.ClientBrokerageAccount)
-async def create_account(
-    account: schemas.ClientBrokerageAccountCreate, db: Session = Depends(get_db)
-):
+def create_account(account: schemas.ClientBrokerageAccountCreate, db: Session = Depends(get_db)):
     """Create a new brokerage account for a client"""
     # Verify client exists
     client_check = db.execute(
@@ -404,7 +402,7 @@ async def create_account(
 
 
 @router.put("/accounts/{account_id}", response_model=schemas.ClientBrokerageAccount)
-async def update_account(
+def update_account(
     account_id: int, account: schemas.ClientBrokerageAccountUpdate, db: Session = Depends(get_db)
 ):
     """Update a brokerage account"""
@@ -473,7 +471,7 @@ async def update_account(
 
 
 @router.delete("/accounts/{account_id}")
-async def delete_account(account_id: int, db: Session = Depends(get_db)):
+def delete_account(account_id: int, db: Session = Depends(get_db)):
     """Delete a brokerage account"""
     # Check if account exists
     existing = db.execute(
@@ -8,6 +8,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from ..database.blocking import execute, fetch_one
 from ..database.connection import get_db
 from ..models import schemas
 
@@ -15,7 +16,7 @@ router = APIRouter(prefix="/api/clients", tags=["Clients"])
 
 
 @router.get("/", response_model=List[schemas.Client])
-async def get_clients(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def get_clients(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """
     Get all clients
 
@@ -80,7 +81,7 @@ async def get_clients(skip: int = 0, limit: int = 100, db: Session = Depends(get
 
 
 @router.get("/{client_id}", response_model=schemas.Client)
-async def get_client(client_id: int, db: Session = Depends(get_db)):
+def get_client(client_id: int, db: Session = Depends(get_db)):
     """Get a specific client by ID"""
     query = text(
         """
@@ -130,7 +131,7 @@ async def get_client(client_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/", response_model=schemas.Client)
-async def create_client(client: schemas.ClientCreate, db: Session = Depends(get_db)):
+def create_client(client: schemas.ClientCreate, db: Session = Depends(get_db)):
     """Create a new client"""
     query = text(
         """
@@ -185,9 +186,7 @@ async def create_client(client: schemas.ClientCreate, db: Session = Depends(get_
 
 
 @router.put("/{client_id}", response_model=schemas.Client)
-async def update_client(
-    client_id: int, client: schemas.ClientUpdate, db: Session = Depends(get_db)
-):
+def update_client(client_id: int, client: schemas.ClientUpdate, db: Session = Depends(get_db)):
     """Update an existing client"""
     # Build update query dynamically based on provided fields
     update_fields = []
@@ -280,7 +279,7 @@ async def update_client(
 
 
 @router.delete("/{client_id}")
-async def delete_client(client_id: int, db: Session = Depends(get_db)):
+def delete_client(client_id: int, db: Session = Depends(get_db)):
     """Soft delete a client (set is_active = FALSE)"""
     query = text(
         """
@@ -302,7 +301,7 @@ async def delete_client(client_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/{client_id}/accounts", response_model=List[schemas.ClientBrokerageAccount])
-async def get_client_accounts(client_id: int, db: Session = Depends(get_db)):
+def get_client_accounts(client_id: int, db: Session = Depends(get_db)):
     """Get all brokerage accounts for a client"""
     query = text(
         """
@@ -349,7 +348,7 @@ async def get_client_accounts(client_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/{client_id}/autonomous-settings")
-async def get_client_autonomous_settings(client_id: int, db: Session = Depends(get_db)):
+def get_client_autonomous_settings(client_id: int, db: Session = Depends(get_db)):
     """
     Get autonomous trading settings for a client
 
@@ -408,7 +407,7 @@ async def get_client_autonomous_settings(client_id: int, db: Session = Depends(g
 
 
 @router.put("/{client_id}/autonomous-settings")
-async def update_client_autonomous_settings(
+def update_client_autonomous_settings(
     client_id: int, settings: dict, db: Session = Depends(get_db)
 ):
     """
@@ -528,7 +527,7 @@ async def update_client_autonomous_settings(
         db.commit()
 
         # Fetch and return updated settings
-        return await get_client_autonomous_settings(client_id, db)
+        return get_client_autonomous_settings(client_id, db)
 
     except HTTPException:
         raise
@@ -538,7 +537,7 @@ async def update_client_autonomous_settings(
 
 
 @router.get("/aggregate/portfolio-stats")
-async def get_aggregate_portfolio_stats(db: Session = Depends(get_db)):
+def get_aggregate_portfolio_stats(db: Session = Depends(get_db)):
     """
     Get aggregate portfolio statistics across all active clients
 
@@ -662,7 +661,7 @@ async def sync_balance_from_schwab(client_id: int, db: Session = Depends(get_db)
             LIMIT 1
         """
         )
-        account_result = db.execute(account_query, {"client_id": client_id}).fetchone()
+        account_result = await fetch_one(db, account_query, {"client_id": client_id})
 
         if not account_result:
             raise HTTPException(
@@ -682,9 +681,9 @@ async def sync_balance_from_schwab(client_id: int, db: Session = Depends(get_db)
             LIMIT 1
         """
         )
-        token_result = db.execute(
-            token_query, {"client_id": client_id, "brokerage_id": brokerage_id}
-        ).fetchone()
+        token_result = await fetch_one(
+            db, token_query, {"client_id": client_id, "brokerage_id": brokerage_id}
+        )
 
         if not token_result or not token_result.access_token:
             raise HTTPException(
@@ -726,7 +725,8 @@ async def sync_balance_from_schwab(client_id: int, db: Session = Depends(get_db)
         """
         )
 
-        db.execute(
+        await execute(
+            db,
             update_query,
             {
                 "account_id": account_hash,
@@ -734,8 +734,8 @@ async def sync_balance_from_schwab(client_id: int, db: Session = Depends(get_db)
                 "buying_power": float(buying_power),
                 "total_value": float(account_value),
             },
+            commit=True,
         )
-        db.commit()
 
         return {
             "success": True,
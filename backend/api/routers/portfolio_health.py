@@ -18,18 +18,11 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from portfolio_analyzer import PortfolioAnalyzer
 
-from ..database.connection import get_db
+from ..database.blocking import fetch_one, run_blocking
+from ..database.connection import get_db, get_psycopg2_connection, get_psycopg2_cursor
 
 router = APIRouter(prefix="/api/portfolio-health", tags=["Portfolio Health"])
 
-# Database connection string from environment variables
-DB_HOST = os.getenv("DB_HOST", "localhost")
-DB_PORT = os.getenv("DB_PORT", "5432")
-DB_NAME = os.getenv("DB_NAME", "acis-ai")
-DB_USER = os.getenv("DB_USER", "postgres")
-DB_PASSWORD = os.getenv("DB_PASSWORD", "")
-DB_CONN_STRING = f"dbname={DB_NAME} user={DB_USER} password={DB_PASSWORD} host={DB_HOST}"
-
 
 async def sync_schwab_positions_to_paper(client_id: int, account_hash: str, db: Session):
     """
@@ -38,9 +31,6 @@ async def sync_schwab_positions_to_paper(client_id: int, account_hash: str, db:
     Uses a separate psycopg2 connection to ensure data is immediately
     committed and visible to the Portfolio Analyzer.
     """
-    import psycopg2
-    from psycopg2.extras import RealDictCursor
-
     from ..services.schwab_api import SchwabAPIClient
     from ..services.schwab_oauth import SchwabOAuthService
 
@@ -70,94 +60,106 @@ async def sync_schwab_positions_to_paper(client_id: int, account_hash: str, db:
         f"Schwab balances - Cash: ${cash_balance:,.2f}, Buying Power: ${buying_power:,.2f}, Account Value: ${account_value:,.2f}"
     )
 
-    # Use separate connection to ensure immediate commit
-    conn = psycopg2.connect(DB_CONN_STRING)
+    return await run_blocking(
+        _write_positions_to_paper,
+        account_hash,
+        positions,
+        cash_balance,
+        buying_power,
+        account_value,
+    )
+
+
+def _write_positions_to_paper(
+    account_hash: str, positions: list, cash_balance, buying_power, account_value
+) -> bool:
+    """Replace the account's paper_positions and balances (runs in the worker pool)"""
     try:
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        with get_psycopg2_connection() as conn:
+            cursor = get_psycopg2_cursor(conn)
+
+            # Ensure account exists in paper_accounts with actual balances from Schwab
+            cursor.execute(
+                """
+                INSERT INTO paper_accounts (account_id, cash_balance, buying_power, total_value)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (account_id) DO UPDATE SET
+                    cash_balance = EXCLUDED.cash_balance,
+                    buying_power = EXCLUDED.buying_power,
+                    total_value = EXCLUDED.total_value,
+                    updated_at = CURRENT_TIMESTAMP
+            """,
+                (account_hash, cash_balance, buying_power, account_value),
+            )
 
-        # Ensure account exists in paper_accounts with actual balances from Schwab
-        cursor.execute(
-            """
-            INSERT INTO paper_accounts (account_id, cash_balance, buying_power, total_value)
-            VALUES (%s, %s, %s, %s)
-            ON CONFLICT (account_id) DO UPDATE SET
-                cash_balance = EXCLUDED.cash_balance,
-                buying_power = EXCLUDED.buying_power,
-                total_value = EXCLUDED.total_value,
-                updated_at = CURRENT_TIMESTAMP
-        """,
-            (account_hash, cash_balance, buying_power, account_value),
-        )
-
-        # Clear existing positions for this account in paper_positions
-        cursor.execute(
-            """
-            DELETE FROM paper_positions
-            WHERE account_id = %s
-        """,
-            (account_hash,),
-        )
-
-        # Insert current Schwab positions (if any)
-        inserted_count = 0
-        if positions:
-            for position in positions:
-                ticker = position.get("symbol", "")
-
-                if not ticker:
-                    continue
-
-                # Calculate values from Schwab position data (already formatted by get_positions)
-                quantity = float(position.get("quantity", 0))
-                market_value = float(position.get("current_value", 0))
-                avg_price = float(position.get("average_price", 0))
-                current_price = market_value / quantity if quantity > 0 else 0
-                unrealized_pnl = float(position.get("total_gain", 0))
-
-                cursor.execute(
-                    """
-                    INSERT INTO paper_positions (account_id, ticker, quantity, avg_price, market_value, unrealized_pnl)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (account_id, ticker)
-                    DO UPDATE SET
-                        quantity = EXCLUDED.quantity,
-                        avg_price = EXCLUDED.avg_price,
-                        market_value = EXCLUDED.market_value,
-                        unrealized_pnl = EXCLUDED.unrealized_pnl,
-                        updated_at = CURRENT_TIMESTAMP
-                """,
-                    (account_hash, ticker, quantity, avg_price, market_value, unrealized_pnl),
-                )
-                inserted_count += 1
-                print(f"  Inserted {ticker}: qty={quantity}, value=${market_value}")
+            # Clear existing positions for this account in paper_positions
+            cursor.execute(
+                """
+                DELETE FROM paper_positions
+                WHERE account_id = %s
+            """,
+                (account_hash,),
+            )
 
-        # Commit immediately to make data visible to other connections
-        conn.commit()
+            # Insert current Schwab positions (if any)
+            inserted_count = 0
+            if positions:
+                for position in positions:
+                    ticker = position.get("symbol", "")
+
+                    if not ticker:
+                        continue
+
+                    # Calculate values from Schwab position data (already formatted by get_positions)
+                    quantity = float(position.get("quantity", 0))
+                    market_value = float(position.get("current_value", 0))
+                    avg_price = float(position.get("average_price", 0))
+                    current_price = market_value / quantity if quantity > 0 else 0
+                    unrealized_pnl = float(position.get("total_gain", 0))
+
+                    cursor.execute(
+                        """
+                        INSERT INTO paper_positions (account_id, ticker, quantity, avg_price, market_value, unrealized_pnl)
+                        VALUES (%s, %s, %s, %s, %s, %s)
+                        ON CONFLICT (account_id, ticker)
+                        DO UPDATE SET
+                            quantity = EXCLUDED.quantity,
+                            avg_price = EXCLUDED.avg_price,
+                            market_value = EXCLUDED.market_value,
+                            unrealized_pnl = EXCLUDED.unrealized_pnl,
+                            updated_at = CURRENT_TIMESTAMP
+                    """,
+                        (account_hash, ticker, quantity, avg_price, market_value, unrealized_pnl),
+                    )
+                    inserted_count += 1
+                    print(f"  Inserted {ticker}: qty={quantity}, value=${market_value}")
+
+            # Commit immediately to make data visible to other connections
+            conn.commit()
+
+            if positions:
+                print(
+                    f"Successfully synced {inserted_count}/{len(positions)} positions to paper_positions"
+                )
+            else:
+                print(f"No positions to sync, but balances updated successfully")
 
-        if positions:
+            # Verify the data was actually inserted
+            cursor.execute(
+                "SELECT COUNT(*) FROM paper_positions WHERE account_id = %s", (account_hash,)
+            )
+            count = cursor.fetchone()["count"]
             print(
-                f"Successfully synced {inserted_count}/{len(positions)} positions to paper_positions"
+                f"  Verification: {count} positions in database for account {account_hash[:8]}..."
             )
-        else:
-            print(f"No positions to sync, but balances updated successfully")
-
-        # Verify the data was actually inserted
-        cursor.execute(
-            "SELECT COUNT(*) FROM paper_positions WHERE account_id = %s", (account_hash,)
-        )
-        count = cursor.fetchone()["count"]
-        print(f"  Verification: {count} positions in database for account {account_hash[:8]}...")
 
-        return True
+            return True
     except Exception as e:
-        conn.rollback()
         print(f"Error syncing positions: {str(e)}")
         import traceback
 
         traceback.print_exc()
         return False
-    finally:
-        conn.close()
 
 
 @router.get("/{client_id}/analysis")
@@ -181,7 +183,8 @@ async def analyze_client_portfolio(
     try:
         # If no account_id specified, get the client's primary brokerage account
         if not account_id:
-            result = db.execute(
+            account_row = await fetch_one(
+                db,
                 text(
                     """
                 SELECT account_hash
@@ -195,7 +198,6 @@ async def analyze_client_portfolio(
                 {"client_id": client_id},
             )
 
-            account_row = result.fetchone()
             if account_row:
                 account_id = account_row.account_hash
             else:
@@ -205,8 +207,8 @@ async def analyze_client_portfolio(
         # Sync Schwab positions to paper_positions table for analysis
         await sync_schwab_positions_to_paper(client_id, account_id, db)
 
-        analyzer = PortfolioAnalyzer(DB_CONN_STRING)
-        analysis = analyzer.analyze_portfolio(client_id, account_id, strategy)
+        analyzer = PortfolioAnalyzer()
+        analysis = await run_blocking(analyzer.analyze_portfolio, client_id, account_id, strategy)
 
         return analysis
 
@@ -215,7 +217,7 @@ async def analyze_client_portfolio(
 
 
 @router.get("/{client_id}/rebalance-recommendations")
-async def get_rebalance_recommendations(
+def get_rebalance_recommendations(
     client_id: int,
     account_id: Optional[str] = None,
     min_priority: str = "low",
@@ -236,7 +238,7 @@ async def get_rebalance_recommendations(
         if not account_id:
             account_id = f"PAPER_CLIENT_{client_id}"
 
-        analyzer = PortfolioAnalyzer(DB_CONN_STRING)
+        analyzer = PortfolioAnalyzer()
         analysis = analyzer.analyze_portfolio(client_id, account_id)
 
         # Filter by priority
@@ -263,7 +265,7 @@ async def get_rebalance_recommendations(
 
 
 @router.get("/{client_id}/health-score")
-async def get_portfolio_health_score(
+def get_portfolio_health_score(
     client_id: int, account_id: Optional[str] = None, db: Session = Depends(get_db)
 ):
     """
@@ -275,7 +277,7 @@ async def get_portfolio_health_score(
         if not account_id:
             account_id = f"PAPER_CLIENT_{client_id}"
 
-        analyzer = PortfolioAnalyzer(DB_CONN_STRING)
+        analyzer = PortfolioAnalyzer()
         analysis = analyzer.analyze_portfolio(client_id, account_id)
 
         return {
@@ -343,13 +345,14 @@ async def sync_positions(client_id: int, account_hash: str, db: Session = Depend
 
         if success:
             # Get count of synced positions
-            result = db.execute(
+            row = await fetch_one(
+                db,
                 text(
                     "SELECT COUNT(*) as count FROM paper_positions WHERE account_id = :account_hash"
                 ),
                 {"account_hash": account_hash},
             )
-            count = result.fetchone().count
+            count = row.count
 
             return {
                 "success": True,
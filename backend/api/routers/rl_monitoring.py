@@ -11,26 +11,19 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-import psycopg2
 from fastapi import APIRouter, HTTPException
-from psycopg2.extras import RealDictCursor
+
+from ..database.blocking import run_blocking
+from ..database.connection import get_psycopg2_connection, get_psycopg2_cursor
 
 router = APIRouter(prefix="/api/rl", tags=["rl"])
 
 # Get project root (2 levels up from this file)
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 
-DB_CONFIG = {
-    "dbname": "acis-ai",
-    "user": "postgres",
-    "password": "$@nJose420",
-    "host": "localhost",
-    "port": 5432,
-}
-
 
 @router.get("/training-status")
-async def get_training_status() -> Dict[str, Any]:
+def get_training_status() -> Dict[str, Any]:
     """
     Get current training status for all RL models.
 
@@ -122,7 +115,7 @@ async def get_training_status() -> Dict[str, Any]:
 
 
 @router.get("/model-performance")
-async def get_model_performance() -> Dict[str, Any]:
+def get_model_performance() -> Dict[str, Any]:
     """
     Get performance metrics for all trained models.
 
@@ -178,6 +171,24 @@ async def get_model_performance() -> Dict[str, Any]:
     }
 
 
+def _get_account_row(client_id: int) -> Optional[Dict[str, Any]]:
+    """First brokerage account for a client (blocking; run via run_blocking)"""
+    with get_psycopg2_connection() as conn:
+        with get_psycopg2_cursor(conn) as cur:
+            cur.execute(
+                """
+                SELECT account_hash
+                FROM brokerage_accounts
+                WHERE client_id = %s
+                LIMIT 1
+            """,
+                [client_id],
+            )
+
+            account_row = cur.fetchone()
+    return account_row
+
+
 @router.get("/recommendations/{portfolio_id}")
 async def get_rl_recommendations(
     portfolio_id: int, client_id: int = 1, max_recommendations: int = 10
@@ -196,22 +207,7 @@ async def get_rl_recommendations(
     from backend.api.services.rl_recommender import get_rl_recommender_service
 
     # Get client's account hash
-    conn = psycopg2.connect(**DB_CONFIG, cursor_factory=RealDictCursor)
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        SELECT account_hash
-        FROM brokerage_accounts
-        WHERE client_id = %s
-        LIMIT 1
-    """,
-        [client_id],
-    )
-
-    account_row = cur.fetchone()
-    cur.close()
-    conn.close()
+    account_row = await run_blocking(_get_account_row, client_id)
 
     if not account_row:
         raise HTTPException(status_code=404, detail="No brokerage account found for client")
@@ -243,7 +239,7 @@ async def get_rl_recommendations(
 
 
 @router.get("/training-logs/{portfolio_id}")
-async def get_training_logs(portfolio_id: int, tail_lines: int = 100) -> Dict[str, Any]:
+def get_training_logs(portfolio_id: int, tail_lines: int = 100) -> Dict[str, Any]:
     """
     Get recent training logs for a specific portfolio.
 
@@ -286,7 +282,7 @@ async def get_training_logs(portfolio_id: int, tail_lines: int = 100) -> Dict[st
 
 
 @router.get("/model-info")
-async def get_model_info() -> Dict[str, Any]:
+def get_model_info() -> Dict[str, Any]:
     """
     Get information about all RL models (paths, strategies, status).
     """
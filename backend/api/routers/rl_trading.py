@@ -9,6 +9,8 @@ from typing import Any, Dict, Optional
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
+from ..database.blocking import run_blocking
+from ..database.connection import get_psycopg2_connection, get_psycopg2_cursor
 from ..services.rl_trading_pipeline import get_rl_trading_pipeline
 
 router = APIRouter(prefix="/api/rl/trading", tags=["rl-trading"])
@@ -122,7 +124,7 @@ async def get_order_batch(batch_id: str) -> Dict[str, Any]:
 
 
 @router.get("/batches")
-async def list_order_batches(
+def list_order_batches(
     client_id: Optional[int] = None, status: Optional[str] = None, limit: int = 20
 ) -> Dict[str, Any]:
     """
@@ -136,41 +138,26 @@ async def list_order_batches(
     Returns:
         List of order batches
     """
-    import psycopg2
-    from psycopg2.extras import RealDictCursor
-
     try:
-        db_config = {
-            "dbname": "acis-ai",
-            "user": "postgres",
-            "password": "$@nJose420",
-            "host": "localhost",
-            "port": 5432,
-        }
-
-        conn = psycopg2.connect(**db_config, cursor_factory=RealDictCursor)
-        cur = conn.cursor()
-
-        # Build query with filters
-        query = "SELECT * FROM rl_order_batches WHERE 1=1"
-        params = []
-
-        if client_id is not None:
-            query += " AND client_id = %s"
-            params.append(client_id)
+        with get_psycopg2_connection() as conn:
+            with get_psycopg2_cursor(conn) as cur:
+                # Build query with filters
+                query = "SELECT * FROM rl_order_batches WHERE 1=1"
+                params = []
 
-        if status:
-            query += " AND status = %s"
-            params.append(status)
+                if client_id is not None:
+                    query += " AND client_id = %s"
+                    params.append(client_id)
 
-        query += " ORDER BY created_at DESC LIMIT %s"
-        params.append(limit)
+                if status:
+                    query += " AND status = %s"
+                    params.append(status)
 
-        cur.execute(query, params)
-        batches = cur.fetchall()
+                query += " ORDER BY created_at DESC LIMIT %s"
+                params.append(limit)
 
-        cur.close()
-        conn.close()
+                cur.execute(query, params)
+                batches = cur.fetchall()
 
         return {"batches": [dict(b) for b in batches], "count": len(batches)}
 
@@ -195,35 +182,26 @@ async def approve_order_batch(
     """
     from datetime import datetime
 
-    import psycopg2
-
     try:
-        db_config = {
-            "dbname": "acis-ai",
-            "user": "postgres",
-            "password": "$@nJose420",
-            "host": "localhost",
-            "port": 5432,
-        }
-
         # Update batch status to approved
-        conn = psycopg2.connect(**db_config)
-        cur = conn.cursor()
-
-        cur.execute(
-            """
-            UPDATE rl_order_batches
-            SET status = 'approved', updated_at = %s
-            WHERE batch_id = %s AND status = 'pending_approval'
-            RETURNING batch_id
-        """,
-            [datetime.now(), batch_id],
-        )
-
-        result = cur.fetchone()
-        conn.commit()
-        cur.close()
-        conn.close()
+        def _mark_approved():
+            with get_psycopg2_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """
+                        UPDATE rl_order_batches
+                        SET status = 'approved', updated_at = %s
+                        WHERE batch_id = %s AND status = 'pending_approval'
+                        RETURNING batch_id
+                    """,
+                        [datetime.now(), batch_id],
+                    )
+
+                    result = cur.fetchone()
+                    conn.commit()
+            return result
+
+        result = await run_blocking(_mark_approved)
 
         if not result:
             raise HTTPException(
@@ -253,7 +231,7 @@ async def approve_order_batch(
 
 
 @router.post("/batches/{batch_id}/reject")
-async def reject_order_batch(batch_id: str, reason: str = "") -> Dict[str, Any]:
+def reject_order_batch(batch_id: str, reason: str = "") -> Dict[str, Any]:
     """
     Reject an order batch.
 
@@ -266,34 +244,21 @@ async def reject_order_batch(batch_id: str, reason: str = "") -> Dict[str, Any]:
     """
     from datetime import datetime
 
-    import psycopg2
-
     try:
-        db_config = {
-            "dbname": "acis-ai",
-            "user": "postgres",
-            "password": "$@nJose420",
-            "host": "localhost",
-            "port": 5432,
-        }
-
-        conn = psycopg2.connect(**db_config)
-        cur = conn.cursor()
-
-        cur.execute(
-            """
-            UPDATE rl_order_batches
-            SET status = 'rejected', updated_at = %s
-            WHERE batch_id = %s AND status = 'pending_approval'
-            RETURNING batch_id
-        """,
-            [datetime.now(), batch_id],
-        )
+        with get_psycopg2_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    UPDATE rl_order_batches
+                    SET status = 'rejected', updated_at = %s
+                    WHERE batch_id = %s AND status = 'pending_approval'
+                    RETURNING batch_id
+                """,
+                    [datetime.now(), batch_id],
+                )
 
-        result = cur.fetchone()
-        conn.commit()
-        cur.close()
-        conn.close()
+                result = cur.fetchone()
+                conn.commit()
 
         if not result:
             raise HTTPException(
@@ -323,6 +288,8 @@ async def get_order_status(symbol: str, client_id: int, account_hash: str) -> Di
     """
     try:
         # Get Schwab API token
+        import os
+
         from sqlalchemy import create_engine, text
 
         from ..services.schwab_api import SchwabAPIClient
@@ -331,23 +298,26 @@ async def get_order_status(symbol: str, client_id: int, account_hash: str) -> Di
             os.getenv("POSTGRES_URL", "postgresql://postgres@localhost:5432/acis-ai")
         )
 
-        with engine.connect() as conn:
-            result = conn.execute(
-                text(
-                    """
-                SELECT access_token
-                FROM brokerage_oauth_tokens
-                WHERE client_id = :client_id AND brokerage_id = 1
-                LIMIT 1
-            """
-                ),
-                {"client_id": client_id},
-            ).fetchone()
-
-            if not result:
-                raise HTTPException(status_code=404, detail="No Schwab token found")
-
-            token = result[0]
+        def _fetch_token():
+            with engine.connect() as conn:
+                return conn.execute(
+                    text(
+                        """
+                    SELECT access_token
+                    FROM brokerage_oauth_tokens
+                    WHERE client_id = :client_id AND brokerage_id = 1
+                    LIMIT 1
+                """
+                    ),
+                    {"client_id": client_id},
+                ).fetchone()
+
+        result = await run_blocking(_fetch_token)
+
+        if not result:
+            raise HTTPException(status_code=404, detail="No Schwab token found")
+
+        token = result[0]
 
         # Get orders from Schwab
         api_client = SchwabAPIClient(token)
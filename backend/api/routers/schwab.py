@@ -15,8 +15,10 @@ from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import RedirectResponse
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from ..database.blocking import execute, fetch_one, run_blocking
 from ..database.connection import get_db
 from ..models import schemas
 from ..services.schwab_api import SchwabAPIClient
@@ -26,7 +28,7 @@ router = APIRouter(prefix="/api/schwab", tags=["Schwab"])
 
 
 @router.post("/ngrok/start")
-async def start_ngrok():
+def start_ngrok():
     """
     Start ngrok tunnel for OAuth callbacks.
 
@@ -88,7 +90,7 @@ async def start_ngrok():
 
 
 @router.get("/ngrok/status")
-async def check_ngrok_status():
+def check_ngrok_status():
     """
     Check if ngrok is running.
 
@@ -116,7 +118,7 @@ async def check_ngrok_status():
 
 
 @router.get("/authorize/{client_id}")
-async def start_oauth_flow(client_id: int, db: Session = Depends(get_db)):
+def start_oauth_flow(client_id: int, db: Session = Depends(get_db)):
     """
     Start Schwab OAuth flow for a client.
 
@@ -262,7 +264,7 @@ async def refresh_token(client_id: int, db: Session = Depends(get_db)):
 
 
 @router.delete("/revoke/{client_id}")
-async def revoke_token(client_id: int, db: Session = Depends(get_db)):
+def revoke_token(client_id: int, db: Session = Depends(get_db)):
     """
     Revoke (delete) Schwab OAuth token for a client.
 
@@ -425,7 +427,7 @@ async def get_portfolio_auto(client_id: int, db: Session = Depends(get_db)):
         """
         )
 
-        result = db.execute(query, {"client_id": client_id}).fetchone()
+        result = await fetch_one(db, query, {"client_id": client_id})
 
         if not result:
             raise HTTPException(
@@ -460,8 +462,12 @@ async def get_portfolio_auto(client_id: int, db: Session = Depends(get_db)):
                 WHERE id = :account_id
             """
             )
-            db.execute(update_query, {"account_hash": account_hash, "account_id": account_id})
-            db.commit()
+            await execute(
+                db,
+                update_query,
+                {"account_hash": account_hash, "account_id": account_id},
+                commit=True,
+            )
 
         # Get data from Schwab API
         api_client = SchwabAPIClient(token)
@@ -549,7 +555,7 @@ async def get_portfolio(client_id: int, account_hash: str, db: Session = Depends
 
 
 @router.get("/status/{client_id}")
-async def get_connection_status(client_id: int, db: Session = Depends(get_db)):
+def get_connection_status(client_id: int, db: Session = Depends(get_db)):
     """
     Check if client has active Schwab connection.
 
@@ -603,6 +609,8 @@ async def place_order(account_hash: str, order: dict, db: Session = Depends(get_
     Returns:
         Order confirmation with order ID
     """
+    from sqlalchemy import text
+
     try:
         # Find the brokerage account by hash
         query = text(
@@ -616,7 +624,7 @@ async def place_order(account_hash: str, order: dict, db: Session = Depends(get_
         """
         )
 
-        result = db.execute(query, {"account_hash": account_hash}).fetchone()
+        result = await fetch_one(db, query, {"account_hash": account_hash})
 
         if not result:
             raise HTTPException(status_code=404, detail="Account not found or no OAuth connection")
@@ -687,20 +695,10 @@ async def get_portfolio_risk_metrics(
 
         risk_service = get_risk_analytics()
 
-        # Convert all Decimal values to float before passing to risk analytics
-        positions_for_risk = []
-        for pos in portfolio_data["positions"]:
-            pos_copy = {}
-            for key, value in pos.items():
-                # Convert Decimal to float
-                if hasattr(value, "__float__"):
-                    pos_copy[key] = float(value)
-                else:
-                    pos_copy[key] = value
-            positions_for_risk.append(pos_copy)
-
-        risk_metrics = risk_service.calculate_portfolio_risk(
-            positions=positions_for_risk, lookback_days=lookback_days
+        risk_metrics = await run_blocking(
+            risk_service.calculate_portfolio_risk,
+            positions=_positions_for_risk(portfolio_data["positions"]),
+            lookback_days=lookback_days,
         )
 
         # Add portfolio context
@@ -719,6 +717,94 @@ async def get_portfolio_risk_metrics(
         raise HTTPException(status_code=500, detail=f"Failed to calculate risk metrics: {str(e)}")
 
 
+class RiskAccount(BaseModel):
+    """One account in a batch risk request."""
+
+    client_id: int
+    account_hash: str
+
+
+class BatchRiskRequest(BaseModel):
+    """Request for risk analytics across many accounts."""
+
+    accounts: List[RiskAccount]
+    lookback_days: int = 252
+
+
+@router.post("/portfolio/risk/batch")
+async def get_batch_portfolio_risk_metrics(
+    request: BatchRiskRequest, db: Session = Depends(get_db)
+):
+    """
+    Get risk analytics for many Schwab accounts in one call.
+
+    Positions are fetched per account; the metrics for all accounts are then
+    computed together from one slice of the shared returns matrix. An account
+    whose positions can't be fetched gets an `error` entry instead of failing
+    the batch.
+
+    Args:
+        request: Accounts (client_id, account_hash) and lookback_days
+
+    Returns:
+        Per-account results in request order, each shaped like the
+        single-account risk endpoint
+    """
+    from backend.api.services.risk_analytics import get_risk_analytics
+
+    # Sequential: the accounts share one database session for token lookups
+    portfolios = {}
+    results = []
+    for account in request.accounts:
+        key = (account.client_id, account.account_hash)
+        result = {"client_id": account.client_id, "account_hash": account.account_hash}
+        results.append(result)
+        if key in portfolios:
+            continue
+        try:
+            portfolio_data = await get_portfolio(account.client_id, account.account_hash, db)
+        except HTTPException as e:
+            result["error"] = e.detail
+            continue
+        if not portfolio_data.get("positions"):
+            result["error"] = "No portfolio positions found"
+            continue
+        portfolios[key] = portfolio_data
+
+    try:
+        risk_service = get_risk_analytics()
+        risk_metrics = await run_blocking(
+            risk_service.calculate_batch_risk,
+            {key: _positions_for_risk(data["positions"]) for key, data in portfolios.items()},
+            lookback_days=request.lookback_days,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to calculate risk metrics: {str(e)}")
+
+    for result in results:
+        key = (result["client_id"], result["account_hash"])
+        if "error" in result or key not in portfolios:
+            continue
+        result.update(
+            {
+                "account_value": portfolios[key]["summary"]["total_value"],
+                "num_positions": portfolios[key]["summary"]["num_positions"],
+                "risk_metrics": risk_metrics[key],
+                "interpretation": _interpret_risk_metrics(risk_metrics[key]),
+            }
+        )
+
+    return {"lookback_days": request.lookback_days, "accounts": results}
+
+
+def _positions_for_risk(positions: List[dict]) -> List[dict]:
+    """Copy positions with Decimal values converted to float for risk analytics."""
+    return [
+        {key: float(value) if hasattr(value, "__float__") else value for key, value in pos.items()}
+        for pos in positions
+    ]
+
+
 def _interpret_risk_metrics(metrics: dict) -> dict:
     """Provide plain English interpretation of risk metrics."""
 
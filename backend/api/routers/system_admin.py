@@ -110,7 +110,7 @@ def run_pipeline_script(pipeline_type: str, script_path: str) -> dict:
 
 
 @router.post("/pipelines/daily", response_model=PipelineResponse)
-async def run_daily_pipeline(background_tasks: BackgroundTasks):
+def run_daily_pipeline(background_tasks: BackgroundTasks):
     """
     Execute the daily data pipeline
 
@@ -143,7 +143,7 @@ async def run_daily_pipeline(background_tasks: BackgroundTasks):
 
 
 @router.post("/pipelines/weekly-ml", response_model=PipelineResponse)
-async def run_weekly_ml_pipeline(background_tasks: BackgroundTasks):
+def run_weekly_ml_pipeline(background_tasks: BackgroundTasks):
     """
     Execute the weekly ML training pipeline
 
@@ -175,7 +175,7 @@ async def run_weekly_ml_pipeline(background_tasks: BackgroundTasks):
 
 
 @router.post("/pipelines/monthly-rl", response_model=PipelineResponse)
-async def run_monthly_rl_pipeline(background_tasks: BackgroundTasks):
+def run_monthly_rl_pipeline(background_tasks: BackgroundTasks):
     """
     Execute the monthly RL training pipeline
 
@@ -208,7 +208,7 @@ async def run_monthly_rl_pipeline(background_tasks: BackgroundTasks):
 
 
 @router.get("/pipelines/status/{job_id}", response_model=PipelineJob)
-async def get_pipeline_status(job_id: str):
+def get_pipeline_status(job_id: str):
     """
     Get the status of a pipeline job
     """
@@ -237,7 +237,7 @@ async def get_pipeline_status(job_id: str):
 
 
 @router.get("/pipelines/list", response_model=List[PipelineJob])
-async def list_pipeline_jobs(limit: int = 50):
+def list_pipeline_jobs(limit: int = 50):
     """
     List recent pipeline jobs
     """
@@ -262,7 +262,7 @@ async def list_pipeline_jobs(limit: int = 50):
 
 
 @router.get("/system/status", response_model=SystemStatus)
-async def get_system_status():
+def get_system_status():
     """
     Get overall system health and status
     """
@@ -308,7 +308,7 @@ async def get_system_status():
 
 
 @router.get("/logs/{log_type}/{filename}")
-async def get_log_file(log_type: str, filename: str):
+def get_log_file(log_type: str, filename: str):
     """
     Retrieve contents of a log file
 
@@ -16,6 +16,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from ..database.blocking import run_blocking
 from ..database.connection import get_db
 from ..models import schemas
 from ..services.rl_recommendation_service import get_recommendation_service
@@ -72,7 +73,8 @@ async def generate_recommendations(
 
         # Generate recommendations from RL model
         rec_service = get_recommendation_service()
-        recommendations = rec_service.generate_recommendations(
+        recommendations = await run_blocking(
+            rec_service.generate_recommendations,
             portfolio_id=portfolio_id,
             current_positions=positions,
             account_value=account_value,
@@ -80,7 +82,9 @@ async def generate_recommendations(
         )
 
         # Store in database
-        recommendation_id = _store_recommendation(db, client_id, account_hash, recommendations)
+        recommendation_id = await run_blocking(
+            _store_recommendation, db, client_id, account_hash, recommendations
+        )
 
         return {"recommendation_id": recommendation_id, **recommendations}
 
@@ -91,7 +95,7 @@ async def generate_recommendations(
 
 
 @router.get("/recommendations/")
-async def get_recommendations(
+def get_recommendations(
     client_id: Optional[int] = None,
     status: Optional[str] = None,
     limit: int = 50,
@@ -159,7 +163,7 @@ async def get_recommendations(
 
 
 @router.get("/recommendations/{recommendation_id}")
-async def get_recommendation(recommendation_id: int, db: Session = Depends(get_db)):
+def get_recommendation(recommendation_id: int, db: Session = Depends(get_db)):
     """Get a specific trade recommendation by ID."""
     query = text(
         """
@@ -199,7 +203,7 @@ async def get_recommendation(recommendation_id: int, db: Session = Depends(get_d
 
 
 @router.post("/recommendations/{recommendation_id}/approve")
-async def approve_recommendation(recommendation_id: int, db: Session = Depends(get_db)):
+def approve_recommendation(recommendation_id: int, db: Session = Depends(get_db)):
     """
     Approve a trade recommendation.
 
@@ -226,7 +230,7 @@ async def approve_recommendation(recommendation_id: int, db: Session = Depends(g
 
 
 @router.post("/recommendations/{recommendation_id}/reject")
-async def reject_recommendation(
+def reject_recommendation(
     recommendation_id: int, reason: Optional[str] = None, db: Session = Depends(get_db)
 ):
     """Reject a trade recommendation."""
@@ -268,7 +272,7 @@ async def execute_recommendation(
         Execution results for all trades
     """
     # Get recommendation
-    rec = await get_recommendation(recommendation_id, db)
+    rec = await run_blocking(get_recommendation, recommendation_id, db)
 
     if rec["status"] != "approved":
         raise HTTPException(
@@ -301,7 +305,7 @@ async def execute_recommendation(
 
 
 @router.get("/executions/")
-async def get_trade_executions(
+def get_trade_executions(
     client_id: Optional[int] = None,
     status: Optional[str] = None,
     limit: int = 100,
@@ -0,0 +1,350 @@
+"""
+Backtest Job Service
+
+Runs BacktestEngine backtests as jobs in a process pool instead of inside the
+request, and keeps their results keyed by what determines them:
+
+    key = sha256(config, model version, data watermark)
+
+- model version: content digest of the default model (prediction_store.model_identity)
+- data watermark: latest ml_training_features and bars dates
+
+A submitted config whose key already has a stored result completes
+immediately; one matching a queued or running job joins that job. Results are
+kept in memory and as JSON files under BACKTEST_CACHE_DIR, so they survive
+restarts and are shared by API worker processes. Retraining the model or
+loading new data changes the key, so stale results are never served.
+
+Each pool process keeps its BacktestEngine (and MLPortfolioManager, with the
+loaded model) between jobs.
+
+Job states: queued -> running -> completed | failed, or cancelled. A queued
+job is removed from the pool on cancel; a running one can't be interrupted, so
+it is marked cancelled and its result is still stored for later requests. It
+stays active until it finishes: resubmitting its config joins the run.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+
+BACKTEST_WORKERS = int(os.getenv("BACKTEST_WORKERS", "2"))
+BACKTEST_CACHE_DIR = Path(
+    os.getenv("BACKTEST_CACHE_DIR", str(PROJECT_ROOT / "backtesting" / "results" / "api_cache"))
+)
+VERSION_TTL = 60.0  # seconds the model version / data watermark are reused
+MAX_JOBS = 1000  # finished jobs beyond this are forgotten (results stay cached)
+
+ACTIVE_STATES = ("queued", "running")
+
+
+# ---------------------------------------------------------------------------
+# Pool process side
+# ---------------------------------------------------------------------------
+
+_engines: Dict[Tuple, Any] = {}
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def run_backtest_job(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one backtest in a pool process
+
+    Args:
+        config: BacktestConfig fields (ISO dates)
+
+    Returns:
+        BacktestEngine.run_backtest results, JSON-normalised
+    """
+    from portfolio.backtest_engine import BacktestEngine
+
+    engine_key = (config["rebalance_frequency"], config["transaction_cost"])
+    engine = _engines.get(engine_key)
+    if engine is None:
+        engine = _engines[engine_key] = BacktestEngine(
+            rebalance_frequency=config["rebalance_frequency"],
+            transaction_cost=config["transaction_cost"],
+        )
+
+    results = engine.run_backtest(
+        start_date=date.fromisoformat(config["start_date"]),
+        end_date=date.fromisoformat(config["end_date"]),
+        initial_capital=config["initial_capital"],
+        top_n=config["top_n"],
+        weighting=config["weighting"],
+        max_position=config["max_position"],
+        min_market_cap=config["min_market_cap"],
+    )
+    return json.loads(json.dumps(results, default=_json_default))
+
+
+def data_version() -> Dict[str, str]:
+    """Model version and data watermark that backtest results depend on"""
+    from portfolio.prediction_store import model_identity
+    from utils.db_config import get_psycopg2_connection
+
+    model_path = PROJECT_ROOT / "models" / "xgboost_optimized" / "model.json"
+    _, model_version = model_identity(str(model_path))
+
+    with get_psycopg2_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT (SELECT MAX(date) FROM ml_training_features),
+                       (SELECT MAX(date) FROM bars)
+                """
+            )
+            features_through, bars_through = cur.fetchone()
+
+    return {
+        "model_version": model_version,
+        "data_watermark": f"{features_through}/{bars_through}",
+    }
+
+
+# ---------------------------------------------------------------------------
+# API process side
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class BacktestJob:
+    """One submitted backtest"""
+
+    job_id: str
+    key: str
+    config: Dict[str, Any]
+    status: str = "queued"
+    cached: bool = False
+    error: Optional[str] = None
+    submitted_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    future: Optional[Future] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "cached": self.cached,
+            "error": self.error,
+            "config": self.config,
+            "submitted_at": self.submitted_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class BacktestJobService:
+    """
+    Submit / status / result / cancel for backtests run in a process pool
+
+    Args:
+        max_workers: Pool processes
+        cache_dir: Directory for stored results (None = memory only)
+        runner: Picklable function config -> results, run in the pool
+        version_fn: Returns the model version / data watermark for the key
+        mp_context: multiprocessing start method for the pool
+    """
+
+    def __init__(
+        self,
+        max_workers: int = BACKTEST_WORKERS,
+        cache_dir: Optional[Path] = BACKTEST_CACHE_DIR,
+        runner: Callable[[Dict[str, Any]], Dict[str, Any]] = run_backtest_job,
+        version_fn: Callable[[], Dict[str, str]] = data_version,
+        mp_context: str = "spawn",
+    ):
+        self.max_workers = max_workers
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.runner = runner
+        self.version_fn = version_fn
+        self.mp_context = mp_context
+
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[str, BacktestJob] = {}
+        self._active: Dict[str, BacktestJob] = {}  # key -> queued/running job
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._version: Optional[Dict[str, str]] = None
+        self._version_at = 0.0
+
+    # -- keys and stored results ------------------------------------------
+
+    def _current_version(self) -> Dict[str, str]:
+        if self._version is None or time.monotonic() - self._version_at > VERSION_TTL:
+            self._version = self.version_fn()
+            self._version_at = time.monotonic()
+        return self._version
+
+    def job_key(self, config: Dict[str, Any]) -> str:
+        """Hash of (config, model version, data watermark)"""
+        payload = {"config": config, **self._current_version()}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _load_result(self, key: str) -> Optional[Dict[str, Any]]:
+        result = self._results.get(key)
+        if result is None and self.cache_dir is not None:
+            path = self.cache_dir / f"{key}.json"
+            if path.exists():
+                result = self._results[key] = json.loads(path.read_text())
+        return result
+
+    def _store_result(self, key: str, result: Dict[str, Any]):
+        self._results[key] = result
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_dir / f".{key}.{os.getpid()}.tmp"
+            tmp.write_text(json.dumps(result))
+            tmp.replace(self.cache_dir / f"{key}.json")
+
+    # -- jobs --------------------------------------------------------------
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(self.mp_context),
+            )
+        return self._executor
+
+    def submit(self, config: Dict[str, Any]) -> BacktestJob:
+        """
+        Submit a backtest; returns a completed job for a stored result and the
+        existing job for a config already queued or running
+        """
+        key = self.job_key(config)
+        with self._lock:
+            active = self._active.get(key)
+            if active is not None and active.status != "cancelled":
+                return active
+
+            job = BacktestJob(job_id=uuid.uuid4().hex, key=key, config=config)
+            self._remember(job)
+
+            if active is not None:
+                # Cancelled while running, so still running: join it instead of
+                # starting the same backtest again
+                job.future = active.future
+            elif self._load_result(key) is not None:
+                job.status = "completed"
+                job.cached = True
+                job.finished_at = time.time()
+                return job
+            else:
+                job.future = self._get_executor().submit(self.runner, config)
+            self._active[key] = job
+
+        job.future.add_done_callback(lambda future: self._finished(job, future))
+        return job
+
+    def _finished(self, job: BacktestJob, future: Future):
+        with self._lock:
+            # A cancelled job that another submission joined is no longer active;
+            # the joining job stores the result
+            owner = self._active.get(job.key) is job
+            if owner:
+                del self._active[job.key]
+            job.finished_at = time.time()
+            if future.cancelled():
+                job.status = "cancelled"
+                return
+            error = future.exception()
+            if error is not None:
+                if job.status != "cancelled":
+                    job.status = "failed"
+                    job.error = str(error)
+                return
+            if owner:
+                self._store_result(job.key, future.result())
+            if job.status != "cancelled":
+                job.status = "completed"
+
+    def _remember(self, job: BacktestJob):
+        self._jobs[job.job_id] = job
+        if len(self._jobs) > MAX_JOBS:
+            for job_id, old in list(self._jobs.items()):
+                if old.status not in ACTIVE_STATES:
+                    del self._jobs[job_id]
+                if len(self._jobs) <= MAX_JOBS:
+                    break
+
+    def get(self, job_id: str) -> Optional[BacktestJob]:
+        """The job, with status refreshed from its future (None if unknown)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.status == "queued" and job.future is not None:
+                if job.future.running():
+                    job.status = "running"
+            return job
+
+    def result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Results of a completed job (None if it has none)"""
+        job = self.get(job_id)
+        if job is None or job.status != "completed":
+            return None
+        with self._lock:
+            return self._load_result(job.key)
+
+    async def wait(self, job: BacktestJob) -> Dict[str, Any]:
+        """Await a job's results without holding a worker thread"""
+        import asyncio
+
+        if job.future is not None and job.status in ACTIVE_STATES:
+            await asyncio.wrap_future(job.future)
+        if job.status == "failed":
+            raise RuntimeError(job.error)
+        result = self.result(job.job_id)
+        if result is None:
+            raise RuntimeError(f"Backtest job {job.job_id} {job.status}")
+        return result
+
+    def cancel(self, job_id: str) -> Optional[BacktestJob]:
+        """Cancel a queued or running job (None if unknown)"""
+        job = self.get(job_id)
+        if job is None or job.status not in ACTIVE_STATES:
+            return job
+        if job.future.cancel():
+            return job  # removed from the pool queue; _finished marks it
+        with self._lock:
+            # Already running in a pool process: can't be interrupted. It stays
+            # active until _finished, so a resubmit joins it, and its result is
+            # still stored
+            job.status = "cancelled"
+        return job
+
+    def shutdown(self):
+        """Stop the pool (API shutdown); queued jobs are cancelled"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Singleton instance
+_backtest_jobs_instance = None
+
+
+def get_backtest_jobs() -> BacktestJobService:
+    """Get or create singleton BacktestJobService instance."""
+    global _backtest_jobs_instance
+    if _backtest_jobs_instance is None:
+        _backtest_jobs_instance = BacktestJobService()
+    return _backtest_jobs_instance
@@ -10,22 +10,14 @@ from typing import Any, Dict, List, Optional
 
 import numpy as np
 import pandas as pd
-import psycopg2
-from psycopg2.extras import RealDictCursor
+
+from ..database.blocking import blocking
+from ..database.connection import get_psycopg2_connection, get_psycopg2_cursor
 
 
 class BacktestService:
     """Service for backtesting portfolio strategies."""
 
-    def __init__(self):
-        self.db_config = {
-            "dbname": "acis-ai",
-            "user": "postgres",
-            "password": "$@nJose420",
-            "host": "localhost",
-            "port": 5432,
-        }
-
     async def get_backtest_results(
         self, portfolio_id: int = None, start_date: str = None, end_date: str = None
     ) -> Dict[str, Any]:
@@ -65,54 +57,51 @@ class BacktestService:
             "status": "actual",
         }
 
-    async def _fetch_backtest_data(
+    @blocking
+    def _fetch_backtest_data(
         self, portfolio_id: int, start_date: str, end_date: str
     ) -> List[Dict[str, Any]]:
         """Fetch backtest results from database."""
 
         try:
-            conn = psycopg2.connect(**self.db_config, cursor_factory=RealDictCursor)
-            cur = conn.cursor()
-
-            # Create backtest_results table if it doesn't exist
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS backtest_results (
-                    id SERIAL PRIMARY KEY,
-                    portfolio_id INTEGER NOT NULL,
-                    date DATE NOT NULL,
-                    portfolio_value DECIMAL(15, 2),
-                    cash DECIMAL(15, 2),
-                    positions JSONB,
-                    daily_return DECIMAL(10, 6),
-                    cumulative_return DECIMAL(10, 6),
-                    sharpe_ratio DECIMAL(10, 4),
-                    created_at TIMESTAMP DEFAULT NOW(),
-                    UNIQUE(portfolio_id, date)
-                )
-            """
-            )
-            conn.commit()
-
-            # Fetch backtest data
-            sql = """
-                SELECT *
-                FROM backtest_results
-                WHERE date >= %s AND date <= %s
-            """
-            params = [start_date, end_date]
-
-            if portfolio_id:
-                sql += " AND portfolio_id = %s"
-                params.append(portfolio_id)
-
-            sql += " ORDER BY portfolio_id, date"
-
-            cur.execute(sql, params)
-            results = [dict(row) for row in cur.fetchall()]
-
-            cur.close()
-            conn.close()
+            with get_psycopg2_connection() as conn:
+                with get_psycopg2_cursor(conn) as cur:
+                    # Create backtest_results table if it doesn't exist
+                    cur.execute(
+                        """
+                        CREATE TABLE IF NOT EXISTS backtest_results (
+                            id SERIAL PRIMARY KEY,
+                            portfolio_id INTEGER NOT NULL,
+                            date DATE NOT NULL,
+                            portfolio_value DECIMAL(15, 2),
+                            cash DECIMAL(15, 2),
+                            positions JSONB,
+                            daily_return DECIMAL(10, 6),
+                            cumulative_return DECIMAL(10, 6),
+                            sharpe_ratio DECIMAL(10, 4),
+                            created_at TIMESTAMP DEFAULT NOW(),
+                            UNIQUE(portfolio_id, date)
+                        )
+                    """
+                    )
+                    conn.commit()
+
+                    # Fetch backtest data
+                    sql = """
+                        SELECT *
+                        FROM backtest_results
+                        WHERE date >= %s AND date <= %s
+                    """
+                    params = [start_date, end_date]
+
+                    if portfolio_id:
+                        sql += " AND portfolio_id = %s"
+                        params.append(portfolio_id)
+
+                    sql += " ORDER BY portfolio_id, date"
+
+                    cur.execute(sql, params)
+                    results = [dict(row) for row in cur.fetchall()]
 
             return results
 
@@ -246,43 +235,41 @@ class BacktestService:
             "initial_value": float(df["portfolio_value"].iloc[0]),
         }
 
-    async def save_backtest_results(self, portfolio_id: int, results: List[Dict[str, Any]]):
+    @blocking
+    def save_backtest_results(self, portfolio_id: int, results: List[Dict[str, Any]]):
         """Save backtest results to database."""
 
         try:
-            conn = psycopg2.connect(**self.db_config, cursor_factory=RealDictCursor)
-            cur = conn.cursor()
-
-            for result in results:
-                cur.execute(
-                    """
-                    INSERT INTO backtest_results (
-                        portfolio_id, date, portfolio_value, cash, positions,
-                        daily_return, cumulative_return, sharpe_ratio
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (portfolio_id, date) DO UPDATE SET
-                        portfolio_value = EXCLUDED.portfolio_value,
-                        cash = EXCLUDED.cash,
-                        positions = EXCLUDED.positions,
-                        daily_return = EXCLUDED.daily_return,
-                        cumulative_return = EXCLUDED.cumulative_return,
-                        sharpe_ratio = EXCLUDED.sharpe_ratio
-                """,
-                    [
-                        portfolio_id,
-                        result["date"],
-                        result.get("portfolio_value"),
-                        result.get("cash"),
-                        result.get("positions"),  # JSON
-                        result.get("daily_return"),
-                        result.get("cumulative_return"),
-                        result.get("sharpe_ratio"),
-                    ],
-                )
-
-            conn.commit()
-            cur.close()
-            conn.close()
+            with get_psycopg2_connection() as conn:
+                with get_psycopg2_cursor(conn) as cur:
+                    for result in results:
+                        cur.execute(
+                            """
+                            INSERT INTO backtest_results (
+                                portfolio_id, date, portfolio_value, cash, positions,
+                                daily_return, cumulative_return, sharpe_ratio
+                            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                            ON CONFLICT (portfolio_id, date) DO UPDATE SET
+                                portfolio_value = EXCLUDED.portfolio_value,
+                                cash = EXCLUDED.cash,
+                                positions = EXCLUDED.positions,
+                                daily_return = EXCLUDED.daily_return,
+                                cumulative_return = EXCLUDED.cumulative_return,
+                                sharpe_ratio = EXCLUDED.sharpe_ratio
+                        """,
+                            [
+                                portfolio_id,
+                                result["date"],
+                                result.get("portfolio_value"),
+                                result.get("cash"),
+                                result.get("positions"),  # JSON
+                                result.get("daily_return"),
+                                result.get("cumulative_return"),
+                                result.get("sharpe_ratio"),
+                            ],
+                        )
+
+                    conn.commit()
 
         except Exception as e:
             print(f"Failed to save backtest results: {e}")
@@ -9,8 +9,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Any, Dict, Optional
 
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from ..database.connection import get_psycopg2_connection, get_psycopg2_cursor
 
 
 class BalanceManager:
@@ -21,21 +20,6 @@ class BalanceManager:
     and validates sufficient funds before trades.
     """
 
-    def __init__(self, db_config: Optional[Dict[str, Any]] = None):
-        """
-        Initialize balance manager.
-
-        Args:
-            db_config: Database configuration dict (defaults to acis-ai database)
-        """
-        self.db_config = db_config or {
-            "dbname": "acis-ai",
-            "user": "postgres",
-            "password": "$@nJose420",
-            "host": "localhost",
-            "port": 5432,
-        }
-
     def get_balance(self, account_id: str) -> Dict[str, float]:
         """
         Get current account balances.
@@ -46,56 +30,50 @@ class BalanceManager:
         Returns:
             Dict with cash_balance, buying_power, total_value, positions_value
         """
-        conn = psycopg2.connect(**self.db_config, cursor_factory=RealDictCursor)
-        try:
-            cursor = conn.cursor()
-
-            # Ensure account exists
-            cursor.execute(
-                """
-                INSERT INTO paper_accounts (account_id, cash_balance, buying_power, total_value)
-                VALUES (%s, 0, 0, 0)
-                ON CONFLICT (account_id) DO NOTHING
-            """,
-                (account_id,),
-            )
-            conn.commit()
-
-            # Get balances
-            cursor.execute(
-                """
-                SELECT cash_balance, buying_power, total_value
-                FROM paper_accounts
-                WHERE account_id = %s
-            """,
-                (account_id,),
-            )
-
-            result = cursor.fetchone()
-
-            # Calculate positions value
-            cursor.execute(
-                """
-                SELECT COALESCE(SUM(market_value), 0) as positions_value
-                FROM paper_positions
-                WHERE account_id = %s
-            """,
-                (account_id,),
-            )
-
-            positions_row = cursor.fetchone()
-            positions_value = float(positions_row["positions_value"]) if positions_row else 0.0
+        with get_psycopg2_connection() as conn:
+            with get_psycopg2_cursor(conn) as cursor:
+                # Ensure account exists
+                cursor.execute(
+                    """
+                    INSERT INTO paper_accounts (account_id, cash_balance, buying_power, total_value)
+                    VALUES (%s, 0, 0, 0)
+                    ON CONFLICT (account_id) DO NOTHING
+                """,
+                    (account_id,),
+                )
+                conn.commit()
+
+                # Get balances
+                cursor.execute(
+                    """
+                    SELECT cash_balance, buying_power, total_value
+                    FROM paper_accounts
+                    WHERE account_id = %s
+                """,
+                    (account_id,),
+                )
+
+                result = cursor.fetchone()
+
+                # Calculate positions value
+                cursor.execute(
+                    """
+                    SELECT COALESCE(SUM(market_value), 0) as positions_value
+                    FROM paper_positions
+                    WHERE account_id = %s
+                """,
+                    (account_id,),
+                )
+
+                positions_row = cursor.fetchone()
+                positions_value = float(positions_row["positions_value"]) if positions_row else 0.0
 
-            return {
-                "cash_balance": float(result["cash_balance"]) if result else 0.0,
-                "buying_power": float(result["buying_power"]) if result else 0.0,
-                "total_value": float(result["total_value"]) if result else 0.0,
-                "positions_value": positions_value,
-            }
-
-        finally:
-            cursor.close()
-            conn.close()
+                return {
+                    "cash_balance": float(result["cash_balance"]) if result else 0.0,
+                    "buying_power": float(result["buying_power"]) if result else 0.0,
+                    "total_value": float(result["total_value"]) if result else 0.0,
+                    "positions_value": positions_value,
+                }
 
     def validate_buy_order(
         self, account_id: str, order_value: float, commission: float = 0.0
@@ -168,52 +146,47 @@ class BalanceManager:
                     "shortfall": validation["shortfall"],
                 }
 
-        conn = psycopg2.connect(**self.db_config, cursor_factory=RealDictCursor)
         try:
-            cursor = conn.cursor()
-
-            # Get current balance
-            cursor.execute(
-                """
-                SELECT cash_balance FROM paper_accounts WHERE account_id = %s
-            """,
-                (account_id,),
-            )
-            result = cursor.fetchone()
-            old_balance = float(result["cash_balance"]) if result else 0.0
-
-            # Update balance (deduct cost)
-            cursor.execute(
-                """
-                UPDATE paper_accounts
-                SET cash_balance = cash_balance - %s,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE account_id = %s
-                RETURNING cash_balance
-            """,
-                (total_cost, account_id),
-            )
-
-            result = cursor.fetchone()
-            new_balance = float(result["cash_balance"]) if result else 0.0
-
-            conn.commit()
-
-            return {
-                "success": True,
-                "old_balance": old_balance,
-                "new_balance": new_balance,
-                "amount_deducted": total_cost,
-                "order_value": order_value,
-                "commission": commission,
-            }
+            with get_psycopg2_connection() as conn:
+                with get_psycopg2_cursor(conn) as cursor:
+                    # Get current balance
+                    cursor.execute(
+                        """
+                        SELECT cash_balance FROM paper_accounts WHERE account_id = %s
+                    """,
+                        (account_id,),
+                    )
+                    result = cursor.fetchone()
+                    old_balance = float(result["cash_balance"]) if result else 0.0
+
+                    # Update balance (deduct cost)
+                    cursor.execute(
+                        """
+                        UPDATE paper_accounts
+                        SET cash_balance = cash_balance - %s,
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE account_id = %s
+                        RETURNING cash_balance
+                    """,
+                        (total_cost, account_id),
+                    )
+
+                    result = cursor.fetchone()
+                    new_balance = float(result["cash_balance"]) if result else 0.0
+
+                    conn.commit()
+
+                    return {
+                        "success": True,
+                        "old_balance": old_balance,
+                        "new_balance": new_balance,
+                        "amount_deducted": total_cost,
+                        "order_value": order_value,
+                        "commission": commission,
+                    }
 
         except Exception as e:
-            conn.rollback()
             return {"success": False, "error": f"Failed to update balance: {str(e)}"}
-        finally:
-            cursor.close()
-            conn.close()
 
     def update_balance_after_sell(
         self, account_id: str, shares: float, price: float, commission: float = 0.0
@@ -233,52 +206,47 @@ class BalanceManager:
         order_value = shares * price
         net_proceeds = order_value - commission
 
-        conn = psycopg2.connect(**self.db_config, cursor_factory=RealDictCursor)
         try:
-            cursor = conn.cursor()
-
-            # Get current balance
-            cursor.execute(
-                """
-                SELECT cash_balance FROM paper_accounts WHERE account_id = %s
-            """,
-                (account_id,),
-            )
-            result = cursor.fetchone()
-            old_balance = float(result["cash_balance"]) if result else 0.0
-
-            # Update balance (add proceeds)
-            cursor.execute(
-                """
-                UPDATE paper_accounts
-                SET cash_balance = cash_balance + %s,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE account_id = %s
-                RETURNING cash_balance
-            """,
-                (net_proceeds, account_id),
-            )
-
-            result = cursor.fetchone()
-            new_balance = float(result["cash_balance"]) if result else 0.0
-
-            conn.commit()
-
-            return {
-                "success": True,
-                "old_balance": old_balance,
-                "new_balance": new_balance,
-                "amount_added": net_proceeds,
-                "order_value": order_value,
-                "commission": commission,
-            }
+            with get_psycopg2_connection() as conn:
+                with get_psycopg2_cursor(conn) as cursor:
+                    # Get current balance
+                    cursor.execute(
+                        """
+                        SELECT cash_balance FROM paper_accounts WHERE account_id = %s
+                    """,
+                        (account_id,),
+                    )
+                    result = cursor.fetchone()
+                    old_balance = float(result["cash_balance"]) if result else 0.0
+
+                    # Update balance (add proceeds)
+                    cursor.execute(
+                        """
+                        UPDATE paper_accounts
+                        SET cash_balance = cash_balance + %s,
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE account_id = %s
+                        RETURNING cash_balance
+                    """,
+                        (net_proceeds, account_id),
+                    )
+
+                    result = cursor.fetchone()
+                    new_balance = float(result["cash_balance"]) if result else 0.0
+
+                    conn.commit()
+
+                    return {
+                        "success": True,
+                        "old_balance": old_balance,
+                        "new_balance": new_balance,
+                        "amount_added": net_proceeds,
+                        "order_value": order_value,
+                        "commission": commission,
+                    }
 
         except Exception as e:
-            conn.rollback()
             return {"success": False, "error": f"Failed to update balance: {str(e)}"}
-        finally:
-            cursor.close()
-            conn.close()
 
     def set_balance(
         self,
@@ -299,63 +267,58 @@ class BalanceManager:
         Returns:
             Dict with 'success' and updated balances
         """
-        conn = psycopg2.connect(**self.db_config, cursor_factory=RealDictCursor)
         try:
-            cursor = conn.cursor()
-
-            # Build update query dynamically
-            updates = ["cash_balance = %s"]
-            params = [cash_balance]
-
-            if buying_power is not None:
-                updates.append("buying_power = %s")
-                params.append(buying_power)
-
-            if total_value is not None:
-                updates.append("total_value = %s")
-                params.append(total_value)
-
-            updates.append("updated_at = CURRENT_TIMESTAMP")
-            params.append(account_id)
-
-            query = f"""
-                INSERT INTO paper_accounts (account_id, cash_balance, buying_power, total_value)
-                VALUES (%s, %s, {buying_power or 0}, {total_value or 0})
-                ON CONFLICT (account_id) DO UPDATE SET
-                    {', '.join(updates)}
-                RETURNING cash_balance, buying_power, total_value
-            """
-
-            cursor.execute(
-                """
-                INSERT INTO paper_accounts (account_id, cash_balance, buying_power, total_value)
-                VALUES (%s, %s, %s, %s)
-                ON CONFLICT (account_id) DO UPDATE SET
-                    cash_balance = EXCLUDED.cash_balance,
-                    buying_power = EXCLUDED.buying_power,
-                    total_value = EXCLUDED.total_value,
-                    updated_at = CURRENT_TIMESTAMP
-                RETURNING cash_balance, buying_power, total_value
-            """,
-                (account_id, cash_balance, buying_power or 0, total_value or 0),
-            )
-
-            result = cursor.fetchone()
-            conn.commit()
-
-            return {
-                "success": True,
-                "cash_balance": float(result["cash_balance"]),
-                "buying_power": float(result["buying_power"]),
-                "total_value": float(result["total_value"]),
-            }
+            with get_psycopg2_connection() as conn:
+                with get_psycopg2_cursor(conn) as cursor:
+                    # Build update query dynamically
+                    updates = ["cash_balance = %s"]
+                    params = [cash_balance]
+
+                    if buying_power is not None:
+                        updates.append("buying_power = %s")
+                        params.append(buying_power)
+
+                    if total_value is not None:
+                        updates.append("total_value = %s")
+                        params.append(total_value)
+
+                    updates.append("updated_at = CURRENT_TIMESTAMP")
+                    params.append(account_id)
+
+                    query = f"""
+                        INSERT INTO paper_accounts (account_id, cash_balance, buying_power, total_value)
+                        VALUES (%s, %s, {buying_power or 0}, {total_value or 0})
+                        ON CONFLICT (account_id) DO UPDATE SET
+                            {', '.join(updates)}
+                        RETURNING cash_balance, buying_power, total_value
+                    """
+
+                    cursor.execute(
+                        """
+                        INSERT INTO paper_accounts (account_id, cash_balance, buying_power, total_value)
+                        VALUES (%s, %s, %s, %s)
+                        ON CONFLICT (account_id) DO UPDATE SET
+                            cash_balance = EXCLUDED.cash_balance,
+                            buying_power = EXCLUDED.buying_power,
+                            total_value = EXCLUDED.total_value,
+                            updated_at = CURRENT_TIMESTAMP
+                        RETURNING cash_balance, buying_power, total_value
+                    """,
+                        (account_id, cash_balance, buying_power or 0, total_value or 0),
+                    )
+
+                    result = cursor.fetchone()
+                    conn.commit()
+
+                    return {
+                        "success": True,
+                        "cash_balance": float(result["cash_balance"]),
+                        "buying_power": float(result["buying_power"]),
+                        "total_value": float(result["total_value"]),
+                    }
 
         except Exception as e:
-            conn.rollback()
             return {"success": False, "error": f"Failed to set balance: {str(e)}"}
-        finally:
-            cursor.close()
-            conn.close()
 
     def initialize_account(self, account_id: str, initial_cash: float = 100000.0) -> Dict[str, Any]:
         """
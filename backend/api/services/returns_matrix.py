@@ -0,0 +1,195 @@
+"""
+Shared Daily Returns Matrix
+
+Process-wide cache of daily close-to-close returns as a dense (trading days x
+tickers) float32 matrix, NaN where a ticker has no bar. Risk analytics slices
+it for any portfolio instead of re-running a LAG() window query over
+daily_bars and pivoting on every request:
+
+- the benchmark (SPY) is always a column
+- tickers not yet cached are loaded once, over the cached date range, and
+  appended as new columns
+- once per day the dates after the last cached date are fetched for every
+  cached ticker in one query and appended as new rows
+- a request for a longer lookback than the cache covers reloads it from the
+  earlier start
+
+Returns follow the LAG() semantics of the original query: each bar's return is
+against that ticker's previous bar, NaN on dates without a bar. The trading
+calendar is the set of dates seen at the last full load plus appended dates.
+"""
+
+import threading
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..database.connection import get_psycopg2_connection
+
+BENCHMARK = "SPY"
+LAG_MARGIN_DAYS = 10  # calendar days fetched before a range to seed the first return
+
+
+class ReturnsMatrix:
+    """
+    Incrementally maintained daily returns for the tickers seen so far
+
+    Args:
+        benchmark: Ticker always kept in the matrix (market returns for beta)
+    """
+
+    def __init__(self, benchmark: str = BENCHMARK):
+        self.benchmark = benchmark
+        self._lock = threading.RLock()
+        self.dates = np.empty(0, dtype="datetime64[D]")
+        self._columns: Dict[str, int] = {}
+        self.values = np.empty((0, 0), dtype=np.float32)
+        self._last_close = np.empty(0)
+        self._start: Optional[date] = None
+        self._refreshed: Optional[date] = None
+        self.queries = 0
+
+    @property
+    def tickers(self) -> List[str]:
+        return list(self._columns)
+
+    def load_closes(self, tickers: List[str], start: date, end: Optional[date] = None):
+        """Long (ticker, date, close) rows from daily_bars, start/end inclusive"""
+        sql = """
+            SELECT ticker, date, close
+            FROM daily_bars
+            WHERE ticker = ANY(%s) AND date >= %s
+        """
+        params = [tickers, start]
+        if end is not None:
+            sql += " AND date <= %s"
+            params.append(end)
+
+        with get_psycopg2_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, params)
+                rows = cur.fetchall()
+        self.queries += 1
+        return pd.DataFrame(rows, columns=["ticker", "date", "close"])
+
+    def window(
+        self, tickers: Iterable[str], start: date
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns on dates >= start for `tickers`, loading / refreshing as needed
+
+        Returns:
+            (dates, returns, market): returns a (dates x tickers) float32 copy
+            with columns in the order requested, market the benchmark's
+            returns on the same dates
+        """
+        tickers = list(dict.fromkeys(tickers))
+        with self._lock:
+            if self._start is None or start < self._start:
+                self._reload(set(self._columns) | set(tickers) | {self.benchmark}, start)
+            else:
+                if self._refreshed != date.today():
+                    self._append_days()
+                missing = [t for t in tickers if t not in self._columns]
+                if missing:
+                    self._append_tickers(missing)
+
+            first = np.searchsorted(self.dates, np.datetime64(start, "D"))
+            cols = [self._columns[t] for t in tickers]
+            return (
+                self.dates[first:],
+                self.values[first:, cols],
+                self.values[first:, self._columns[self.benchmark]].copy(),
+            )
+
+    def refresh(self):
+        """Append any dates after the last cached one (normally done once a day)"""
+        with self._lock:
+            if self._start is not None:
+                self._append_days()
+
+    @staticmethod
+    def _pivot(prices: pd.DataFrame, tickers: List[str]) -> pd.DataFrame:
+        """Closes as a (date x tickers) float64 frame sorted by date"""
+        if prices.empty:
+            index = pd.DatetimeIndex([], dtype="datetime64[s]")
+            return pd.DataFrame(index=index, columns=tickers, dtype=np.float64)
+        prices = prices.assign(
+            date=pd.to_datetime(prices["date"]).astype("datetime64[s]"),
+            close=prices["close"].astype(np.float64),
+        )
+        pivot = prices.pivot(index="date", columns="ticker", values="close")
+        return pivot.reindex(columns=tickers).sort_index()
+
+    @staticmethod
+    def _returns(closes: np.ndarray, seed: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bar-to-previous-bar returns of a (dates x tickers) close block
+
+        Args:
+            closes: Closes, NaN where a ticker has no bar
+            seed: Each ticker's last close before the block (NaN if none)
+
+        Returns:
+            (returns, last_close)
+        """
+        carried = pd.DataFrame(np.vstack([seed, closes])).ffill().to_numpy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = closes / carried[:-1] - 1.0
+        return returns, carried[-1]
+
+    def _reload(self, tickers: Iterable[str], start: date):
+        tickers = sorted(tickers)
+        closes = self._pivot(
+            self.load_closes(tickers, start - timedelta(days=LAG_MARGIN_DAYS)), tickers
+        )
+        returns, last_close = self._returns(closes.to_numpy(), np.full(len(tickers), np.nan))
+        keep = closes.index >= pd.Timestamp(start)
+
+        self.dates = closes.index[keep].to_numpy().astype("datetime64[D]")
+        self._columns = {t: i for i, t in enumerate(tickers)}
+        self.values = np.ascontiguousarray(returns[keep], dtype=np.float32)
+        self._last_close = last_close
+        self._start = start
+        self._refreshed = date.today()
+
+    def _append_tickers(self, tickers: List[str]):
+        end = self.dates[-1].item() if len(self.dates) else date.today()
+        closes = self._pivot(
+            self.load_closes(tickers, self._start - timedelta(days=LAG_MARGIN_DAYS), end),
+            tickers,
+        )
+        returns, last_close = self._returns(closes.to_numpy(), np.full(len(tickers), np.nan))
+        block = pd.DataFrame(returns, index=closes.index).reindex(
+            pd.DatetimeIndex(self.dates.astype("datetime64[s]"))
+        )
+
+        for ticker in tickers:
+            self._columns[ticker] = len(self._columns)
+        self.values = np.hstack([self.values, block.to_numpy(dtype=np.float32)])
+        self._last_close = np.concatenate([self._last_close, last_close])
+
+    def _append_days(self):
+        self._refreshed = date.today()
+        after = self.dates[-1].item() + timedelta(days=1) if len(self.dates) else self._start
+        closes = self._pivot(self.load_closes(self.tickers, after), self.tickers)
+        if closes.empty:
+            return
+
+        returns, self._last_close = self._returns(closes.to_numpy(), self._last_close)
+        self.dates = np.concatenate([self.dates, closes.index.to_numpy().astype("datetime64[D]")])
+        self.values = np.vstack([self.values, returns.astype(np.float32)])
+
+
+# Shared instance
+_returns_matrix_instance = None
+
+
+def get_returns_matrix() -> ReturnsMatrix:
+    """Get or create the process-wide ReturnsMatrix."""
+    global _returns_matrix_instance
+    if _returns_matrix_instance is None:
+        _returns_matrix_instance = ReturnsMatrix()
+    return _returns_matrix_instance
@@ -9,30 +9,31 @@ Calculates professional risk metrics for portfolios:
 - Beta: Sensitivity to market movements
 - Value at Risk (VaR): Expected maximum loss
 - Correlation Matrix: How holdings move together
+
+Daily returns come from the shared ReturnsMatrix cache (see returns_matrix.py)
+rather than a per-request query; calculate_batch_risk scores many portfolios
+from one window.
 """
 
-import os
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+import warnings
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Hashable, List, Optional
 
 import numpy as np
-import pandas as pd
-import psycopg2
-from psycopg2.extras import RealDictCursor
+
+from .returns_matrix import ReturnsMatrix, get_returns_matrix
 
 
 class RiskAnalytics:
-    """Calculate portfolio risk metrics."""
-
-    def __init__(self):
-        """Initialize with database connection."""
-        self.db_config = {
-            "host": os.getenv("DB_HOST", "localhost"),
-            "port": int(os.getenv("DB_PORT", 5432)),
-            "database": os.getenv("DB_NAME", "acis-ai"),
-            "user": os.getenv("DB_USER", "postgres"),
-            "password": os.getenv("DB_PASSWORD", "$@nJose420"),
-        }
+    """
+    Calculate portfolio risk metrics.
+
+    Returns come from the shared ReturnsMatrix; metrics for any number of
+    portfolios are computed together as (dates x portfolios) array operations.
+    """
+
+    def __init__(self, returns_matrix: Optional[ReturnsMatrix] = None):
+        self.returns_matrix = returns_matrix or get_returns_matrix()
 
     def calculate_portfolio_risk(
         self, positions: List[Dict[str, Any]], lookback_days: int = 252  # 1 year of trading days
@@ -47,162 +48,114 @@ class RiskAnalytics:
         Returns:
             Dictionary with all risk metrics
         """
+        return self.calculate_batch_risk({0: positions}, lookback_days)[0]
 
-        if not positions:
-            return self._empty_risk_metrics()
-
-        # Extract symbols and weights
-        symbols = [p["symbol"] for p in positions if p.get("instrument_type") == "EQUITY"]
-
-        if not symbols:
-            return self._empty_risk_metrics()
-
-        # Convert all values to float to avoid Decimal issues
-        total_value = sum(
-            float(p["current_value"]) for p in positions if p.get("instrument_type") == "EQUITY"
-        )
-
-        if total_value == 0:
-            return self._empty_risk_metrics()
-
-        weights = {}
-        for p in positions:
-            if p.get("instrument_type") == "EQUITY":
-                # Ensure both current_value and total_value are float before division
-                current_val = float(p["current_value"])
-                weight = current_val / total_value
-                weights[p["symbol"]] = float(weight)  # Explicit float conversion
-
-        # Get historical price data
-        returns_df = self._get_historical_returns(symbols, lookback_days)
-
-        if returns_df.empty:
-            return self._empty_risk_metrics()
-
-        # Get market returns (SPY as benchmark)
-        market_returns = self._get_market_returns(lookback_days)
-
-        # Calculate portfolio returns
-        portfolio_returns = self._calculate_portfolio_returns(returns_df, weights)
-
-        # Calculate all risk metrics
-        metrics = {
-            "volatility": self._calculate_volatility(portfolio_returns),
-            "sharpe_ratio": self._calculate_sharpe_ratio(portfolio_returns),
-            "sortino_ratio": self._calculate_sortino_ratio(portfolio_returns),
-            "max_drawdown": self._calculate_max_drawdown(portfolio_returns),
-            "beta": self._calculate_beta(portfolio_returns, market_returns),
-            "var_95": self._calculate_var(portfolio_returns, confidence=0.95),
-            "var_99": self._calculate_var(portfolio_returns, confidence=0.99),
-            "cvar_95": self._calculate_cvar(portfolio_returns, confidence=0.95),
-            "correlation_matrix": self._calculate_correlation(returns_df),
-            "diversification_score": self._calculate_diversification_score(returns_df, weights),
-            "lookback_days": lookback_days,
-            "analysis_date": datetime.now().isoformat(),
-        }
-
-        return metrics
-
-    def _get_historical_returns(self, symbols: List[str], lookback_days: int) -> pd.DataFrame:
-        """Fetch historical daily returns for symbols."""
-
-        conn = psycopg2.connect(**self.db_config, cursor_factory=RealDictCursor)
-        cur = conn.cursor()
-
-        # Get daily price data
-        sql = """
-            SELECT
-                ticker,
-                date,
-                close,
-                LAG(close) OVER (PARTITION BY ticker ORDER BY date) as prev_close
-            FROM daily_bars
-            WHERE ticker = ANY(%s)
-              AND date >= CURRENT_DATE - INTERVAL '%s days'
-            ORDER BY date DESC
+    def calculate_batch_risk(
+        self, portfolios: Dict[Hashable, List[Dict[str, Any]]], lookback_days: int = 252
+    ) -> Dict[Hashable, Dict[str, Any]]:
         """
+        Calculate risk metrics for many portfolios from one returns window.
 
-        cur.execute(sql, [symbols, lookback_days + 30])  # Extra days for lag calculation
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
-
-        if not rows:
-            return pd.DataFrame()
-
-        # Convert to DataFrame and calculate returns
-        df = pd.DataFrame(rows)
-        # Convert Decimal to float before calculations
-        df["close"] = df["close"].astype(float)
-        df["prev_close"] = df["prev_close"].astype(float)
-        df["return"] = (df["close"] - df["prev_close"]) / df["prev_close"]
-
-        # Pivot to wide format (dates x tickers)
-        returns_pivot = df.pivot(index="date", columns="ticker", values="return")
-        returns_pivot = returns_pivot.dropna()
-
-        return returns_pivot
-
-    def _get_market_returns(self, lookback_days: int) -> pd.Series:
-        """Get S&P 500 (SPY) returns as market benchmark."""
-
-        conn = psycopg2.connect(**self.db_config, cursor_factory=RealDictCursor)
-        cur = conn.cursor()
-
-        sql = """
-            SELECT
-                date,
-                close,
-                LAG(close) OVER (ORDER BY date) as prev_close
-            FROM daily_bars
-            WHERE ticker = 'SPY'
-              AND date >= CURRENT_DATE - INTERVAL '%s days'
-            ORDER BY date DESC
-        """
-
-        cur.execute(sql, [lookback_days + 30])
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
-
-        if not rows:
-            return pd.Series()
-
-        df = pd.DataFrame(rows)
-        # Convert Decimal to float before calculations
-        df["close"] = df["close"].astype(float)
-        df["prev_close"] = df["prev_close"].astype(float)
-        df["return"] = (df["close"] - df["prev_close"]) / df["prev_close"]
-
-        return df.set_index("date")["return"].dropna()
+        Args:
+            portfolios: Positions per portfolio key (e.g. account hash)
+            lookback_days: Number of trading days to look back for calculations
 
-    def _calculate_portfolio_returns(
-        self, returns_df: pd.DataFrame, weights: Dict[str, float]
-    ) -> pd.Series:
-        """Calculate weighted portfolio returns."""
+        Returns:
+            Risk metrics per portfolio key (same shape as calculate_portfolio_risk)
+        """
+        weights = {key: self._equity_weights(positions) for key, positions in portfolios.items()}
+        active = [key for key, w in weights.items() if w]
+        results = {key: self._empty_risk_metrics() for key in portfolios}
+        if not active:
+            return results
+
+        symbols = sorted(set().union(*(weights[key] for key in active)))
+        column = {symbol: i for i, symbol in enumerate(symbols)}
+        start = date.today() - timedelta(days=lookback_days + 30)  # as the original LAG window
+        _, returns, market = self.returns_matrix.window(symbols, start)
+        returns = returns.astype(np.float64)
+        market = market.astype(np.float64)
+        missing = np.isnan(returns)
+
+        # Weights and holdings as (tickers x portfolios); tickers without any
+        # return in the window are left out, as the per-portfolio pivot did
+        W = np.zeros((len(symbols), len(active)))
+        held = np.zeros((len(symbols), len(active)), dtype=bool)
+        for j, key in enumerate(active):
+            for symbol, weight in weights[key].items():
+                W[column[symbol], j] = weight
+                held[column[symbol], j] = True
+        held &= ~missing.all(axis=0)[:, None]
+
+        # A date counts for a portfolio when every held ticker has a return
+        valid = (missing.astype(np.float64) @ held == 0) & held.any(axis=0)
+        has_data = valid.any(axis=0)
+        portfolio_returns = np.where(valid, np.nan_to_num(returns) @ W, np.nan)
+
+        with warnings.catch_warnings(), np.errstate(divide="ignore", invalid="ignore"):
+            warnings.simplefilter("ignore", RuntimeWarning)
+            vectors = {
+                "volatility": self._calculate_volatility(portfolio_returns),
+                "sharpe_ratio": self._calculate_sharpe_ratio(portfolio_returns),
+                "sortino_ratio": self._calculate_sortino_ratio(portfolio_returns),
+                "max_drawdown": self._calculate_max_drawdown(portfolio_returns),
+                "beta": self._calculate_beta(portfolio_returns, market),
+                "var_95": self._calculate_var(portfolio_returns, confidence=0.95),
+                "var_99": self._calculate_var(portfolio_returns, confidence=0.99),
+                "cvar_95": self._calculate_cvar(portfolio_returns, confidence=0.95),
+            }
+            analysis_date = datetime.now().isoformat()
+
+            for j, key in enumerate(active):
+                if not has_data[j]:
+                    continue
+                cols = np.flatnonzero(held[:, j])
+                corr = self._correlation(returns[valid[:, j]][:, cols])
+                tickers = [symbols[i] for i in cols]
+
+                metrics = {name: float(values[j]) for name, values in vectors.items()}
+                metrics.update(
+                    {
+                        "correlation_matrix": self._calculate_correlation(corr, tickers),
+                        "diversification_score": self._calculate_diversification_score(
+                            corr, weights[key]
+                        ),
+                        "lookback_days": lookback_days,
+                        "analysis_date": analysis_date,
+                    }
+                )
+                results[key] = metrics
+
+        return results
+
+    def _equity_weights(self, positions: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Weight of each equity position in the equity value (empty if none)."""
+        equities = [p for p in positions or [] if p.get("instrument_type") == "EQUITY"]
 
-        portfolio_returns = pd.Series(0, index=returns_df.index)
+        # Convert all values to float to avoid Decimal issues
+        total_value = sum(float(p["current_value"]) for p in equities)
+        if not equities or total_value == 0:
+            return {}
 
-        for symbol, weight in weights.items():
-            if symbol in returns_df.columns:
-                portfolio_returns += returns_df[symbol] * weight
+        return {p["symbol"]: float(p["current_value"]) / total_value for p in equities}
 
-        return portfolio_returns
+    @staticmethod
+    def _count(returns: np.ndarray) -> np.ndarray:
+        """Observations per portfolio column."""
+        return (~np.isnan(returns)).sum(axis=0)
 
-    def _calculate_volatility(self, returns: pd.Series) -> float:
+    def _calculate_volatility(self, returns: np.ndarray) -> np.ndarray:
         """
         Calculate annualized volatility (standard deviation).
 
         Volatility = std(daily returns) * sqrt(252)
         """
-        if len(returns) < 2:
-            return 0.0
-
-        return float(returns.std() * np.sqrt(252))
+        volatility = np.nanstd(returns, axis=0, ddof=1) * np.sqrt(252)
+        return np.where(self._count(returns) < 2, 0.0, volatility)
 
     def _calculate_sharpe_ratio(
-        self, returns: pd.Series, risk_free_rate: float = 0.045  # 4.5% current risk-free rate
-    ) -> float:
+        self, returns: np.ndarray, risk_free_rate: float = 0.045  # 4.5% current risk-free rate
+    ) -> np.ndarray:
         """
         Calculate Sharpe Ratio (risk-adjusted return).
 
@@ -213,45 +166,32 @@ class RiskAnalytics:
         > 2.0 = Very good
         > 3.0 = Excellent
         """
-        if len(returns) < 2:
-            return 0.0
-
-        annual_return = (1 + returns.mean()) ** 252 - 1
-        volatility = returns.std() * np.sqrt(252)
-
-        if volatility == 0:
-            return 0.0
+        annual_return = (1 + np.nanmean(returns, axis=0)) ** 252 - 1
+        volatility = np.nanstd(returns, axis=0, ddof=1) * np.sqrt(252)
 
         sharpe = (annual_return - risk_free_rate) / volatility
-        return float(sharpe)
+        return np.where((self._count(returns) < 2) | (volatility == 0), 0.0, sharpe)
 
-    def _calculate_sortino_ratio(self, returns: pd.Series, risk_free_rate: float = 0.045) -> float:
+    def _calculate_sortino_ratio(
+        self, returns: np.ndarray, risk_free_rate: float = 0.045
+    ) -> np.ndarray:
         """
         Calculate Sortino Ratio (downside risk-adjusted return).
 
         Like Sharpe, but only penalizes downside volatility.
         Better for portfolios with asymmetric returns.
         """
-        if len(returns) < 2:
-            return 0.0
-
-        annual_return = (1 + returns.mean()) ** 252 - 1
+        annual_return = (1 + np.nanmean(returns, axis=0)) ** 252 - 1
 
         # Downside deviation (only negative returns)
-        downside_returns = returns[returns < 0]
-
-        if len(downside_returns) == 0:
-            return float("inf")
+        downside_returns = np.where(returns < 0, returns, np.nan)
+        downside_std = np.nanstd(downside_returns, axis=0, ddof=1) * np.sqrt(252)
 
-        downside_std = downside_returns.std() * np.sqrt(252)
+        sortino = np.where(downside_std == 0, 0.0, (annual_return - risk_free_rate) / downside_std)
+        sortino = np.where(self._count(downside_returns) == 0, np.inf, sortino)
+        return np.where(self._count(returns) < 2, 0.0, sortino)
 
-        if downside_std == 0:
-            return 0.0
-
-        sortino = (annual_return - risk_free_rate) / downside_std
-        return float(sortino)
-
-    def _calculate_max_drawdown(self, returns: pd.Series) -> float:
+    def _calculate_max_drawdown(self, returns: np.ndarray) -> np.ndarray:
         """
         Calculate maximum drawdown (largest peak-to-trough decline).
 
@@ -259,21 +199,18 @@ class RiskAnalytics:
 
         Example: -30% means portfolio declined 30% from peak.
         """
-        if len(returns) < 2:
-            return 0.0
+        # Cumulative returns (dates outside a portfolio's window leave it unchanged)
+        cumulative = np.cumprod(1 + np.nan_to_num(returns), axis=0)
 
-        # Calculate cumulative returns
-        cumulative = (1 + returns).cumprod()
-
-        # Calculate running maximum
-        running_max = cumulative.expanding().max()
-
-        # Calculate drawdown
+        # Running maximum and drawdown
+        running_max = np.maximum.accumulate(cumulative, axis=0)
         drawdown = (cumulative - running_max) / running_max
 
-        return float(drawdown.min())
+        return np.where(self._count(returns) < 2, 0.0, drawdown.min(axis=0, initial=0.0))
 
-    def _calculate_beta(self, portfolio_returns: pd.Series, market_returns: pd.Series) -> float:
+    def _calculate_beta(
+        self, portfolio_returns: np.ndarray, market_returns: np.ndarray
+    ) -> np.ndarray:
         """
         Calculate Beta (sensitivity to market movements).
 
@@ -285,25 +222,27 @@ class RiskAnalytics:
         Beta < 1.0: Less volatile than market
         Beta < 0.0: Moves opposite to market
         """
-        if len(portfolio_returns) < 2 or len(market_returns) < 2:
-            return 1.0
-
-        # Align dates
-        aligned = pd.DataFrame({"portfolio": portfolio_returns, "market": market_returns}).dropna()
-
-        if len(aligned) < 2:
-            return 1.0
-
-        covariance = aligned["portfolio"].cov(aligned["market"])
-        market_variance = aligned["market"].var()
-
-        if market_variance == 0:
-            return 1.0
-
-        beta = covariance / market_variance
-        return float(beta)
+        # Align dates: both series need a return
+        aligned = ~np.isnan(portfolio_returns) & ~np.isnan(market_returns)[:, None]
+        n = aligned.sum(axis=0)
+
+        portfolio = np.where(aligned, portfolio_returns, np.nan)
+        market = np.where(aligned, market_returns[:, None], np.nan)
+        portfolio_dev = portfolio - np.nanmean(portfolio, axis=0)
+        market_dev = market - np.nanmean(market, axis=0)
+
+        covariance = np.nansum(portfolio_dev * market_dev, axis=0) / (n - 1)
+        market_variance = np.nansum(market_dev**2, axis=0) / (n - 1)
+
+        insufficient = (
+            (self._count(portfolio_returns) < 2)
+            | (np.count_nonzero(~np.isnan(market_returns)) < 2)
+            | (n < 2)
+            | (market_variance == 0)
+        )
+        return np.where(insufficient, 1.0, covariance / market_variance)
 
-    def _calculate_var(self, returns: pd.Series, confidence: float = 0.95) -> float:
+    def _calculate_var(self, returns: np.ndarray, confidence: float = 0.95) -> np.ndarray:
         """
         Calculate Value at Risk (VaR).
 
@@ -312,13 +251,10 @@ class RiskAnalytics:
         Example: VaR(95%) = -2.5% means there's a 5% chance
         of losing more than 2.5% in a single day.
         """
-        if len(returns) < 2:
-            return 0.0
-
-        var = np.percentile(returns, (1 - confidence) * 100)
-        return float(var)
+        var = np.nanpercentile(returns, (1 - confidence) * 100, axis=0)
+        return np.where(self._count(returns) < 2, 0.0, var)
 
-    def _calculate_cvar(self, returns: pd.Series, confidence: float = 0.95) -> float:
+    def _calculate_cvar(self, returns: np.ndarray, confidence: float = 0.95) -> np.ndarray:
         """
         Calculate Conditional Value at Risk (CVaR / Expected Shortfall).
 
@@ -327,15 +263,19 @@ class RiskAnalytics:
         More conservative than VaR - tells you average loss
         in worst-case scenarios.
         """
-        if len(returns) < 2:
-            return 0.0
-
         var = self._calculate_var(returns, confidence)
-        cvar = returns[returns <= var].mean()
+        cvar = np.nanmean(np.where(returns <= var, returns, np.nan), axis=0)
+
+        return np.where(self._count(returns) < 2, 0.0, cvar)
 
-        return float(cvar)
+    @staticmethod
+    def _correlation(returns: np.ndarray) -> np.ndarray:
+        """Correlation matrix of a (dates x holdings) returns block."""
+        if returns.shape[1] < 2:
+            return np.empty((returns.shape[1], returns.shape[1]))
+        return np.corrcoef(returns, rowvar=False)
 
-    def _calculate_correlation(self, returns_df: pd.DataFrame) -> Dict[str, Any]:
+    def _calculate_correlation(self, corr: np.ndarray, tickers: List[str]) -> Dict[str, Any]:
         """
         Calculate correlation matrix between holdings.
 
@@ -344,16 +284,17 @@ class RiskAnalytics:
         0.0 = No correlation
         -1.0 = Perfect negative correlation
         """
-        if returns_df.empty or len(returns_df.columns) < 2:
+        if len(tickers) < 2:
             return {}
 
-        corr_matrix = returns_df.corr()
-
-        # Convert to dict format
-        return corr_matrix.to_dict()
+        # Convert to dict format ({column: {row: value}})
+        return {
+            col: {row: float(corr[i, j]) for i, row in enumerate(tickers)}
+            for j, col in enumerate(tickers)
+        }
 
     def _calculate_diversification_score(
-        self, returns_df: pd.DataFrame, weights: Dict[str, float]
+        self, corr: np.ndarray, weights: Dict[str, float]
     ) -> float:
         """
         Calculate portfolio diversification score (0-100).
@@ -363,17 +304,15 @@ class RiskAnalytics:
 
         Uses average correlation and concentration metrics.
         """
-        if returns_df.empty or len(returns_df.columns) < 2:
+        if len(corr) < 2:
             return 0.0
 
         # Calculate average correlation (excluding diagonal)
-        corr_matrix = returns_df.corr()
-        mask = np.triu(np.ones_like(corr_matrix, dtype=bool), k=1)
-        avg_correlation = corr_matrix.where(mask).stack().mean()
+        avg_correlation = np.nanmean(corr[np.triu_indices(len(corr), k=1)])
 
         # Calculate concentration (Herfindahl index)
-        weight_values = list(weights.values())
-        herfindahl = sum(w**2 for w in weight_values)
+        weight_values = np.fromiter(weights.values(), dtype=np.float64)
+        herfindahl = float(weight_values @ weight_values)
 
         # Diversification score (0-100)
         # Lower correlation = higher score
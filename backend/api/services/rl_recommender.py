@@ -9,23 +9,16 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 import numpy as np
-import psycopg2
-from psycopg2.extras import RealDictCursor
 from stable_baselines3 import PPO
 
+from ..database.blocking import blocking, run_blocking
+from ..database.connection import get_psycopg2_connection, get_psycopg2_cursor
+
 
 class RLRecommenderService:
     """Service for generating trade recommendations using trained RL models."""
 
     def __init__(self):
-        self.db_config = {
-            "dbname": "acis-ai",
-            "user": "postgres",
-            "password": "$@nJose420",
-            "host": "localhost",
-            "port": 5432,
-        }
-
         # Get project root directory (3 levels up from backend/api/services)
         import pathlib
 
@@ -102,7 +95,7 @@ class RLRecommenderService:
         """
 
         # Load model
-        model = self._load_model(portfolio_id)
+        model = await run_blocking(self._load_model, portfolio_id)
 
         if model is None:
             return {
@@ -120,7 +113,7 @@ class RLRecommenderService:
         observation = self._build_observation(current_positions, account_value, market_state)
 
         # Get action from model
-        action, _states = model.predict(observation, deterministic=True)
+        action, _states = await run_blocking(model.predict, observation, deterministic=True)
 
         # Interpret action as trade recommendations
         recommendations = self._action_to_recommendations(
@@ -140,26 +133,24 @@ class RLRecommenderService:
             },
         }
 
-    async def _get_market_state(self, portfolio_id: int) -> Dict[str, Any]:
+    @blocking
+    def _get_market_state(self, portfolio_id: int) -> Dict[str, Any]:
         """Fetch current market conditions."""
 
-        conn = psycopg2.connect(**self.db_config, cursor_factory=RealDictCursor)
-        cur = conn.cursor()
-
-        # Get recent market data (SPY as proxy)
-        cur.execute(
-            """
-            SELECT close, volume
-            FROM daily_bars
-            WHERE ticker = 'SPY'
-            ORDER BY date DESC
-            LIMIT 30
-        """
-        )
+        with get_psycopg2_connection() as conn:
+            with get_psycopg2_cursor(conn) as cur:
+                # Get recent market data (SPY as proxy)
+                cur.execute(
+                    """
+                    SELECT close, volume
+                    FROM daily_bars
+                    WHERE ticker = 'SPY'
+                    ORDER BY date DESC
+                    LIMIT 30
+                """
+                )
 
-        spy_data = [dict(row) for row in cur.fetchall()]
-        cur.close()
-        conn.close()
+                spy_data = [dict(row) for row in cur.fetchall()]
 
         if not spy_data:
             return {"market_trend": 0.0, "volatility": 0.0}
@@ -10,9 +10,9 @@ from decimal import Decimal
 from typing import Any, Dict, List, Optional
 
 import httpx
-import psycopg2
-from psycopg2.extras import RealDictCursor
 
+from ..database.blocking import blocking
+from ..database.connection import get_psycopg2_connection, get_psycopg2_cursor
 from .rl_recommender import get_rl_recommender_service
 from .trade_execution import OrderAction, OrderDuration, OrderType, TradeExecutionService
 
@@ -23,13 +23,6 @@ class RLTradingPipeline:
     """
 
     def __init__(self):
-        self.db_config = {
-            "dbname": "acis-ai",
-            "user": "postgres",
-            "password": "$@nJose420",
-            "host": "localhost",
-            "port": 5432,
-        }
         self.rl_service = get_rl_recommender_service()
         self.trade_service = TradeExecutionService()
 
@@ -334,27 +327,25 @@ class RLTradingPipeline:
 
             return response.json()
 
-    async def _get_market_price(self, symbol: str) -> Optional[float]:
+    @blocking
+    def _get_market_price(self, symbol: str) -> Optional[float]:
         """Get current market price for a symbol."""
 
-        conn = psycopg2.connect(**self.db_config, cursor_factory=RealDictCursor)
-        cur = conn.cursor()
-
-        # Get most recent daily bar
-        cur.execute(
-            """
-            SELECT close
-            FROM daily_bars
-            WHERE symbol = %s
-            ORDER BY date DESC
-            LIMIT 1
-        """,
-            [symbol],
-        )
+        with get_psycopg2_connection() as conn:
+            with get_psycopg2_cursor(conn) as cur:
+                # Get most recent daily bar
+                cur.execute(
+                    """
+                    SELECT close
+                    FROM daily_bars
+                    WHERE symbol = %s
+                    ORDER BY date DESC
+                    LIMIT 1
+                """,
+                    [symbol],
+                )
 
-        row = cur.fetchone()
-        cur.close()
-        conn.close()
+                row = cur.fetchone()
 
         if row:
             return float(row["close"])
@@ -366,153 +357,143 @@ class RLTradingPipeline:
 
         return f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}"
 
-    async def _save_order_batch(self, order_batch: Dict[str, Any]) -> None:
+    @blocking
+    def _save_order_batch(self, order_batch: Dict[str, Any]) -> None:
         """Save order batch to database."""
 
         import json
 
-        conn = psycopg2.connect(**self.db_config)
-        cur = conn.cursor()
-
-        # Create table if not exists
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS rl_order_batches (
-                batch_id TEXT PRIMARY KEY,
-                client_id INTEGER NOT NULL,
-                account_hash TEXT NOT NULL,
-                portfolio_id INTEGER NOT NULL,
-                strategy_name TEXT,
-                status TEXT NOT NULL,
-                created_at TIMESTAMP NOT NULL,
-                updated_at TIMESTAMP,
-                current_portfolio JSONB,
-                target_allocation JSONB,
-                trades JSONB,
-                execution_results JSONB
-            )
-        """
-        )
+        with get_psycopg2_connection() as conn:
+            with conn.cursor() as cur:
+                # Create table if not exists
+                cur.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS rl_order_batches (
+                        batch_id TEXT PRIMARY KEY,
+                        client_id INTEGER NOT NULL,
+                        account_hash TEXT NOT NULL,
+                        portfolio_id INTEGER NOT NULL,
+                        strategy_name TEXT,
+                        status TEXT NOT NULL,
+                        created_at TIMESTAMP NOT NULL,
+                        updated_at TIMESTAMP,
+                        current_portfolio JSONB,
+                        target_allocation JSONB,
+                        trades JSONB,
+                        execution_results JSONB
+                    )
+                """
+                )
 
-        cur.execute(
-            """
-            INSERT INTO rl_order_batches (
-                batch_id, client_id, account_hash, portfolio_id, strategy_name,
-                status, created_at, current_portfolio, target_allocation, trades
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """,
-            [
-                order_batch["batch_id"],
-                order_batch["client_id"],
-                order_batch["account_hash"],
-                order_batch["portfolio_id"],
-                order_batch["strategy_name"],
-                order_batch["status"],
-                datetime.now(),
-                json.dumps(order_batch["current_portfolio"]),
-                json.dumps(order_batch["target_allocation"]),
-                json.dumps(order_batch["trades"]),
-            ],
-        )
+                cur.execute(
+                    """
+                    INSERT INTO rl_order_batches (
+                        batch_id, client_id, account_hash, portfolio_id, strategy_name,
+                        status, created_at, current_portfolio, target_allocation, trades
+                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """,
+                    [
+                        order_batch["batch_id"],
+                        order_batch["client_id"],
+                        order_batch["account_hash"],
+                        order_batch["portfolio_id"],
+                        order_batch["strategy_name"],
+                        order_batch["status"],
+                        datetime.now(),
+                        json.dumps(order_batch["current_portfolio"]),
+                        json.dumps(order_batch["target_allocation"]),
+                        json.dumps(order_batch["trades"]),
+                    ],
+                )
 
-        conn.commit()
-        cur.close()
-        conn.close()
+                conn.commit()
 
-    async def _get_order_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+    @blocking
+    def _get_order_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve order batch from database."""
 
         import json
 
-        conn = psycopg2.connect(**self.db_config, cursor_factory=RealDictCursor)
-        cur = conn.cursor()
-
-        cur.execute(
-            """
-            SELECT *
-            FROM rl_order_batches
-            WHERE batch_id = %s
-        """,
-            [batch_id],
-        )
+        with get_psycopg2_connection() as conn:
+            with get_psycopg2_cursor(conn) as cur:
+                cur.execute(
+                    """
+                    SELECT *
+                    FROM rl_order_batches
+                    WHERE batch_id = %s
+                """,
+                    [batch_id],
+                )
 
-        row = cur.fetchone()
-        cur.close()
-        conn.close()
+                row = cur.fetchone()
 
         if not row:
             return None
 
         return dict(row)
 
-    async def _update_batch_status(self, batch_id: str, status: str) -> None:
+    @blocking
+    def _update_batch_status(self, batch_id: str, status: str) -> None:
         """Update order batch status."""
 
-        conn = psycopg2.connect(**self.db_config)
-        cur = conn.cursor()
-
-        cur.execute(
-            """
-            UPDATE rl_order_batches
-            SET status = %s, updated_at = %s
-            WHERE batch_id = %s
-        """,
-            [status, datetime.now(), batch_id],
-        )
+        with get_psycopg2_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    UPDATE rl_order_batches
+                    SET status = %s, updated_at = %s
+                    WHERE batch_id = %s
+                """,
+                    [status, datetime.now(), batch_id],
+                )
 
-        conn.commit()
-        cur.close()
-        conn.close()
+                conn.commit()
 
-    async def _update_trade_status(
+    @blocking
+    def _update_trade_status(
         self, batch_id: str, symbol: str, status: str, result: Dict[str, Any]
     ) -> None:
         """Update individual trade status within a batch."""
 
         import json
 
-        conn = psycopg2.connect(**self.db_config, cursor_factory=RealDictCursor)
-        cur = conn.cursor()
-
-        # Get current batch
-        cur.execute(
-            """
-            SELECT trades, execution_results
-            FROM rl_order_batches
-            WHERE batch_id = %s
-        """,
-            [batch_id],
-        )
+        with get_psycopg2_connection() as conn:
+            with get_psycopg2_cursor(conn) as cur:
+                # Get current batch
+                cur.execute(
+                    """
+                    SELECT trades, execution_results
+                    FROM rl_order_batches
+                    WHERE batch_id = %s
+                """,
+                    [batch_id],
+                )
 
-        row = cur.fetchone()
-        if not row:
-            cur.close()
-            conn.close()
-            return
-
-        trades = row["trades"]
-        execution_results = row["execution_results"] or {}
-
-        # Update execution results
-        execution_results[symbol] = {
-            "status": status,
-            "timestamp": datetime.now().isoformat(),
-            "result": result,
-        }
+                row = cur.fetchone()
+                if not row:
+                    return
 
-        # Save back
-        cur.execute(
-            """
-            UPDATE rl_order_batches
-            SET execution_results = %s, updated_at = %s
-            WHERE batch_id = %s
-        """,
-            [json.dumps(execution_results), datetime.now(), batch_id],
-        )
+                trades = row["trades"]
+                execution_results = row["execution_results"] or {}
+
+                # Update execution results
+                execution_results[symbol] = {
+                    "status": status,
+                    "timestamp": datetime.now().isoformat(),
+                    "result": result,
+                }
+
+                # Save back
+                cur.execute(
+                    """
+                    UPDATE rl_order_batches
+                    SET execution_results = %s, updated_at = %s
+                    WHERE batch_id = %s
+                """,
+                    [json.dumps(execution_results), datetime.now(), batch_id],
+                )
 
-        conn.commit()
-        cur.close()
-        conn.close()
+                conn.commit()
 
 
 # Singleton instance
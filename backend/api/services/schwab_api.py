@@ -8,15 +8,30 @@ Handles API calls to Schwab for:
 - Market data
 
 Requires valid OAuth token from SchwabOAuthService.
+
+All clients share one pooled httpx.AsyncClient per process (kept-alive
+connections, no TLS handshake per call). Quote lookups go through a
+QuoteCoalescer: short-TTL cache, in-flight request sharing and batching of
+concurrent lookups into multi-symbol requests; each session's client is closed
+when its event loop shuts down or the session is replaced.
 """
 
+import asyncio
+import os
+import time
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import httpx
 
-# Schwab API Base URL
-SCHWAB_API_BASE = "https://api.schwabapi.com/trader/v1"
+# Schwab API Base URL (override to point at a mock server)
+SCHWAB_API_BASE = os.getenv("SCHWAB_API_BASE", "https://api.schwabapi.com/trader/v1")
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("SCHWAB_HTTP_MAX_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = 60.0  # seconds an idle connection is kept open
+QUOTE_CACHE_TTL = float(os.getenv("SCHWAB_QUOTE_TTL_SECONDS", "5"))
+QUOTE_BATCH_WINDOW = 0.01  # seconds a queued quote lookup waits for others to batch with
+QUOTE_BATCH_SIZE = 500  # max symbols per marketdata/quotes request
 
 
 class SchwabAPIClient:
@@ -24,15 +39,16 @@ class SchwabAPIClient:
     Client for Schwab API calls.
     """
 
-    def __init__(self, access_token: str):
+    def __init__(self, access_token: str, base_url: Optional[str] = None):
         """
         Initialize Schwab API client.
 
         Args:
             access_token: Valid OAuth access token
+            base_url: API base URL (default SCHWAB_API_BASE)
         """
         self.access_token = access_token
-        self.base_url = SCHWAB_API_BASE
+        self.base_url = base_url or SCHWAB_API_BASE
         self.headers = {"Authorization": f"Bearer {access_token}"}
 
     async def get_account_numbers(self) -> List[Dict[str, Any]]:
@@ -44,15 +60,15 @@ class SchwabAPIClient:
         """
         url = f"{self.base_url}/accounts/accountNumbers"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers, timeout=30.0)
+        client = get_http_client()
+        response = await client.get(url, headers=self.headers, timeout=30.0)
 
-            if response.status_code != 200:
-                raise Exception(
-                    f"Failed to get account numbers: {response.status_code} - {response.text}"
-                )
+        if response.status_code != 200:
+            raise Exception(
+                f"Failed to get account numbers: {response.status_code} - {response.text}"
+            )
 
-            return response.json()
+        return response.json()
 
     async def get_account(self, account_hash: str, fields: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -71,13 +87,13 @@ class SchwabAPIClient:
         if fields:
             params["fields"] = fields
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers, params=params, timeout=30.0)
+        client = get_http_client()
+        response = await client.get(url, headers=self.headers, params=params, timeout=30.0)
 
-            if response.status_code != 200:
-                raise Exception(f"Failed to get account: {response.status_code} - {response.text}")
+        if response.status_code != 200:
+            raise Exception(f"Failed to get account: {response.status_code} - {response.text}")
 
-            return response.json()
+        return response.json()
 
     async def get_all_accounts(self, fields: Optional[str] = "positions") -> List[Dict[str, Any]]:
         """
@@ -95,13 +111,13 @@ class SchwabAPIClient:
         if fields:
             params["fields"] = fields
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers, params=params, timeout=30.0)
+        client = get_http_client()
+        response = await client.get(url, headers=self.headers, params=params, timeout=30.0)
 
-            if response.status_code != 200:
-                raise Exception(f"Failed to get accounts: {response.status_code} - {response.text}")
+        if response.status_code != 200:
+            raise Exception(f"Failed to get accounts: {response.status_code} - {response.text}")
 
-            return response.json()
+        return response.json()
 
     async def get_positions(self, account_hash: str) -> List[Dict[str, Any]]:
         """
@@ -208,13 +224,13 @@ class SchwabAPIClient:
         if status:
             params["status"] = status
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers, params=params, timeout=30.0)
+        client = get_http_client()
+        response = await client.get(url, headers=self.headers, params=params, timeout=30.0)
 
-            if response.status_code != 200:
-                raise Exception(f"Failed to get orders: {response.status_code} - {response.text}")
+        if response.status_code != 200:
+            raise Exception(f"Failed to get orders: {response.status_code} - {response.text}")
 
-            return response.json()
+        return response.json()
 
     async def place_order(self, account_hash: str, order: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -232,21 +248,21 @@ class SchwabAPIClient:
         # Add Content-Type header for POST requests
         post_headers = {**self.headers, "Content-Type": "application/json"}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, headers=post_headers, json=order, timeout=30.0)
+        client = get_http_client()
+        response = await client.post(url, headers=post_headers, json=order, timeout=30.0)
 
-            if response.status_code not in [200, 201]:
-                raise Exception(f"Failed to place order: {response.status_code} - {response.text}")
+        if response.status_code not in [200, 201]:
+            raise Exception(f"Failed to place order: {response.status_code} - {response.text}")
 
-            # Get order ID from Location header
-            location = response.headers.get("Location", "")
-            order_id = location.split("/")[-1] if location else None
+        # Get order ID from Location header
+        location = response.headers.get("Location", "")
+        order_id = location.split("/")[-1] if location else None
 
-            return {
-                "order_id": order_id,
-                "status": "ACCEPTED",
-                "message": "Order placed successfully",
-            }
+        return {
+            "order_id": order_id,
+            "status": "ACCEPTED",
+            "message": "Order placed successfully",
+        }
 
     async def cancel_order(self, account_hash: str, order_id: str) -> Dict[str, Any]:
         """
@@ -261,40 +277,33 @@ class SchwabAPIClient:
         """
         url = f"{self.base_url}/accounts/{account_hash}/orders/{order_id}"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(url, headers=self.headers, timeout=30.0)
+        client = get_http_client()
+        response = await client.delete(url, headers=self.headers, timeout=30.0)
 
-            if response.status_code != 200:
-                raise Exception(f"Failed to cancel order: {response.status_code} - {response.text}")
+        if response.status_code != 200:
+            raise Exception(f"Failed to cancel order: {response.status_code} - {response.text}")
 
-            return {
-                "order_id": order_id,
-                "status": "CANCELLED",
-                "message": "Order cancelled successfully",
-            }
+        return {
+            "order_id": order_id,
+            "status": "CANCELLED",
+            "message": "Order cancelled successfully",
+        }
 
     async def get_quote(self, symbol: str) -> Dict[str, Any]:
         """
         Get real-time quote for a symbol.
 
+        Concurrent single-symbol lookups are batched into one multi-symbol
+        request (see QuoteCoalescer).
+
         Args:
             symbol: Stock symbol
 
         Returns:
             Quote data with price, volume, etc.
         """
-        url = f"{self.base_url}/marketdata/quotes"
-
-        params = {"symbols": symbol}
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers, params=params, timeout=30.0)
-
-            if response.status_code != 200:
-                raise Exception(f"Failed to get quote: {response.status_code} - {response.text}")
-
-            data = response.json()
-            return data.get(symbol, {})
+        quotes = await _get_session().quotes.get([symbol], self._fetch_quotes)
+        return quotes.get(symbol, {})
 
     async def get_quotes(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
         """
@@ -306,17 +315,220 @@ class SchwabAPIClient:
         Returns:
             Dict of symbol -> quote data
         """
+        quotes = await _get_session().quotes.get(symbols, self._fetch_quotes)
+        return {symbol: quote for symbol, quote in quotes.items() if quote}
+
+    async def _fetch_quotes(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """One marketdata/quotes request for `symbols`."""
         url = f"{self.base_url}/marketdata/quotes"
 
         params = {"symbols": ",".join(symbols)}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers, params=params, timeout=30.0)
+        client = get_http_client()
+        response = await client.get(url, headers=self.headers, params=params, timeout=30.0)
+
+        if response.status_code != 200:
+            raise Exception(f"Failed to get quotes: {response.status_code} - {response.text}")
 
-            if response.status_code != 200:
-                raise Exception(f"Failed to get quotes: {response.status_code} - {response.text}")
+        return response.json()
 
-            return response.json()
+
+class _BatchFailed(Exception):
+    """A batch request failed; carries the error and the fetch (token) that made it"""
+
+    def __init__(self, error: Exception, fetch):
+        super().__init__(str(error))
+        self.error = error
+        self.fetch = fetch
+
+
+class QuoteCoalescer:
+    """
+    Shared quote lookups for one event loop.
+
+    - quotes younger than `ttl` seconds are served from the cache
+    - a symbol already being fetched waits on that in-flight request
+    - other symbols are queued and fetched together: the queue is flushed as
+      one multi-symbol request `window` seconds after the first symbol is
+      queued, or as soon as it holds `batch_size` symbols
+
+    A batch is fetched with the token of the caller that flushed it; quotes
+    are market data, the same for every account. If that request fails, each
+    other caller waiting on it retries its own symbols with its own token, so
+    one account's expired token only fails that account's lookups.
+    """
+
+    def __init__(
+        self,
+        ttl: float = QUOTE_CACHE_TTL,
+        window: float = QUOTE_BATCH_WINDOW,
+        batch_size: int = QUOTE_BATCH_SIZE,
+    ):
+        self.ttl = ttl
+        self.window = window
+        self.batch_size = batch_size
+        self._cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._queue: List[str] = []
+        self._fetch: Optional[Callable[[List[str]], Awaitable[Dict[str, Any]]]] = None
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+        self.requests = 0  # upstream marketdata/quotes calls
+
+    async def get(
+        self, symbols: List[str], fetch: Callable[[List[str]], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Quotes for `symbols` ({} for symbols Schwab returns nothing for)
+
+        Args:
+            symbols: Stock symbols
+            fetch: Coroutine function making one quotes request for a batch
+        """
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        quotes = {}
+        waiting = {}
+
+        for symbol in dict.fromkeys(symbols):
+            cached = self._cache.get(symbol)
+            if cached is not None and now - cached[0] < self.ttl:
+                quotes[symbol] = cached[1]
+            elif symbol in self._inflight:
+                waiting[symbol] = self._inflight[symbol]
+            else:
+                waiting[symbol] = self._inflight[symbol] = loop.create_future()
+                self._queue.append(symbol)
+
+        if self._queue:
+            self._fetch = fetch
+            if len(self._queue) >= self.batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.window, self._flush)
+
+        if waiting:
+            # Shielded: one caller giving up must not cancel the shared request
+            results = await asyncio.gather(
+                *(asyncio.shield(f) for f in waiting.values()), return_exceptions=True
+            )
+            retry = []
+            for symbol, result in zip(waiting, results):
+                if isinstance(result, _BatchFailed):
+                    if result.fetch != fetch:
+                        retry.append(symbol)
+                        continue
+                    raise result.error
+                if isinstance(result, BaseException):
+                    raise result
+                quotes[symbol] = result
+            if retry:
+                # Another caller's request failed: ours may still succeed
+                self.requests += 1
+                quotes.update(self._store(retry, await fetch(retry)))
+        return quotes
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        while self._queue:
+            batch = self._queue[: self.batch_size]
+            self._queue = self._queue[self.batch_size :]
+            task = asyncio.ensure_future(self._fetch_batch(batch, self._fetch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _store(self, symbols: List[str], data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Cache a response's quotes; {} for symbols it has nothing for"""
+        now = time.monotonic()
+        quotes = {}
+        for symbol in symbols:
+            quotes[symbol] = data.get(symbol, {})
+            if quotes[symbol]:
+                self._cache[symbol] = (now, quotes[symbol])
+        return quotes
+
+    async def _fetch_batch(self, batch: List[str], fetch):
+        self.requests += 1
+        quotes, error = None, None
+        try:
+            quotes = self._store(batch, await fetch(batch))
+        except Exception as e:
+            error = _BatchFailed(e, fetch)
+        finally:
+            # Every waiter is released, also when this task is cancelled
+            for symbol in batch:
+                future = self._inflight.pop(symbol, None)
+                if future is None or future.done():
+                    continue
+                if quotes is not None:
+                    future.set_result(quotes[symbol])
+                elif error is not None:
+                    future.set_exception(error)
+                else:
+                    future.cancel()
+
+
+class _HTTPSession:
+    """Pooled HTTP client and quote coalescer bound to one event loop"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+        self.quotes = QuoteCoalescer()
+        # Closes the client when the loop shuts down: asyncio.run() cancels
+        # leftover tasks before closing the loop
+        self._closer = loop.create_task(self._close_on_cancel())
+
+    async def _close_on_cancel(self):
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.client.aclose()
+
+    def close_soon(self):
+        """Close the client on its own loop (callable from any loop or thread)"""
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._closer.cancel)
+
+
+_session: Optional[_HTTPSession] = None
+
+
+def _get_session() -> _HTTPSession:
+    global _session
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.loop is not loop or _session.client.is_closed:
+        # Connections can't be shared across event loops (scripts calling
+        # asyncio.run() repeatedly get a fresh session per loop)
+        if _session is not None:
+            _session.close_soon()
+        _session = _HTTPSession(loop)
+    return _session
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """The process's pooled Schwab HTTP client (keep-alive connections are reused)."""
+    return _get_session().client
+
+
+async def close_http_client():
+    """Close the pooled client (app shutdown)."""
+    global _session
+    if _session is not None:
+        if _session.loop is asyncio.get_running_loop():
+            await _session.client.aclose()
+        _session.close_soon()
+    _session = None
 
 
 def create_market_order(symbol: str, quantity: int, instruction: str = "BUY") -> Dict[str, Any]:
@@ -7,19 +7,34 @@ Handles OAuth2 flow for Schwab API:
 3. Store tokens in database
 4. Refresh tokens when expired
 
+Access tokens are served from the process-level token cache
+(utils/token_cache.py): the database is read once per (client, brokerage) and
+written only when a token is stored or refreshed. Tokens nearing expiry are
+refreshed in the background, one refresh per key at a time.
+
 Schwab API Documentation:
 https://developer.schwab.com/
 """
 
+import asyncio
 import base64
 import os
 import secrets
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
 
 import httpx
 from sqlalchemy import text
 
+from utils import get_logger
+from utils.token_cache import CachedToken, token_cache
+
+from ..database.blocking import execute, fetch_one, run_blocking
+from ..database.connection import SessionLocal
+
+logger = get_logger(__name__)
+
 # Schwab OAuth Configuration
 SCHWAB_AUTH_URL = "https://api.schwabapi.com/v1/oauth/authorize"
 SCHWAB_TOKEN_URL = "https://api.schwabapi.com/v1/oauth/token"
@@ -27,6 +42,9 @@ SCHWAB_CLIENT_ID = os.getenv("SCHWAB_CLIENT_ID", "")
 SCHWAB_CLIENT_SECRET = os.getenv("SCHWAB_CLIENT_SECRET", "")
 SCHWAB_REDIRECT_URI = os.getenv("SCHWAB_REDIRECT_URI", "http://localhost:8000/api/schwab/callback")
 
+# In-progress token refreshes per (client_id, brokerage_id) (single-flight)
+_refresh_tasks: Dict[Tuple[int, int], asyncio.Task] = {}
+
 
 class SchwabOAuthService:
     """
@@ -177,9 +195,10 @@ class SchwabOAuthService:
         expires_in: int,
         token_type: str,
         scope: str,
+        db=None,
     ):
         """
-        Store OAuth tokens in database.
+        Store OAuth tokens in database (and the token cache).
 
         Args:
             client_id: Internal client ID
@@ -189,6 +208,7 @@ class SchwabOAuthService:
             expires_in: Token expiration time in seconds
             token_type: Token type (usually "Bearer")
             scope: OAuth scopes granted
+            db: Session to write with (default: this service's session)
         """
         expires_at = datetime.utcnow() + timedelta(seconds=expires_in)
 
@@ -214,7 +234,8 @@ class SchwabOAuthService:
         """
         )
 
-        self.db.execute(
+        await execute(
+            db or self.db,
             query,
             {
                 "client_id": client_id,
@@ -225,15 +246,23 @@ class SchwabOAuthService:
                 "scope": scope,
                 "expires_at": expires_at,
             },
+            commit=True,
         )
 
-        self.db.commit()
+        token_cache.put(
+            (client_id, brokerage_id), access_token, refresh_token, time.time() + expires_in
+        )
 
     async def get_valid_token(self, client_id: int, brokerage_id: int = 1) -> Optional[str]:
         """
         Get a valid access token for client.
         Refreshes token if expired.
 
+        Served from the token cache; the database is only read for a token
+        not cached yet. A token within 5 minutes of expiry is refreshed before
+        it is returned; within 15 minutes it is returned while a refresh runs
+        in the background.
+
         Args:
             client_id: Internal client ID
             brokerage_id: Brokerage ID
@@ -241,7 +270,24 @@ class SchwabOAuthService:
         Returns:
             Valid access token or None if not found
         """
-        # Get token from database
+        key = (client_id, brokerage_id)
+        token = token_cache.get(key)
+
+        if token is None:
+            token = await self._load_token(client_id, brokerage_id)
+            if token is None:
+                return None
+
+        if token_cache.needs_refresh(token):
+            # Token expired or expiring soon, refresh it
+            token = await asyncio.shield(self._refresh_single_flight(key, token))
+        elif token_cache.refresh_due(token):
+            self._refresh_single_flight(key, token)
+
+        return token.access_token
+
+    async def _load_token(self, client_id: int, brokerage_id: int) -> Optional[CachedToken]:
+        """Read a client's token from the database into the token cache."""
         query = text(
             """
             SELECT access_token, refresh_token, expires_at
@@ -251,34 +297,62 @@ class SchwabOAuthService:
         """
         )
 
-        result = self.db.execute(
-            query, {"client_id": client_id, "brokerage_id": brokerage_id}
-        ).fetchone()
+        result = await fetch_one(
+            self.db, query, {"client_id": client_id, "brokerage_id": brokerage_id}
+        )
 
         if not result:
             return None
 
         access_token, refresh_token, expires_at = result
 
-        # Check if token is expired (with 5-minute buffer)
-        if expires_at <= datetime.utcnow() + timedelta(minutes=5):
-            # Token expired or expiring soon, refresh it
-            new_token_data = await self._refresh_token(refresh_token)
+        # expires_at is stored as naive UTC
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+
+        return token_cache.put(
+            (client_id, brokerage_id), access_token, refresh_token, expires_at.timestamp()
+        )
+
+    def _refresh_single_flight(self, key: Tuple[int, int], stale: CachedToken) -> asyncio.Task:
+        """The refresh task for key: the one in progress, or a new one."""
+        task = _refresh_tasks.get(key)
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._refresh_and_store(key, stale))
+            _refresh_tasks[key] = task
+            task.add_done_callback(
+                lambda t: _refresh_tasks.pop(key, None) if _refresh_tasks.get(key) is t else None
+            )
+            task.add_done_callback(_log_refresh_failure)
+        return task
 
-            # Store new tokens
+    async def _refresh_and_store(self, key: Tuple[int, int], stale: CachedToken) -> CachedToken:
+        """Refresh a token and store it (own session: may outlive the request)."""
+        current = token_cache.get(key)
+        if current is not None and current is not stale and not token_cache.needs_refresh(current):
+            return current  # refreshed elsewhere in the meantime
+
+        client_id, brokerage_id = key
+        new_token_data = await self._refresh_token(stale.refresh_token)
+        refresh_token = new_token_data.get("refresh_token", stale.refresh_token)
+
+        # Store new tokens
+        db = SessionLocal()
+        try:
             await self._store_tokens(
                 client_id=client_id,
                 brokerage_id=brokerage_id,
                 access_token=new_token_data["access_token"],
-                refresh_token=new_token_data.get("refresh_token", refresh_token),
+                refresh_token=refresh_token,
                 expires_in=new_token_data["expires_in"],
                 token_type=new_token_data.get("token_type", "Bearer"),
                 scope=new_token_data.get("scope", ""),
+                db=db,
             )
+        finally:
+            await run_blocking(db.close)
 
-            return new_token_data["access_token"]
-
-        return access_token
+        return token_cache.get(key)
 
     async def _refresh_token(self, refresh_token: str) -> Dict[str, Any]:
         """
@@ -331,3 +405,10 @@ class SchwabOAuthService:
         self.db.execute(query, {"client_id": client_id, "brokerage_id": brokerage_id})
 
         self.db.commit()
+        token_cache.invalidate((client_id, brokerage_id))
+
+
+def _log_refresh_failure(task: asyncio.Task):
+    """Done callback for refresh tasks; a failed refresh is retried by the next request."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Schwab token refresh failed: {task.exception()}")
@@ -10,8 +10,9 @@ from enum import Enum
 from typing import Any, Dict, List, Optional
 
 import httpx
-import psycopg2
-from psycopg2.extras import RealDictCursor
+
+from ..database.blocking import blocking
+from ..database.connection import get_psycopg2_connection, get_psycopg2_cursor
 
 
 class OrderType(str, Enum):
@@ -44,14 +45,6 @@ class TradeExecutionService:
     """Service for executing trades via Schwab API."""
 
     def __init__(self):
-        self.db_config = {
-            "dbname": "acis-ai",
-            "user": "postgres",
-            "password": "$@nJose420",
-            "host": "localhost",
-            "port": 5432,
-        }
-
         # Max order value limits (aligned with autonomous rebalancer)
         self.max_order_value_usd = 100000  # $100k per order
         self.max_position_pct = (
@@ -244,6 +237,21 @@ class TradeExecutionService:
 
         return payload
 
+    @blocking
+    def _get_token_row(self, client_id: int) -> Optional[Dict[str, Any]]:
+        """Stored Schwab OAuth token row for a client."""
+        with get_psycopg2_connection() as conn:
+            with get_psycopg2_cursor(conn) as cur:
+                sql = """
+                    SELECT access_token
+                    FROM brokerage_oauth_tokens
+                    WHERE client_id = %s AND brokerage_id = 1
+                    LIMIT 1
+                """
+                cur.execute(sql, [client_id])
+                token_row = cur.fetchone()
+        return token_row
+
     async def _execute_schwab_order(
         self, client_id: int, account_hash: str, order_payload: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -251,19 +259,7 @@ class TradeExecutionService:
 
         try:
             # Get OAuth token for this client
-            conn = psycopg2.connect(**self.db_config, cursor_factory=RealDictCursor)
-            cur = conn.cursor()
-
-            sql = """
-                SELECT access_token
-                FROM brokerage_oauth_tokens
-                WHERE client_id = %s AND brokerage_id = 1
-                LIMIT 1
-            """
-            cur.execute(sql, [client_id])
-            token_row = cur.fetchone()
-            cur.close()
-            conn.close()
+            token_row = await self._get_token_row(client_id)
 
             if not token_row:
                 return {"success": False, "error": "No OAuth token found for client"}
@@ -300,7 +296,8 @@ class TradeExecutionService:
         except Exception as e:
             return {"success": False, "error": f"Order execution failed: {str(e)}"}
 
-    async def _log_order(
+    @blocking
+    def _log_order(
         self,
         client_id: int,
         account_hash: str,
@@ -314,57 +311,54 @@ class TradeExecutionService:
         """Log order to database for audit trail."""
 
         try:
-            conn = psycopg2.connect(**self.db_config, cursor_factory=RealDictCursor)
-            cur = conn.cursor()
-
-            # Create orders table if it doesn't exist
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS trade_orders (
-                    id SERIAL PRIMARY KEY,
-                    client_id INTEGER NOT NULL,
-                    account_hash VARCHAR(255) NOT NULL,
-                    symbol VARCHAR(10) NOT NULL,
-                    action VARCHAR(20) NOT NULL,
-                    quantity INTEGER NOT NULL,
-                    order_type VARCHAR(20) NOT NULL,
-                    limit_price DECIMAL(10, 2),
-                    order_id VARCHAR(255),
-                    status VARCHAR(50),
-                    success BOOLEAN,
-                    error_message TEXT,
-                    created_at TIMESTAMP DEFAULT NOW(),
-                    updated_at TIMESTAMP DEFAULT NOW()
-                )
-            """
-            )
-
-            # Insert order log
-            cur.execute(
-                """
-                INSERT INTO trade_orders (
-                    client_id, account_hash, symbol, action, quantity,
-                    order_type, limit_price, order_id, status, success, error_message
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """,
-                [
-                    client_id,
-                    account_hash,
-                    symbol,
-                    action.value,
-                    quantity,
-                    order_type.value,
-                    limit_price,
-                    result.get("order_id"),
-                    result.get("status"),
-                    result.get("success"),
-                    result.get("error"),
-                ],
-            )
-
-            conn.commit()
-            cur.close()
-            conn.close()
+            with get_psycopg2_connection() as conn:
+                with get_psycopg2_cursor(conn) as cur:
+                    # Create orders table if it doesn't exist
+                    cur.execute(
+                        """
+                        CREATE TABLE IF NOT EXISTS trade_orders (
+                            id SERIAL PRIMARY KEY,
+                            client_id INTEGER NOT NULL,
+                            account_hash VARCHAR(255) NOT NULL,
+                            symbol VARCHAR(10) NOT NULL,
+                            action VARCHAR(20) NOT NULL,
+                            quantity INTEGER NOT NULL,
+                            order_type VARCHAR(20) NOT NULL,
+                            limit_price DECIMAL(10, 2),
+                            order_id VARCHAR(255),
+                            status VARCHAR(50),
+                            success BOOLEAN,
+                            error_message TEXT,
+                            created_at TIMESTAMP DEFAULT NOW(),
+                            updated_at TIMESTAMP DEFAULT NOW()
+                        )
+                    """
+                    )
+
+                    # Insert order log
+                    cur.execute(
+                        """
+                        INSERT INTO trade_orders (
+                            client_id, account_hash, symbol, action, quantity,
+                            order_type, limit_price, order_id, status, success, error_message
+                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    """,
+                        [
+                            client_id,
+                            account_hash,
+                            symbol,
+                            action.value,
+                            quantity,
+                            order_type.value,
+                            limit_price,
+                            result.get("order_id"),
+                            result.get("status"),
+                            result.get("success"),
+                            result.get("error"),
+                        ],
+                    )
+
+                    conn.commit()
 
         except Exception as e:
             print(f"Failed to log order: {e}")
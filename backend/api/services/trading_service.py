@@ -18,6 +18,7 @@ from typing import Any, Dict, List, Optional
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from ..database.blocking import blocking, execute, fetch_one, run_blocking
 from .balance_manager import get_balance_manager
 from .schwab_api import SchwabAPIClient, create_limit_order, create_market_order
 
@@ -83,7 +84,7 @@ class TradingService:
                 SELECT trading_mode FROM clients WHERE client_id = :client_id
             """
             )
-            mode_result = self.db.execute(trading_mode_query, {"client_id": client_id}).fetchone()
+            mode_result = await fetch_one(self.db, trading_mode_query, {"client_id": client_id})
             trading_mode = mode_result[0] if mode_result else "paper"
 
             # Update balance based on trading mode
@@ -93,7 +94,8 @@ class TradingService:
             if trading_mode == "paper":
                 # PAPER TRADING: Update cash in database directly
                 if action.upper() == "BUY":
-                    balance_result = self.balance_manager.update_balance_after_buy(
+                    balance_result = await run_blocking(
+                        self.balance_manager.update_balance_after_buy,
                         account_id=account_hash,
                         shares=shares,
                         price=price,
@@ -103,8 +105,12 @@ class TradingService:
                     if not balance_result["success"]:
                         raise ValueError(f"Balance update failed: {balance_result.get('error')}")
                 elif action.upper() == "SELL":
-                    balance_result = self.balance_manager.update_balance_after_sell(
-                        account_id=account_hash, shares=shares, price=price, commission=commission
+                    balance_result = await run_blocking(
+                        self.balance_manager.update_balance_after_sell,
+                        account_id=account_hash,
+                        shares=shares,
+                        price=price,
+                        commission=commission,
                     )
                     if not balance_result["success"]:
                         raise ValueError(f"Balance update failed: {balance_result.get('error')}")
@@ -114,8 +120,10 @@ class TradingService:
                     # Fetch current balances from Schwab API
                     schwab_balances = await self.schwab.get_balances(account_hash)
                     # Sync those balances to our database
-                    balance_result = self.balance_manager.sync_from_schwab(
-                        account_id=account_hash, schwab_balances=schwab_balances
+                    balance_result = await run_blocking(
+                        self.balance_manager.sync_from_schwab,
+                        account_id=account_hash,
+                        schwab_balances=schwab_balances,
                     )
                 except Exception as e:
                     # Log error but don't fail the trade
@@ -123,7 +131,7 @@ class TradingService:
                     balance_result = {"success": False, "error": str(e)}
 
             # Log trade to database
-            trade_id = self._log_trade_execution(
+            trade_id = await self._log_trade_execution(
                 client_id=client_id,
                 account_id=account_id,
                 recommendation_id=recommendation_id,
@@ -151,7 +159,7 @@ class TradingService:
 
         except Exception as e:
             # Log failed trade
-            trade_id = self._log_trade_execution(
+            trade_id = await self._log_trade_execution(
                 client_id=client_id,
                 account_id=account_id,
                 recommendation_id=recommendation_id,
@@ -187,7 +195,7 @@ class TradingService:
             Execution results for all trades
         """
         # Get recommendation from database
-        recommendation = self._get_recommendation(recommendation_id)
+        recommendation = await self._get_recommendation(recommendation_id)
 
         if not recommendation:
             raise ValueError(f"Recommendation {recommendation_id} not found")
@@ -222,11 +230,11 @@ class TradingService:
 
         # Update recommendation status
         if failed == 0:
-            self._update_recommendation_status(recommendation_id, "executed")
+            await self._update_recommendation_status(recommendation_id, "executed")
         elif successful == 0:
-            self._update_recommendation_status(recommendation_id, "failed")
+            await self._update_recommendation_status(recommendation_id, "failed")
         else:
-            self._update_recommendation_status(recommendation_id, "partially_executed")
+            await self._update_recommendation_status(recommendation_id, "partially_executed")
 
         return {
             "recommendation_id": recommendation_id,
@@ -236,6 +244,7 @@ class TradingService:
             "results": results,
         }
 
+    @blocking
     def _log_trade_execution(
         self,
         client_id: int,
@@ -299,6 +308,7 @@ class TradingService:
 
         return result[0]
 
+    @blocking
     def _get_recommendation(self, recommendation_id: int) -> Optional[Dict[str, Any]]:
         """Get recommendation from database."""
         query = text(
@@ -326,6 +336,7 @@ class TradingService:
             "status": result[6],
         }
 
+    @blocking
     def _update_recommendation_status(self, recommendation_id: int, status: str):
         """Update recommendation status."""
         query = text(
@@ -341,7 +352,8 @@ class TradingService:
 
         self.db.commit()
 
-    async def get_trade_status(self, trade_id: int) -> Dict[str, Any]:
+    @blocking
+    def get_trade_status(self, trade_id: int) -> Dict[str, Any]:
         """
         Get status of a trade execution.
 
@@ -418,8 +430,7 @@ class TradingService:
             """
             )
 
-            self.db.execute(query, {"trade_id": trade_id})
-            self.db.commit()
+            await execute(self.db, query, {"trade_id": trade_id}, commit=True)
 
             return {
                 "success": True,
@@ -9,15 +9,20 @@ Identifies:
 - Tax-loss harvesting opportunities
 """
 
+import sys
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-import psycopg2
 from psycopg2.extras import RealDictCursor
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import get_psycopg2_connection
+
 
 @dataclass
 class Position:
@@ -57,9 +62,6 @@ class PortfolioAnalyzer:
     Analyzes portfolios and generates rebalancing recommendations
     """
 
-    def __init__(self, db_conn_string: str):
-        self.db_conn_string = db_conn_string
-
     def analyze_portfolio(
         self, client_id: int, account_id: str, target_strategy: str = "growth_largecap"
     ) -> Dict:
@@ -73,9 +75,7 @@ class PortfolioAnalyzer:
             - Tax-loss harvest opportunities
             - Overall health score
         """
-        conn = psycopg2.connect(self.db_conn_string)
-
-        try:
+        with get_psycopg2_connection() as conn:
             # Get current positions
             positions = self._get_current_positions(conn, account_id)
 
@@ -118,9 +118,6 @@ class PortfolioAnalyzer:
                 "total_portfolio_value": sum(p.market_value for p in positions),
             }
 
-        finally:
-            conn.close()
-
     def _get_current_positions(self, conn, account_id: str) -> List[Position]:
         """Fetch current portfolio positions"""
         cursor = conn.cursor(cursor_factory=RealDictCursor)
@@ -25,6 +25,13 @@ import psycopg2
 
 # Import hybrid portfolio generator for real ML models
 from autonomous.hybrid_portfolio_generator import HybridPortfolioGenerator
+from backtesting.market_data import (
+    DEFAULT_REGIME,
+    REGIME_MIN_HISTORY,
+    MarketDataContext,
+    classify_regime,
+    regime_indicators,
+)
 from utils import get_logger
 
 logger = get_logger(__name__)
@@ -36,6 +43,72 @@ DB_CONFIG = {
     "password": "$@nJose420",
 }
 
+# Fallback portfolios when real models are disabled or return nothing
+MOCK_PORTFOLIOS = {
+    "growth_largecap": [
+        "AAPL",
+        "MSFT",
+        "GOOGL",
+        "AMZN",
+        "NVDA",
+        "META",
+        "TSLA",
+        "NFLX",
+        "AMD",
+        "CRM",
+    ],
+    "growth_midcap": [
+        "SQ",
+        "SHOP",
+        "DDOG",
+        "SNOW",
+        "NET",
+        "CRWD",
+        "ZS",
+        "OKTA",
+        "TWLO",
+        "DOCU",
+    ],
+    "growth_smallcap": [
+        "BILL",
+        "FROG",
+        "UPST",
+        "PATH",
+        "OPEN",
+        "SOFI",
+        "AFRM",
+        "HOOD",
+        "COIN",
+        "RBLX",
+    ],
+    "value_largecap": ["JPM", "BAC", "WFC", "XOM", "CVX", "JNJ", "PG", "KO", "PFE", "MRK"],
+    "value_midcap": [
+        "KEY",
+        "FITB",
+        "RF",
+        "HBAN",
+        "MTB",
+        "CFG",
+        "ZION",
+        "CMA",
+        "FHN",
+        "ONB",
+    ],
+    "value_smallcap": [
+        "UBSI",
+        "WAFD",
+        "CATY",
+        "FFIN",
+        "NWBI",
+        "INDB",
+        "BHLB",
+        "FIBK",
+        "TOWN",
+        "FULT",
+    ],
+    "dividend_strategy": ["T", "VZ", "IBM", "ABBV", "BMY", "MO", "SO", "D", "DUK", "KMI"],
+}
+
 
 class AutonomousBacktest:
     """
@@ -49,6 +122,7 @@ class AutonomousBacktest:
         account_id=None,
         rebalance_frequency="monthly",
         use_real_models=True,
+        preload_market_data=True,
     ):
         """
         Initialize backtest.
@@ -59,9 +133,13 @@ class AutonomousBacktest:
             account_id: Account ID/hash to fetch actual balance from paper_accounts
             rebalance_frequency: How often to rebalance ('monthly' or 'quarterly')
             use_real_models: Use real ML models (True) or mock portfolios (False)
+            preload_market_data: Serve prices and regimes from a MarketDataContext
+                loaded once per run (True) or query the database per day (False)
         """
         self.rebalance_frequency = rebalance_frequency
         self.use_real_models = use_real_models
+        self.preload_market_data = preload_market_data
+        self.market_data = None
         self.conn = psycopg2.connect(**DB_CONFIG)
 
         # Fetch client-specific starting capital if provided
@@ -147,6 +225,8 @@ class AutonomousBacktest:
         """Get closing prices for tickers on specific date"""
         if not tickers:
             return {}
+        if self.market_data is not None:
+            return self.market_data.get_prices(date, tickers)
 
         query = """
         SELECT ticker, close
@@ -180,7 +260,20 @@ class AutonomousBacktest:
         Simplified regime detection for backtest
         Uses SPY moving averages and volatility
         """
-        # Get SPY data up to this date
+        if self.market_data is not None:
+            regime, vol = self.market_data.regime(date)
+        else:
+            regime, vol = self._query_market_regime(date)
+
+        if regime is None:
+            return DEFAULT_REGIME  # Default if insufficient data
+
+        logger.info(f"  Regime: {regime} (vol: {vol:.2%})")
+
+        return regime
+
+    def _query_market_regime(self, date):
+        """Live-query mode: recompute the regime from the trailing 200 SPY rows"""
         query = """
         SELECT date, close
         FROM etf_bars
@@ -191,44 +284,14 @@ class AutonomousBacktest:
         """
         df = pd.read_sql(query, self.conn, params=(date,))
 
-        if len(df) < 50:
-            return "bull_medium_vol"  # Default if insufficient data
-
-        df = df.sort_values("date")
-
-        # Calculate indicators
-        df["sma_50"] = df["close"].rolling(50).mean()
-        df["sma_200"] = df["close"].rolling(200).mean()
-        df["returns"] = df["close"].pct_change()
-        df["volatility_20d"] = df["returns"].rolling(20).std() * np.sqrt(252)
-
-        latest = df.iloc[-1]
-
-        # Trend
-        if latest["close"] > latest["sma_50"] > latest["sma_200"]:
-            trend = "bull"
-        elif latest["close"] < latest["sma_50"] < latest["sma_200"]:
-            trend = "bear"
-        else:
-            trend = "sideways"
-
-        # Volatility
-        vol = latest["volatility_20d"]
-        if pd.isna(vol):
-            vol_regime = "medium"
-        elif vol < 0.12:
-            vol_regime = "low"
-        elif vol < 0.18:
-            vol_regime = "medium"
-        elif vol < 0.25:
-            vol_regime = "high"
-        else:
-            vol_regime = "extreme"
+        if len(df) < REGIME_MIN_HISTORY:
+            return None, np.nan  # Insufficient data
 
-        regime = f"{trend}_{vol_regime}_vol"
-        logger.info(f"  Regime: {regime} (vol: {vol:.2%})")
-
-        return regime
+        latest = regime_indicators(df).iloc[-1]
+        regime = classify_regime(
+            latest["close"], latest["sma_50"], latest["sma_200"], latest["volatility_20d"]
+        )
+        return regime, latest["volatility_20d"]
 
     def select_strategy(self, regime):
         """
@@ -303,73 +366,7 @@ class AutonomousBacktest:
             # Fallback to mock if ML fails
             logger.warning(f"ML models failed for {strategy}, using mock")
 
-        # Mock portfolios (fallback)
-        mock_portfolios = {
-            "growth_largecap": [
-                "AAPL",
-                "MSFT",
-                "GOOGL",
-                "AMZN",
-                "NVDA",
-                "META",
-                "TSLA",
-                "NFLX",
-                "AMD",
-                "CRM",
-            ],
-            "growth_midcap": [
-                "SQ",
-                "SHOP",
-                "DDOG",
-                "SNOW",
-                "NET",
-                "CRWD",
-                "ZS",
-                "OKTA",
-                "TWLO",
-                "DOCU",
-            ],
-            "growth_smallcap": [
-                "BILL",
-                "FROG",
-                "UPST",
-                "PATH",
-                "OPEN",
-                "SOFI",
-                "AFRM",
-                "HOOD",
-                "COIN",
-                "RBLX",
-            ],
-            "value_largecap": ["JPM", "BAC", "WFC", "XOM", "CVX", "JNJ", "PG", "KO", "PFE", "MRK"],
-            "value_midcap": [
-                "KEY",
-                "FITB",
-                "RF",
-                "HBAN",
-                "MTB",
-                "CFG",
-                "ZION",
-                "CMA",
-                "FHN",
-                "ONB",
-            ],
-            "value_smallcap": [
-                "UBSI",
-                "WAFD",
-                "CATY",
-                "FFIN",
-                "NWBI",
-                "INDB",
-                "BHLB",
-                "FIBK",
-                "TOWN",
-                "FULT",
-            ],
-            "dividend_strategy": ["T", "VZ", "IBM", "ABBV", "BMY", "MO", "SO", "D", "DUK", "KMI"],
-        }
-
-        tickers = mock_portfolios.get(strategy, mock_portfolios["value_largecap"])
+        tickers = MOCK_PORTFOLIOS.get(strategy, MOCK_PORTFOLIOS["value_largecap"])
 
         # Get prices for available tickers
         prices = self.get_market_prices(date, tickers)
@@ -584,6 +581,15 @@ class AutonomousBacktest:
         rebalance_dates = self.get_rebalance_dates(trading_days)
         logger.info(f"Rebalance dates: {len(rebalance_dates)}")
 
+        # Preload closes and the SPY regime series so per-day lookups stay in memory
+        if self.preload_market_data:
+            universe = [t for tickers in MOCK_PORTFOLIOS.values() for t in tickers]
+            self.market_data = MarketDataContext(self.conn, trading_days, universe)
+            logger.info(
+                f"Market data preloaded: {len(self.market_data.tickers)} tickers, "
+                f"{len(self.market_data.spy_dates)} SPY bars"
+            )
+
         # Run backtest
         for i, date in enumerate(trading_days):
             # Rebalance if needed
@@ -615,6 +621,9 @@ class AutonomousBacktest:
                     f"Progress: {i+1}/{len(trading_days)} days ({(i+1)/len(trading_days)*100:.1f}%)"
                 )
 
+        if self.market_data is not None:
+            logger.info(f"Market data queries: {self.market_data.queries}")
+
         # Generate report
         return self.generate_report()
 
@@ -767,6 +776,11 @@ def main():
     parser.add_argument(
         "--mock", action="store_true", help="Use mock portfolios instead of real ML models"
     )
+    parser.add_argument(
+        "--live-queries",
+        action="store_true",
+        help="Query prices and SPY per day instead of preloading market data",
+    )
     args = parser.parse_args()
 
     backtest = AutonomousBacktest(
@@ -775,6 +789,7 @@ def main():
         account_id=args.account_id,
         rebalance_frequency=args.frequency,
         use_real_models=not args.mock,
+        preload_market_data=not args.live_queries,
     )
 
     try:
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+In-memory market data for the autonomous fund backtest
+
+AutonomousBacktest used to query daily_bars for every mark-to-market day and
+re-read 200 SPY rows from etf_bars on every rebalance. MarketDataContext loads
+the data once per run instead:
+
+- closes for the candidate universe as a dense (trading days x tickers) float64
+  matrix, NaN where a ticker has no bar; tickers first seen later (e.g. names
+  picked by the ML models) are loaded for the whole period in one query and
+  appended as new columns
+- the full SPY series with the regime indicators (SMA 50/200, annualised 20-day
+  volatility) computed once as rolling series
+
+Per-day price and regime lookups are then array indexing. The regime values
+match the per-rebalance query: the rolling windows over the full series equal
+the same windows over the trailing 200 rows.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils import get_logger
+
+logger = get_logger(__name__)
+
+REGIME_MIN_HISTORY = 50  # SPY rows needed before a regime is classified
+DEFAULT_REGIME = "bull_medium_vol"
+
+
+def regime_indicators(spy: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rolling regime indicators for a (date, close) series
+
+    Returns:
+        Frame sorted by date with close, sma_50, sma_200 and volatility_20d
+    """
+    df = spy.sort_values("date").reset_index(drop=True)
+    df["sma_50"] = df["close"].rolling(50).mean()
+    df["sma_200"] = df["close"].rolling(200).mean()
+    df["returns"] = df["close"].pct_change()
+    df["volatility_20d"] = df["returns"].rolling(20).std() * np.sqrt(252)
+    return df
+
+
+def classify_regime(close: float, sma_50: float, sma_200: float, volatility: float) -> str:
+    """Trend + volatility regime label, e.g. 'bull_low_vol' or 'sideways_extreme_vol'"""
+    if close > sma_50 > sma_200:
+        trend = "bull"
+    elif close < sma_50 < sma_200:
+        trend = "bear"
+    else:
+        trend = "sideways"
+
+    if pd.isna(volatility):
+        vol_regime = "medium"
+    elif volatility < 0.12:
+        vol_regime = "low"
+    elif volatility < 0.18:
+        vol_regime = "medium"
+    elif volatility < 0.25:
+        vol_regime = "high"
+    else:
+        vol_regime = "extreme"
+
+    return f"{trend}_{vol_regime}_vol"
+
+
+class MarketDataContext:
+    """
+    Preloaded closes and SPY regime series for one backtest period
+
+    Args:
+        conn: psycopg2 connection used for the preload and later ticker loads
+        trading_days: Backtest calendar (dates as returned from daily_bars)
+        tickers: Candidate universe to load up front
+    """
+
+    def __init__(self, conn, trading_days: List, tickers: Iterable[str] = ()):
+        self.conn = conn
+        self.days = pd.DatetimeIndex(pd.to_datetime(trading_days))
+        self._rows = {day: i for i, day in enumerate(self.days)}
+        self._columns: Dict[str, int] = {}
+        self.closes = np.empty((len(self.days), 0))
+        self.queries = 0
+
+        self.load_tickers(tickers)
+        self._load_spy()
+
+    @property
+    def tickers(self) -> List[str]:
+        return list(self._columns)
+
+    def _row(self, date) -> Optional[int]:
+        return self._rows.get(pd.Timestamp(date))
+
+    def load_tickers(self, tickers: Iterable[str]):
+        """Load the whole-period closes of any tickers not yet in the matrix"""
+        missing = [t for t in dict.fromkeys(tickers) if t not in self._columns]
+        if not missing or not len(self.days):
+            return
+
+        query = """
+        SELECT ticker, date, close
+        FROM daily_bars
+        WHERE ticker = ANY(%s) AND date >= %s AND date <= %s
+        """
+        df = pd.read_sql(
+            query,
+            self.conn,
+            params=(missing, self.days[0].date(), self.days[-1].date()),
+        )
+        self.queries += 1
+        self.add_prices(df, missing)
+
+    def add_prices(self, prices: pd.DataFrame, tickers: List[str]):
+        """Append long (ticker, date, close) rows as columns for `tickers`"""
+        if prices.empty:
+            block = np.full((len(self.days), len(tickers)), np.nan)
+        else:
+            prices = prices.assign(date=pd.to_datetime(prices["date"]))
+            pivot = prices.pivot(index="date", columns="ticker", values="close")
+            block = pivot.reindex(index=self.days, columns=tickers).to_numpy(dtype=np.float64)
+
+        for ticker in tickers:
+            self._columns[ticker] = len(self._columns)
+        self.closes = np.hstack([self.closes, block])
+
+    def get_prices(self, date, tickers: Iterable[str]) -> Dict[str, float]:
+        """Closes on `date` for the tickers that have a bar, loading unseen tickers first"""
+        tickers = list(tickers)
+        if not tickers:
+            return {}
+        self.load_tickers(tickers)
+
+        row = self._row(date)
+        if row is None:
+            return {}
+        closes = self.closes[row]
+        prices = {}
+        for ticker in tickers:
+            price = closes[self._columns[ticker]]
+            if not np.isnan(price):
+                prices[ticker] = float(price)
+        return prices
+
+    def _load_spy(self):
+        query = """
+        SELECT date, close
+        FROM etf_bars
+        WHERE ticker = 'SPY'
+          AND date <= %s
+        ORDER BY date
+        """
+        end = self.days[-1].date() if len(self.days) else pd.Timestamp.today().date()
+        spy = pd.read_sql(query, self.conn, params=(end,))
+        self.queries += 1
+        self.set_spy(spy)
+
+    def set_spy(self, spy: pd.DataFrame):
+        """Compute the rolling regime indicators for a (date, close) SPY series"""
+        df = regime_indicators(spy.assign(date=pd.to_datetime(spy["date"])))
+        self.spy_dates = df["date"].to_numpy(dtype="datetime64[ns]")
+        self.spy_indicators = df[["close", "sma_50", "sma_200", "volatility_20d"]].to_numpy(
+            dtype=np.float64
+        )
+
+    def regime(self, date):
+        """
+        Regime as of `date` (latest SPY bar on or before it)
+
+        Returns:
+            (regime, volatility_20d); regime is None with fewer than
+            REGIME_MIN_HISTORY bars of history
+        """
+        count = int(np.searchsorted(self.spy_dates, np.datetime64(pd.Timestamp(date)), "right"))
+        if count < REGIME_MIN_HISTORY:
+            return None, np.nan
+        close, sma_50, sma_200, volatility = self.spy_indicators[count - 1]
+        return classify_regime(close, sma_50, sma_200, volatility), volatility
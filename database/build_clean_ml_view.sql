@@ -5,9 +5,22 @@
  * - Exclude penny stocks (< $0.50)
  * - Exclude extreme single-day moves (> 200%)
  * - Works with actual EMA/MACD pivot schemas
+ *
+ * Bootstrap only: after database/migrations/003_ml_feature_store.sql the view
+ * is backed by the ml_feature_store table, kept current by
+ * ml_models/feature_store.py instead of REFRESH MATERIALIZED VIEW. The script
+ * refuses to run once ml_feature_store exists; rebuild the store with
+ * `python ml_models/feature_store.py --rebuild-from <date>` instead.
  */
 
-DROP MATERIALIZED VIEW IF EXISTS ml_training_features CASCADE;
+DO $$
+BEGIN
+    IF to_regclass('ml_feature_store') IS NOT NULL THEN
+        RAISE EXCEPTION 'ml_training_features is a view over ml_feature_store (migration 003); '
+            'rebuild with: python ml_models/feature_store.py --rebuild-from <date>';
+    END IF;
+    DROP MATERIALIZED VIEW IF EXISTS ml_training_features CASCADE;
+END $$;
 
 CREATE MATERIALIZED VIEW ml_training_features AS
 WITH clean_bars AS (
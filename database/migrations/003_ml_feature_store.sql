@@ -0,0 +1,39 @@
+/*
+ * Incremental ML Feature Store
+ *
+ * Replaces the ml_training_features materialized view (a full recompute over
+ * all of daily_bars on every REFRESH) with a keyed table that is appended to
+ * and back-filled by ml_models/feature_store.py.
+ *
+ * - ml_feature_store: same columns as the old view, PRIMARY KEY (ticker, date)
+ * - ml_training_features: plain view over ml_feature_store, so every existing
+ *   query keeps working unchanged
+ *
+ * Run after database/build_clean_ml_view.sql has built the view once; the
+ * existing rows are copied in as the starting point.
+ */
+
+BEGIN;
+
+-- Seed from the current materialized view (keeps its column types)
+CREATE TABLE ml_feature_store AS
+SELECT * FROM ml_training_features;
+
+ALTER TABLE ml_feature_store ADD PRIMARY KEY (ticker, date);
+
+CREATE INDEX idx_ml_feature_store_date ON ml_feature_store(date);
+CREATE INDEX idx_ml_feature_store_target ON ml_feature_store(target_return) WHERE target_return IS NOT NULL;
+CREATE INDEX idx_ml_feature_store_pending_target ON ml_feature_store(date) WHERE target_return IS NULL;
+
+-- Swap the materialized view for a plain view over the store
+DROP MATERIALIZED VIEW ml_training_features;
+
+CREATE VIEW ml_training_features AS
+SELECT * FROM ml_feature_store;
+
+COMMIT;
+
+ANALYZE ml_feature_store;
+
+-- Verify
+SELECT COUNT(*) AS feature_rows, MAX(date) AS watermark FROM ml_feature_store;
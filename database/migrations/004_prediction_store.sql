@@ -0,0 +1,41 @@
+/*
+ * ML Prediction Store
+ *
+ * Persisted XGBoost scores shared by the backtests, the RL environment, the
+ * autonomous generator and the ML portfolio API (portfolio/prediction_store.py).
+ *
+ * - ml_predictions: one score per (model, version, date, ticker)
+ * - ml_prediction_dates: (model, version, date) triples scored in full; a
+ *   reader scores a date itself only when it is missing here
+ *
+ * model_id is the model directory name (e.g. growth_midcap); model_version is
+ * a digest of the model files, so retraining starts a fresh set of scores.
+ */
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS ml_predictions (
+    model_id VARCHAR(100) NOT NULL,
+    model_version VARCHAR(40) NOT NULL,
+    date DATE NOT NULL,
+    ticker VARCHAR(10) NOT NULL,
+    predicted_return DOUBLE PRECISION NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (model_id, model_version, date, ticker)
+);
+
+CREATE TABLE IF NOT EXISTS ml_prediction_dates (
+    model_id VARCHAR(100) NOT NULL,
+    model_version VARCHAR(40) NOT NULL,
+    date DATE NOT NULL,
+    num_predictions INTEGER NOT NULL,
+    scored_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (model_id, model_version, date)
+);
+
+COMMIT;
+
+-- Verify
+SELECT model_id, model_version, COUNT(*) AS dates, MIN(date), MAX(date)
+FROM ml_prediction_dates
+GROUP BY model_id, model_version;
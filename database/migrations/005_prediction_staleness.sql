@@ -0,0 +1,31 @@
+/*
+ * Prediction Store Staleness Watermarks
+ *
+ * Lets the prediction store (portfolio/prediction_store.py) notice when a
+ * scored date's features have been rewritten, e.g. by a --recompute-days run
+ * or a feature store rebuild, and score that date again.
+ *
+ * - ml_feature_store.updated_at: when the feature row was last written. Added
+ *   after ml_training_features was created over the store (003), so it is not
+ *   a feature column.
+ * - ml_prediction_dates.feature_rows / features_updated_at: the feature
+ *   watermark (row count, latest updated_at) of the rows a date was scored
+ *   from; NULL for dates scored before this migration, which are rescored.
+ *
+ * Run after 003_ml_feature_store.sql and 004_prediction_store.sql.
+ */
+
+BEGIN;
+
+ALTER TABLE ml_feature_store
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP;
+
+ALTER TABLE ml_prediction_dates
+    ADD COLUMN IF NOT EXISTS feature_rows INTEGER,
+    ADD COLUMN IF NOT EXISTS features_updated_at TIMESTAMP;
+
+COMMIT;
+
+-- Verify
+SELECT COUNT(*) AS dates, COUNT(features_updated_at) AS dates_with_watermark
+FROM ml_prediction_dates;
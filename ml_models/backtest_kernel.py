@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+NumPy portfolio simulation kernel for the parallel backtester
+
+Replaces the per-day / per-ticker `price_pivot.loc[...]` loop in
+PortfolioBacktester.simulate_portfolio with array operations:
+
+- prices are a dense (days x tickers) matrix, NaN where a ticker has no bar
+- the rebalance schedule is a boolean day mask (day 0 always rebalances)
+- allocations are a (rebalances x tickers) weight matrix
+
+Within a holding period the daily value is one masked matrix-vector product;
+only the per-rebalance carry (value after costs) is sequential, so the cost
+is O(days x tickers) array work plus O(rebalances) Python steps.
+
+PricePanel holds the close matrix for a whole parameter sweep (every universe
+and date range the sweep touches) as plain NumPy arrays - fixed-width ticker
+strings, datetime64 dates, float64 closes - so it can be placed in the Ray
+object store once and read zero-copy by every actor.
+
+Positions are sized exactly as in the original loop: each selected ticker
+holds `value * weight` units, and the daily value is the sum of units x close
+over tickers that have a bar that day.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class SimulationResult:
+    """Equity curve and trading statistics from simulate()"""
+
+    values: np.ndarray  # (days,) portfolio value at each close
+    rebalance_days: np.ndarray  # (rebalances,) day index of each rebalance
+    trades: np.ndarray  # (rebalances,) positions touched (old | new holdings)
+    costs: np.ndarray  # (rebalances,) transaction + slippage cost charged
+
+    @property
+    def total_costs(self) -> float:
+        return float(self.costs.sum())
+
+    @property
+    def cost_drag(self) -> float:
+        """Total costs as a fraction of the average portfolio value"""
+        mean_value = self.values.mean() if len(self.values) else 0.0
+        return float(self.total_costs / mean_value) if mean_value else 0.0
+
+
+def build_price_matrix(
+    prices: pd.DataFrame, tickers: Sequence[str]
+) -> Tuple[pd.Index, List[str], np.ndarray]:
+    """
+    Dense close matrix from long (ticker, date, close) rows
+
+    Returns:
+        (dates, columns, matrix) - columns are the `tickers` that have any price,
+        in `tickers` order; matrix is float64 (days x columns) with NaN gaps
+    """
+    pivot = prices.pivot(index="date", columns="ticker", values="close")
+    columns = [t for t in tickers if t in pivot.columns]
+    matrix = pivot.reindex(columns=columns).to_numpy(dtype=np.float64)
+    return pivot.index, columns, matrix
+
+
+@dataclass
+class PricePanel:
+    """Dense closes shared by every config of a sweep, plus universe membership"""
+
+    dates: np.ndarray  # (days,) datetime64[D]
+    tickers: np.ndarray  # (tickers,) fixed-width unicode, union of all universes
+    closes: np.ndarray  # (days x tickers) float64, NaN where no bar
+    universes: Dict[str, np.ndarray] = field(default_factory=dict)  # name -> column mask
+
+    @classmethod
+    def from_prices(cls, prices: pd.DataFrame, universes: Dict[str, List[str]]) -> "PricePanel":
+        """
+        Build from long (ticker, date, close) rows
+
+        Args:
+            prices: Rows for the union of all universe tickers
+            universes: Universe name -> tickers, in the order the loader returned them
+        """
+        tickers = list(dict.fromkeys(t for members in universes.values() for t in members))
+        dates, columns, matrix = build_price_matrix(prices, tickers)
+        column_array = np.array(columns, dtype=str)
+        return cls(
+            dates=np.asarray(pd.to_datetime(dates).values.astype("datetime64[D]")),
+            tickers=column_array,
+            closes=np.ascontiguousarray(matrix),
+            universes={
+                name: np.isin(column_array, np.array(members, dtype=str))
+                for name, members in universes.items()
+            },
+        )
+
+    def select(
+        self, universe: str, start_date: str, end_date: str
+    ) -> Tuple[pd.DatetimeIndex, List[str], np.ndarray]:
+        """
+        The (dates, columns, matrix) a per-config load of `universe` over
+        [start_date, end_date] would have produced
+
+        Columns keep the universe order and exclude tickers without a bar in the
+        window; days on which no universe ticker traded are dropped.
+        """
+        rows = (self.dates >= np.datetime64(start_date, "D")) & (
+            self.dates <= np.datetime64(end_date, "D")
+        )
+        window = self.closes[rows][:, self.universes[universe]]
+        traded = ~np.isnan(window)
+        columns = traded.any(axis=0)
+        days = traded.any(axis=1)
+        matrix = window[days][:, columns]
+        tickers = self.tickers[self.universes[universe]][columns].tolist()
+        return pd.DatetimeIndex(self.dates[rows][days]), tickers, matrix
+
+
+def rebalance_mask(dates: Sequence, rebalance_dates: Sequence[str]) -> np.ndarray:
+    """Boolean day mask: trading days whose YYYY-MM-DD is in rebalance_dates, plus day 0"""
+    wanted = set(rebalance_dates)
+    mask = np.fromiter((str(d)[:10] in wanted for d in dates), dtype=bool, count=len(dates))
+    if len(mask):
+        mask[0] = True
+    return mask
+
+
+def random_selection_weights(
+    price_matrix: np.ndarray,
+    rebalance_days: np.ndarray,
+    position_count: int,
+    rng=np.random,
+) -> np.ndarray:
+    """
+    Equal weights (1 / position_count) on a random draw of tickers with a bar
+    on each rebalance day
+
+    Draws from `rng` exactly as np.random.choice over the available tickers
+    (in column order) does, so a seeded run picks the same names as the loop.
+    """
+    weights = np.zeros((len(rebalance_days), price_matrix.shape[1]))
+    available = ~np.isnan(price_matrix[rebalance_days])
+    for k in range(len(rebalance_days)):
+        candidates = np.flatnonzero(available[k])
+        chosen = rng.choice(candidates, size=min(position_count, len(candidates)), replace=False)
+        weights[k, chosen] = 1.0 / position_count
+    return weights
+
+
+def simulate(
+    price_matrix: np.ndarray,
+    rebalance: np.ndarray,
+    weights: np.ndarray,
+    cost_bps: float,
+    initial_value: float = 100000.0,
+) -> SimulationResult:
+    """
+    Simulate the equity curve for a rebalance schedule and weight matrix
+
+    Args:
+        price_matrix: (days x tickers) closes, NaN where missing
+        rebalance: (days,) boolean rebalance mask; day 0 must be set
+        weights: (rebalances x tickers) allocation per rebalance (0 = not held)
+        cost_bps: Transaction cost + slippage per position touched, in bps of value
+        initial_value: Starting portfolio value
+
+    Returns:
+        SimulationResult
+    """
+    n_days = price_matrix.shape[0]
+    rebalance_days = np.flatnonzero(rebalance)
+    if n_days == 0:
+        empty = np.zeros(0)
+        return SimulationResult(empty, rebalance_days, empty.astype(int), empty)
+    if rebalance_days[0] != 0:
+        raise ValueError("Day 0 must be a rebalance day")
+
+    closes = np.nan_to_num(price_matrix, nan=0.0)
+    held = weights != 0
+    previous = np.vstack([np.zeros((1, weights.shape[1]), dtype=bool), held[:-1]])
+    trades = (held | previous).sum(axis=1)
+    cost_rate = cost_bps / 10000
+
+    bounds = np.append(rebalance_days, n_days)
+    values = np.empty(n_days)
+    costs = np.empty(len(rebalance_days))
+    value = float(initial_value)
+    for k, (start, end) in enumerate(zip(bounds[:-1], bounds[1:])):
+        costs[k] = value * cost_rate * trades[k]
+        value -= costs[k]
+        if held[k].any():
+            values[start:end] = value * (closes[start:end] @ weights[k])
+        else:
+            values[start:end] = value
+        value = values[end - 1]
+
+    return SimulationResult(values, rebalance_days, trades, costs)
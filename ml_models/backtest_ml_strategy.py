@@ -39,6 +39,13 @@ class MLBacktester:
         self.top_n_stocks = top_n_stocks
         self.rebalance_frequency = rebalance_frequency
         self.models_dir = Path(__file__).parent / "models"
+        self._features = {}  # as_of_date (Timestamp) -> feature DataFrame
+
+    def prepare_features(self, as_of_dates: list):
+        """Build features for every rebalance date in one batched pass"""
+        missing = [d for d in as_of_dates if pd.to_datetime(d) not in self._features]
+        if missing:
+            self._features.update(FeatureEngineer.create_features_for_dates(missing))
 
     def load_model_for_date(self, as_of_date: str):
         """Load the appropriate model for a given date"""
@@ -83,9 +90,9 @@ class MLBacktester:
         Returns:
             DataFrame with ticker and score columns
         """
-        # Create features
-        engineer = FeatureEngineer(as_of_date=as_of_date)
-        features = engineer.create_features()
+        # Create features (prepared in batch by run_backtest)
+        self.prepare_features([as_of_date])
+        features = self._features[pd.to_datetime(as_of_date)].copy()
 
         if len(features) == 0:
             return pd.DataFrame()
@@ -149,6 +156,7 @@ class MLBacktester:
         # Generate rebalance dates
         rebalance_dates = self._generate_rebalance_dates(start_date, end_date)
         logger.info(f"Rebalancing {len(rebalance_dates)} times")
+        self.prepare_features(rebalance_dates)
 
         # Track portfolio
         portfolio_values = []
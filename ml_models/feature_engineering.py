@@ -25,16 +25,158 @@ from utils import get_logger, get_psycopg2_connection
 logger = get_logger(__name__)
 
 
+# Trading-day lags for the momentum features and the 52-week high window
+MOMENTUM_LAGS = {"1mo": 21, "3mo": 63, "6mo": 126, "12mo": 252}
+MOMENTUM_FEATURES = [f"return_{label}" for label in MOMENTUM_LAGS] + ["dist_from_52w_high"]
+HIGH_52W_ROWS = 253
+
+# How far back (calendar days) an "as of" lookup may reach for each source
+BAR_STALENESS_DAYS = 10
+INDICATOR_STALENESS_DAYS = 10
+FUNDAMENTAL_STALENESS_DAYS = 365
+MOMENTUM_LOOKBACK_DAYS = 400  # covers 252 trading days of history
+
+INDICATOR_COLUMNS = {
+    "sma": {20: "sma_20", 50: "sma_50", 200: "sma_200"},
+    "ema": {12: "ema_12", 26: "ema_26", 50: "ema_50"},
+    "rsi": {14: "rsi_14"},
+}
+
+FUNDAMENTAL_COLUMNS = """
+    market_cap,
+    price_to_earnings as pe_ratio,
+    price_to_book as pb_ratio,
+    price_to_sales as ps_ratio,
+    price_to_cash_flow as pcf_ratio,
+    price_to_free_cash_flow as pfcf_ratio,
+    ev_to_sales,
+    ev_to_ebitda,
+    earnings_per_share as eps,
+    return_on_assets as roa,
+    return_on_equity as roe,
+    dividend_yield,
+    current as current_ratio,
+    quick as quick_ratio,
+    debt_to_equity,
+    free_cash_flow as fcf,
+    free_cash_flow / NULLIF(market_cap, 0) as fcf_yield
+"""
+
+
+def latest_as_of(
+    conn,
+    table: str,
+    columns: str,
+    as_of_dates: List[pd.Timestamp],
+    tickers: List[str],
+    staleness_days: int,
+    partition: Tuple[str, ...] = (),
+    where: str = "",
+) -> pd.DataFrame:
+    """
+    Latest row per (as_of_date, ticker[, partition...]) on or before each as_of_date
+
+    One DISTINCT ON pass over `table`, restricted to rows within
+    `staleness_days` before each date, replaces a correlated
+    MAX(date) subquery per date.
+
+    Returns:
+        DataFrame with as_of_date, ticker, the partition columns and `columns`
+    """
+    keys = ", ".join(("a.as_of_date", "x.ticker") + tuple(f"x.{c}" for c in partition))
+    query = f"""
+    SELECT DISTINCT ON ({keys})
+        {keys}, {columns}
+    FROM unnest(%(dates)s::date[]) AS a(as_of_date)
+    JOIN {table} x
+      ON x.date <= a.as_of_date
+     AND x.date > a.as_of_date - %(staleness)s
+    WHERE x.ticker = ANY(%(tickers)s) {where}
+    ORDER BY {keys}, x.date DESC
+    """
+    params = {
+        "dates": [d.date() for d in as_of_dates],
+        "staleness": staleness_days,
+        "tickers": list(tickers),
+    }
+    df = pd.read_sql(query, conn, params=params)
+    df["as_of_date"] = pd.to_datetime(df["as_of_date"])
+    return df
+
+
+def momentum_frame(bars: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add lagged closes and the 52-week high to bars sorted by (ticker, date)
+
+    Mirrors the LAG(close, n) / MAX(close) OVER (ROWS 252 PRECEDING) window
+    functions, computed once over a bounded history instead of per query.
+    """
+    closes = bars.groupby("ticker", sort=False)["close"]
+    for label, lag in MOMENTUM_LAGS.items():
+        bars[f"close_{label}_ago"] = closes.shift(lag)
+    bars["high_52w"] = (
+        closes.rolling(HIGH_52W_ROWS, min_periods=1).max().reset_index(level=0, drop=True)
+    )
+    return bars
+
+
+def price_momentum_features(
+    bars: pd.DataFrame, dates: List[pd.Timestamp], min_price: float, min_volume: int
+) -> pd.DataFrame:
+    """
+    Eligible tickers with price and momentum features, one row per (as_of_date, ticker)
+
+    Args:
+        bars: daily_bars rows (ticker, date, high, low, close, volume) sorted by
+              ticker and date, covering MOMENTUM_LOOKBACK_DAYS before the first date
+        dates: As-of dates
+        min_price / min_volume: Filters on the latest bar as of each date
+    """
+    bars["date"] = pd.to_datetime(bars["date"])
+    for column in ("high", "low", "close", "volume"):
+        bars[column] = bars[column].astype(float)
+    bars = momentum_frame(bars)
+
+    grid = pd.DataFrame(
+        [(d, t) for d in dates for t in bars["ticker"].unique()], columns=["as_of_date", "ticker"]
+    )
+    latest = pd.merge_asof(
+        grid,
+        bars.sort_values("date"),
+        left_on="as_of_date",
+        right_on="date",
+        by="ticker",
+        direction="backward",
+        tolerance=pd.Timedelta(days=BAR_STALENESS_DAYS),
+    )
+
+    # Eligibility: latest bar as of the date passes the price / volume filters
+    latest = latest[(latest["close"] >= min_price) & (latest["volume"] >= min_volume)]
+    latest = latest.sort_values(["as_of_date", "ticker"], ignore_index=True)
+
+    features = latest[["as_of_date", "ticker", "close", "volume"]].copy()
+    features["daily_range"] = (latest["high"] - latest["low"]) / latest["close"]
+    features["dollar_volume"] = latest["volume"] * latest["close"]
+    for label in MOMENTUM_LAGS:
+        features[f"return_{label}"] = (
+            latest["close"] / latest[f"close_{label}_ago"].replace(0, np.nan) - 1
+        )
+    features["dist_from_52w_high"] = latest["close"] / latest["high_52w"].replace(0, np.nan) - 1
+    return features
+
+
 class FeatureEngineer:
     """Creates ML-ready features from database tables"""
 
-    def __init__(self, as_of_date: str):
+    def __init__(self, as_of_date: str, conn=None):
         """
         Args:
             as_of_date: Date to create features for (YYYY-MM-DD format)
+            conn: Optional open psycopg2 connection to reuse (one is opened per call otherwise)
         """
         self.as_of_date = pd.to_datetime(as_of_date)
         self.lookback_days = 252  # 1 year of trading days
+        self.conn = conn
 
     def create_features(self, min_price: float = 5.0, min_volume: int = 100000) -> pd.DataFrame:
         """
@@ -48,161 +190,156 @@ class FeatureEngineer:
             DataFrame with ticker and all features
         """
         logger.info(f"Creating features for date: {self.as_of_date.date()}")
+        features = self.create_features_for_dates(
+            [self.as_of_date], min_price=min_price, min_volume=min_volume, conn=self.conn
+        )[self.as_of_date]
 
-        # Get universe of eligible stocks
-        tickers = self._get_eligible_tickers(min_price, min_volume)
-        logger.info(f"Found {len(tickers)} eligible tickers")
-
-        if len(tickers) == 0:
-            logger.warning("No eligible tickers found!")
-            return pd.DataFrame()
+        logger.info(f"Created {len(features)} feature rows with {len(features.columns)} columns")
+        return features
 
-        # Build feature dataframe
-        features = pd.DataFrame({"ticker": tickers})
+    @classmethod
+    def create_features_for_dates(
+        cls,
+        as_of_dates: List,
+        min_price: float = 5.0,
+        min_volume: int = 100000,
+        conn=None,
+    ) -> Dict[pd.Timestamp, pd.DataFrame]:
+        """
+        Create features for many as-of dates in one batched pass
 
-        # Add each feature group
-        features = self._add_price_features(features)
-        features = self._add_technical_features(features)
-        features = self._add_fundamental_features(features)
-        features = self._add_momentum_features(features)
-        features = self._add_quality_features(features)
-        features = self._add_interaction_features(features)
-        # Sector-relative features disabled - sector column not in database
-        # features = self._add_sector_relative_features(features)
+        Every feature group is one query over the union of dates on a single
+        connection; the result for each date matches create_features().
 
-        # Drop rows with too many missing values
-        missing_threshold = 0.5  # Drop if >50% features are missing
-        missing_pct = features.isnull().sum(axis=1) / len(features.columns)
-        features = features[missing_pct < missing_threshold]
+        Args:
+            as_of_dates: Dates to create features for
+            min_price: Minimum stock price filter
+            min_volume: Minimum average daily volume filter
+            conn: Optional open psycopg2 connection to reuse
 
-        logger.info(f"Created {len(features)} feature rows with {len(features.columns)} columns")
-        return features
+        Returns:
+            Dict of as_of_date (Timestamp) -> feature DataFrame
+        """
+        dates = sorted({pd.to_datetime(d) for d in as_of_dates})
+        if conn is None:
+            with get_psycopg2_connection() as conn:
+                return cls.create_features_for_dates(dates, min_price, min_volume, conn)
+
+        start = datetime.now()
+        features = cls._build_price_and_momentum(conn, dates, min_price, min_volume)
+        results = {}
+
+        if not features.empty:
+            features = cls._add_technical_features(conn, features)
+            features = cls._add_fundamental_features(conn, features)
+            # Momentum columns follow the fundamentals (models are fit on this column order)
+            features = features[
+                [c for c in features.columns if c not in MOMENTUM_FEATURES] + MOMENTUM_FEATURES
+            ]
+            features = cls._add_quality_features(features)
+            features = cls._add_interaction_features(features)
+            # Sector-relative features disabled - sector column not in database
+            # features = cls._add_sector_relative_features(conn, features)
+
+            for as_of_date, group in features.groupby("as_of_date", sort=False):
+                group = group.drop(columns="as_of_date").reset_index(drop=True)
+
+                # Drop rows with too many missing values
+                missing_threshold = 0.5  # Drop if >50% features are missing
+                missing_pct = group.isnull().sum(axis=1) / len(group.columns)
+                results[as_of_date] = group[missing_pct < missing_threshold].reset_index(drop=True)
+
+        for as_of_date in dates:
+            if as_of_date not in results:
+                logger.warning(f"No eligible tickers found for {as_of_date.date()}!")
+                results[as_of_date] = pd.DataFrame()
+
+        if len(dates) > 1:
+            logger.info(
+                f"Created features for {len(dates)} dates in "
+                f"{(datetime.now() - start).total_seconds():.1f}s"
+            )
+        return results
 
-    def _get_eligible_tickers(self, min_price: float, min_volume: int) -> List[str]:
-        """Get list of eligible tickers based on filters"""
+    @staticmethod
+    def _get_universe(conn) -> List[str]:
+        """Common stocks with $2B+ market cap"""
         query = """
-        SELECT DISTINCT t.ticker
-        FROM ticker_overview t
-        INNER JOIN daily_bars d ON t.ticker = d.ticker
-        WHERE t.market_cap >= 2000000000  -- $2B+ market cap
-          AND t.type = 'CS'  -- Common stock
-          AND d.date = (
-              SELECT MAX(date)
-              FROM daily_bars
-              WHERE ticker = t.ticker
-                AND date <= %s
-          )
-          AND d.close >= %s
-          AND d.volume >= %s
-        ORDER BY t.ticker
+        SELECT ticker
+        FROM ticker_overview
+        WHERE market_cap >= 2000000000  -- $2B+ market cap
+          AND type = 'CS'  -- Common stock
+        ORDER BY ticker
+        """
+        with conn.cursor() as cur:
+            cur.execute(query)
+            return [row[0] for row in cur.fetchall()]
+
+    @classmethod
+    def _build_price_and_momentum(
+        cls, conn, dates: List[pd.Timestamp], min_price: float, min_volume: int
+    ) -> pd.DataFrame:
         """
+        Eligible tickers with price and momentum features, one row per (as_of_date, ticker)
 
-        with get_psycopg2_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(query, (self.as_of_date, min_price, min_volume))
-                return [row[0] for row in cur.fetchall()]
+        Reads daily_bars once over [first date - MOMENTUM_LOOKBACK_DAYS, last date];
+        each date's latest bar is then resolved with an as-of merge.
+        """
+        universe = cls._get_universe(conn)
+        if not universe:
+            return pd.DataFrame()
 
-    def _add_price_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Add current price and volume features"""
         query = """
-        SELECT ticker, close, volume,
-               (high - low) / close as daily_range,
-               volume * close as dollar_volume
+        SELECT ticker, date, high, low, close, volume
         FROM daily_bars
-        WHERE date = (
-            SELECT MAX(date)
-            FROM daily_bars
-            WHERE ticker = daily_bars.ticker
-              AND date <= %s
-        )
-        AND ticker = ANY(%s)
+        WHERE ticker = ANY(%s)
+          AND date > %s
+          AND date <= %s
+        ORDER BY ticker, date
         """
+        window_start = dates[0] - timedelta(days=MOMENTUM_LOOKBACK_DAYS)
+        bars = pd.read_sql(query, conn, params=(universe, window_start.date(), dates[-1].date()))
+        if bars.empty:
+            return pd.DataFrame()
+        return price_momentum_features(bars, dates, min_price, min_volume)
 
-        with get_psycopg2_connection() as conn:
-            price_df = pd.read_sql(query, conn, params=(self.as_of_date, df["ticker"].tolist()))
-
-        return df.merge(price_df, on="ticker", how="left")
-
-    def _add_technical_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def _add_technical_features(conn, df: pd.DataFrame) -> pd.DataFrame:
         """Add technical indicator features"""
-        tickers = df["ticker"].tolist()
+        dates = sorted(df["as_of_date"].unique())
+        tickers = df["ticker"].unique().tolist()
+        keys = ["as_of_date", "ticker"]
 
-        # SMA features
-        sma_query = """
-        SELECT ticker,
-               AVG(CASE WHEN window_size = 20 THEN value END) as sma_20,
-               AVG(CASE WHEN window_size = 50 THEN value END) as sma_50,
-               AVG(CASE WHEN window_size = 200 THEN value END) as sma_200
-        FROM sma
-        WHERE date = (
-            SELECT MAX(date)
-            FROM sma
-            WHERE ticker = sma.ticker
-              AND date <= %s
-        )
-        AND ticker = ANY(%s)
-        GROUP BY ticker
-        """
-
-        # EMA features
-        ema_query = """
-        SELECT ticker,
-               AVG(CASE WHEN window_size = 12 THEN value END) as ema_12,
-               AVG(CASE WHEN window_size = 26 THEN value END) as ema_26,
-               AVG(CASE WHEN window_size = 50 THEN value END) as ema_50
-        FROM ema
-        WHERE date = (
-            SELECT MAX(date)
-            FROM ema
-            WHERE ticker = ema.ticker
-              AND date <= %s
-        )
-        AND ticker = ANY(%s)
-        GROUP BY ticker
-        """
-
-        # RSI features
-        rsi_query = """
-        SELECT ticker,
-               AVG(CASE WHEN window_size = 14 THEN value END) as rsi_14
-        FROM rsi
-        WHERE date = (
-            SELECT MAX(date)
-            FROM rsi
-            WHERE ticker = rsi.ticker
-              AND date <= %s
-        )
-        AND ticker = ANY(%s)
-        GROUP BY ticker
-        """
-
-        # MACD features
-        macd_query = """
-        SELECT ticker,
-               macd_value as macd_line,
-               signal_value as signal_line,
-               histogram_value as macd_histogram
-        FROM macd
-        WHERE date = (
-            SELECT MAX(date)
-            FROM macd
-            WHERE ticker = macd.ticker
-              AND date <= %s
+        for table, windows in INDICATOR_COLUMNS.items():
+            latest = latest_as_of(
+                conn,
+                table,
+                "value",
+                dates,
+                tickers,
+                INDICATOR_STALENESS_DAYS,
+                partition=("window_size",),
+                where=f"AND x.window_size IN ({', '.join(str(w) for w in windows)})",
+            )
+            wide = latest.pivot_table(
+                index=keys, columns="window_size", values="value", aggfunc="mean"
+            )
+            wide = wide.reindex(columns=list(windows)).rename(columns=windows)
+            wide.columns.name = None
+            df = df.merge(wide.reset_index(), on=keys, how="left")
+
+        macd = latest_as_of(
+            conn,
+            "macd",
+            "macd_value as macd_line, signal_value as signal_line, histogram_value as macd_histogram",
+            dates,
+            tickers,
+            INDICATOR_STALENESS_DAYS,
         )
-        AND ticker = ANY(%s)
-        """
-
-        with get_psycopg2_connection() as conn:
-            sma_df = pd.read_sql(sma_query, conn, params=(self.as_of_date, tickers))
-            ema_df = pd.read_sql(ema_query, conn, params=(self.as_of_date, tickers))
-            rsi_df = pd.read_sql(rsi_query, conn, params=(self.as_of_date, tickers))
-            macd_df = pd.read_sql(macd_query, conn, params=(self.as_of_date, tickers))
+        df = df.merge(macd, on=keys, how="left")
 
-        # Merge all technical indicators
-        df = df.merge(sma_df, on="ticker", how="left")
-        df = df.merge(ema_df, on="ticker", how="left")
-        df = df.merge(rsi_df, on="ticker", how="left")
-        df = df.merge(macd_df, on="ticker", how="left")
+        numeric = [c for c in df.columns if c not in keys]
+        df[numeric] = df[numeric].astype(float)
 
         # Create derived technical features
         df["price_to_sma_50"] = df["close"] / df["sma_50"]
@@ -212,77 +349,24 @@ class FeatureEngineer:
 
         return df
 
-    def _add_fundamental_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def _add_fundamental_features(conn, df: pd.DataFrame) -> pd.DataFrame:
         """Add fundamental metrics from ratios table"""
-        query = """
-        SELECT
-            ticker,
-            market_cap,
-            price_to_earnings as pe_ratio,
-            price_to_book as pb_ratio,
-            price_to_sales as ps_ratio,
-            price_to_cash_flow as pcf_ratio,
-            price_to_free_cash_flow as pfcf_ratio,
-            ev_to_sales,
-            ev_to_ebitda,
-            earnings_per_share as eps,
-            return_on_assets as roa,
-            return_on_equity as roe,
-            dividend_yield,
-            current as current_ratio,
-            quick as quick_ratio,
-            debt_to_equity,
-            free_cash_flow as fcf,
-            free_cash_flow / NULLIF(market_cap, 0) as fcf_yield
-        FROM ratios
-        WHERE date = (
-            SELECT MAX(date)
-            FROM ratios
-            WHERE ticker = ratios.ticker
-              AND date <= %s
-        )
-        AND ticker = ANY(%s)
-        """
-
-        with get_psycopg2_connection() as conn:
-            fund_df = pd.read_sql(query, conn, params=(self.as_of_date, df["ticker"].tolist()))
-
-        return df.merge(fund_df, on="ticker", how="left")
-
-    def _add_momentum_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Add momentum features (returns over various periods)"""
-        query = """
-        WITH price_history AS (
-            SELECT
-                ticker,
-                date,
-                close,
-                LAG(close, 21) OVER (PARTITION BY ticker ORDER BY date) as close_1mo_ago,
-                LAG(close, 63) OVER (PARTITION BY ticker ORDER BY date) as close_3mo_ago,
-                LAG(close, 126) OVER (PARTITION BY ticker ORDER BY date) as close_6mo_ago,
-                LAG(close, 252) OVER (PARTITION BY ticker ORDER BY date) as close_12mo_ago,
-                MAX(close) OVER (PARTITION BY ticker ORDER BY date ROWS BETWEEN 252 PRECEDING AND CURRENT ROW) as high_52w
-            FROM daily_bars
-            WHERE ticker = ANY(%s)
-              AND date <= %s
+        fund_df = latest_as_of(
+            conn,
+            "ratios",
+            FUNDAMENTAL_COLUMNS,
+            sorted(df["as_of_date"].unique()),
+            df["ticker"].unique().tolist(),
+            FUNDAMENTAL_STALENESS_DAYS,
         )
-        SELECT
-            ticker,
-            (close / NULLIF(close_1mo_ago, 0) - 1) as return_1mo,
-            (close / NULLIF(close_3mo_ago, 0) - 1) as return_3mo,
-            (close / NULLIF(close_6mo_ago, 0) - 1) as return_6mo,
-            (close / NULLIF(close_12mo_ago, 0) - 1) as return_12mo,
-            (close / NULLIF(high_52w, 0) - 1) as dist_from_52w_high
-        FROM price_history
-        WHERE date = (SELECT MAX(date) FROM price_history WHERE ticker = price_history.ticker)
-        """
-
-        with get_psycopg2_connection() as conn:
-            mom_df = pd.read_sql(query, conn, params=(df["ticker"].tolist(), self.as_of_date))
+        numeric = [c for c in fund_df.columns if c not in ("as_of_date", "ticker")]
+        fund_df[numeric] = fund_df[numeric].astype(float)
 
-        return df.merge(mom_df, on="ticker", how="left")
+        return df.merge(fund_df, on=["as_of_date", "ticker"], how="left")
 
-    def _add_quality_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def _add_quality_features(df: pd.DataFrame) -> pd.DataFrame:
         """Add quality scores (Piotroski F-Score, Altman Z, etc)"""
         # Note: This assumes you have scoring tables populated
         # For now, we'll create placeholder - you can implement actual scores later
@@ -291,7 +375,8 @@ class FeatureEngineer:
 
         return df
 
-    def _add_interaction_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def _add_interaction_features(df: pd.DataFrame) -> pd.DataFrame:
         """Add interaction features (combinations of other features)"""
         # Momentum × Quality
         if "return_6mo" in df.columns and "roe" in df.columns:
@@ -309,7 +394,8 @@ class FeatureEngineer:
 
         return df
 
-    def _add_sector_relative_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def _add_sector_relative_features(conn, df: pd.DataFrame) -> pd.DataFrame:
         """Add sector-relative metrics"""
         query = """
         SELECT ticker, sector
@@ -317,8 +403,7 @@ class FeatureEngineer:
         WHERE ticker = ANY(%s)
         """
 
-        with get_psycopg2_connection() as conn:
-            sector_df = pd.read_sql(query, conn, params=(df["ticker"].tolist(),))
+        sector_df = pd.read_sql(query, conn, params=(df["ticker"].unique().tolist(),))
 
         df = df.merge(sector_df, on="ticker", how="left")
 
@@ -327,7 +412,7 @@ class FeatureEngineer:
 
         for metric in sector_metrics:
             if metric in df.columns:
-                sector_medians = df.groupby("sector")[metric].transform("median")
+                sector_medians = df.groupby(["as_of_date", "sector"])[metric].transform("median")
                 df[f"{metric}_sector_relative"] = df[metric] / (
                     sector_medians + 0.001
                 )  # Avoid division by zero
@@ -346,29 +431,24 @@ class FeatureEngineer:
             DataFrame with forward_return column added
         """
         future_date = self.as_of_date + timedelta(days=horizon_days * 1.4)  # Account for weekends
+        tickers = df["ticker"].tolist()
 
         query = """
         WITH current_prices AS (
-            SELECT ticker, close as current_close
+            SELECT DISTINCT ON (ticker) ticker, close as current_close
             FROM daily_bars
-            WHERE date = (
-                SELECT MAX(date)
-                FROM daily_bars
-                WHERE ticker = daily_bars.ticker
-                  AND date <= %s
-            )
-            AND ticker = ANY(%s)
+            WHERE ticker = ANY(%s)
+              AND date <= %s
+              AND date > %s
+            ORDER BY ticker, date DESC
         ),
         future_prices AS (
-            SELECT ticker, close as future_close
+            SELECT DISTINCT ON (ticker) ticker, close as future_close
             FROM daily_bars
-            WHERE date = (
-                SELECT MIN(date)
-                FROM daily_bars
-                WHERE ticker = daily_bars.ticker
-                  AND date >= %s
-            )
-            AND ticker = ANY(%s)
+            WHERE ticker = ANY(%s)
+              AND date >= %s
+              AND date < %s
+            ORDER BY ticker, date
         )
         SELECT
             c.ticker,
@@ -376,13 +456,21 @@ class FeatureEngineer:
         FROM current_prices c
         LEFT JOIN future_prices f ON c.ticker = f.ticker
         """
+        window = timedelta(days=BAR_STALENESS_DAYS)
+        params = (
+            tickers,
+            self.as_of_date.date(),
+            (self.as_of_date - window).date(),
+            tickers,
+            future_date.date(),
+            (future_date + window).date(),
+        )
 
-        with get_psycopg2_connection() as conn:
-            returns_df = pd.read_sql(
-                query,
-                conn,
-                params=(self.as_of_date, df["ticker"].tolist(), future_date, df["ticker"].tolist()),
-            )
+        if self.conn is not None:
+            returns_df = pd.read_sql(query, self.conn, params=params)
+        else:
+            with get_psycopg2_connection() as conn:
+                returns_df = pd.read_sql(query, conn, params=params)
 
         return df.merge(returns_df, on="ticker", how="left")
 
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+Incremental ML Feature Store Builder
+
+Maintains the ml_feature_store table (exposed as the ml_training_features view,
+see database/migrations/003_ml_feature_store.sql) without recomputing the whole
+history on every run.
+
+Each run:
+1. Finds the watermark (latest date already in the store)
+2. Loads the new daily_bars rows plus, per ticker, the trailing clean bars that
+   hold the rolling-window state (51-row SMA, 21-row volatility/volume/range
+   windows, 20-row return lags)
+3. Computes the window features for the new (ticker, date) rows only, with the
+   same filtering and window definitions as database/build_clean_ml_view.sql
+4. Upserts them, joining EMA / MACD / latest-as-of ratios / ticker_overview in SQL
+5. Back-fills target_return for rows whose 20-day horizon has now matured
+
+Usage:
+    python ml_models/feature_store.py                           # append new dates
+    python ml_models/feature_store.py --recompute-days 5        # also redo last 5 days
+    python ml_models/feature_store.py --rebuild-from 2015-01-01 # full rebuild
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import time
+from datetime import date, timedelta
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils import get_logger, get_psycopg2_connection
+from utils.bulk_writer import copy_rows
+
+logger = get_logger(__name__)
+
+# Filters and windows mirror database/build_clean_ml_view.sql
+MIN_PRICE = 0.50
+MAX_DAILY_MOVE = 2.0
+HISTORY_START_DATE = date(2010, 1, 1)
+FEATURE_START_DATE = date(2015, 1, 1)
+SHORT_WINDOW = 21  # ROWS BETWEEN 20 PRECEDING AND CURRENT ROW
+LONG_WINDOW = 51  # ROWS BETWEEN 50 PRECEDING AND CURRENT ROW
+TARGET_HORIZON = 20
+
+# Trailing clean bars loaded per ticker as rolling-window state. A few rows more
+# than LONG_WINDOW so the window is still full after extreme-move rows are dropped.
+STATE_ROWS = 60
+# Tickers with no bar in this many calendar days restart with an empty window
+STATE_LOOKBACK_DAYS = 365
+# Rows this far back with a NULL target are re-checked for a matured horizon
+BACKFILL_LOOKBACK_DAYS = 45
+
+PRICE_COLUMNS = ["open", "high", "low", "close", "volume", "vwap"]
+WINDOW_FEATURE_COLUMNS = [
+    "return_1d",
+    "return_5d",
+    "return_20d",
+    "volatility_20d",
+    "volume_ratio_20d",
+    "price_vs_sma20",
+    "price_vs_sma50",
+    "daily_range",
+    "range_20d",
+]
+BATCH_COLUMNS = ["ticker", "date"] + PRICE_COLUMNS + WINDOW_FEATURE_COLUMNS
+
+# Columns filled in SQL from ema / macd / ratios / ticker_overview
+JOINED_COLUMNS = [
+    "ema_12",
+    "ema_26",
+    "ema_50",
+    "ema_200",
+    "price_vs_ema50",
+    "price_vs_ema200",
+    "macd_line",
+    "macd_signal",
+    "macd_histogram",
+    "macd_signal_diff",
+    "macd_positive",
+    "pe_ratio",
+    "pb_ratio",
+    "ps_ratio",
+    "pcf_ratio",
+    "p_fcf_ratio",
+    "ev_to_ebitda",
+    "ev_to_sales",
+    "roe",
+    "roa",
+    "current_ratio",
+    "quick_ratio",
+    "cash_ratio",
+    "debt_to_equity",
+    "dividend_yield",
+    "eps",
+    "free_cash_flow",
+    "market_cap",
+    "enterprise_value",
+    "average_volume",
+]
+STORE_COLUMNS = BATCH_COLUMNS + JOINED_COLUMNS + ["target_return"]
+
+
+def _safe_divide(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
+    """numerator / NULLIF(denominator, 0)"""
+    return numerator / denominator.where(denominator != 0)
+
+
+def compute_window_features(bars: pd.DataFrame, since: Optional[date] = None) -> pd.DataFrame:
+    """
+    Price-derived features for every bar dated after `since`
+
+    Args:
+        bars: Clean bars (close >= MIN_PRICE, volume > 0) with ticker, date and
+              PRICE_COLUMNS. Must include the trailing history rows that carry
+              the rolling-window state for each ticker.
+        since: Only rows with date > since are returned (None returns all rows)
+
+    Returns:
+        DataFrame with BATCH_COLUMNS, sorted by ticker and date
+    """
+    if bars.empty:
+        return pd.DataFrame(columns=BATCH_COLUMNS)
+
+    df = bars.sort_values(["ticker", "date"]).reset_index(drop=True)
+
+    # Extreme single-day moves are judged against the previous clean bar and
+    # dropped before any window is evaluated
+    prev_close = df.groupby("ticker", sort=False)["close"].shift(1)
+    move = (_safe_divide(df["close"] - prev_close, prev_close)).abs()
+    df = df[prev_close.isna() | (move <= MAX_DAILY_MOVE)].reset_index(drop=True)
+
+    grouped = df.groupby("ticker", sort=False)
+
+    for lag, column in ((1, "return_1d"), (5, "return_5d"), (20, "return_20d")):
+        lagged = grouped["close"].shift(lag)
+        df[column] = _safe_divide(df["close"] - lagged, lagged)
+
+    def rolling(column: str, window: int, how: str) -> pd.Series:
+        windowed = grouped[column].rolling(window, min_periods=1)
+        return getattr(windowed, how)().droplevel(0).sort_index()
+
+    close_mean_20 = rolling("close", SHORT_WINDOW, "mean")
+    df["volatility_20d"] = _safe_divide(rolling("close", SHORT_WINDOW, "std"), close_mean_20)
+    df["volume_ratio_20d"] = _safe_divide(df["volume"], rolling("volume", SHORT_WINDOW, "mean"))
+    df["price_vs_sma20"] = _safe_divide(df["close"], close_mean_20) - 1
+    df["price_vs_sma50"] = _safe_divide(df["close"], rolling("close", LONG_WINDOW, "mean")) - 1
+    df["daily_range"] = _safe_divide(df["high"] - df["low"], df["close"])
+    df["range_20d"] = _safe_divide(
+        rolling("high", SHORT_WINDOW, "max") - rolling("low", SHORT_WINDOW, "min"), df["close"]
+    )
+
+    if since is not None:
+        df = df[df["date"] > pd.Timestamp(since)]
+
+    return df[BATCH_COLUMNS].reset_index(drop=True)
+
+
+class FeatureStoreBuilder:
+    """Appends new feature rows to ml_feature_store and back-fills matured targets"""
+
+    def __init__(self, state_rows: int = STATE_ROWS):
+        self.state_rows = state_rows
+
+    def get_watermark(self, conn) -> Optional[date]:
+        """Latest date already in the store"""
+        with conn.cursor() as cur:
+            cur.execute("SELECT MAX(date) FROM ml_feature_store")
+            return cur.fetchone()[0]
+
+    def get_latest_bar_date(self, conn) -> Optional[date]:
+        with conn.cursor() as cur:
+            cur.execute("SELECT MAX(date) FROM daily_bars")
+            return cur.fetchone()[0]
+
+    def load_bars(self, conn, since: date, through: date) -> pd.DataFrame:
+        """
+        Clean bars in (since, through] plus the last `state_rows` clean bars on or
+        before `since` for every ticker that has new bars
+        """
+        history_floor = max(HISTORY_START_DATE, since - timedelta(days=STATE_LOOKBACK_DAYS))
+        query = """
+            WITH active AS (
+                SELECT DISTINCT ticker
+                FROM daily_bars
+                WHERE date > %(since)s AND date <= %(through)s
+                  AND close >= %(min_price)s AND volume > 0
+            ),
+            history AS (
+                SELECT b.ticker, b.date, b.open, b.high, b.low, b.close, b.volume, b.vwap,
+                       ROW_NUMBER() OVER (PARTITION BY b.ticker ORDER BY b.date DESC) AS rn
+                FROM daily_bars b
+                JOIN active a ON a.ticker = b.ticker
+                WHERE b.date <= %(since)s AND b.date >= %(history_floor)s
+                  AND b.close >= %(min_price)s AND b.volume > 0
+            )
+            SELECT ticker, date, open, high, low, close, volume, vwap
+            FROM history
+            WHERE rn <= %(state_rows)s
+            UNION ALL
+            SELECT ticker, date, open, high, low, close, volume, vwap
+            FROM daily_bars
+            WHERE date > %(since)s AND date <= %(through)s
+              AND date >= %(history_floor)s
+              AND close >= %(min_price)s AND volume > 0
+        """
+        params = {
+            "since": since,
+            "through": through,
+            "history_floor": history_floor,
+            "min_price": MIN_PRICE,
+            "state_rows": self.state_rows,
+        }
+        with conn.cursor() as cur:
+            cur.execute(query, params)
+            rows = cur.fetchall()
+
+        df = pd.DataFrame(rows, columns=["ticker", "date"] + PRICE_COLUMNS)
+        df["date"] = pd.to_datetime(df["date"])
+        for column in PRICE_COLUMNS:
+            df[column] = df[column].astype(np.float64)
+        return df
+
+    def write_rows(self, conn, features: pd.DataFrame) -> int:
+        """Upsert computed rows, joining indicator and fundamental columns in SQL"""
+        if features.empty:
+            return 0
+
+        batch_columns_sql = ", ".join(
+            f"{c} {'TEXT' if c == 'ticker' else 'DATE' if c == 'date' else 'DOUBLE PRECISION'}"
+            for c in BATCH_COLUMNS
+        )
+        records = features.astype(object).where(features.notna(), None)
+        records["date"] = features["date"].dt.date
+        values = list(records.itertuples(index=False, name=None))
+
+        update_columns = [c for c in STORE_COLUMNS if c not in ("ticker", "date", "target_return")]
+        upsert = f"""
+            INSERT INTO ml_feature_store ({", ".join(STORE_COLUMNS)})
+            SELECT
+                b.ticker, b.date,
+                {", ".join(f"b.{c}" for c in PRICE_COLUMNS + WINDOW_FEATURE_COLUMNS)},
+                ema12.value, ema26.value, ema50.value, ema200.value,
+                b.close / NULLIF(ema50.value, 0) - 1,
+                b.close / NULLIF(ema200.value, 0) - 1,
+                macd.macd_value, macd.signal_value, macd.histogram_value,
+                macd.macd_value - macd.signal_value,
+                CASE WHEN macd.histogram_value > 0 THEN 1 ELSE 0 END,
+                r.price_to_earnings, r.price_to_book, r.price_to_sales,
+                r.price_to_cash_flow, r.price_to_free_cash_flow,
+                r.ev_to_ebitda, r.ev_to_sales,
+                r.return_on_equity, r.return_on_assets,
+                r.current, r.quick, r.cash,
+                r.debt_to_equity, r.dividend_yield, r.earnings_per_share, r.free_cash_flow,
+                COALESCE(t.share_class_shares_outstanding * b.close, r.market_cap),
+                r.enterprise_value, r.average_volume,
+                NULL
+            FROM _feature_batch b
+            LEFT JOIN ema ema12 ON b.ticker = ema12.ticker AND b.date = ema12.date
+                AND ema12.window_size = 12 AND ema12.series_type = 'close'
+            LEFT JOIN ema ema26 ON b.ticker = ema26.ticker AND b.date = ema26.date
+                AND ema26.window_size = 26 AND ema26.series_type = 'close'
+            LEFT JOIN ema ema50 ON b.ticker = ema50.ticker AND b.date = ema50.date
+                AND ema50.window_size = 50 AND ema50.series_type = 'close'
+            LEFT JOIN ema ema200 ON b.ticker = ema200.ticker AND b.date = ema200.date
+                AND ema200.window_size = 200 AND ema200.series_type = 'close'
+            LEFT JOIN macd ON b.ticker = macd.ticker AND b.date = macd.date
+                AND macd.short_window = 12 AND macd.long_window = 26
+                AND macd.signal_window = 9 AND macd.series_type = 'close'
+            LEFT JOIN LATERAL (
+                SELECT *
+                FROM ratios r2
+                WHERE r2.ticker = b.ticker AND r2.date <= b.date
+                ORDER BY r2.date DESC
+                LIMIT 1
+            ) r ON true
+            LEFT JOIN ticker_overview t ON b.ticker = t.ticker
+            ON CONFLICT (ticker, date) DO UPDATE SET
+                {", ".join(f"{c} = EXCLUDED.{c}" for c in update_columns)},
+                updated_at = CURRENT_TIMESTAMP
+        """
+
+        with conn.cursor() as cur:
+            cur.execute(f"CREATE TEMP TABLE _feature_batch ({batch_columns_sql}) ON COMMIT DROP")
+            copy_rows(cur, "_feature_batch", BATCH_COLUMNS, values)
+            cur.execute(upsert)
+            return cur.rowcount
+
+    def backfill_targets(self, conn, since: date) -> int:
+        """
+        Fill target_return for rows whose 20-day forward close now exists
+
+        Only rows dated after since - BACKFILL_LOOKBACK_DAYS are checked; older
+        NULL targets are permanent (extreme or penny-stock future moves).
+        updated_at is left alone: targets are not model inputs, so scores in
+        the prediction store stay valid.
+        """
+        floor = since - timedelta(days=BACKFILL_LOOKBACK_DAYS)
+        query = """
+            WITH horizon AS (
+                SELECT
+                    ticker,
+                    date,
+                    close,
+                    LEAD(close, %(horizon)s) OVER (PARTITION BY ticker ORDER BY date)
+                        AS future_close_20d
+                FROM daily_bars
+                WHERE close >= %(min_price)s AND volume > 0 AND date >= %(floor)s
+            )
+            UPDATE ml_feature_store f
+            SET target_return = (h.future_close_20d - h.close) / NULLIF(h.close, 0)
+            FROM horizon h
+            WHERE f.ticker = h.ticker
+              AND f.date = h.date
+              AND f.date >= %(floor)s
+              AND f.target_return IS NULL
+              AND h.future_close_20d IS NOT NULL
+              AND h.future_close_20d >= %(min_price)s
+              AND ABS((h.future_close_20d - h.close) / NULLIF(h.close, 0)) <= %(max_move)s
+        """
+        params = {
+            "horizon": TARGET_HORIZON,
+            "min_price": MIN_PRICE,
+            "floor": floor,
+            "max_move": MAX_DAILY_MOVE,
+        }
+        with conn.cursor() as cur:
+            cur.execute(query, params)
+            return cur.rowcount
+
+    def build_range(self, since: date, through: date) -> Dict:
+        """Compute, upsert and back-fill every row in (since, through] in one transaction"""
+        start = time.time()
+        with get_psycopg2_connection() as conn:
+            bars = self.load_bars(conn, since, through)
+            features = compute_window_features(
+                bars, since=max(since, FEATURE_START_DATE - timedelta(days=1))
+            )
+            rows_written = self.write_rows(conn, features)
+            targets_filled = self.backfill_targets(conn, since)
+
+        stats = {
+            "since": str(since),
+            "through": str(through),
+            "bars_loaded": len(bars),
+            "rows_written": rows_written,
+            "targets_backfilled": targets_filled,
+            "seconds": round(time.time() - start, 2),
+        }
+        logger.info(
+            f"Feature store ({since}, {through}]: {rows_written:,} rows written, "
+            f"{targets_filled:,} targets back-filled in {stats['seconds']}s"
+        )
+        return stats
+
+    def update(self, through: Optional[date] = None, recompute_days: int = 0) -> Dict:
+        """
+        Append every date after the watermark
+
+        Args:
+            through: Last date to build (default: latest date in daily_bars)
+            recompute_days: Also recompute rows from the last N calendar days, e.g.
+                            to pick up EMA/MACD/ratios that landed after the bars
+        """
+        with get_psycopg2_connection() as conn:
+            watermark = self.get_watermark(conn)
+            through = through or self.get_latest_bar_date(conn)
+
+        if watermark is None:
+            logger.warning("ml_feature_store is empty - running a full rebuild")
+            return self.rebuild(FEATURE_START_DATE, through=through)
+
+        since = watermark - timedelta(days=recompute_days)
+        if through is None or through <= since:
+            logger.info(f"Feature store is up to date (watermark {watermark})")
+            return {"since": str(since), "through": str(through), "rows_written": 0}
+
+        return self.build_range(since, through)
+
+    def rebuild(
+        self, from_date: date, through: Optional[date] = None, chunk_days: int = 90
+    ) -> Dict:
+        """Delete rows from from_date onward and rebuild them chunk by chunk"""
+        with get_psycopg2_connection() as conn:
+            through = through or self.get_latest_bar_date(conn)
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM ml_feature_store WHERE date >= %s", (from_date,))
+                logger.info(f"Deleted {cur.rowcount:,} rows from {from_date}")
+
+        totals = {"rows_written": 0, "targets_backfilled": 0}
+        since = from_date - timedelta(days=1)
+        while since < through:
+            chunk_end = min(since + timedelta(days=chunk_days), through)
+            stats = self.build_range(since, chunk_end)
+            totals["rows_written"] += stats["rows_written"]
+            totals["targets_backfilled"] += stats["targets_backfilled"]
+            since = chunk_end
+
+        return {"since": str(from_date), "through": str(through), **totals}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally update ml_feature_store")
+    parser.add_argument("--through", type=str, help="Last date to build (YYYY-MM-DD)")
+    parser.add_argument(
+        "--recompute-days",
+        type=int,
+        default=0,
+        help="Recompute rows from the last N calendar days as well",
+    )
+    parser.add_argument(
+        "--rebuild-from", type=str, help="Delete and rebuild every row from this date"
+    )
+    parser.add_argument("--chunk-days", type=int, default=90, help="Rebuild chunk size")
+    args = parser.parse_args()
+
+    builder = FeatureStoreBuilder()
+    through = date.fromisoformat(args.through) if args.through else None
+
+    if args.rebuild_from:
+        stats = builder.rebuild(
+            date.fromisoformat(args.rebuild_from), through=through, chunk_days=args.chunk_days
+        )
+    else:
+        stats = builder.update(through=through, recompute_days=args.recompute_days)
+
+    logger.info(f"Feature store update complete: {stats}")
+
+
+if __name__ == "__main__":
+    main()
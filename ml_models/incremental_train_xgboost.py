@@ -29,8 +29,9 @@ import pandas as pd
 import xgboost as xgb
 from scipy.stats import spearmanr
 
+from ml_models.training_data import load_training_features
+from ml_models.xgb_streaming import SERVING_FILL_VALUE, CacheChunkIter, train_streaming
 from utils import get_logger
-from utils.db_config import engine
 
 logger = get_logger(__name__)
 
@@ -144,18 +145,7 @@ class IncrementalXGBoostTrainer:
         logger.info(f"Loading features for {self.strategy} ({self.market_cap_segment} cap)")
         logger.info(f"Date range: {start_date} to {end_date}")
 
-        query = """
-        SELECT * FROM ml_training_features
-        WHERE date >= %(start_date)s
-          AND date <= %(end_date)s
-          AND target_return IS NOT NULL
-          AND close >= %(min_price)s
-        ORDER BY date, ticker
-        """
-
-        params = {"start_date": start_date, "end_date": end_date, "min_price": self.min_price}
-
-        df = pd.read_sql(query, engine, params=params)
+        df = load_training_features(start_date, end_date, min_price=self.min_price)
 
         logger.info(f"Loaded {len(df):,} rows, {df['ticker'].nunique()} unique tickers")
         return df
@@ -190,8 +180,21 @@ class IncrementalXGBoostTrainer:
 
         return params
 
-    def train_full(self, start_date: date = None, end_date: date = None):
-        """Full retraining from scratch"""
+    def train_full(
+        self,
+        start_date: date = None,
+        end_date: date = None,
+        streaming: bool = False,
+        fill_value: float = SERVING_FILL_VALUE,
+    ):
+        """
+        Full retraining from scratch
+
+        With streaming, the training set is streamed from the local cache into a
+        QuantileDMatrix (ml_models/xgb_streaming.py) instead of a DataFrame;
+        missing values are filled with 0 to match the fillna(0) of incremental
+        updates and scoring
+        """
         logger.info("=" * 60)
         logger.info("FULL RETRAINING MODE")
         logger.info("=" * 60)
@@ -205,19 +208,30 @@ class IncrementalXGBoostTrainer:
         # Backup existing model
         self.backup_model()
 
-        # Load data
-        df = self.load_features(start_date, end_date)
-        X, y, feature_cols = self.prepare_features(df)
+        if streaming:
+            logger.info("Training new model from scratch (streaming)...")
+            chunks = CacheChunkIter(
+                start_date, end_date, min_price=self.min_price, fill_value=fill_value
+            )
+            model, metrics, _ = train_streaming(chunks, self.get_xgboost_params())
+            feature_cols = chunks.feature_names
+            n_samples = metrics["rows"]
+            train_corr = metrics["spearman_ic"]
+        else:
+            # Load data
+            df = self.load_features(start_date, end_date)
+            X, y, feature_cols = self.prepare_features(df)
 
-        # Train new model
-        logger.info("Training new model from scratch...")
-        params = self.get_xgboost_params()
-        model = xgb.XGBRegressor(**params)
-        model.fit(X, y, verbose=100)
+            # Train new model
+            logger.info("Training new model from scratch...")
+            params = self.get_xgboost_params()
+            model = xgb.XGBRegressor(**params)
+            model.fit(X, y, verbose=100)
 
-        # Evaluate
-        train_preds = model.predict(X)
-        train_corr, _ = spearmanr(y, train_preds)
+            # Evaluate
+            train_preds = model.predict(X)
+            train_corr, _ = spearmanr(y, train_preds)
+            n_samples = len(X)
 
         # Save model
         model.save_model(str(self.model_path))
@@ -229,7 +243,7 @@ class IncrementalXGBoostTrainer:
             "last_trained_date": end_date.isoformat(),
             "training_start_date": start_date.isoformat(),
             "training_end_date": end_date.isoformat(),
-            "n_samples": len(X),
+            "n_samples": n_samples,
             "n_features": len(feature_cols),
             "train_correlation": float(train_corr),
             "mode": "full",
@@ -242,7 +256,7 @@ class IncrementalXGBoostTrainer:
         logger.info("=" * 60)
         logger.info("FULL RETRAINING COMPLETE")
         logger.info(f"✓ Model saved: {self.model_path}")
-        logger.info(f"✓ Training samples: {len(X):,}")
+        logger.info(f"✓ Training samples: {n_samples:,}")
         logger.info(f"✓ Train correlation: {train_corr:.4f}")
         logger.info("=" * 60)
 
@@ -340,6 +354,11 @@ def main():
     parser.add_argument(
         "--end-date", type=str, default=None, help="End date (YYYY-MM-DD) for full training"
     )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Full training: stream the cache into a QuantileDMatrix (bounded memory)",
+    )
 
     args = parser.parse_args()
 
@@ -354,7 +373,11 @@ def main():
 
     # Train
     if args.mode == "full":
-        model, metadata = trainer.train_full(start_date, end_date)
+        model, metadata = trainer.train_full(
+            start_date,
+            end_date,
+            streaming=args.streaming,
+        )
     else:
         model, metadata = trainer.train_incremental(days=args.days, n_iterations=args.iterations)
 
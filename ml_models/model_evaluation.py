@@ -32,7 +32,7 @@ def load_walk_forward_results():
 
     if not results_path.exists():
         raise FileNotFoundError(
-            f"Walk-forward results not found at {results_path}. " "Run train_xgboost.py first."
+            f"Walk-forward results not found at {results_path}. " "Run walk_forward.py first."
         )
 
     return pd.read_csv(results_path)
@@ -166,10 +166,12 @@ def get_feature_importance_stability():
         DataFrame with top features and their average importance across all models
     """
     models_dir = Path(__file__).parent
-    importance_files = list(models_dir.glob("feature_importance/feature_importance_*.csv"))
+    importance_files = list(
+        models_dir.glob("feature_importance/walk_forward/feature_importance_*.csv")
+    )
 
     if not importance_files:
-        raise FileNotFoundError("No feature importance files found. Run train_xgboost.py first.")
+        raise FileNotFoundError("No feature importance files found. Run walk_forward.py first.")
 
     all_importances = []
     for f in importance_files:
@@ -202,7 +204,9 @@ def analyze_feature_importance_drift(top_n: int = 10, threshold: float = 0.3):
         DataFrame with drift analysis
     """
     models_dir = Path(__file__).parent
-    importance_files = sorted(list(models_dir.glob("feature_importance/feature_importance_*.csv")))
+    importance_files = sorted(
+        list(models_dir.glob("feature_importance/walk_forward/feature_importance_*.csv"))
+    )
 
     if len(importance_files) < 2:
         print("Need at least 2 models to analyze drift")
@@ -380,4 +384,4 @@ if __name__ == "__main__":
 
     except FileNotFoundError as e:
         print(f"Error: {e}")
-        print("\nPlease run train_xgboost.py first to generate model results.")
+        print("\nPlease run walk_forward.py first to generate model results.")
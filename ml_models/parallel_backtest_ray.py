@@ -9,6 +9,8 @@ Features:
 - Monte Carlo simulations
 - Transaction cost modeling
 - Walk-forward optimization
+- Price panel loaded once per sweep and shared zero-copy via the Ray object store
+- CPU-only actor mode (--cpu-only) for machines without GPUs
 
 Expected speedup: 10-20x vs sequential backtesting
 """
@@ -16,7 +18,7 @@ import json
 import sys
 from datetime import date, timedelta
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -27,6 +29,13 @@ import numpy as np
 import pandas as pd
 import ray
 
+from ml_models.backtest_kernel import (
+    PricePanel,
+    build_price_matrix,
+    random_selection_weights,
+    rebalance_mask,
+    simulate,
+)
 from utils import get_logger
 from utils.db_config import engine
 
@@ -65,6 +74,77 @@ class BacktestResults:
     transaction_costs: float
 
 
+def load_price_data(tickers: List[str], start_date: str, end_date: str) -> pd.DataFrame:
+    """Load price data for backtest"""
+    query = """
+    SELECT ticker, date, close, volume
+    FROM daily_bars
+    WHERE ticker = ANY(%(tickers)s)
+      AND date >= %(start_date)s
+      AND date <= %(end_date)s
+    ORDER BY ticker, date;
+    """
+
+    df = pd.read_sql(
+        query,
+        engine,
+        params={"tickers": tickers, "start_date": start_date, "end_date": end_date},
+    )
+
+    return df
+
+
+def get_stock_universe(market_cap: str) -> List[str]:
+    """Get eligible stock universe for a market-cap bucket"""
+    # Simplified universe selection (in production, use full screener logic)
+    from portfolio.config import MARKET_CAP_RANGES, UNIVERSAL_FILTERS
+
+    cap_config = MARKET_CAP_RANGES[market_cap]
+    min_cap = cap_config["min"]
+    max_cap = cap_config["max"]
+
+    query = """
+    SELECT ticker
+    FROM ticker_overview
+    WHERE active = true
+      AND type = %(stock_type)s
+      AND market_cap >= %(min_cap)s
+    """
+    params = {"stock_type": UNIVERSAL_FILTERS["stock_type"], "min_cap": min_cap}
+
+    if max_cap:
+        query += " AND market_cap < %(max_cap)s"
+        params["max_cap"] = max_cap
+
+    query += " ORDER BY ticker;"
+
+    df = pd.read_sql(query, engine, params=params)
+    return df["ticker"].tolist()
+
+
+def load_price_panel(configs: List[Dict]) -> PricePanel:
+    """
+    Load one price panel covering every universe and date range in `configs`
+
+    Universe membership only depends on the market-cap bucket, so each bucket
+    is queried once and prices are loaded once for the union of tickers.
+    """
+    market_caps = list(dict.fromkeys(c["market_cap"] for c in configs))
+    universes = {cap: get_stock_universe(cap) for cap in market_caps}
+    tickers = list(dict.fromkeys(t for members in universes.values() for t in members))
+
+    start_date = min(str(c["start_date"]) for c in configs)
+    end_date = max(str(c["end_date"]) for c in configs)
+    prices = load_price_data(tickers, start_date, end_date)
+
+    panel = PricePanel.from_prices(prices, universes)
+    logger.info(
+        f"Loaded price panel: {len(panel.dates)} days x {len(panel.tickers)} tickers "
+        f"({panel.closes.nbytes / 1e6:.0f} MB) for {len(market_caps)} universe(s)"
+    )
+    return panel
+
+
 @ray.remote(num_gpus=0.25)  # Each backtest gets 1/4 GPU (4 backtests per GPU)
 class PortfolioBacktester:
     """Ray actor for parallel portfolio backtesting"""
@@ -74,49 +154,11 @@ class PortfolioBacktester:
 
     def load_price_data(self, tickers: List[str], start_date: str, end_date: str) -> pd.DataFrame:
         """Load price data for backtest"""
-        query = """
-        SELECT ticker, date, close, volume
-        FROM daily_bars
-        WHERE ticker = ANY(%(tickers)s)
-          AND date >= %(start_date)s
-          AND date <= %(end_date)s
-        ORDER BY ticker, date;
-        """
-
-        df = pd.read_sql(
-            query,
-            self.engine,
-            params={"tickers": tickers, "start_date": start_date, "end_date": end_date},
-        )
-
-        return df
+        return load_price_data(tickers, start_date, end_date)
 
     def get_stock_universe(self, strategy: str, market_cap: str, as_of_date: str) -> List[str]:
         """Get eligible stock universe for strategy"""
-        # Simplified universe selection (in production, use full screener logic)
-        from portfolio.config import MARKET_CAP_RANGES, UNIVERSAL_FILTERS
-
-        cap_config = MARKET_CAP_RANGES[market_cap]
-        min_cap = cap_config["min"]
-        max_cap = cap_config["max"]
-
-        query = """
-        SELECT ticker
-        FROM ticker_overview
-        WHERE active = true
-          AND type = %(stock_type)s
-          AND market_cap >= %(min_cap)s
-        """
-        params = {"stock_type": UNIVERSAL_FILTERS["stock_type"], "min_cap": min_cap}
-
-        if max_cap:
-            query += " AND market_cap < %(max_cap)s"
-            params["max_cap"] = max_cap
-
-        query += " ORDER BY ticker;"
-
-        df = pd.read_sql(query, self.engine, params=params)
-        return df["ticker"].tolist()
+        return get_stock_universe(market_cap)
 
     def simulate_portfolio(
         self,
@@ -130,68 +172,54 @@ class PortfolioBacktester:
         """
         Simulate portfolio performance with transaction costs
 
+        Runs the vectorized kernel in ml_models/backtest_kernel.py over a dense
+        price matrix (one matrix-vector product per holding period).
+
         Returns:
             Dictionary with daily returns and portfolio values
         """
-        # Pivot prices to wide format
-        price_pivot = prices.pivot(index="date", columns="ticker", values="close")
-
-        # Equal-weight portfolio
-        weights = 1.0 / position_count
-
-        # Initialize tracking
-        portfolio_value = 100000  # Start with $100k
-        portfolio_values = []
-        dates = []
-        holdings = {}
-        total_costs = 0.0
-
-        for i, current_date in enumerate(price_pivot.index):
-            # Check if rebalance date
-            if str(current_date)[:10] in rebalance_dates or i == 0:
-                # Select top N stocks (in production, use ML predictions)
-                available_stocks = [
-                    t
-                    for t in tickers
-                    if t in price_pivot.columns and not pd.isna(price_pivot.loc[current_date, t])
-                ]
-                selected_stocks = np.random.choice(
-                    available_stocks, size=min(position_count, len(available_stocks)), replace=False
-                ).tolist()
-
-                # Calculate transaction costs
-                old_holdings = set(holdings.keys())
-                new_holdings = set(selected_stocks)
-                trades = len(old_holdings.union(new_holdings))
-
-                if trades > 0:
-                    cost = portfolio_value * (transaction_cost_bps + slippage_bps) / 10000 * trades
-                    total_costs += cost
-                    portfolio_value -= cost
-
-                # Set new holdings
-                holdings = {ticker: portfolio_value * weights for ticker in selected_stocks}
-
-            # Calculate daily portfolio value
-            if holdings:
-                portfolio_value = sum(
-                    shares * price_pivot.loc[current_date, ticker]
-                    for ticker, shares in holdings.items()
-                    if ticker in price_pivot.columns
-                    and not pd.isna(price_pivot.loc[current_date, ticker])
-                )
-
-            portfolio_values.append(portfolio_value)
-            dates.append(current_date)
+        dates, _, price_matrix = build_price_matrix(prices, tickers)
+        return self.simulate_matrix(
+            dates,
+            price_matrix,
+            rebalance_dates,
+            position_count,
+            transaction_cost_bps,
+            slippage_bps,
+        )
+
+    def simulate_matrix(
+        self,
+        dates,
+        price_matrix: np.ndarray,
+        rebalance_dates: List[str],
+        position_count: int,
+        transaction_cost_bps: float,
+        slippage_bps: float,
+    ) -> Dict:
+        """Simulate over a dense (days x tickers) close matrix"""
+        rebalance = rebalance_mask(dates, rebalance_dates)
+
+        # Select top N stocks at each rebalance (in production, use ML predictions)
+        weights = random_selection_weights(price_matrix, np.flatnonzero(rebalance), position_count)
+        sim = simulate(
+            price_matrix,
+            rebalance,
+            weights,
+            cost_bps=transaction_cost_bps + slippage_bps,
+            initial_value=100000,  # Start with $100k
+        )
 
         # Create return series
-        portfolio_df = pd.DataFrame({"date": dates, "value": portfolio_values})
+        portfolio_df = pd.DataFrame({"date": list(dates), "value": sim.values})
         portfolio_df["return"] = portfolio_df["value"].pct_change()
 
         return {
             "portfolio_df": portfolio_df,
-            "total_costs": total_costs,
+            "total_costs": sim.total_costs,
             "num_rebalances": len(rebalance_dates),
+            "trades": sim.trades,
+            "cost_drag": sim.cost_drag,
         }
 
     def calculate_metrics(self, portfolio_df: pd.DataFrame, total_costs: float) -> Dict:
@@ -241,17 +269,19 @@ class PortfolioBacktester:
             "transaction_costs": total_costs,
         }
 
-    def run_backtest(self, config: Dict) -> Dict:
-        """Run a single backtest"""
+    def run_backtest(self, config: Dict, panel: Optional[PricePanel] = None) -> Dict:
+        """
+        Run a single backtest
+
+        Args:
+            config: BacktestConfig dictionary
+            panel: Shared price panel (from the Ray object store); when None the
+                   universe and prices are loaded from the database
+        """
         config_obj = BacktestConfig(**config)
 
         logger.info(f"Running backtest: {config_obj.portfolio_id}")
 
-        # Get stock universe
-        tickers = self.get_stock_universe(
-            config_obj.strategy, config_obj.market_cap, config_obj.start_date
-        )
-
         # Generate rebalance dates
         rebalance_dates = (
             pd.date_range(
@@ -263,13 +293,21 @@ class PortfolioBacktester:
             .tolist()
         )
 
-        # Load price data
-        prices = self.load_price_data(tickers, config_obj.start_date, config_obj.end_date)
+        if panel is not None:
+            dates, _, price_matrix = panel.select(
+                config_obj.market_cap, config_obj.start_date, config_obj.end_date
+            )
+        else:
+            tickers = self.get_stock_universe(
+                config_obj.strategy, config_obj.market_cap, config_obj.start_date
+            )
+            prices = self.load_price_data(tickers, config_obj.start_date, config_obj.end_date)
+            dates, _, price_matrix = build_price_matrix(prices, tickers)
 
         # Simulate portfolio
-        sim_results = self.simulate_portfolio(
-            tickers=tickers,
-            prices=prices,
+        sim_results = self.simulate_matrix(
+            dates,
+            price_matrix,
             rebalance_dates=rebalance_dates,
             position_count=config_obj.position_count,
             transaction_cost_bps=config_obj.transaction_cost_bps,
@@ -286,40 +324,55 @@ class PortfolioBacktester:
 
 
 class ParallelBacktestEngine:
-    """Orchestrate parallel backtesting across multiple GPUs"""
+    """Orchestrate parallel backtesting across multiple GPUs (or CPU-only actors)"""
 
-    def __init__(self, num_actors: int = 4):
+    def __init__(self, num_actors: int = 4, cpu_only: bool = False):
         """
         Args:
             num_actors: Number of parallel backtest actors (typically 4-16)
+            cpu_only: Run actors without GPU reservations (plain Linux boxes);
+                      the simulation kernel is NumPy and does not need a GPU
         """
         self.num_actors = num_actors
+        self.cpu_only = cpu_only
 
         # Initialize Ray
         if not ray.is_initialized():
-            ray.init(num_gpus=4)  # Adjust based on DGX Spark GPU count
+            if cpu_only:
+                ray.init()
+            else:
+                ray.init(num_gpus=4)  # Adjust based on DGX Spark GPU count
 
         # Create actor pool
-        self.actors = [PortfolioBacktester.remote() for _ in range(num_actors)]
-        logger.info(f"Initialized {num_actors} backtest actors")
+        actor_options = {"num_gpus": 0, "num_cpus": 1} if cpu_only else {}
+        self.actors = [
+            PortfolioBacktester.options(**actor_options).remote() for _ in range(num_actors)
+        ]
+        mode = "CPU-only" if cpu_only else "GPU"
+        logger.info(f"Initialized {num_actors} {mode} backtest actors")
 
-    def run_backtests(self, configs: List[Dict]) -> List[Dict]:
+    def run_backtests(self, configs: List[Dict], shared_data: bool = True) -> List[Dict]:
         """
         Run multiple backtests in parallel
 
         Args:
             configs: List of BacktestConfig dictionaries
+            shared_data: Load the price panel once and share it through the Ray
+                         object store (otherwise every actor queries Postgres per config)
 
         Returns:
             List of BacktestResults dictionaries
         """
         logger.info(f"Running {len(configs)} backtests in parallel...")
 
+        # One load for the whole sweep; actors read the arrays zero-copy
+        panel_ref = ray.put(load_price_panel(configs)) if shared_data and configs else None
+
         # Distribute work across actors
         futures = []
         for i, config in enumerate(configs):
             actor = self.actors[i % len(self.actors)]
-            future = actor.run_backtest.remote(config)
+            future = actor.run_backtest.remote(config, panel_ref)
             futures.append(future)
 
         # Wait for all results
@@ -389,6 +442,9 @@ def main():
     parser.add_argument("--num-actors", type=int, default=8, help="Number of parallel actors")
     parser.add_argument("--start-date", type=str, default="2015-01-01")
     parser.add_argument("--end-date", type=str, default=str(date.today()))
+    parser.add_argument(
+        "--cpu-only", action="store_true", help="Run actors without GPUs (plain Linux boxes)"
+    )
 
     args = parser.parse_args()
 
@@ -397,7 +453,7 @@ def main():
     logger.info("=" * 60)
 
     # Initialize engine
-    engine = ParallelBacktestEngine(num_actors=args.num_actors)
+    engine = ParallelBacktestEngine(num_actors=args.num_actors, cpu_only=args.cpu_only)
 
     # Define base config
     base_config = {
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Lazy Sliding-Window Sequences
+
+LSTM training windows without materializing them. LSTMTrainer.create_sequences
+stacks every overlapping window into one (n_windows, sequence_length,
+n_features) array, sequence_length times the size of the rows, and
+normalize_data copies it again. Here:
+
+- The rows are ordered by (ticker, date) with one sort and stored once as a
+  contiguous float32 array (tickers back to back)
+- Windows are an offset table (the first row of each window) into a
+  sliding_window_view of that array; a batch is gathered only when asked for
+- Normalization statistics are computed from the rows, weighted by how many
+  training windows each row appears in, so they equal StandardScaler fit on
+  the materialized training windows; they are applied per batch
+
+Windows, targets and dates match create_sequences one for one (same order,
+same NaN -> 0), so index splits are the same as slicing its arrays.
+
+Used by train_lstm_gpu.py --windowed (WindowedSequenceDataset);
+tests/performance/bench_lstm_windows.py compares RAM and epoch time.
+"""
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+STATS_BLOCK_ROWS = 1_000_000
+
+
+class SequenceWindows:
+    """
+    Sliding windows over per-ticker rows, built and normalized lazily
+
+    Args:
+        df: Rows (ticker, date, features..., targets...)
+        feature_cols: Window feature columns
+        target_cols: Target columns (taken at each window's last row)
+        sequence_length: Rows per window
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        feature_cols: List[str],
+        target_cols: List[str],
+        sequence_length: int,
+    ):
+        self.feature_cols = feature_cols
+        self.target_cols = target_cols
+        self.sequence_length = sequence_length
+
+        # Tickers in order of first appearance (as df["ticker"].unique()), dates ascending
+        codes, self.tickers = pd.factorize(df["ticker"])
+        by_date = np.argsort(df["date"].to_numpy(), kind="stable")
+        order = by_date[np.argsort(codes[by_date], kind="stable")]
+
+        self.X = np.ascontiguousarray(df[feature_cols].to_numpy(dtype=np.float32)[order])
+        np.nan_to_num(self.X, copy=False)
+        self.y = np.nan_to_num(df[target_cols].to_numpy(dtype=np.float32)[order])
+        self.row_dates = df["date"].to_numpy()[order]
+
+        # Window offset table: tickers with n rows give n - sequence_length windows
+        counts = np.bincount(codes, minlength=len(self.tickers))
+        bounds = np.concatenate([[0], np.cumsum(counts)])
+        n_windows = np.maximum(counts - sequence_length, 0)
+        first = np.cumsum(n_windows) - n_windows
+        self.starts = np.repeat(bounds[:-1] - first, n_windows) + np.arange(n_windows.sum())
+        self.ends = self.starts + sequence_length - 1
+
+        if len(self.X) >= sequence_length:
+            # (n_rows - sequence_length + 1, sequence_length, n_features) view, no copy
+            self.views = sliding_window_view(self.X, sequence_length, axis=0).transpose(0, 2, 1)
+        else:
+            self.views = np.empty((0, sequence_length, len(feature_cols)), dtype=np.float32)
+
+        self.mean_: Optional[np.ndarray] = None
+        self.scale_: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def dates(self) -> np.ndarray:
+        """Date of each window's last row"""
+        return self.row_dates[self.ends]
+
+    def coverage(self, indices=None) -> np.ndarray:
+        """Number of the given windows (default: all) each row appears in"""
+        starts = self.starts if indices is None else self.starts[indices]
+        n = len(self.X) + 1
+        opened = np.bincount(starts, minlength=n)
+        closed = np.bincount(starts + self.sequence_length, minlength=n)
+        return np.cumsum(opened - closed)[:-1]
+
+    def fit_normalization(self, indices=None):
+        """
+        Per-feature mean and scale over the given windows' rows, as
+        StandardScaler.fit on those windows stacked would compute them
+        """
+        weights = self.coverage(indices).astype(np.float64)
+        total = weights.sum()
+        if total == 0:
+            raise ValueError("No windows to fit normalization on")
+
+        weighted_sum = np.zeros(self.X.shape[1])
+        for block in range(0, len(self.X), STATS_BLOCK_ROWS):
+            rows = slice(block, block + STATS_BLOCK_ROWS)
+            weighted_sum += weights[rows] @ self.X[rows]
+        mean = weighted_sum / total
+
+        squares = np.zeros(self.X.shape[1])
+        for block in range(0, len(self.X), STATS_BLOCK_ROWS):
+            rows = slice(block, block + STATS_BLOCK_ROWS)
+            squares += weights[rows] @ np.square(self.X[rows] - mean)
+        scale = np.sqrt(squares / total)
+        scale[scale == 0.0] = 1.0  # constant features, as StandardScaler
+
+        self.set_normalization(mean, scale)
+        return self
+
+    def set_normalization(self, mean: np.ndarray, scale: np.ndarray):
+        """Use saved statistics (e.g. a trained model's scaler_mean / scaler_scale)"""
+        self.mean_ = np.asarray(mean, dtype=np.float32)
+        self.scale_ = np.asarray(scale, dtype=np.float32)
+
+    def sequences(self, indices) -> np.ndarray:
+        """Windows (normalized if fitted): (sequence_length, n_features) or a batch of them"""
+        starts = self.starts[indices]
+        # Fancy indexing gathers a copy; a single window is a view, so copy it
+        batch = self.views[starts] if np.ndim(starts) else self.views[starts].copy()
+        if self.mean_ is not None:
+            batch -= self.mean_
+            batch /= self.scale_
+        return batch
+
+    def targets(self, indices) -> np.ndarray:
+        """Targets at each window's last row"""
+        return self.y[self.ends[indices]]
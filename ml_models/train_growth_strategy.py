@@ -16,8 +16,8 @@ import pandas as pd
 import xgboost as xgb
 from scipy.stats import spearmanr
 
+from ml_models.training_data import load_training_features
 from utils import get_logger
-from utils.db_config import engine
 
 logger = get_logger(__name__)
 
@@ -71,18 +71,7 @@ class GrowthStrategyTrainer:
         )
         logger.warning("⚠️  Market cap filtering will be applied during portfolio generation")
 
-        query = f"""
-        SELECT * FROM ml_training_features
-        WHERE date >= %(start_date)s
-          AND date <= %(end_date)s
-          AND target_return IS NOT NULL
-          AND close >= %(min_price)s
-        ORDER BY date, ticker
-        """
-
-        params = {"start_date": start_date, "end_date": end_date, "min_price": self.min_price}
-
-        df = pd.read_sql(query, engine, params=params)
+        df = load_training_features(start_date, end_date, min_price=self.min_price)
 
         logger.info(f"Loaded {len(df):,} rows")
         logger.info(f"Unique tickers: {df['ticker'].nunique()}")
@@ -138,10 +127,8 @@ class GrowthStrategyTrainer:
 
         return X, y, all_feature_cols
 
-    def train(self, X, y, feature_names):
-        """Train XGBoost with growth strategy parameters"""
-        logger.info("Training growth strategy model...")
-
+    def get_xgboost_params(self):
+        """Get growth strategy XGBoost parameters"""
         params = {
             "objective": "reg:squarederror",
             "tree_method": "hist",
@@ -157,6 +144,16 @@ class GrowthStrategyTrainer:
 
         if self.gpu_id is not None:
             params["device"] = f"cuda:{self.gpu_id}"
+
+        return params
+
+    def train(self, X, y, feature_names):
+        """Train XGBoost with growth strategy parameters"""
+        logger.info("Training growth strategy model...")
+
+        params = self.get_xgboost_params()
+
+        if self.gpu_id is not None:
             logger.info(f"Using GPU: {self.gpu_id}")
         else:
             logger.info("Using CPU")
@@ -28,8 +28,9 @@ import pandas as pd
 import torch
 import torch.nn as nn
 from sklearn.preprocessing import StandardScaler
-from torch.utils.data import DataLoader, Dataset
+from torch.utils.data import BatchSampler, DataLoader, Dataset, RandomSampler, SequentialSampler
 
+from ml_models.sequence_windows import SequenceWindows
 from utils import get_logger
 from utils.db_config import engine
 
@@ -55,6 +56,44 @@ class StockSequenceDataset(Dataset):
         return self.sequences[idx], self.targets[idx]
 
 
+class WindowedSequenceDataset(Dataset):
+    """
+    StockSequenceDataset over lazy windows (ml_models/sequence_windows.py)
+
+    Each item (or batch, when idx is a list of indices from a BatchSampler) is
+    gathered from the per-ticker rows and normalized when it is read.
+    """
+
+    def __init__(self, windows: SequenceWindows, indices: np.ndarray):
+        """
+        Args:
+            windows: Windows over the loaded rows
+            indices: Window indices in this split
+        """
+        self.windows = windows
+        self.indices = np.asarray(indices)
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, idx):
+        rows = self.indices[idx]
+        return (
+            torch.from_numpy(self.windows.sequences(rows)),
+            torch.from_numpy(self.windows.targets(rows)),
+        )
+
+    def loader(self, batch_size: int, shuffle: bool, **kwargs) -> DataLoader:
+        """DataLoader fetching whole batches with one gather each"""
+        sampler = RandomSampler(self) if shuffle else SequentialSampler(self)
+        return DataLoader(
+            self,
+            sampler=BatchSampler(sampler, batch_size=batch_size, drop_last=False),
+            batch_size=None,
+            **kwargs,
+        )
+
+
 class AttentionLSTM(nn.Module):
     """Bidirectional LSTM with attention for stock prediction"""
 
@@ -297,6 +336,33 @@ class LSTMTrainer:
 
         return sequences, targets, dates
 
+    def create_windows(self, df: pd.DataFrame) -> SequenceWindows:
+        """
+        Lazy equivalent of create_sequences: the same windows, targets and
+        dates in the same order, without materializing them
+        """
+        logger.info(f"Indexing windows with length {self.sequence_length}...")
+
+        target_cols = ["target_5d", "target_20d", "target_63d"]
+        self.feature_names = [
+            col for col in df.columns if col not in ["ticker", "date"] + target_cols
+        ]
+
+        windows = SequenceWindows(df, self.feature_names, target_cols, self.sequence_length)
+
+        logger.info(f"Indexed {len(windows):,} windows over {len(windows.X):,} rows")
+        return windows
+
+    def fit_window_normalization(self, windows: SequenceWindows, indices: np.ndarray):
+        """normalize_data(fit=True) for lazy windows: fit on the training windows only"""
+        windows.fit_normalization(indices)
+
+        # Saved by save_model as scaler_mean / scaler_scale
+        self.scaler.mean_ = windows.mean_.astype(np.float64)
+        self.scaler.scale_ = windows.scale_.astype(np.float64)
+        self.scaler.var_ = self.scaler.scale_**2
+        self.scaler.n_features_in_ = len(self.scaler.mean_)
+
     def normalize_data(
         self, sequences: np.ndarray, targets: np.ndarray, fit: bool = True
     ) -> Tuple[np.ndarray, np.ndarray]:
@@ -323,8 +389,6 @@ class LSTMTrainer:
         epochs: int = 50,
     ) -> Dict:
         """Train LSTM model"""
-        logger.info(f"Training LSTM model for {epochs} epochs...")
-
         # Create datasets and loaders
         train_dataset = StockSequenceDataset(train_sequences, train_targets)
         val_dataset = StockSequenceDataset(val_sequences, val_targets)
@@ -336,8 +400,34 @@ class LSTMTrainer:
             val_dataset, batch_size=self.batch_size, shuffle=False, num_workers=4, pin_memory=True
         )
 
+        return self.train_loaders(train_loader, val_loader, train_sequences.shape[2], epochs)
+
+    def train_windows(
+        self,
+        windows: SequenceWindows,
+        train_indices: np.ndarray,
+        val_indices: np.ndarray,
+        epochs: int = 50,
+    ) -> Dict:
+        """Train LSTM model on lazy windows (normalization fit on train_indices)"""
+        self.fit_window_normalization(windows, train_indices)
+
+        train_loader = WindowedSequenceDataset(windows, train_indices).loader(
+            self.batch_size, shuffle=True, num_workers=4, pin_memory=True
+        )
+        val_loader = WindowedSequenceDataset(windows, val_indices).loader(
+            self.batch_size, shuffle=False, num_workers=4, pin_memory=True
+        )
+
+        return self.train_loaders(train_loader, val_loader, len(self.feature_names), epochs)
+
+    def train_loaders(
+        self, train_loader: DataLoader, val_loader: DataLoader, n_features: int, epochs: int
+    ) -> Dict:
+        """Training loop over (sequences, targets) batches"""
+        logger.info(f"Training LSTM model for {epochs} epochs...")
+
         # Initialize model
-        n_features = train_sequences.shape[2]
         n_outputs = len(self.prediction_horizons)
 
         self.model = AttentionLSTM(
@@ -478,6 +568,11 @@ def main():
     parser.add_argument("--epochs", type=int, default=50)
     parser.add_argument("--gpu", type=int, default=0)
     parser.add_argument("--output", type=str, default="models/lstm_gpu.pt")
+    parser.add_argument(
+        "--windowed",
+        action="store_true",
+        help="Index windows lazily instead of materializing every sequence (bounded RAM)",
+    )
 
     args = parser.parse_args()
 
@@ -500,20 +595,33 @@ def main():
         # Load data
         df = trainer.load_data(args.start_date, args.end_date)
 
-        # Create sequences
-        sequences, targets, dates = trainer.create_sequences(df)
+        mlflow.log_param("windowed", args.windowed)
+
+        if args.windowed:
+            windows = trainer.create_windows(df)
+            del df
+
+            # Same 80/20 split as the materialized sequences
+            split_idx = int(len(windows) * 0.8)
+            indices = np.arange(len(windows))
+            history = trainer.train_windows(
+                windows, indices[:split_idx], indices[split_idx:], epochs=args.epochs
+            )
+        else:
+            # Create sequences
+            sequences, targets, dates = trainer.create_sequences(df)
 
-        # Train/val split (80/20 temporal split)
-        split_idx = int(len(sequences) * 0.8)
-        train_seq, val_seq = sequences[:split_idx], sequences[split_idx:]
-        train_tgt, val_tgt = targets[:split_idx], targets[split_idx:]
+            # Train/val split (80/20 temporal split)
+            split_idx = int(len(sequences) * 0.8)
+            train_seq, val_seq = sequences[:split_idx], sequences[split_idx:]
+            train_tgt, val_tgt = targets[:split_idx], targets[split_idx:]
 
-        # Normalize
-        train_seq, train_tgt = trainer.normalize_data(train_seq, train_tgt, fit=True)
-        val_seq, val_tgt = trainer.normalize_data(val_seq, val_tgt, fit=False)
+            # Normalize
+            train_seq, train_tgt = trainer.normalize_data(train_seq, train_tgt, fit=True)
+            val_seq, val_tgt = trainer.normalize_data(val_seq, val_tgt, fit=False)
 
-        # Train
-        history = trainer.train(train_seq, train_tgt, val_seq, val_tgt, epochs=args.epochs)
+            # Train
+            history = trainer.train(train_seq, train_tgt, val_seq, val_tgt, epochs=args.epochs)
 
         # Log final metrics
         mlflow.log_metric("final_val_loss", history["val_loss"][-1])
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Multi-Model Strategy Training
+
+Trains the growth / value / dividend x small / mid / large model set from one
+load of the training data, instead of one process per model that each
+re-read and re-materialize the same feature table (train_all_strategies.sh,
+scripts/auto_train_models.py).
+
+1. Load ml_training_features once (training-data cache, float32) at the
+   lowest min_price of the model set, build the float32 feature matrix once
+   and order its rows by close, descending
+2. Each model's universe (close >= min_price; market cap filters are applied
+   at inference, see the trainers) is then a prefix of the matrix: a view,
+   no copy
+3. Models with the same parameters and universe are trained once and saved
+   under each name (growth mid/large and value mid/large today)
+4. Sequential (default, and on GPU): one xgb.QuantileDMatrix per universe,
+   quantized once and shared by every model on it, the smaller universes
+   reusing the largest one's cuts. Parallel (--workers N): forked worker
+   processes train one model each from the parent's matrix (copy-on-write)
+
+Each model is saved exactly as its trainer saves it (trainer.save_model and
+the feature importance CSV), with the trainer's XGBoost parameters.
+
+Usage:
+    python ml_models/train_strategy_models.py
+    python ml_models/train_strategy_models.py --workers 4
+    python ml_models/train_strategy_models.py --gpu 0 --models growth_smallcap value_smallcap
+    python ml_models/train_strategy_models.py --baseline   # also time one process per model
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from scipy.stats import spearmanr
+
+from ml_models.train_dividend_strategy import DividendStrategyTrainer
+from ml_models.train_growth_strategy import GrowthStrategyTrainer
+from ml_models.train_value_strategy import ValueStrategyTrainer
+from ml_models.training_data import load_training_features
+from ml_models.xgb_streaming import gain_importance, native_params
+from utils import get_logger
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# The model set of train_all_strategies.sh / scripts/auto_train_models.py
+STRATEGY_MODELS = [
+    {"strategy": "dividend", "market_cap": "mid", "name": "dividend_strategy"},
+    {"strategy": "growth", "market_cap": "small", "name": "growth_smallcap"},
+    {"strategy": "growth", "market_cap": "mid", "name": "growth_midcap"},
+    {"strategy": "growth", "market_cap": "large", "name": "growth_largecap"},
+    {"strategy": "value", "market_cap": "small", "name": "value_smallcap"},
+    {"strategy": "value", "market_cap": "mid", "name": "value_midcap"},
+    {"strategy": "value", "market_cap": "large", "name": "value_largecap"},
+]
+
+EXCLUDE_COLUMNS = ["ticker", "date", "target_return"]
+
+
+def make_trainer(config: Dict, gpu_id: Optional[int] = None):
+    """The single-model trainer for a STRATEGY_MODELS entry"""
+    if config["strategy"] == "dividend":
+        return DividendStrategyTrainer(gpu_id=gpu_id)
+    if config["strategy"] == "growth":
+        return GrowthStrategyTrainer(gpu_id=gpu_id, market_cap_segment=config["market_cap"])
+    if config["strategy"] == "value":
+        return ValueStrategyTrainer(gpu_id=gpu_id, market_cap_segment=config["market_cap"])
+    raise ValueError(f"Unknown strategy: {config['strategy']}")
+
+
+def importance_path(config: Dict) -> Path:
+    """Where the trainer's main() writes the feature importance CSV"""
+    if config["strategy"] == "dividend":
+        name = "feature_importance_dividend.csv"
+    else:
+        name = f"feature_importance_{config['strategy']}_{config['market_cap']}cap.csv"
+    return Path("ml_models/feature_importance") / name
+
+
+class SharedTrainingData:
+    """
+    Feature matrix for every model, rows ordered by close (descending) so each
+    min_price universe is a prefix view
+
+    Args:
+        df: Training rows (ticker, date, features..., target_return)
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.feature_names = [c for c in df.columns if c not in EXCLUDE_COLUMNS]
+        close = df["close"].to_numpy(dtype=np.float32)
+        order = np.argsort(-close, kind="stable")
+
+        self.close = close[order]
+        self.X = np.ascontiguousarray(df[self.feature_names].to_numpy(dtype=np.float32)[order])
+        self.X[np.isnan(self.X)] = 0.0  # fillna(0), as in the trainers
+        self.y = df["target_return"].to_numpy(dtype=np.float32)[order]
+
+    def rows(self, min_price: float) -> int:
+        """Number of rows with close >= min_price (the universe's prefix length)"""
+        # close is descending: rows with close >= min_price come first
+        return int(np.searchsorted(-self.close, -min_price, side="right"))
+
+    def segment(self, min_price: float) -> Tuple[np.ndarray, np.ndarray]:
+        """(X, y) views of the rows with close >= min_price"""
+        n = self.rows(min_price)
+        return self.X[:n], self.y[:n]
+
+
+@dataclass
+class ModelFit:
+    """One training run, saved under every model name that shares it"""
+
+    params: Dict
+    min_price: float
+    configs: List[Dict] = field(default_factory=list)
+    trainers: List = field(default_factory=list)
+
+    @property
+    def names(self) -> List[str]:
+        return [c["name"] for c in self.configs]
+
+
+def plan_fits(configs: List[Dict], gpu_id: Optional[int] = None) -> List[ModelFit]:
+    """Group the models by (universe, parameters); each group is trained once"""
+    fits: Dict[str, ModelFit] = {}
+    for config in configs:
+        trainer = make_trainer(config, gpu_id)
+        params = trainer.get_xgboost_params()
+        key = json.dumps([trainer.min_price, params], sort_keys=True)
+        fit = fits.setdefault(key, ModelFit(params=params, min_price=trainer.min_price))
+        fit.configs.append(config)
+        fit.trainers.append(trainer)
+    # Largest universe first: its quantile cuts are shared with the others
+    return sorted(fits.values(), key=lambda fit: fit.min_price)
+
+
+def train_fit(
+    data: SharedTrainingData,
+    fit: ModelFit,
+    dtrain: Optional[xgb.DMatrix] = None,
+    nthread: Optional[int] = None,
+    rounds: Optional[int] = None,
+) -> Tuple[xgb.Booster, Dict, pd.DataFrame]:
+    """
+    Train one fit and score it in-sample like the trainers' evaluate()
+
+    Returns:
+        (booster, metrics, feature importance)
+    """
+    X, y = data.segment(fit.min_price)
+    if dtrain is None:
+        dtrain = xgb.QuantileDMatrix(X, label=y, feature_names=data.feature_names, nthread=nthread)
+
+    params, n_estimators = native_params(fit.params)
+    if nthread is not None:
+        params["nthread"] = nthread
+    booster = xgb.train(params, dtrain, num_boost_round=rounds or n_estimators)
+
+    y_pred = booster.inplace_predict(X)
+    spearman_ic, _ = spearmanr(y, y_pred)
+    metrics = {
+        "pearson": float(np.corrcoef(y, y_pred)[0, 1]),
+        "spearman_ic": float(spearman_ic),
+        "rows": len(y),
+    }
+
+    importance = gain_importance(booster, data.feature_names)
+    return booster, metrics, importance
+
+
+# Forked workers read the parent's matrix through these globals (copy-on-write)
+_worker_data: Optional[SharedTrainingData] = None
+_worker_fits: List[ModelFit] = []
+
+
+def _train_in_worker(index: int, nthread: int, rounds: Optional[int]):
+    started = time.time()
+    booster, metrics, importance = train_fit(
+        _worker_data, _worker_fits[index], nthread=nthread, rounds=rounds
+    )
+    return index, booster, metrics, importance, time.time() - started
+
+
+class MultiModelTrainer:
+    """
+    Trains a set of strategy models from one shared data load
+
+    Args:
+        configs: STRATEGY_MODELS entries to train
+        gpu_id: GPU for every model (None = CPU)
+        workers: Parallel worker processes (1 = sequential with shared QuantileDMatrix)
+        rounds: Override n_estimators (quick runs)
+    """
+
+    def __init__(
+        self,
+        configs: List[Dict] = STRATEGY_MODELS,
+        gpu_id: Optional[int] = None,
+        workers: int = 1,
+        rounds: Optional[int] = None,
+    ):
+        self.configs = configs
+        self.gpu_id = gpu_id
+        self.workers = 1 if gpu_id is not None else max(1, workers)
+        self.rounds = rounds
+        self.fits = plan_fits(configs, gpu_id)
+
+    def load(self, start_date: date, end_date: date) -> SharedTrainingData:
+        min_price = min(fit.min_price for fit in self.fits)
+        df = load_training_features(start_date, end_date, min_price=min_price)
+        logger.info(f"Loaded {len(df):,} rows, {df['ticker'].nunique()} unique tickers")
+        return SharedTrainingData(df)
+
+    def train(self, data: SharedTrainingData) -> List[Tuple]:
+        """Train every fit; returns (fit, booster, metrics, importance, seconds) per fit"""
+        if self.workers > 1:
+            return self._train_parallel(data)
+
+        results = []
+        dmatrices: Dict[float, xgb.DMatrix] = {}
+        for fit in self.fits:
+            started = time.time()
+            dtrain = dmatrices.get(fit.min_price)
+            if dtrain is None:
+                X, y = data.segment(fit.min_price)
+                reference = next(iter(dmatrices.values()), None)
+                dtrain = dmatrices[fit.min_price] = xgb.QuantileDMatrix(
+                    X, label=y, feature_names=data.feature_names, ref=reference
+                )
+            booster, metrics, importance = train_fit(data, fit, dtrain, rounds=self.rounds)
+            results.append((fit, booster, metrics, importance, time.time() - started))
+            logger.info(
+                f"Trained {', '.join(fit.names)} on {metrics['rows']:,} rows in "
+                f"{time.time() - started:.1f}s (Spearman IC {metrics['spearman_ic']:.4f})"
+            )
+        return results
+
+    def _train_parallel(self, data: SharedTrainingData) -> List[Tuple]:
+        global _worker_data, _worker_fits
+        _worker_data, _worker_fits = data, self.fits
+        workers = min(self.workers, len(self.fits))
+        nthread = max(1, (os.cpu_count() or 1) // workers)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("fork")
+            ) as pool:
+                futures = [
+                    pool.submit(_train_in_worker, i, nthread, self.rounds)
+                    for i in range(len(self.fits))
+                ]
+                results = []
+                for future in futures:
+                    index, booster, metrics, importance, seconds = future.result()
+                    fit = self.fits[index]
+                    results.append((fit, booster, metrics, importance, seconds))
+                    logger.info(
+                        f"Trained {', '.join(fit.names)} on {metrics['rows']:,} rows in "
+                        f"{seconds:.1f}s (Spearman IC {metrics['spearman_ic']:.4f})"
+                    )
+                return results
+        finally:
+            _worker_data, _worker_fits = None, []
+
+    def save(self, data: SharedTrainingData, results: List[Tuple]) -> List[Dict]:
+        """Save every model as its trainer does; returns one summary per model"""
+        summaries = []
+        for fit, booster, metrics, importance, seconds in results:
+            for config, trainer in zip(fit.configs, fit.trainers):
+                trainer.save_model(booster, data.feature_names, metrics)
+                path = importance_path(config)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                importance.to_csv(path, index=False)
+                summaries.append(
+                    {
+                        "model_name": config["name"],
+                        "strategy": config["strategy"],
+                        "market_cap": config["market_cap"],
+                        "status": "success",
+                        "rows": metrics["rows"],
+                        "spearman_ic": metrics["spearman_ic"],
+                        "seconds": seconds,
+                    }
+                )
+        return summaries
+
+    def run(self, start_date: date, end_date: date) -> Dict:
+        """Load once, train and save every model; returns timings and per-model results"""
+        started = time.time()
+        logger.info(
+            f"Training {len(self.configs)} models as {len(self.fits)} fits "
+            f"({'sequential' if self.workers == 1 else f'{self.workers} workers'})"
+        )
+
+        data = self.load(start_date, end_date)
+        load_seconds = time.time() - started
+
+        results = self.train(data)
+        models = self.save(data, results)
+        total = time.time() - started
+
+        logger.info(f"Load: {load_seconds:.1f}s, train + save: {total - load_seconds:.1f}s")
+        return {
+            "total_seconds": total,
+            "load_seconds": load_seconds,
+            "fits": len(self.fits),
+            "models": models,
+        }
+
+
+def run_baseline(configs: List[Dict], start_date: str, end_date: str, gpu_id=None) -> float:
+    """Wall time of today's flow: one trainer process per model"""
+    started = time.time()
+    for config in configs:
+        script = PROJECT_ROOT / "ml_models" / f"train_{config['strategy']}_strategy.py"
+        cmd = [sys.executable, str(script), "--start-date", start_date, "--end-date", end_date]
+        if config["strategy"] != "dividend":
+            cmd.extend(["--market-cap", config["market_cap"]])
+        if gpu_id is not None:
+            cmd.extend(["--gpu", str(gpu_id)])
+        subprocess.run(cmd, check=True, capture_output=True)
+    return time.time() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train all strategy models from one data load")
+    parser.add_argument("--start-date", type=str, default="2015-01-01")
+    parser.add_argument("--end-date", type=str, default="2025-10-30")
+    parser.add_argument("--gpu", type=int, default=None, help="GPU ID (omit for CPU)")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Parallel worker processes (CPU only)"
+    )
+    parser.add_argument(
+        "--models", nargs="+", default=None, help="Model names to train (default: all)"
+    )
+    parser.add_argument("--n-estimators", type=int, default=None, help="Override boosting rounds")
+    parser.add_argument(
+        "--baseline",
+        action="store_true",
+        help="Also time one process per model (train_all_strategies.sh) for comparison",
+    )
+    args = parser.parse_args()
+
+    configs = STRATEGY_MODELS
+    if args.models:
+        configs = [c for c in STRATEGY_MODELS if c["name"] in args.models]
+
+    logger.info("=" * 80)
+    logger.info("MULTI-MODEL STRATEGY TRAINING")
+    logger.info("=" * 80)
+    logger.info(f"Models: {', '.join(c['name'] for c in configs)}")
+    logger.info(f"Date range: {args.start_date} to {args.end_date}")
+    logger.info(f"GPU: {args.gpu if args.gpu is not None else 'CPU'}")
+    logger.info("=" * 80)
+
+    baseline = None
+    if args.baseline:
+        logger.info("Timing one process per model...")
+        baseline = run_baseline(configs, args.start_date, args.end_date, args.gpu)
+
+    trainer = MultiModelTrainer(
+        configs, gpu_id=args.gpu, workers=args.workers, rounds=args.n_estimators
+    )
+    report = trainer.run(date.fromisoformat(args.start_date), date.fromisoformat(args.end_date))
+
+    logger.info("=" * 80)
+    logger.info(f"✅ {len(report['models'])} MODELS TRAINED IN {report['total_seconds']:.1f}s")
+    logger.info("=" * 80)
+    for model in report["models"]:
+        logger.info(
+            f"  {model['model_name']:<20} {model['rows']:>12,} rows  "
+            f"IC {model['spearman_ic']:.4f}"
+        )
+    if baseline is not None:
+        logger.info(
+            f"One process per model: {baseline:.1f}s, shared load: "
+            f"{report['total_seconds']:.1f}s ({baseline / report['total_seconds']:.1f}x)"
+        )
+    logger.info("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
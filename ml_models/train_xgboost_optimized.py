@@ -16,8 +16,15 @@ import pandas as pd
 import xgboost as xgb
 from scipy.stats import spearmanr
 
+from ml_models.training_data import load_training_features
+from ml_models.xgb_streaming import (
+    SERVING_FILL_VALUE,
+    CacheChunkIter,
+    DatabaseChunkIter,
+    require_external_memory,
+    train_streaming,
+)
 from utils import get_logger
-from utils.db_config import engine
 
 logger = get_logger(__name__)
 
@@ -39,18 +46,10 @@ class OptimizedXGBoostTrainer:
 
         This is 20-100x faster than the complex JOIN query!
         """
-        logger.info(f"Loading features from materialized view: {start_date} to {end_date}")
-        logger.info("Using pre-computed ml_training_features view (FAST!)")
-
-        query = """
-        SELECT * FROM ml_training_features
-        WHERE date >= %(start_date)s
-          AND date <= %(end_date)s
-          AND target_return IS NOT NULL
-        ORDER BY date, ticker
-        """
+        logger.info(f"Loading features from the training-data cache: {start_date} to {end_date}")
+        logger.info("Using the local ml_training_features snapshot (float32 Parquet)")
 
-        df = pd.read_sql(query, engine, params={"start_date": start_date, "end_date": end_date})
+        df = load_training_features(start_date, end_date)
 
         logger.info(f"Loaded {len(df):,} rows in seconds (not minutes!)")
         return df
@@ -79,42 +78,37 @@ class OptimizedXGBoostTrainer:
 
         return X, y, feature_cols
 
+    def get_xgboost_params(self):
+        """XGBoost parameters (GPU device if gpu_id is set)"""
+        params = {
+            "objective": "reg:squarederror",
+            "tree_method": "hist",
+            "max_depth": 6,
+            "learning_rate": 0.01,
+            "n_estimators": 1000,
+            "subsample": 0.8,
+            "colsample_bytree": 0.8,
+            "reg_alpha": 0.1,
+            "reg_lambda": 1.0,
+            "random_state": 42,
+        }
+
+        if self.gpu_id is not None:
+            params["device"] = f"cuda:{self.gpu_id}"
+
+        return params
+
     def train(self, X, y, feature_names):
         """
         Train XGBoost model with GPU acceleration
         """
         logger.info("Starting XGBoost training...")
 
-        # Configure XGBoost params
         if self.gpu_id is not None:
             logger.info(f"Using GPU: {self.gpu_id}")
-            params = {
-                "objective": "reg:squarederror",
-                "tree_method": "hist",
-                "device": f"cuda:{self.gpu_id}",
-                "max_depth": 6,
-                "learning_rate": 0.01,
-                "n_estimators": 1000,
-                "subsample": 0.8,
-                "colsample_bytree": 0.8,
-                "reg_alpha": 0.1,
-                "reg_lambda": 1.0,
-                "random_state": 42,
-            }
         else:
             logger.info("Using CPU")
-            params = {
-                "objective": "reg:squarederror",
-                "tree_method": "hist",
-                "max_depth": 6,
-                "learning_rate": 0.01,
-                "n_estimators": 1000,
-                "subsample": 0.8,
-                "colsample_bytree": 0.8,
-                "reg_alpha": 0.1,
-                "reg_lambda": 1.0,
-                "random_state": 42,
-            }
+        params = self.get_xgboost_params()
 
         # Train model
         model = xgb.XGBRegressor(**params)
@@ -138,6 +132,49 @@ class OptimizedXGBoostTrainer:
 
         return model, importance
 
+    def train_streaming(
+        self,
+        start_date: date,
+        end_date: date,
+        source: str = "cache",
+        external_memory: bool = False,
+        fill_value: float = SERVING_FILL_VALUE,
+    ):
+        """
+        Train without materializing the training set (ml_models/xgb_streaming.py)
+
+        Chunks from the local cache (or the database) are quantized into a
+        QuantileDMatrix, or an on-disk ExtMemQuantileDMatrix with
+        external_memory. Missing values are filled with 0, as the in-memory
+        path and MLPortfolioManager scoring do.
+
+        Returns:
+            (booster, importance, metrics, feature_names)
+        """
+        cache_prefix = None
+        if external_memory:
+            require_external_memory()
+            cache_prefix = str(Path("models/xgboost_optimized/.xgb_cache").resolve())
+            Path(cache_prefix).parent.mkdir(parents=True, exist_ok=True)
+
+        chunk_iter = CacheChunkIter if source == "cache" else DatabaseChunkIter
+        chunks = chunk_iter(start_date, end_date, fill_value=fill_value, cache_prefix=cache_prefix)
+        logger.info(
+            f"Streaming {len(chunks.feature_names)} features from the {source} "
+            f"({'NaN handled by XGBoost' if fill_value is None else f'NaN -> {fill_value}'})"
+        )
+
+        booster, metrics, importance = train_streaming(chunks, self.get_xgboost_params())
+
+        logger.info(f"Training samples: {metrics['rows']:,}")
+        logger.info(f"Pearson correlation: {metrics['pearson']:.4f}")
+        logger.info(f"Spearman correlation (IC): {metrics['spearman_ic']:.4f}")
+        logger.info("\nTop 20 features:")
+        logger.info(importance.head(20).to_string())
+
+        importance.to_csv("ml_models/feature_importance/feature_importance.csv", index=False)
+        return booster, importance, metrics, chunks.feature_names
+
     def evaluate(self, model, X, y):
         """
         Evaluate model performance
@@ -154,7 +191,7 @@ class OptimizedXGBoostTrainer:
         logger.info(f"Pearson correlation: {corr:.4f}")
         logger.info(f"Spearman correlation (IC): {spearman_corr:.4f}")
 
-        return {"pearson": corr, "spearman": spearman_corr, "predictions": y_pred}
+        return {"pearson": corr, "spearman_ic": spearman_corr, "predictions": y_pred}
 
     def save_model(self, model, feature_names):
         """
@@ -184,6 +221,23 @@ def main():
     parser.add_argument("--end-date", type=str, default="2025-10-30")
     parser.add_argument("--horizon", type=int, default=20, help="Forward return horizon (days)")
     parser.add_argument("--gpu", type=int, default=None, help="GPU ID (omit for CPU)")
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Stream chunks into a QuantileDMatrix instead of loading a DataFrame",
+    )
+    parser.add_argument(
+        "--source",
+        type=str,
+        default="cache",
+        choices=["cache", "database"],
+        help="Streaming source",
+    )
+    parser.add_argument(
+        "--external-memory",
+        action="store_true",
+        help="Streaming: keep the matrix on disk (requires xgboost>=3.0)",
+    )
 
     args = parser.parse_args()
 
@@ -200,17 +254,25 @@ def main():
     # Initialize trainer
     trainer = OptimizedXGBoostTrainer(gpu_id=args.gpu, target_horizon_days=args.horizon)
 
-    # Load data from materialized view (FAST!)
-    df = trainer.load_features_from_view(start_date=args.start_date, end_date=args.end_date)
+    if args.streaming:
+        model, importance, results, feature_names = trainer.train_streaming(
+            date.fromisoformat(args.start_date),
+            date.fromisoformat(args.end_date),
+            source=args.source,
+            external_memory=args.external_memory,
+        )
+    else:
+        # Load data from materialized view (FAST!)
+        df = trainer.load_features_from_view(start_date=args.start_date, end_date=args.end_date)
 
-    # Prepare training data
-    X, y, feature_names = trainer.prepare_training_data(df)
+        # Prepare training data
+        X, y, feature_names = trainer.prepare_training_data(df)
 
-    # Train model
-    model, importance = trainer.train(X, y, feature_names)
+        # Train model
+        model, importance = trainer.train(X, y, feature_names)
 
-    # Evaluate
-    results = trainer.evaluate(model, X, y)
+        # Evaluate
+        results = trainer.evaluate(model, X, y)
 
     # Save model
     trainer.save_model(model, feature_names)
@@ -218,7 +280,7 @@ def main():
     logger.info("============================================================")
     logger.info("✅ TRAINING COMPLETE!")
     logger.info("============================================================")
-    logger.info(f"Spearman IC: {results['spearman']:.4f}")
+    logger.info(f"Spearman IC: {results['spearman_ic']:.4f}")
     logger.info("Model saved to: models/xgboost_optimized/")
     logger.info("Feature importance saved to: ml_models/feature_importance/feature_importance.csv")
     logger.info("============================================================")
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Local Training-Data Cache
+
+Keeps a snapshot of ml_training_features on local disk as one Parquet file
+per month, so trainers read their date range and columns from memory-mapped
+columnar files instead of pulling millions of rows through pd.read_sql:
+
+    <cache_dir>/month=2024-06.parquet
+    <cache_dir>/_manifest.json          # watermark, columns, rows per month
+
+Numeric columns are stored as float32 (about half the size of the float64
+frames read_sql builds from NUMERIC columns).
+
+Refresh is incremental by watermark: when MAX(date) in the view moves past
+the cached watermark, the months from (cached watermark - REFETCH_DAYS)
+onward are re-read. That covers the new dates and the target_return values
+feature_store.py back-fills for the last BACKFILL_LOOKBACK_DAYS. After
+feature_store.py --rebuild-from, run with --rebuild.
+
+Trainers call load_training_features(), which refreshes first if the view
+has new dates (one MAX(date) query otherwise). Refreshes take a file lock, so
+trainers started together wait for a single refresh.
+
+Usage:
+    python ml_models/training_data.py              # refresh
+    python ml_models/training_data.py --rebuild    # re-read everything
+    python ml_models/training_data.py --info
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import fcntl
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from ml_models.feature_store import BACKFILL_LOOKBACK_DAYS
+from utils import get_logger, get_psycopg2_connection
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+TRAINING_DATA_DIR = Path(
+    os.getenv("TRAINING_DATA_DIR", str(PROJECT_ROOT / "data" / "training_cache"))
+)
+SOURCE = "ml_training_features"
+KEY_COLUMNS = ["ticker", "date"]
+# Calendar days before the cached watermark that are re-read on refresh
+REFETCH_DAYS = BACKFILL_LOOKBACK_DAYS + 5
+
+MANIFEST = "_manifest.json"
+
+
+def as_date(value) -> date:
+    """date from a date or ISO string (callers pass CLI arguments through)"""
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def to_float32(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast every numeric column (including psycopg2 Decimals) other than the keys to float32"""
+    for column in df.columns:
+        if column in KEY_COLUMNS:
+            continue
+        values = df[column]
+        if values.dtype == object:
+            sample = values.dropna()
+            if not sample.empty and not isinstance(
+                sample.iloc[0], (Decimal, int, float, bool, np.number)
+            ):
+                continue  # text column, kept as is
+        df[column] = pd.to_numeric(values, errors="coerce").astype(np.float32)
+    return df
+
+
+class TrainingDataCache:
+    """
+    Month-partitioned Parquet snapshot of ml_training_features
+
+    Args:
+        cache_dir: Directory holding the month files and manifest
+        source: Table or view to snapshot
+    """
+
+    def __init__(self, cache_dir: Path = TRAINING_DATA_DIR, source: str = SOURCE):
+        self.cache_dir = Path(cache_dir)
+        self.source = source
+
+    # -- database ----------------------------------------------------------
+
+    def db_bounds(self) -> Tuple[Optional[date], Optional[date]]:
+        """First and last date in the source"""
+        with get_psycopg2_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"SELECT MIN(date), MAX(date) FROM {self.source}")
+                return cur.fetchone()
+
+    def fetch_rows(self, start: date, end: date) -> pd.DataFrame:
+        """Source rows with start <= date < end, ordered by date and ticker"""
+        with get_psycopg2_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"""
+                    SELECT * FROM {self.source}
+                    WHERE date >= %(start)s AND date < %(end)s
+                    ORDER BY date, ticker
+                    """,
+                    {"start": start, "end": end},
+                )
+                columns = [d[0] for d in cur.description]
+                return pd.DataFrame(cur.fetchall(), columns=columns)
+
+    # -- files -------------------------------------------------------------
+
+    def month_path(self, month: date) -> Path:
+        return self.cache_dir / f"month={month:%Y-%m}.parquet"
+
+    def read_manifest(self) -> Optional[Dict]:
+        path = self.cache_dir / MANIFEST
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def watermark(self) -> Optional[date]:
+        """Latest date in the cache"""
+        manifest = self.read_manifest()
+        return date.fromisoformat(manifest["watermark"]) if manifest else None
+
+    def _write_atomic(self, path: Path, write):
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        write(tmp)
+        tmp.replace(path)
+
+    @contextmanager
+    def _lock(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_dir / ".lock", "w") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    # -- refresh -----------------------------------------------------------
+
+    def refresh(self, rebuild: bool = False) -> Dict:
+        """
+        Bring the cache up to the source's watermark
+
+        Args:
+            rebuild: Re-read every month instead of only the trailing ones
+
+        Returns:
+            Stats: months written, rows and the new watermark
+        """
+        with self._lock():
+            first, last = self.db_bounds()
+            if last is None:
+                logger.warning(f"{self.source} is empty, nothing to cache")
+                return {"months": 0, "rows": 0, "watermark": None}
+
+            manifest = None if rebuild else self.read_manifest()
+            cached = date.fromisoformat(manifest["watermark"]) if manifest else None
+
+            if cached is not None and cached == last:
+                return {"months": 0, "rows": 0, "watermark": str(last)}
+            if cached is None or cached > last:
+                since = month_start(first)
+                months: Dict[str, int] = {}
+                for stale in self.cache_dir.glob("month=*.parquet"):
+                    stale.unlink()
+            else:
+                since = month_start(cached - timedelta(days=REFETCH_DAYS))
+                months = dict(manifest["months"])
+
+            started = time.time()
+            columns = manifest["columns"] if manifest else None
+            total = written = 0
+            month = since
+            while month <= last:
+                df = to_float32(self.fetch_rows(month, next_month(month)))
+                key = f"{month:%Y-%m}"
+                path = self.month_path(month)
+                if df.empty:
+                    months.pop(key, None)
+                    path.unlink(missing_ok=True)
+                else:
+                    if columns is not None and list(df.columns) != columns:
+                        raise RuntimeError(
+                            f"{self.source} columns changed since the last refresh; "
+                            f"run with --rebuild"
+                        )
+                    columns = list(df.columns)
+                    table = pa.Table.from_pandas(df, preserve_index=False)
+                    self._write_atomic(path, lambda tmp: pq.write_table(table, tmp))
+                    months[key] = len(df)
+                    total += len(df)
+                written += 1
+                month = next_month(month)
+
+            manifest = {
+                "source": self.source,
+                "watermark": str(last),
+                "columns": columns,
+                "months": dict(sorted(months.items())),
+                "refreshed_at": datetime.now().isoformat(),
+            }
+            self._write_atomic(
+                self.cache_dir / MANIFEST,
+                lambda tmp: tmp.write_text(json.dumps(manifest, indent=2)),
+            )
+
+        logger.info(
+            f"Training data cache refreshed: {written} months, {total:,} rows from {since} "
+            f"through {last} in {time.time() - started:.1f}s"
+        )
+        return {"months": written, "rows": total, "watermark": str(last)}
+
+    def ensure_fresh(self) -> Optional[date]:
+        """Refresh if the source has dates past the cached watermark; returns the watermark"""
+        _, last = self.db_bounds()
+        cached = self.watermark()
+        if last is not None and cached != last:
+            self.refresh()
+            cached = self.watermark()
+        return cached
+
+    # -- load --------------------------------------------------------------
+
+    def month_files(self, start_date: date, end_date: date) -> List[Path]:
+        """Cached month files overlapping [start_date, end_date], in date order"""
+        start_date, end_date = as_date(start_date), as_date(end_date)
+        manifest = self.read_manifest() or {"months": {}}
+        paths = []
+        month = month_start(start_date)
+        while month <= end_date:
+            if f"{month:%Y-%m}" in manifest["months"]:
+                paths.append(self.month_path(month))
+            month = next_month(month)
+        return paths
+
+    def feature_columns(self) -> List[str]:
+        """Cached columns other than ticker, date and target_return"""
+        manifest = self.read_manifest() or {"columns": []}
+        return [c for c in manifest["columns"] if c not in KEY_COLUMNS + ["target_return"]]
+
+    def _read(self, paths, start_date, end_date, columns, min_price, require_target) -> pa.Table:
+        start_date, end_date = as_date(start_date), as_date(end_date)
+        condition = (pc.field("date") >= pa.scalar(start_date)) & (
+            pc.field("date") <= pa.scalar(end_date)
+        )
+        if require_target:
+            condition &= pc.field("target_return").is_valid()
+        if min_price is not None:
+            condition &= pc.field("close") >= min_price
+
+        return pq.read_table(
+            [str(p) for p in paths], columns=columns, filters=condition, memory_map=True
+        )
+
+    def load(
+        self,
+        start_date: date,
+        end_date: date,
+        columns: Optional[List[str]] = None,
+        min_price: Optional[float] = None,
+        require_target: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Rows with start_date <= date <= end_date, ordered by date and ticker
+
+        Args:
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+            columns: Columns to read (None = all)
+            min_price: Only rows with close >= min_price
+            require_target: Only rows with a target_return
+
+        Returns:
+            DataFrame with float32 feature columns
+        """
+        paths = self.month_files(start_date, end_date)
+        if not paths:
+            manifest = self.read_manifest() or {"columns": []}
+            return pd.DataFrame(columns=columns or manifest["columns"])
+
+        table = self._read(paths, start_date, end_date, columns, min_price, require_target)
+        return table.to_pandas()
+
+    def load_arrays(
+        self,
+        start_date: date,
+        end_date: date,
+        feature_names: List[str],
+        min_price: Optional[float] = None,
+        paths: Optional[List[Path]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (X, y) float32 arrays of the rows with a target_return, without a DataFrame
+
+        Missing feature values stay NaN. X is C-ordered, one column per
+        feature_names entry.
+        """
+        paths = self.month_files(start_date, end_date) if paths is None else paths
+        if not paths:
+            return np.empty((0, len(feature_names)), np.float32), np.empty(0, np.float32)
+
+        table = self._read(
+            paths, start_date, end_date, feature_names + ["target_return"], min_price, True
+        )
+        X = np.empty((table.num_rows, len(feature_names)), dtype=np.float32)
+        for j, name in enumerate(feature_names):
+            X[:, j] = table.column(name).to_numpy()
+        y = table.column("target_return").to_numpy().astype(np.float32, copy=False)
+        return X, y
+
+
+# Singleton instance
+_training_data_instance = None
+
+
+def get_training_data_cache() -> TrainingDataCache:
+    """Get or create singleton TrainingDataCache instance."""
+    global _training_data_instance
+    if _training_data_instance is None:
+        _training_data_instance = TrainingDataCache()
+    return _training_data_instance
+
+
+def load_training_features(
+    start_date: date,
+    end_date: date,
+    columns: Optional[List[str]] = None,
+    min_price: Optional[float] = None,
+    require_target: bool = True,
+) -> pd.DataFrame:
+    """
+    ml_training_features rows for a date range from the local cache
+
+    Refreshes the cache first if the view has new dates. Same rows and order
+    as SELECT * ... WHERE date BETWEEN ... [AND target_return IS NOT NULL]
+    [AND close >= min_price] ORDER BY date, ticker, with float32 features.
+    """
+    cache = get_training_data_cache()
+    cache.ensure_fresh()
+    return cache.load(
+        start_date,
+        end_date,
+        columns=columns,
+        min_price=min_price,
+        require_target=require_target,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the local ml_training_features cache")
+    parser.add_argument("--rebuild", action="store_true", help="Re-read every month")
+    parser.add_argument("--info", action="store_true", help="Show the cache manifest and exit")
+    args = parser.parse_args()
+
+    cache = get_training_data_cache()
+    if args.info:
+        manifest = cache.read_manifest()
+        if manifest is None:
+            logger.info(f"No cache at {cache.cache_dir}")
+            return
+        size = sum(p.stat().st_size for p in cache.cache_dir.glob("month=*.parquet"))
+        logger.info(
+            f"{cache.cache_dir}: {len(manifest['months'])} months, "
+            f"{sum(manifest['months'].values()):,} rows, {size / 1e6:.0f} MB, "
+            f"watermark {manifest['watermark']}, refreshed {manifest['refreshed_at']}"
+        )
+        return
+
+    stats = cache.refresh(rebuild=args.rebuild)
+    logger.info(f"Training data cache: {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+"""
+Parallel Walk-Forward Training and Evaluation
+
+Produces the walk-forward results ml_models/model_evaluation.py reads
+(load_walk_forward_results, plot_ic_over_time, analyze_feature_importance_drift)
+without retraining one window at a time in one process:
+
+1. Load ml_training_features once from the training-data cache, month by
+   month, into a float32 feature matrix on disk (features.npy, target.npy,
+   day_index.npy), rows ordered by date, so every fold's train and test
+   sets are contiguous row ranges
+2. Define folds over the cached trading dates: train_months of history,
+   the last purge_days trading dates dropped (their targets overlap the
+   test window), then test_months of test, stepping step_months
+3. Train the folds concurrently in a process pool; each worker memory-maps
+   the matrix once and trains on slices of it (no copies, no pickled data)
+4. Per fold: IC, mean per-date IC, quintile spread, RMSE / R², gain feature
+   importance; written as models/walk_forward_results.csv,
+   models/walk_forward/xgboost_<test_start>.json and
+   feature_importance/walk_forward/feature_importance_<test_start>.csv (the
+   previous run's files are removed first, so no stale folds are mixed in)
+
+Usage:
+    python ml_models/walk_forward.py --start-date 2015-01-01 --end-date 2025-10-30
+    python ml_models/walk_forward.py --train-months 36 --test-months 12 --step-months 3
+    python ml_models/walk_forward.py --model growth_smallcap --workers 8
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from dateutil.relativedelta import relativedelta
+from scipy.stats import spearmanr
+
+from ml_models.train_strategy_models import STRATEGY_MODELS, make_trainer
+from ml_models.train_xgboost_optimized import OptimizedXGBoostTrainer
+from ml_models.training_data import (
+    TRAINING_DATA_DIR,
+    TrainingDataCache,
+    as_date,
+    get_training_data_cache,
+    month_start,
+    next_month,
+)
+from ml_models.xgb_streaming import gain_importance, native_params
+from utils import get_logger
+
+logger = get_logger(__name__)
+
+MODELS_DIR = Path(__file__).parent / "models"
+# Walk-forward folds only; the trainers' feature_importance_<strategy>.csv stay one level up
+IMPORTANCE_DIR = Path(__file__).parent / "feature_importance" / "walk_forward"
+
+TARGET_HORIZON_DAYS = 20  # target_return horizon (trading days)
+MIN_NAMES_PER_DATE = 10  # dates with fewer names are left out of per-date IC / quintiles
+
+
+@dataclass
+class Fold:
+    """One walk-forward split: row ranges of the date-ordered feature matrix"""
+
+    split: int
+    train_start: str
+    train_end: str
+    test_start: str
+    test_end: str
+    train_rows: Tuple[int, int]
+    test_rows: Tuple[int, int]
+
+
+def make_folds(
+    days: np.ndarray,
+    day_rows: np.ndarray,
+    train_months: int = 36,
+    test_months: int = 1,
+    step_months: int = 1,
+    purge_days: int = TARGET_HORIZON_DAYS,
+) -> List[Fold]:
+    """
+    Walk-forward folds over the trading dates
+
+    Args:
+        days: Sorted distinct dates of the matrix rows
+        day_rows: Row offset of each date (len(days) + 1 entries)
+        train_months: Training window (calendar months before the test window)
+        test_months: Test window
+        step_months: Step between consecutive folds
+        purge_days: Trading dates dropped from the end of the training window
+
+    Returns:
+        Folds with a non-empty training and test set
+    """
+    folds = []
+    if len(days) == 0:
+        return folds
+
+    last = pd.Timestamp(days[-1])
+    train_start = pd.Timestamp(days[0])
+    while True:
+        test_start = train_start + relativedelta(months=train_months)
+        test_end = test_start + relativedelta(months=test_months)
+        if test_end > last + timedelta(days=1):
+            break
+
+        first_train, first_test, end_test = np.searchsorted(
+            days, [d.date() for d in (train_start, test_start, test_end)]
+        )
+        end_train = max(first_train, first_test - purge_days)
+        if end_train > first_train and end_test > first_test:
+            folds.append(
+                Fold(
+                    split=len(folds) + 1,
+                    train_start=str(days[first_train]),
+                    train_end=str(days[end_train - 1]),
+                    test_start=str(days[first_test]),
+                    test_end=str(days[end_test - 1]),
+                    train_rows=(int(day_rows[first_train]), int(day_rows[end_train])),
+                    test_rows=(int(day_rows[first_test]), int(day_rows[end_test])),
+                )
+            )
+        train_start += relativedelta(months=step_months)
+    return folds
+
+
+def evaluate_fold(y: np.ndarray, y_pred: np.ndarray, day_index: np.ndarray) -> Dict:
+    """
+    Test-set metrics, with the columns model_evaluation.py reads
+
+    information_coefficient is the pooled Spearman IC; mean_monthly_ic, and the
+    quintile returns, are computed per date (cross-sectionally) and averaged.
+    """
+    ic, ic_pvalue = spearmanr(y_pred, y)
+    residual = y - y_pred
+    total = np.sum((y - y.mean()) ** 2)
+
+    daily_ic, top, bottom = [], [], []
+    bounds = np.flatnonzero(np.diff(day_index)) + 1
+    for rows in np.split(np.arange(len(y)), bounds):
+        if len(rows) < MIN_NAMES_PER_DATE:
+            continue
+        daily_ic.append(spearmanr(y_pred[rows], y[rows])[0])
+        quintile = np.argsort(np.argsort(y_pred[rows])) * 5 // len(rows)
+        top.append(y[rows][quintile == 4].mean())
+        bottom.append(y[rows][quintile == 0].mean())
+
+    top_return = float(np.mean(top)) if top else 0.0
+    bottom_return = float(np.mean(bottom)) if bottom else 0.0
+    return {
+        "rmse": float(np.sqrt(np.mean(residual**2))),
+        "r2": float(1 - np.sum(residual**2) / total) if total > 0 else 0.0,
+        "information_coefficient": float(ic),
+        "ic_pvalue": float(ic_pvalue),
+        "mean_monthly_ic": float(np.nanmean(daily_ic)) if daily_ic else 0.0,
+        "n_days": len(daily_ic),
+        "top_quintile_return": top_return,
+        "bottom_quintile_return": bottom_return,
+        "top_minus_bottom": top_return - bottom_return,
+    }
+
+
+def open_matrix(work_dir: Path) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Read-only memory maps of (features, target, day_index)"""
+    return tuple(
+        np.load(work_dir / f"{name}.npy", mmap_mode="r")
+        for name in ("features", "target", "day_index")
+    )
+
+
+def train_fold(
+    arrays: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    fold: Fold,
+    params: Dict,
+    feature_names: List[str],
+    model_dir: Path,
+    nthread: Optional[int] = None,
+    rounds: Optional[int] = None,
+) -> Tuple[Dict, pd.DataFrame]:
+    """Train on the fold's training rows, score its test rows, save the model"""
+    started = time.time()
+    X, y, day_index = arrays
+    train, test = slice(*fold.train_rows), slice(*fold.test_rows)
+
+    dtrain = xgb.QuantileDMatrix(X[train], label=y[train], feature_names=feature_names)
+    train_params, n_estimators = native_params(params)
+    if nthread is not None:
+        train_params["nthread"] = nthread
+    booster = xgb.train(train_params, dtrain, num_boost_round=rounds or n_estimators)
+    del dtrain
+
+    y_pred = booster.inplace_predict(X[test])
+    metrics = evaluate_fold(np.asarray(y[test]), y_pred, np.asarray(day_index[test]))
+
+    model_path = model_dir / f"xgboost_{fold.test_start}.json"
+    booster.save_model(str(model_path))
+
+    result = {
+        **{k: v for k, v in asdict(fold).items() if not k.endswith("_rows")},
+        "model_path": str(model_path),
+        **metrics,
+        "train_samples": fold.train_rows[1] - fold.train_rows[0],
+        "test_samples": fold.test_rows[1] - fold.test_rows[0],
+        "seconds": time.time() - started,
+    }
+    return result, gain_importance(booster, feature_names)
+
+
+# Pool workers memory-map the matrix once (initializer) and train folds on slices of it
+_worker_arrays: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+
+def _open_in_worker(work_dir: str):
+    global _worker_arrays
+    _worker_arrays = open_matrix(Path(work_dir))
+
+
+def _train_in_worker(fold: Fold, *args):
+    return train_fold(_worker_arrays, fold, *args)
+
+
+class WalkForwardEngine:
+    """
+    Walk-forward training over a shared, memory-mapped feature matrix
+
+    Args:
+        train_months: Training window in months
+        test_months: Test window in months
+        step_months: Step between folds in months
+        purge_days: Trading dates between training and test (target horizon)
+        model: STRATEGY_MODELS name whose parameters / min_price to use
+            (None = train_xgboost_optimized.py's model)
+        gpu_id: GPU for every fold (one worker)
+        workers: Parallel worker processes (default: CPU count)
+        rounds: Override n_estimators
+        fill_value: Replace missing features, as the trainers' fillna(0)
+            (None = keep NaN for XGBoost)
+        cache: TrainingDataCache (default: the shared one, refreshed if stale)
+        models_dir: Results CSV directory (where model_evaluation.py reads it)
+        importance_dir: Per-fold feature importance directory (walk-forward files only)
+    """
+
+    def __init__(
+        self,
+        train_months: int = 36,
+        test_months: int = 1,
+        step_months: int = 1,
+        purge_days: int = TARGET_HORIZON_DAYS,
+        model: Optional[str] = None,
+        gpu_id: Optional[int] = None,
+        workers: Optional[int] = None,
+        rounds: Optional[int] = None,
+        fill_value: Optional[float] = 0.0,
+        cache: Optional[TrainingDataCache] = None,
+        models_dir: Path = MODELS_DIR,
+        importance_dir: Path = IMPORTANCE_DIR,
+    ):
+        self.train_months = train_months
+        self.test_months = test_months
+        self.step_months = step_months
+        self.purge_days = purge_days
+        self.rounds = rounds
+        self.fill_value = fill_value
+        self.cache = cache
+        self.models_dir = Path(models_dir)
+        self.importance_dir = Path(importance_dir)
+        self.workers = 1 if gpu_id is not None else max(1, workers or os.cpu_count() or 1)
+
+        if model is None:
+            trainer = OptimizedXGBoostTrainer(gpu_id=gpu_id)
+        else:
+            config = next((c for c in STRATEGY_MODELS if c["name"] == model), None)
+            if config is None:
+                raise ValueError(f"Unknown model: {model}")
+            trainer = make_trainer(config, gpu_id)
+        self.model = model or "xgboost_optimized"
+        self.params = trainer.get_xgboost_params()
+        self.min_price = getattr(trainer, "min_price", None)
+
+    def build_matrix(self, start_date: date, end_date: date, work_dir: Path) -> Dict:
+        """
+        Write the date-ordered feature matrix for [start_date, end_date] to
+        work_dir, one cached month in memory at a time
+
+        Returns:
+            feature_names, days (sorted distinct dates) and day_rows (row offset per date)
+        """
+        cache = self.cache
+        if cache is None:
+            cache = get_training_data_cache()
+            cache.ensure_fresh()
+        start_date, end_date = as_date(start_date), as_date(end_date)
+        feature_names = cache.feature_columns()
+        work_dir = Path(work_dir)
+        work_dir.mkdir(parents=True, exist_ok=True)
+
+        # Pass 1: dates of the selected rows, to size the matrix
+        months, month_dates = [], []
+        for path in cache.month_files(start_date, end_date):
+            first = max(start_date, date.fromisoformat(path.stem.split("=")[1] + "-01"))
+            last = min(end_date, next_month(month_start(first)) - timedelta(days=1))
+            dates = cache.load(first, last, columns=["date"], min_price=self.min_price)["date"]
+            months.append((path, first, last))
+            month_dates.append(pd.to_datetime(dates).dt.date.to_numpy())
+        all_dates = np.concatenate(month_dates) if month_dates else np.empty(0, dtype=object)
+        days, day_index = np.unique(all_dates, return_inverse=True)
+
+        # Pass 2: features and target, month by month
+        n_rows = len(all_dates)
+        X = np.lib.format.open_memmap(
+            work_dir / "features.npy",
+            mode="w+",
+            dtype=np.float32,
+            shape=(n_rows, len(feature_names)),
+        )
+        y = np.lib.format.open_memmap(
+            work_dir / "target.npy", mode="w+", dtype=np.float32, shape=(n_rows,)
+        )
+        offset = 0
+        for path, first, last in months:
+            X_month, y_month = cache.load_arrays(
+                first, last, feature_names, min_price=self.min_price, paths=[path]
+            )
+            if self.fill_value is not None:
+                X_month[np.isnan(X_month)] = self.fill_value
+            X[offset : offset + len(y_month)] = X_month
+            y[offset : offset + len(y_month)] = y_month
+            offset += len(y_month)
+        X.flush()
+        y.flush()
+        del X, y
+        np.save(work_dir / "day_index.npy", day_index.astype(np.int32))
+
+        day_rows = np.searchsorted(day_index, np.arange(len(days) + 1))
+        logger.info(
+            f"Feature matrix: {n_rows:,} rows x {len(feature_names)} features, "
+            f"{len(days):,} dates ({n_rows * len(feature_names) * 4 / 1e9:.1f} GB on disk)"
+        )
+        return {"feature_names": feature_names, "days": days, "day_rows": day_rows}
+
+    def clear_previous_run(self):
+        """Remove the last run's fold models, fold importance files and results CSV"""
+        shutil.rmtree(self.models_dir / "walk_forward", ignore_errors=True)
+        shutil.rmtree(self.importance_dir, ignore_errors=True)
+        (self.models_dir / "walk_forward_results.csv").unlink(missing_ok=True)
+
+    def train_folds(
+        self, folds: List[Fold], feature_names: List[str], work_dir: Path
+    ) -> List[Tuple[Dict, pd.DataFrame]]:
+        """Train every fold (in parallel with workers > 1); failed folds are logged and skipped"""
+        model_dir = self.models_dir / "walk_forward"
+        model_dir.mkdir(parents=True, exist_ok=True)
+        workers = min(self.workers, len(folds)) or 1
+        nthread = max(1, (os.cpu_count() or 1) // workers)
+        args = (self.params, feature_names, model_dir, nthread, self.rounds)
+
+        def report(fold: Fold, outcome: Tuple[Dict, pd.DataFrame]):
+            result, _ = outcome
+            logger.info(
+                f"Split {fold.split}/{len(folds)} (test {fold.test_start} to {fold.test_end}): "
+                f"IC {result['information_coefficient']:.4f}, "
+                f"spread {result['top_minus_bottom']:.2%} in {result['seconds']:.1f}s"
+            )
+
+        outcomes = []
+        if workers == 1:
+            arrays = open_matrix(work_dir)
+            for fold in folds:
+                try:
+                    outcomes.append(train_fold(arrays, fold, *args))
+                    report(fold, outcomes[-1])
+                except Exception as e:
+                    logger.error(f"Error in split {fold.split}: {str(e)}")
+            return outcomes
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_open_in_worker,
+            initargs=(str(work_dir),),
+        ) as pool:
+            futures = [(fold, pool.submit(_train_in_worker, fold, *args)) for fold in folds]
+            for fold, future in futures:
+                try:
+                    outcomes.append(future.result())
+                    report(fold, outcomes[-1])
+                except Exception as e:
+                    logger.error(f"Error in split {fold.split}: {str(e)}")
+        return outcomes
+
+    def save_results(self, outcomes: List[Tuple[Dict, pd.DataFrame]]) -> pd.DataFrame:
+        """Write walk_forward_results.csv and one feature importance CSV per fold"""
+        results = pd.DataFrame([result for result, _ in outcomes])
+        if results.empty:
+            logger.warning("No results to save")
+            return results
+
+        self.importance_dir.mkdir(parents=True, exist_ok=True)
+        for result, importance in outcomes:
+            importance.to_csv(
+                self.importance_dir / f"feature_importance_{result['test_start']}.csv", index=False
+            )
+
+        results = results.sort_values("split").reset_index(drop=True)
+        results.insert(1, "model", self.model)
+        self.models_dir.mkdir(parents=True, exist_ok=True)
+        results_path = self.models_dir / "walk_forward_results.csv"
+        results.to_csv(results_path, index=False)
+        logger.info(f"Results saved: {results_path}")
+        return results
+
+    def run(
+        self, start_date: date, end_date: date, work_dir: Optional[Path] = None
+    ) -> pd.DataFrame:
+        """
+        Build the matrix, train and evaluate every fold, write the result files
+
+        Args:
+            start_date: First date of the first training window
+            end_date: Last date of the last test window
+            work_dir: Where to write the feature matrix (default: a temporary
+                directory next to the training-data cache, removed afterwards)
+
+        Returns:
+            One row per fold (the walk_forward_results.csv contents)
+        """
+        started = time.time()
+        temporary = work_dir is None
+        if temporary:
+            TRAINING_DATA_DIR.mkdir(parents=True, exist_ok=True)
+            work_dir = Path(tempfile.mkdtemp(prefix="walk_forward_", dir=TRAINING_DATA_DIR))
+        work_dir = Path(work_dir)
+
+        try:
+            matrix = self.build_matrix(start_date, end_date, work_dir)
+            folds = make_folds(
+                matrix["days"],
+                matrix["day_rows"],
+                self.train_months,
+                self.test_months,
+                self.step_months,
+                self.purge_days,
+            )
+            logger.info(
+                f"{len(folds)} folds ({self.train_months}m train, {self.test_months}m test, "
+                f"{self.step_months}m step, {self.purge_days}-day purge) on "
+                f"{min(self.workers, len(folds) or 1)} workers; matrix built in "
+                f"{time.time() - started:.1f}s"
+            )
+            self.clear_previous_run()
+            outcomes = self.train_folds(folds, matrix["feature_names"], work_dir)
+        finally:
+            if temporary:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+        results = self.save_results(outcomes)
+        logger.info(
+            f"Walk-forward: {len(results)}/{len(folds)} folds in {time.time() - started:.1f}s"
+        )
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel walk-forward training and evaluation")
+    parser.add_argument("--start-date", type=str, default="2015-01-01")
+    parser.add_argument("--end-date", type=str, default="2025-10-30")
+    parser.add_argument("--train-months", type=int, default=36, help="Training window in months")
+    parser.add_argument("--test-months", type=int, default=1, help="Test window in months")
+    parser.add_argument("--step-months", type=int, default=1, help="Step size in months")
+    parser.add_argument(
+        "--purge-days",
+        type=int,
+        default=TARGET_HORIZON_DAYS,
+        help="Trading days dropped between training and test (target horizon)",
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default=None,
+        choices=[c["name"] for c in STRATEGY_MODELS],
+        help="Strategy model parameters / universe (default: train_xgboost_optimized.py)",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all)")
+    parser.add_argument("--gpu", type=int, default=None, help="GPU ID (omit for CPU)")
+    parser.add_argument("--n-estimators", type=int, default=None, help="Override boosting rounds")
+    parser.add_argument(
+        "--keep-nan",
+        action="store_true",
+        help="Leave missing features to XGBoost instead of fillna(0)",
+    )
+    parser.add_argument(
+        "--work-dir", type=str, default=None, help="Keep the feature matrix in this directory"
+    )
+    args = parser.parse_args()
+
+    logger.info("=" * 80)
+    logger.info("WALK-FORWARD TRAINING")
+    logger.info("=" * 80)
+    logger.info(f"Period: {args.start_date} to {args.end_date}")
+    logger.info(f"Model: {args.model or 'xgboost_optimized'}")
+    logger.info(f"GPU: {args.gpu if args.gpu is not None else 'CPU'}")
+    logger.info("=" * 80)
+
+    engine = WalkForwardEngine(
+        train_months=args.train_months,
+        test_months=args.test_months,
+        step_months=args.step_months,
+        purge_days=args.purge_days,
+        model=args.model,
+        gpu_id=args.gpu,
+        workers=args.workers,
+        rounds=args.n_estimators,
+        fill_value=None if args.keep_nan else 0.0,
+    )
+    results = engine.run(
+        date.fromisoformat(args.start_date),
+        date.fromisoformat(args.end_date),
+        work_dir=Path(args.work_dir) if args.work_dir else None,
+    )
+    if results.empty:
+        return
+
+    logger.info("=" * 80)
+    logger.info("WALK-FORWARD TRAINING SUMMARY")
+    logger.info("=" * 80)
+    logger.info(f"Total Splits: {len(results)}")
+    logger.info(f"Information Coefficient: {results['information_coefficient'].mean():.4f}")
+    logger.info(f"Mean Daily IC: {results['mean_monthly_ic'].mean():.4f}")
+    logger.info(f"Top - Bottom Spread: {results['top_minus_bottom'].mean():.2%}")
+    logger.info(
+        f"IC Min / Max / Std: {results['information_coefficient'].min():.4f} / "
+        f"{results['information_coefficient'].max():.4f} / "
+        f"{results['information_coefficient'].std():.4f}"
+    )
+    logger.info("Analyze with: python ml_models/model_evaluation.py")
+    logger.info("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Memory-Bounded XGBoost Training
+
+Streams the training set into XGBoost chunk by chunk instead of building a
+pandas frame, filling it (fillna(0) copies it) and letting XGBRegressor.fit
+convert it again. Peak memory is the quantized matrix plus one chunk:
+
+- CacheChunkIter: one month of the training-data cache at a time
+  (ml_models/training_data.py), read straight into float32 arrays
+- DatabaseChunkIter: fixed-size row chunks from ml_training_features
+  through a server-side cursor (each pass re-runs the query)
+- build_dmatrix: xgb.QuantileDMatrix from the iterator (about one byte per
+  value at 256 bins), or ExtMemQuantileDMatrix on disk when the iterator has
+  a cache_prefix (external memory needs xgboost >= 3.0; in-memory streaming
+  works on 2.x)
+- train_streaming: xgb.train on it, then predicts chunk by chunk for the
+  in-sample IC
+
+Missing values are passed as NaN unless fill_value is given. The trainers
+always pass fill_value=0.0: MLPortfolioManager and incremental updates score
+with fillna(0), so a model trained on NaN would see different inputs at
+serving time.
+
+Used by train_xgboost_optimized.py --streaming and incremental_train_xgboost.py
+--streaming; tests/performance/bench_xgb_memory.py compares peak RSS.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from scipy.stats import spearmanr
+
+from ml_models.training_data import SOURCE, TrainingDataCache, as_date, get_training_data_cache
+from utils import get_logger, get_psycopg2_connection
+
+logger = get_logger(__name__)
+
+EXCLUDE_COLUMNS = ["ticker", "date", "target_return"]
+DB_CHUNK_ROWS = 250_000
+
+# XGBRegressor keyword -> native xgb.train parameter
+NATIVE_PARAMS = {"reg_alpha": "alpha", "reg_lambda": "lambda", "random_state": "seed"}
+
+# Missing-value fill shared with serving (MLPortfolioManager.score_features: fillna(0))
+SERVING_FILL_VALUE = 0.0
+
+
+def require_external_memory():
+    """Raise unless the installed xgboost has ExtMemQuantileDMatrix (3.0+)"""
+    if not hasattr(xgb, "ExtMemQuantileDMatrix"):
+        raise RuntimeError(
+            f"External-memory training needs xgboost>=3.0 (installed: {xgb.__version__}); "
+            "upgrade xgboost or train without --external-memory"
+        )
+
+
+def native_params(params: Dict) -> Tuple[Dict, int]:
+    """XGBRegressor parameters -> (xgb.train params, boosting rounds)"""
+    params = dict(params)
+    rounds = params.pop("n_estimators")
+    return {NATIVE_PARAMS.get(k, k): v for k, v in params.items()}, rounds
+
+
+def gain_importance(booster: xgb.Booster, feature_names: List[str]) -> pd.DataFrame:
+    """Normalized gain per feature, as XGBRegressor.feature_importances_ reports it"""
+    gain = booster.get_score(importance_type="gain")
+    total = sum(gain.values()) or 1.0
+    return pd.DataFrame(
+        {
+            "feature": feature_names,
+            "importance": [gain.get(name, 0.0) / total for name in feature_names],
+        }
+    ).sort_values("importance", ascending=False)
+
+
+class ChunkIter(xgb.DataIter, ABC):
+    """
+    DataIter over (X, y) float32 chunks from chunks()
+
+    Args:
+        feature_names: Feature columns, in X column order
+        fill_value: Replace missing values (None = keep NaN for XGBoost)
+        cache_prefix: On-disk cache path for external memory (None = in memory)
+    """
+
+    def __init__(
+        self,
+        feature_names: List[str],
+        fill_value: Optional[float] = None,
+        cache_prefix: Optional[str] = None,
+    ):
+        self.feature_names = feature_names
+        self.fill_value = fill_value
+        self.rows = 0
+        self._chunks: Optional[Iterator] = None
+        # DataIter.__init__ first: its __del__ runs even if the check below raises
+        super().__init__(cache_prefix=cache_prefix)
+        if cache_prefix:
+            require_external_memory()
+
+    @abstractmethod
+    def chunks(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """One pass over the training rows as (X, y) float32 chunks"""
+
+    def arrays(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Non-empty chunks with fill_value applied"""
+        for X, y in self.chunks():
+            if len(y) == 0:
+                continue
+            if self.fill_value is not None:
+                X[np.isnan(X)] = self.fill_value
+            yield X, y
+
+    def next(self, input_data) -> bool:
+        if self._chunks is None:
+            self._chunks = self.arrays()
+            self.rows = 0
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            return False
+        X, y = chunk
+        self.rows += len(y)
+        input_data(data=X, label=y, feature_names=self.feature_names)
+        return True
+
+    def reset(self):
+        if self._chunks is not None:
+            self._chunks.close()
+        self._chunks = None
+
+
+class CacheChunkIter(ChunkIter):
+    """
+    Training-data cache rows with a target, one month per chunk
+
+    Args:
+        start_date: First date (inclusive)
+        end_date: Last date (inclusive)
+        min_price: Only rows with close >= min_price
+        cache: TrainingDataCache (default: the shared one, refreshed if stale)
+    """
+
+    def __init__(
+        self,
+        start_date: date,
+        end_date: date,
+        min_price: Optional[float] = None,
+        cache: Optional[TrainingDataCache] = None,
+        feature_names: Optional[List[str]] = None,
+        fill_value: Optional[float] = None,
+        cache_prefix: Optional[str] = None,
+    ):
+        if cache is None:
+            cache = get_training_data_cache()
+            cache.ensure_fresh()
+        self.cache = cache
+        self.start_date, self.end_date = as_date(start_date), as_date(end_date)
+        self.min_price = min_price
+        super().__init__(feature_names or cache.feature_columns(), fill_value, cache_prefix)
+
+    def chunks(self):
+        for path in self.cache.month_files(self.start_date, self.end_date):
+            yield self.cache.load_arrays(
+                self.start_date,
+                self.end_date,
+                self.feature_names,
+                min_price=self.min_price,
+                paths=[path],
+            )
+
+
+class DatabaseChunkIter(ChunkIter):
+    """
+    ml_training_features rows with a target, DB_CHUNK_ROWS per chunk, read
+    through a server-side cursor (for hosts without the local cache)
+    """
+
+    def __init__(
+        self,
+        start_date: date,
+        end_date: date,
+        min_price: Optional[float] = None,
+        feature_names: Optional[List[str]] = None,
+        chunk_rows: int = DB_CHUNK_ROWS,
+        fill_value: Optional[float] = None,
+        cache_prefix: Optional[str] = None,
+        source: str = SOURCE,
+    ):
+        self.start_date, self.end_date = as_date(start_date), as_date(end_date)
+        self.min_price = min_price
+        self.chunk_rows = chunk_rows
+        self.source = source
+        if feature_names is None:
+            with get_psycopg2_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(f"SELECT * FROM {source} LIMIT 0")
+                    feature_names = [d[0] for d in cur.description if d[0] not in EXCLUDE_COLUMNS]
+        super().__init__(feature_names, fill_value, cache_prefix)
+
+    def chunks(self):
+        # numpy reads psycopg2's Decimal / float / bool / None values as float32 / NaN
+        columns = ", ".join(self.feature_names)
+        query = f"""
+            SELECT {columns}, target_return
+            FROM {self.source}
+            WHERE date >= %(start_date)s AND date <= %(end_date)s
+              AND target_return IS NOT NULL
+              AND close >= %(min_price)s
+            ORDER BY date, ticker
+        """
+        params = {
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "min_price": self.min_price if self.min_price is not None else float("-inf"),
+        }
+        with get_psycopg2_connection() as conn:
+            with conn.cursor(name="xgb_training_chunks") as cur:
+                cur.itersize = self.chunk_rows
+                cur.execute(query, params)
+                while True:
+                    rows = cur.fetchmany(self.chunk_rows)
+                    if not rows:
+                        break
+                    block = np.array(rows, dtype=np.float32)
+                    yield np.ascontiguousarray(block[:, :-1]), block[:, -1].copy()
+
+
+def build_dmatrix(chunks: ChunkIter, max_bin: int = 256) -> xgb.DMatrix:
+    """Quantized DMatrix from the iterator: in memory, or on disk if it has a cache_prefix"""
+    if chunks.cache_prefix:
+        return xgb.ExtMemQuantileDMatrix(chunks, max_bin=max_bin)
+    return xgb.QuantileDMatrix(chunks, max_bin=max_bin)
+
+
+def predict_chunks(booster: xgb.Booster, chunks: ChunkIter) -> Tuple[np.ndarray, np.ndarray]:
+    """(y, predictions) over every chunk, one chunk in memory at a time"""
+    ys, preds = [], []
+    for X, y in chunks.arrays():
+        ys.append(y)
+        preds.append(booster.inplace_predict(X))
+    if not ys:
+        return np.empty(0, np.float32), np.empty(0, np.float32)
+    return np.concatenate(ys), np.concatenate(preds)
+
+
+def train_streaming(
+    chunks: ChunkIter, params: Dict, rounds: Optional[int] = None
+) -> Tuple[xgb.Booster, Dict, pd.DataFrame]:
+    """
+    Train on the streamed training set
+
+    Args:
+        chunks: Chunk iterator over the training rows
+        params: XGBRegressor-style parameters (the trainers' get_xgboost_params)
+        rounds: Override n_estimators
+
+    Returns:
+        (booster, in-sample metrics, feature importance)
+    """
+    dtrain = build_dmatrix(chunks, max_bin=params.get("max_bin", 256))
+    logger.info(
+        f"Quantized {dtrain.num_row():,} rows x {dtrain.num_col()} features "
+        f"({'external memory' if chunks.cache_prefix else 'in memory'})"
+    )
+
+    train_params, n_estimators = native_params(params)
+    booster = xgb.train(train_params, dtrain, num_boost_round=rounds or n_estimators)
+    del dtrain
+
+    y, y_pred = predict_chunks(booster, chunks)
+    spearman_ic, _ = spearmanr(y, y_pred)
+    metrics = {
+        "pearson": float(np.corrcoef(y, y_pred)[0, 1]),
+        "spearman_ic": float(spearman_ic),
+        "rows": len(y),
+    }
+    return booster, metrics, gain_importance(booster, chunks.feature_names)
@@ -5,8 +5,9 @@ Integrates with existing ACIS AI training pipeline
 
 import os
 import sys
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from pathlib import Path
+from typing import Optional
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -22,8 +23,20 @@ from sklearn.model_selection import train_test_split
 from mlops.mlflow.mlflow_client import ACISMLflowClient
 
 
-def load_training_data(conn_string: str, strategy: str = "growth") -> pd.DataFrame:
-    """Load training data from database"""
+def load_training_data(conn_string: Optional[str], strategy: str = "growth") -> pd.DataFrame:
+    """
+    Load training data: from the local ml_training_features cache
+    (ml_models/training_data.py) unless a connection string is given
+    """
+    if conn_string is None:
+        from ml_models.training_data import load_training_features
+
+        end = date.today()
+        df = load_training_features(end - timedelta(days=730), end, require_target=False)
+        if "strategy" in df.columns:
+            df = df[df["strategy"] == strategy]
+        return df.iloc[::-1].reset_index(drop=True)
+
     import psycopg2
 
     conn = psycopg2.connect(conn_string)
@@ -84,9 +97,7 @@ def train_model_with_mlflow(
     # Load data
     print(f"Loading training data for {strategy} strategy...")
     if db_connection is None:
-        db_connection = os.getenv(
-            "DATABASE_URL", "postgresql://postgres:$@nJose420@localhost:5432/acis-ai"
-        )
+        db_connection = os.getenv("DATABASE_URL")  # unset: local training-data cache
 
     df = load_training_data(db_connection, strategy)
     print(f"Loaded {len(df)} samples")
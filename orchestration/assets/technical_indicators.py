@@ -29,12 +29,12 @@ def sma(context: AssetExecutionContext, daily_bars: dict) -> Output[dict]:
     Depends on: daily_bars
     Windows: 20, 50, 200 days
     """
-    from scripts.update import update_sma
+    from scripts.daily.update_indicators import update_indicators
 
     target_date = date.today() - timedelta(days=1)
     context.log.info(f"Calculating SMA for {target_date}")
 
-    result = update_sma.update_sma(target_date)
+    result = update_indicators(["sma"], through=target_date)["sma"]
 
     context.log.info(f"Calculated SMA for {result['tickers_updated']} tickers")
 
@@ -55,12 +55,12 @@ def ema(context: AssetExecutionContext, daily_bars: dict) -> Output[dict]:
     Depends on: daily_bars
     Windows: 12, 26, 50 days
     """
-    from scripts.update import update_ema
+    from scripts.daily.update_indicators import update_indicators
 
     target_date = date.today() - timedelta(days=1)
     context.log.info(f"Calculating EMA for {target_date}")
 
-    result = update_ema.update_ema(target_date)
+    result = update_indicators(["ema"], through=target_date)["ema"]
 
     context.log.info(f"Calculated EMA for {result['tickers_updated']} tickers")
 
@@ -81,12 +81,12 @@ def rsi(context: AssetExecutionContext, daily_bars: dict) -> Output[dict]:
     Depends on: daily_bars
     Period: 14 days
     """
-    from scripts.update import update_rsi
+    from scripts.daily.update_indicators import update_indicators
 
     target_date = date.today() - timedelta(days=1)
     context.log.info(f"Calculating RSI for {target_date}")
 
-    result = update_rsi.update_rsi(target_date)
+    result = update_indicators(["rsi"], through=target_date)["rsi"]
 
     context.log.info(f"Calculated RSI for {result['tickers_updated']} tickers")
 
@@ -107,12 +107,12 @@ def macd(context: AssetExecutionContext, ema: dict) -> Output[dict]:
     Depends on: ema (uses EMA-12 and EMA-26)
     Parameters: 12, 26, 9
     """
-    from scripts.update import update_macd
+    from scripts.daily.update_indicators import update_indicators
 
     target_date = date.today() - timedelta(days=1)
     context.log.info(f"Calculating MACD for {target_date}")
 
-    result = update_macd.update_macd(target_date)
+    result = update_indicators(["macd"], through=target_date)["macd"]
 
     context.log.info(f"Calculated MACD for {result['tickers_updated']} tickers")
 
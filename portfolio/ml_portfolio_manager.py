@@ -10,12 +10,14 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import json
 from datetime import date, datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 import xgboost as xgb
 
+from portfolio.model_registry import model_registry
+from portfolio.prediction_store import PREDICTION_COLUMNS, PredictionStore, model_identity
 from utils import get_logger
 from utils.db_config import engine
 
@@ -29,13 +31,19 @@ class MLPortfolioManager:
     Features:
     - Load trained model
     - Generate predictions for universe of stocks
+    - Read-through prediction store (scores each model version/date once)
     - Rank stocks by predicted returns
     - Portfolio construction with risk management
     - Rebalancing logic
     """
 
     def __init__(
-        self, model_path: str = None, strategy: str = None, market_cap_segment: str = None
+        self,
+        model_path: str = None,
+        strategy: str = None,
+        market_cap_segment: str = None,
+        use_prediction_store: bool = True,
+        prediction_store: Optional[PredictionStore] = None,
     ):
         """
         Initialize portfolio manager with trained model
@@ -44,6 +52,9 @@ class MLPortfolioManager:
             model_path: Path to trained XGBoost model (absolute or relative to project root)
             strategy: Strategy type ('dividend', 'growth', 'value', None for default)
             market_cap_segment: Market cap segment ('small', 'mid', 'large', 'all', None for default)
+            use_prediction_store: Serve get_predictions() from the prediction store,
+                scoring only dates it does not hold yet (False = always score)
+            prediction_store: Store to use (default: PredictionStore on the shared engine)
         """
         # Determine model path based on strategy
         if model_path is None:
@@ -69,33 +80,28 @@ class MLPortfolioManager:
         self.model = None
         self.feature_names = None
         self.metadata = None
+        self.model_id = None
+        self.model_version = None
+        self.prediction_store = (
+            (prediction_store or PredictionStore()) if use_prediction_store else None
+        )
         self.load_model()
 
     def load_model(self):
-        """Load trained XGBoost model"""
-        logger.info(f"Loading trained model from {self.model_path}")
-
-        # Load model
-        self.model = xgb.XGBRegressor()
-        self.model.load_model(self.model_path)
-
-        # Load feature names
-        feature_path = Path(self.model_path).parent / "feature_names.json"
-        with open(feature_path, "r") as f:
-            self.feature_names = json.load(f)
-
-        # Load metadata if available
-        metadata_path = Path(self.model_path).parent / "metadata.json"
-        if metadata_path.exists():
-            with open(metadata_path, "r") as f:
-                self.metadata = json.load(f)
+        """Load trained XGBoost model (shared via the process-wide model registry)"""
+        bundle = model_registry.get_xgboost(self.model_path)
+
+        self.model = bundle.model
+        self.feature_names = bundle.feature_names
+        self.metadata = bundle.metadata
+        self.model_id, self.model_version = model_identity(self.model_path)
+
+        if self.metadata:
             logger.info(
                 f"Model metadata: {self.metadata.get('strategy', 'default')} strategy, "
                 f"IC: {self.metadata.get('spearman_ic', 'N/A')}"
             )
 
-        logger.info(f"Model loaded successfully with {len(self.feature_names)} features")
-
     def _load_strategy_config(self):
         """Load strategy-specific configuration from JSON files"""
         if not self.strategy or not self.market_cap_segment:
@@ -118,6 +124,22 @@ class MLPortfolioManager:
             logger.warning(f"Strategy config not found: {config_path}")
             return None
 
+    def _resolve_filters(
+        self, min_market_cap: float, max_market_cap: float, min_price: float
+    ) -> Tuple[float, float, float]:
+        """Apply the strategy config's ml_filters where not explicitly provided"""
+        strategy_config = self._load_strategy_config()
+        if strategy_config and "ml_filters" in strategy_config:
+            ml_filters = strategy_config["ml_filters"]
+            # Only apply strategy config filters if not explicitly overridden
+            if min_market_cap is None and "min_market_cap" in ml_filters:
+                min_market_cap = ml_filters["min_market_cap"]
+            if max_market_cap is None and "max_market_cap" in ml_filters:
+                max_market_cap = ml_filters["max_market_cap"]
+            if min_price is None and "min_price" in ml_filters:
+                min_price = ml_filters["min_price"]
+        return min_market_cap, max_market_cap, min_price
+
     def get_latest_features(
         self,
         tickers: List[str] = None,
@@ -142,17 +164,9 @@ class MLPortfolioManager:
         if as_of_date is None:
             as_of_date = date.today()
 
-        # Load strategy config and apply filters if not explicitly provided
-        strategy_config = self._load_strategy_config()
-        if strategy_config and "ml_filters" in strategy_config:
-            ml_filters = strategy_config["ml_filters"]
-            # Only apply strategy config filters if not explicitly overridden
-            if min_market_cap is None and "min_market_cap" in ml_filters:
-                min_market_cap = ml_filters["min_market_cap"]
-            if max_market_cap is None and "max_market_cap" in ml_filters:
-                max_market_cap = ml_filters["max_market_cap"]
-            if min_price is None and "min_price" in ml_filters:
-                min_price = ml_filters["min_price"]
+        min_market_cap, max_market_cap, min_price = self._resolve_filters(
+            min_market_cap, max_market_cap, min_price
+        )
 
         filter_desc = []
         if min_market_cap:
@@ -214,6 +228,16 @@ class MLPortfolioManager:
         """
         logger.info(f"Generating predictions for {len(features_df)} stocks...")
 
+        results = self.score_features(features_df)
+        return self._rank_predictions(results)
+
+    def score_features(self, features_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Raw model scores for feature rows
+
+        Returns:
+            DataFrame with ticker, date, predicted_return (input row order)
+        """
         # Prepare features (same as training)
         exclude_cols = ["ticker", "date", "target_return"]
         feature_cols = [col for col in features_df.columns if col not in exclude_cols]
@@ -224,16 +248,17 @@ class MLPortfolioManager:
         # Generate predictions
         predictions = self.model.predict(X)
 
-        # Create results DataFrame
-        results = pd.DataFrame(
+        return pd.DataFrame(
             {
-                "ticker": features_df["ticker"],
-                "date": features_df["date"],
+                "ticker": features_df["ticker"].values,
+                "date": features_df["date"].values,
                 "predicted_return": predictions,
             }
         )
 
-        # Add ranking
+    def _rank_predictions(self, results: pd.DataFrame) -> pd.DataFrame:
+        """Add rank (1 = highest predicted return) and sort best first"""
+        results = results.copy()
         results["rank"] = results["predicted_return"].rank(ascending=False, method="first")
         results = results.sort_values("predicted_return", ascending=False)
 
@@ -242,6 +267,75 @@ class MLPortfolioManager:
 
         return results
 
+    def get_predictions(
+        self,
+        tickers: List[str] = None,
+        as_of_date: date = None,
+        min_market_cap: float = None,
+        max_market_cap: float = None,
+        min_price: float = None,
+    ) -> pd.DataFrame:
+        """
+        Ranked predictions for the latest feature date on or before as_of_date
+
+        Same universe and result as get_latest_features() + generate_predictions(),
+        but served from the prediction store: a (model version, date) is scored
+        once over the whole feature universe and every later call, filter or
+        caller reuses the stored scores until the date's features are rewritten.
+
+        Returns:
+            DataFrame with ticker, date, predicted_return, rank (best first);
+            empty if no features exist on or before as_of_date
+        """
+        if self.prediction_store is None:
+            features_df = self.get_latest_features(
+                tickers=tickers,
+                as_of_date=as_of_date,
+                min_market_cap=min_market_cap,
+                max_market_cap=max_market_cap,
+                min_price=min_price,
+            )
+            if len(features_df) == 0:
+                return pd.DataFrame(columns=PREDICTION_COLUMNS + ["rank"])
+            return self.generate_predictions(features_df)
+
+        store = self.prediction_store
+        feature_date = store.feature_date(as_of_date)
+        if feature_date is None:
+            logger.warning(f"No features on or before {as_of_date}")
+            return pd.DataFrame(columns=PREDICTION_COLUMNS + ["rank"])
+
+        if not store.has_date(self.model_id, self.model_version, feature_date):
+            watermarks = store.feature_watermarks(feature_date, feature_date)
+            features_df = pd.read_sql(
+                "SELECT * FROM ml_training_features WHERE date = %(date)s ORDER BY ticker",
+                store.engine,
+                params={"date": feature_date},
+            )
+            logger.info(
+                f"Scoring {len(features_df)} stocks for {feature_date} "
+                f"({self.model_id}@{self.model_version}, missing or stale in prediction store)"
+            )
+            store.write(
+                self.model_id, self.model_version, self.score_features(features_df), watermarks
+            )
+
+        min_market_cap, max_market_cap, min_price = self._resolve_filters(
+            min_market_cap, max_market_cap, min_price
+        )
+        results = store.read(
+            self.model_id,
+            self.model_version,
+            feature_date,
+            tickers=tickers,
+            min_market_cap=min_market_cap,
+            max_market_cap=max_market_cap,
+            min_price=min_price,
+        )
+        if len(results) == 0:
+            return pd.DataFrame(columns=PREDICTION_COLUMNS + ["rank"])
+        return self._rank_predictions(results)
+
     def construct_portfolio(
         self,
         predictions: pd.DataFrame,
@@ -428,18 +522,15 @@ class MLPortfolioManager:
         logger.info("PORTFOLIO REBALANCING WORKFLOW")
         logger.info("=" * 60)
 
-        # Step 1: Load latest features
-        features_df = self.get_latest_features(
+        # Steps 1-2: Latest features and predictions (via the prediction store)
+        predictions = self.get_predictions(
             tickers=tickers, as_of_date=as_of_date, min_market_cap=min_market_cap
         )
 
-        if len(features_df) == 0:
+        if len(predictions) == 0:
             logger.error("No features found! Cannot rebalance.")
             return None
 
-        # Step 2: Generate predictions
-        predictions = self.generate_predictions(features_df)
-
         # Step 3: Construct target portfolio
         target_portfolio = self.construct_portfolio(
             predictions=predictions, top_n=top_n, weighting=weighting, max_position=max_position
@@ -447,9 +538,9 @@ class MLPortfolioManager:
 
         # Step 4: Get current prices
         prices = {}
+        universe = set(predictions["ticker"])
         for ticker in set(current_portfolio.keys()) | set(target_portfolio["ticker"]):
-            price_row = features_df[features_df["ticker"] == ticker]
-            if len(price_row) > 0:
+            if ticker in universe:
                 # Use most recent close price (would need to add this to query)
                 prices[ticker] = 100.0  # Placeholder - need actual prices
 
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Process-wide Model Registry
+
+Loads each XGBoost booster (with its feature_names.json / metadata.json) and
+each PPO policy once per process and serves it to every caller.
+
+Features:
+- Keyed by model kind + model path (the path encodes strategy/market cap)
+- Hot reload: model files are re-stat'ed on access; a changed mtime triggers a
+  reload and the new entry is swapped in atomically (callers holding the old
+  model keep using it until they ask again)
+- LRU eviction bounds the number of resident models
+- Load / hit / miss / reload / eviction counters via stats()
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import xgboost as xgb
+
+from utils import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class XGBoostModelBundle:
+    """XGBoost regressor plus the sidecar files written at training time"""
+
+    model: xgb.XGBRegressor
+    feature_names: List[str]
+    metadata: Optional[Dict]
+
+
+@dataclass
+class _RegistryEntry:
+    value: Any
+    mtimes: Dict[str, float]
+    loaded_at: float = field(default_factory=time.time)
+
+
+def _file_mtimes(paths: List[Path]) -> Dict[str, float]:
+    """mtime for every watched file (missing optional files are recorded as 0)"""
+    return {str(p): (p.stat().st_mtime if p.exists() else 0.0) for p in paths}
+
+
+def load_xgboost_bundle(model_path: Path) -> XGBoostModelBundle:
+    """Load model.json, feature_names.json and (optional) metadata.json from disk"""
+    model = xgb.XGBRegressor()
+    model.load_model(str(model_path))
+
+    with open(model_path.parent / "feature_names.json", "r") as f:
+        feature_names = json.load(f)
+
+    metadata = None
+    metadata_path = model_path.parent / "metadata.json"
+    if metadata_path.exists():
+        with open(metadata_path, "r") as f:
+            metadata = json.load(f)
+
+    return XGBoostModelBundle(model=model, feature_names=feature_names, metadata=metadata)
+
+
+def load_ppo_policy(model_path: Path):
+    """Load a stable-baselines3 PPO policy zip"""
+    from stable_baselines3 import PPO
+
+    return PPO.load(str(model_path))
+
+
+class ModelRegistry:
+    """Thread-safe LRU cache of loaded models with mtime-based hot reload"""
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], _RegistryEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._counters = {"loads": 0, "hits": 0, "misses": 0, "reloads": 0, "evictions": 0}
+
+    def _key_lock(self, key: Tuple[str, str]) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(
+        self,
+        kind: str,
+        model_path: str,
+        loader: Callable[[Path], Any],
+        watch: Optional[List[str]] = None,
+    ) -> Any:
+        """
+        Return the loaded model for (kind, model_path), loading or reloading as needed
+
+        Args:
+            kind: Model family, e.g. 'xgboost' or 'ppo'
+            model_path: Path to the primary model file
+            loader: Function that loads the model from model_path
+            watch: Extra sidecar file names (relative to the model directory) whose
+                   changes also trigger a reload
+        """
+        path = Path(model_path).resolve()
+        key = (kind, str(path))
+        watched = [path] + [path.parent / name for name in (watch or [])]
+
+        # Fast path: cached and unchanged on disk
+        current_mtimes = _file_mtimes(watched)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.mtimes == current_mtimes:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return entry.value
+            self._counters["misses"] += 1
+
+        # Slow path: one loader per key, others wait for its result
+        with self._key_lock(key):
+            current_mtimes = _file_mtimes(watched)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.mtimes == current_mtimes:
+                    self._entries.move_to_end(key)
+                    return entry.value
+                is_reload = entry is not None
+
+            logger.info(f"{'Reloading' if is_reload else 'Loading'} {kind} model: {path}")
+            value = loader(path)
+
+            with self._lock:
+                self._entries[key] = _RegistryEntry(value=value, mtimes=current_mtimes)
+                self._entries.move_to_end(key)
+                self._counters["loads"] += 1
+                if is_reload:
+                    self._counters["reloads"] += 1
+                while len(self._entries) > self.max_entries:
+                    evicted_key, _ = self._entries.popitem(last=False)
+                    self._counters["evictions"] += 1
+                    logger.info(f"Evicted {evicted_key[0]} model: {evicted_key[1]}")
+
+            return value
+
+    def get_xgboost(self, model_path: str) -> XGBoostModelBundle:
+        """XGBoost model with feature names and metadata"""
+        return self.get(
+            "xgboost",
+            model_path,
+            load_xgboost_bundle,
+            watch=["feature_names.json", "metadata.json"],
+        )
+
+    def get_ppo(self, model_path: str):
+        """stable-baselines3 PPO policy"""
+        return self.get("ppo", model_path, load_ppo_policy)
+
+    def invalidate(self, model_path: Optional[str] = None):
+        """Drop one model (all kinds) or, with no path, everything"""
+        with self._lock:
+            if model_path is None:
+                self._entries.clear()
+                return
+            path = str(Path(model_path).resolve())
+            for key in [k for k in self._entries if k[1] == path]:
+                del self._entries[key]
+
+    def stats(self) -> Dict:
+        """Counters and currently resident models"""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": self._counters["hits"] / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "models": [
+                    {"kind": kind, "path": path, "loaded_at": entry.loaded_at}
+                    for (kind, path), entry in self._entries.items()
+                ],
+            }
+
+
+model_registry = ModelRegistry(max_entries=int(os.getenv("MODEL_REGISTRY_MAX_ENTRIES", "16")))
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+ML Prediction Store
+
+Persists XGBoost scores per (model id, model version, date, ticker) so the
+backtests, the RL environment, the autonomous generator and the API read the
+same predictions instead of re-scoring ml_training_features on every call.
+
+- ml_predictions: one row per scored ticker
+- ml_prediction_dates: one row per fully scored (model, version, date), so a
+  date is known to be complete even when a filter leaves it empty, with the
+  date's feature watermark (row count, latest ml_feature_store.updated_at)
+  at scoring time; a date whose features were rewritten since is rescored
+- model id = model directory name (e.g. growth_midcap); model version = digest
+  of model.json + feature_names.json, so a retrained model never reads the
+  previous model's scores
+
+MLPortfolioManager.get_predictions() reads through the store and scores a
+date only when it is missing or stale. batch_score() fills a date range in one streamed
+pass over ml_training_features:
+
+    python portfolio/prediction_store.py --strategy growth --market-cap mid \\
+        --start-date 2015-01-01 --end-date 2025-10-30
+
+Schema: database/migrations/004_prediction_store.sql and 005_prediction_staleness.sql
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import hashlib
+import time
+from datetime import date
+from functools import lru_cache
+from typing import Iterable, List, Optional, Set
+
+import pandas as pd
+
+from utils import get_logger, get_psycopg2_connection
+from utils.bulk_writer import copy_upsert
+
+logger = get_logger(__name__)
+
+PREDICTION_COLUMNS = ["ticker", "date", "predicted_return"]
+
+PREDICTION_INSERT_SQL = """
+    INSERT INTO ml_predictions (
+        model_id, model_version, date, ticker, predicted_return, created_at
+    ) VALUES (%s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+    ON CONFLICT (model_id, model_version, date, ticker) DO UPDATE SET
+        predicted_return = EXCLUDED.predicted_return,
+        created_at = CURRENT_TIMESTAMP
+"""
+
+COVERAGE_INSERT_SQL = """
+    INSERT INTO ml_prediction_dates (
+        model_id, model_version, date, num_predictions,
+        feature_rows, features_updated_at, scored_at
+    ) VALUES (%s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+    ON CONFLICT (model_id, model_version, date) DO UPDATE SET
+        num_predictions = EXCLUDED.num_predictions,
+        feature_rows = EXCLUDED.feature_rows,
+        features_updated_at = EXCLUDED.features_updated_at,
+        scored_at = CURRENT_TIMESTAMP
+"""
+
+# Per-date feature watermark; changes whenever the feature store rewrites a date
+FEATURE_WATERMARK_SQL = """
+    SELECT date, COUNT(*) AS feature_rows, MAX(updated_at) AS features_updated_at
+    FROM ml_feature_store
+    WHERE (%(start_date)s IS NULL OR date >= %(start_date)s)
+      AND (%(end_date)s IS NULL OR date <= %(end_date)s)
+    GROUP BY date
+"""
+
+# ml_prediction_dates rows (alias d) whose watermark matches the features' (alias w)
+CURRENT_COVERAGE_SQL = """
+    d.model_id = %(model_id)s
+    AND d.model_version = %(model_version)s
+    AND d.feature_rows = w.feature_rows
+    AND d.features_updated_at = w.features_updated_at
+"""
+
+
+@lru_cache(maxsize=64)
+def _digest(paths: tuple, mtimes: tuple) -> str:
+    sha = hashlib.sha1()
+    for path in paths:
+        if Path(path).exists():
+            sha.update(Path(path).read_bytes())
+    return sha.hexdigest()[:16]
+
+
+def model_identity(model_path: str) -> tuple:
+    """
+    (model_id, model_version) for an XGBoost model.json
+
+    The version is a content digest of model.json and feature_names.json, cached
+    per file mtime so repeated manager construction does not re-read the model.
+    """
+    path = Path(model_path).resolve()
+    files = (str(path), str(path.parent / "feature_names.json"))
+    mtimes = tuple(Path(f).stat().st_mtime if Path(f).exists() else 0.0 for f in files)
+    return path.parent.name, _digest(files, mtimes)
+
+
+def complete_dates(chunks: Iterable[pd.DataFrame]) -> Iterable[pd.DataFrame]:
+    """
+    Regroup date-ordered chunks so each yielded frame holds only whole dates
+
+    A streamed read splits rows at arbitrary points; the rows of the last date
+    in a chunk are held back and prepended to the next chunk.
+    """
+    pending = None
+    for chunk in chunks:
+        if pending is not None:
+            chunk = pd.concat([pending, chunk], ignore_index=True)
+        if chunk.empty:
+            pending = chunk
+            continue
+        last = chunk["date"].iloc[-1]
+        is_last = chunk["date"] == last
+        pending = chunk[is_last]
+        if not is_last.all():
+            yield chunk[~is_last]
+    if pending is not None and not pending.empty:
+        yield pending
+
+
+class PredictionStore:
+    """Reads and writes ml_predictions / ml_prediction_dates"""
+
+    def __init__(self, engine=None):
+        self._engine = engine
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from utils.db_config import engine
+
+            self._engine = engine
+        return self._engine
+
+    def feature_date(self, as_of_date: Optional[date] = None) -> Optional[date]:
+        """Latest ml_training_features date on or before as_of_date (None = today)"""
+        as_of_date = as_of_date or date.today()
+        df = pd.read_sql(
+            "SELECT MAX(date) AS max_date FROM ml_training_features WHERE date <= %(as_of_date)s",
+            self.engine,
+            params={"as_of_date": as_of_date},
+        )
+        value = df["max_date"].iloc[0] if len(df) else None
+        return None if pd.isna(value) else pd.Timestamp(value).date()
+
+    def feature_watermarks(
+        self, start_date: Optional[date] = None, end_date: Optional[date] = None
+    ) -> pd.DataFrame:
+        """
+        Feature watermark per date: row count and latest updated_at
+
+        Read it before the features it describes, so a rewrite that lands in
+        between leaves an older watermark behind and the date is rescored.
+
+        Returns:
+            DataFrame with date, feature_rows, features_updated_at
+        """
+        df = pd.read_sql(
+            FEATURE_WATERMARK_SQL,
+            self.engine,
+            params={"start_date": start_date, "end_date": end_date},
+        )
+        df["date"] = [pd.Timestamp(d).date() for d in df["date"]]
+        return df
+
+    def scored_dates(
+        self,
+        model_id: str,
+        model_version: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Set[date]:
+        """Dates fully scored for this model version from their current features"""
+        df = pd.read_sql(
+            f"""
+            SELECT d.date
+            FROM ml_prediction_dates d
+            JOIN ({FEATURE_WATERMARK_SQL}) w ON w.date = d.date
+            WHERE {CURRENT_COVERAGE_SQL}
+            """,
+            self.engine,
+            params={
+                "model_id": model_id,
+                "model_version": model_version,
+                "start_date": start_date,
+                "end_date": end_date,
+            },
+        )
+        return {pd.Timestamp(d).date() for d in df["date"]}
+
+    def has_date(self, model_id: str, model_version: str, as_of: date) -> bool:
+        return as_of in self.scored_dates(model_id, model_version, as_of, as_of)
+
+    def write(
+        self,
+        model_id: str,
+        model_version: str,
+        predictions: pd.DataFrame,
+        watermarks: pd.DataFrame,
+    ) -> int:
+        """
+        Store scores (ticker, date, predicted_return) and mark their dates complete
+
+        Every date present in `predictions` must be scored in full. Earlier
+        scores for those dates are replaced, so tickers that left a rewritten
+        date do not linger.
+
+        Args:
+            watermarks: feature_watermarks() read before the scored features
+
+        Returns:
+            Number of prediction rows written
+        """
+        if predictions.empty:
+            return 0
+
+        dates = [pd.Timestamp(d).date() for d in predictions["date"]]
+        rows = [
+            (model_id, model_version, d, ticker, float(score))
+            for d, ticker, score in zip(
+                dates, predictions["ticker"], predictions["predicted_return"]
+            )
+        ]
+        counts = pd.Series(dates).value_counts()
+        marks = {
+            d: (int(n), pd.Timestamp(updated_at).to_pydatetime())
+            for d, n, updated_at in watermarks[
+                ["date", "feature_rows", "features_updated_at"]
+            ].itertuples(index=False)
+        }
+        coverage = [
+            (model_id, model_version, d, int(n), *marks.get(d, (None, None)))
+            for d, n in counts.items()
+        ]
+
+        with get_psycopg2_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    DELETE FROM ml_predictions
+                    WHERE model_id = %s AND model_version = %s AND date = ANY(%s)
+                    """,
+                    (model_id, model_version, list(counts.index)),
+                )
+                copy_upsert(cur, PREDICTION_INSERT_SQL, rows)
+                copy_upsert(cur, COVERAGE_INSERT_SQL, coverage)
+
+        return len(rows)
+
+    def read(
+        self,
+        model_id: str,
+        model_version: str,
+        as_of: date,
+        tickers: Optional[List[str]] = None,
+        min_market_cap: Optional[float] = None,
+        max_market_cap: Optional[float] = None,
+        min_price: Optional[float] = None,
+    ) -> pd.DataFrame:
+        """
+        Stored scores for one feature date, with the universe filters
+        get_latest_features() applies (joined against ml_training_features)
+
+        Returns:
+            DataFrame with ticker, date, predicted_return
+        """
+        filters = []
+        params = {"model_id": model_id, "model_version": model_version, "date": as_of}
+        if tickers:
+            filters.append("p.ticker = ANY(%(tickers)s)")
+            params["tickers"] = list(tickers)
+        if min_market_cap:
+            filters.append("f.market_cap >= %(min_market_cap)s")
+            params["min_market_cap"] = min_market_cap
+        if max_market_cap:
+            filters.append("f.market_cap <= %(max_market_cap)s")
+            params["max_market_cap"] = max_market_cap
+        if min_price:
+            filters.append("f.close >= %(min_price)s")
+            params["min_price"] = min_price
+
+        needs_features = bool(min_market_cap or max_market_cap or min_price)
+        join = (
+            "JOIN ml_training_features f ON f.ticker = p.ticker AND f.date = p.date"
+            if needs_features
+            else ""
+        )
+        where_clause = "AND " + " AND ".join(filters) if filters else ""
+
+        query = f"""
+        SELECT p.ticker, p.date, p.predicted_return
+        FROM ml_predictions p
+        {join}
+        WHERE p.model_id = %(model_id)s
+          AND p.model_version = %(model_version)s
+          AND p.date = %(date)s
+          {where_clause}
+        ORDER BY p.ticker
+        """
+        return pd.read_sql(query, self.engine, params=params)
+
+
+def batch_score(
+    manager,
+    start_date: date,
+    end_date: date,
+    store: Optional[PredictionStore] = None,
+    chunksize: int = 250_000,
+) -> int:
+    """
+    Score every unscored or stale ml_training_features date in [start_date, end_date]
+
+    Streams the range once (server-side cursor, date order), scores each chunk
+    with the manager's model and writes whole dates to the store. Dates already
+    scored for this model version from their current features (same
+    watermark) are skipped in SQL.
+
+    Args:
+        manager: MLPortfolioManager whose model (and model_id / model_version) to use
+
+    Returns:
+        Number of predictions written
+    """
+    store = store or manager.prediction_store or PredictionStore()
+    query = f"""
+    WITH w AS ({FEATURE_WATERMARK_SQL}),
+    current AS (
+        SELECT d.date
+        FROM ml_prediction_dates d
+        JOIN w ON w.date = d.date
+        WHERE {CURRENT_COVERAGE_SQL}
+    )
+    SELECT f.*
+    FROM ml_training_features f
+    WHERE f.date >= %(start_date)s
+      AND f.date <= %(end_date)s
+      AND NOT EXISTS (SELECT 1 FROM current c WHERE c.date = f.date)
+    ORDER BY f.date
+    """
+    params = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "model_id": manager.model_id,
+        "model_version": manager.model_version,
+    }
+
+    logger.info(
+        f"Scoring {manager.model_id}@{manager.model_version} from {start_date} to {end_date}"
+    )
+    start = time.time()
+    watermarks = store.feature_watermarks(start_date, end_date)
+    written, num_dates = 0, 0
+    with store.engine.connect().execution_options(stream_results=True) as conn:
+        chunks = pd.read_sql(query, conn, params=params, chunksize=chunksize)
+        for features in complete_dates(chunks):
+            predictions = manager.score_features(features)
+            written += store.write(manager.model_id, manager.model_version, predictions, watermarks)
+            num_dates += features["date"].nunique()
+            logger.info(f"  Scored through {features['date'].iloc[-1]} ({written:,} predictions)")
+
+    logger.info(
+        f"Stored {written:,} predictions for {num_dates} dates in {time.time() - start:.1f}s"
+    )
+    return written
+
+
+def main():
+    from portfolio.ml_portfolio_manager import MLPortfolioManager
+
+    parser = argparse.ArgumentParser(description="Fill the ML prediction store for a date range")
+    parser.add_argument("--strategy", choices=["growth", "value", "dividend"], default=None)
+    parser.add_argument("--market-cap", choices=["small", "mid", "large"], default=None)
+    parser.add_argument("--model-path", default=None, help="Explicit model.json path")
+    parser.add_argument("--start-date", required=True, help="Start date (YYYY-MM-DD)")
+    parser.add_argument("--end-date", default=str(date.today()), help="End date (YYYY-MM-DD)")
+    parser.add_argument("--chunksize", type=int, default=250_000)
+    args = parser.parse_args()
+
+    manager = MLPortfolioManager(
+        model_path=args.model_path, strategy=args.strategy, market_cap_segment=args.market_cap
+    )
+    batch_score(
+        manager,
+        date.fromisoformat(args.start_date),
+        date.fromisoformat(args.end_date),
+        chunksize=args.chunksize,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -28,15 +28,19 @@ class StockScreener:
     """Screen stocks based on universal and strategy-specific criteria"""
 
     def __init__(self):
+        self._cm = None
         self.conn = None
 
     def __enter__(self):
-        self.conn = get_psycopg2_connection().__enter__()
+        # Keep the context manager: its __exit__ commits and returns the pooled connection
+        self._cm = get_psycopg2_connection()
+        self.conn = self._cm.__enter__()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.conn:
-            self.conn.__exit__(exc_type, exc_val, exc_tb)
+        if self._cm:
+            cm, self._cm, self.conn = self._cm, None, None
+            return cm.__exit__(exc_type, exc_val, exc_tb)
 
     def get_universe(self, market_cap: str, as_of_date: Optional[date] = None) -> List[str]:
         """
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Lockstep Batched Environment
+
+Runs N HybridPortfolioEnv copies in lockstep and exchanges stacked NumPy
+arrays with the trainer, so the policy is evaluated once per step for all
+environments instead of once per environment.
+
+Copies share the read-only market data (price cube, candidate cache, ML
+model) of the template env; only per-episode state is separate. Episode
+starts are staggered across the first rebalance window so the copies visit
+different rebalance dates. With a candidate cache, which only holds every
+rebalance_frequency-th trading date, starts are instead whole rebalance
+periods apart, so every copy rebalances on candidates scored for that day.
+Finished environments are reset in the same step (the returned observation
+is the first observation of the new episode).
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import copy
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class BatchedEnv:
+    """N environments stepped together with stacked observations and rewards"""
+
+    def __init__(self, template_env, num_envs: int):
+        """
+        Args:
+            template_env: Fully initialized HybridPortfolioEnv to copy
+            num_envs: Number of environments to run in lockstep
+        """
+        if num_envs < 1:
+            raise ValueError(f"num_envs must be >= 1, got {num_envs}")
+
+        self.num_envs = num_envs
+        self.envs: List = [template_env] + [copy.copy(template_env) for _ in range(num_envs - 1)]
+
+        self.single_observation_space = template_env.observation_space
+        self.single_action_space = template_env.action_space
+
+        rebalance_frequency = getattr(template_env, "rebalance_frequency", 1)
+        if getattr(template_env, "candidate_cache", None) is not None:
+            self.start_steps = [i * rebalance_frequency for i in range(num_envs)]
+        else:
+            self.start_steps = [i * rebalance_frequency // num_envs for i in range(num_envs)]
+
+        obs_dim = self.single_observation_space.shape[0]
+        self._obs = np.zeros((num_envs, obs_dim), dtype=np.float32)
+        self._rewards = np.zeros(num_envs, dtype=np.float32)
+        self._dones = np.zeros(num_envs, dtype=np.float32)
+
+    def _reset_env(self, i: int, seed: Optional[int] = None) -> np.ndarray:
+        obs, _ = self.envs[i].reset(seed=seed, options={"start_step": self.start_steps[i]})
+        return obs
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[np.ndarray, Dict]:
+        """Reset all environments; returns observations of shape (num_envs, obs_dim)"""
+        for i in range(self.num_envs):
+            self._obs[i] = self._reset_env(i, None if seed is None else seed + i)
+        return self._obs.copy(), {}
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Dict]]:
+        """
+        Step every environment with its row of actions
+
+        Returns:
+            observations (num_envs, obs_dim), rewards (num_envs,),
+            dones (num_envs,) as float32, and per-env info dicts
+        """
+        infos = []
+        for i, env in enumerate(self.envs):
+            obs, reward, terminated, truncated, info = env.step(actions[i])
+            done = terminated or truncated
+            if done:
+                obs = self._reset_env(i)
+            self._obs[i] = obs
+            self._rewards[i] = reward
+            self._dones[i] = float(done)
+            infos.append(info)
+
+        return self._obs.copy(), self._rewards.copy(), self._dones.copy(), infos
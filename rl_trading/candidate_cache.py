@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+ML Candidate Cache for RL Training
+
+Offline "candidate precompute" stage for HybridPortfolioEnv. For one
+strategy/market-cap model and date range, every rebalance date is scored once
+with XGBoost and the top N tickers and predicted returns are written to disk.
+The environment memory-maps the result at startup so PPO rollouts never touch
+Postgres or XGBoost.
+
+On-disk layout (one directory per model/date range):
+- dates.npy              datetime64[D] (n_dates,)           rebalance dates
+- tickers.npy            <U16 (n_dates, top_n)               '' where padded
+- predicted_returns.npy  float32 (n_dates, top_n)            NaN where padded
+- metadata.json          strategy, segment, model path/mtime, top_n, frequency
+
+Usage:
+    python rl_trading/candidate_cache.py --strategy growth --market-cap mid \\
+        --start-date 2015-01-01 --end-date 2023-12-31
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import json
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils import get_logger
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+TICKER_DTYPE = "<U16"
+
+
+def ml_model_name(strategy: str, market_cap_segment: str) -> str:
+    """Model directory name used by MLPortfolioManager"""
+    if strategy == "dividend":
+        return "dividend_strategy"
+    return f"{strategy}_{market_cap_segment}cap"
+
+
+def default_cache_dir(strategy: str, market_cap_segment: str, start_date, end_date) -> Path:
+    """Default cache location: models/<ml model>/candidates_<start>_<end>"""
+    start = pd.to_datetime(start_date).strftime("%Y%m%d")
+    end = pd.to_datetime(end_date).strftime("%Y%m%d")
+    return (
+        PROJECT_ROOT
+        / "models"
+        / ml_model_name(strategy, market_cap_segment)
+        / f"candidates_{start}_{end}"
+    )
+
+
+class CandidateCache:
+    """Memory-mapped top-N ML candidates per rebalance date"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+        if not (self.path / "metadata.json").exists():
+            raise FileNotFoundError(
+                f"Candidate cache not found at {self.path}. "
+                f"Run rl_trading/candidate_cache.py to precompute it."
+            )
+
+        with open(self.path / "metadata.json", "r") as f:
+            self.metadata: Dict = json.load(f)
+
+        self.dates = np.load(self.path / "dates.npy")
+        self.tickers = np.load(self.path / "tickers.npy", mmap_mode="r")
+        self.predicted_returns = np.load(self.path / "predicted_returns.npy", mmap_mode="r")
+        self.top_n = self.tickers.shape[1]
+
+        self._frames: Dict[int, pd.DataFrame] = {}
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def is_stale(self) -> bool:
+        """True if the ML model file changed after the cache was built"""
+        model_path = self.metadata.get("model_path")
+        if not model_path or not Path(model_path).exists():
+            return False
+        return Path(model_path).stat().st_mtime > self.metadata.get("model_mtime", 0)
+
+    def lookup(self, as_of_date) -> pd.DataFrame:
+        """
+        Candidates scored for the latest cached date on or before as_of_date
+
+        Returns:
+            DataFrame with ticker and predicted_return, sorted by predicted_return
+            descending (empty if no cached date precedes as_of_date)
+        """
+        key = np.datetime64(pd.Timestamp(as_of_date).date(), "D")
+        row = int(np.searchsorted(self.dates, key, side="right")) - 1
+        if row < 0:
+            return pd.DataFrame(columns=["ticker", "predicted_return"])
+
+        frame = self._frames.get(row)
+        if frame is None:
+            tickers = self.tickers[row]
+            valid = tickers != ""
+            frame = pd.DataFrame(
+                {
+                    "ticker": tickers[valid].astype(object),
+                    "predicted_return": np.asarray(self.predicted_returns[row][valid]),
+                }
+            )
+            self._frames[row] = frame
+
+        return frame
+
+
+def precompute_candidates(
+    strategy: str,
+    market_cap_segment: str,
+    start_date: str,
+    end_date: str,
+    top_n: int = 200,
+    rebalance_frequency: int = 20,
+    output_dir: Optional[Path] = None,
+) -> Path:
+    """
+    Score every rebalance date once and write the candidate cache
+
+    Rebalance dates are the env's trading days (daily_bars dates with a traded
+    close in range) taken every rebalance_frequency days, so the cache lines up
+    with HybridPortfolioEnv steps. Pass rebalance_frequency=1 to score every day.
+
+    Returns:
+        Path to the cache directory
+    """
+    from portfolio.ml_portfolio_manager import MLPortfolioManager
+    from utils.db_config import engine
+
+    output_dir = Path(
+        output_dir or default_cache_dir(strategy, market_cap_segment, start_date, end_date)
+    )
+    ml_manager = MLPortfolioManager(strategy=strategy, market_cap_segment=market_cap_segment)
+
+    trading_dates = pd.read_sql(
+        """
+        SELECT DISTINCT date
+        FROM daily_bars
+        WHERE date >= %(start_date)s
+          AND date <= %(end_date)s
+          AND close > 0
+          AND volume > 0
+        ORDER BY date
+        """,
+        engine,
+        params={"start_date": start_date, "end_date": end_date},
+    )["date"]
+    rebalance_dates = pd.to_datetime(trading_dates).iloc[::rebalance_frequency]
+
+    logger.info(
+        f"Precomputing {ml_model_name(strategy, market_cap_segment)} candidates for "
+        f"{len(rebalance_dates)} rebalance dates (top {top_n})"
+    )
+
+    tickers = np.full((len(rebalance_dates), top_n), "", dtype=TICKER_DTYPE)
+    predicted_returns = np.full((len(rebalance_dates), top_n), np.nan, dtype=np.float32)
+
+    for i, rebalance_date in enumerate(rebalance_dates):
+        predictions = ml_manager.get_predictions(as_of_date=rebalance_date.date())
+        if len(predictions) == 0:
+            logger.warning(f"No features available for {rebalance_date.date()}")
+            continue
+
+        top = predictions.head(top_n)
+        n = len(top)
+        tickers[i, :n] = top["ticker"].to_numpy(dtype=TICKER_DTYPE)
+        predicted_returns[i, :n] = top["predicted_return"].to_numpy(dtype=np.float32)
+
+        if (i + 1) % 10 == 0:
+            logger.info(f"  Scored {i + 1}/{len(rebalance_dates)} dates")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    np.save(output_dir / "dates.npy", rebalance_dates.to_numpy().astype("datetime64[D]"))
+    np.save(output_dir / "tickers.npy", tickers)
+    np.save(output_dir / "predicted_returns.npy", predicted_returns)
+
+    metadata = {
+        "strategy": strategy,
+        "market_cap_segment": market_cap_segment,
+        "start_date": str(start_date),
+        "end_date": str(end_date),
+        "top_n": top_n,
+        "rebalance_frequency": rebalance_frequency,
+        "num_dates": len(rebalance_dates),
+        "model_path": str(ml_manager.model_path),
+        "model_mtime": Path(ml_manager.model_path).stat().st_mtime,
+        "created_at": str(datetime.now()),
+    }
+    with open(output_dir / "metadata.json", "w") as f:
+        json.dump(metadata, f, indent=2)
+
+    logger.info(f"Candidate cache saved to: {output_dir}")
+
+    return output_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute ML candidates for RL training")
+    parser.add_argument(
+        "--strategy",
+        type=str,
+        default="growth",
+        choices=["dividend", "growth", "value"],
+        help="Investment strategy",
+    )
+    parser.add_argument(
+        "--market-cap",
+        type=str,
+        default="mid",
+        choices=["small", "mid", "large"],
+        help="Market cap segment",
+    )
+    parser.add_argument("--start-date", type=str, default="2015-01-01", help="First date")
+    parser.add_argument("--end-date", type=str, default="2023-12-31", help="Last date")
+    parser.add_argument("--top-n", type=int, default=200, help="Candidates kept per date")
+    parser.add_argument(
+        "--rebalance-frequency", type=int, default=20, help="Trading days between scored dates"
+    )
+    parser.add_argument("--output", type=str, default=None, help="Cache directory override")
+
+    args = parser.parse_args()
+
+    precompute_candidates(
+        strategy=args.strategy,
+        market_cap_segment=args.market_cap,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        top_n=args.top_n,
+        rebalance_frequency=args.rebalance_frequency,
+        output_dir=Path(args.output) if args.output else None,
+    )
+
+
+if __name__ == "__main__":
+    main()
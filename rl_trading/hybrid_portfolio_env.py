@@ -32,6 +32,8 @@ import pandas as pd
 from gymnasium import spaces
 
 from portfolio.ml_portfolio_manager import MLPortfolioManager
+from rl_trading.candidate_cache import CandidateCache
+from rl_trading.price_cube import PriceCube
 from utils import get_logger
 from utils.db_config import engine
 
@@ -62,6 +64,7 @@ class HybridPortfolioEnv(gym.Env):
         transaction_cost: float = 0.001,  # 10 bps
         position_limits: Tuple[float, float] = (0.01, 0.10),  # 1-10% per position
         min_ml_score: float = 0.01,  # Minimum 1% predicted return
+        candidate_cache: Optional[str] = None,  # Precomputed candidates (skips live ML scoring)
     ):
         super().__init__()
 
@@ -77,14 +80,32 @@ class HybridPortfolioEnv(gym.Env):
         self.position_limits = position_limits
         self.min_ml_score = min_ml_score
 
-        # Load ML model
-        logger.info(f"Loading ML model: {strategy}_{market_cap_segment}cap")
-        self.ml_manager = MLPortfolioManager(
-            strategy=strategy, market_cap_segment=market_cap_segment
-        )
+        # Load precomputed candidates, or the ML model for live scoring
+        self.candidate_cache = None
+        self.ml_manager = None
+        if candidate_cache is not None:
+            self.candidate_cache = CandidateCache(candidate_cache)
+            logger.info(
+                f"Using candidate cache: {candidate_cache} ({len(self.candidate_cache)} dates)"
+            )
+            if self.candidate_cache.top_n < ml_top_n:
+                logger.warning(
+                    f"Candidate cache holds top {self.candidate_cache.top_n} per date, "
+                    f"fewer than ml_top_n={ml_top_n}"
+                )
+            if self.candidate_cache.is_stale():
+                logger.warning(
+                    "ML model changed after candidate cache was built - re-run precompute"
+                )
+        else:
+            logger.info(f"Loading ML model: {strategy}_{market_cap_segment}cap")
+            self.ml_manager = MLPortfolioManager(
+                strategy=strategy, market_cap_segment=market_cap_segment
+            )
 
         # State tracking
         self.current_date = None
+        self.current_date_idx = 0
         self.current_capital = initial_capital
         self.current_positions = {}  # {ticker: shares}
         self.current_candidates = None  # ML-selected candidates
@@ -123,7 +144,7 @@ class HybridPortfolioEnv(gym.Env):
         logger.info("Loading historical price data...")
 
         query = """
-        SELECT ticker, date, close, volume
+        SELECT ticker, date, close
         FROM daily_bars
         WHERE date >= %(start_date)s
           AND date <= %(end_date)s
@@ -132,31 +153,53 @@ class HybridPortfolioEnv(gym.Env):
         ORDER BY date, ticker
         """
 
-        self.price_data = pd.read_sql(
+        price_data = pd.read_sql(
             query, engine, params={"start_date": self.start_date, "end_date": self.end_date}
         )
 
-        self.price_data["date"] = pd.to_datetime(self.price_data["date"])
+        logger.info(f"Loaded {len(price_data)} price records")
+        self._index_price_data(price_data)
+
+    def _index_price_data(self, price_data: pd.DataFrame):
+        """Pack long-format prices into a dense date x ticker cube"""
+        self.price_cube = PriceCube.from_frame(price_data)
+
+        # Market proxy: equal-weighted close of the first 100 tickers, precomputed per date
+        self.market_proxy = self.price_cube.market_proxy(n_tickers=100)
 
         # Create trading dates
-        self.trading_dates = sorted(self.price_data["date"].unique())
+        self.trading_dates = list(self.price_cube.dates)
         self.current_step = 0
 
-        logger.info(f"Loaded {len(self.price_data)} price records")
+        logger.info(
+            f"Price cube: {self.price_cube.n_dates} dates x {self.price_cube.n_tickers} tickers "
+            f"({self.price_cube.nbytes / 1e6:.1f} MB)"
+        )
         logger.info(f"Date range: {self.trading_dates[0]} to {self.trading_dates[-1]}")
         logger.info(f"Trading days: {len(self.trading_dates)}")
 
+    def _set_current_step(self, step: int):
+        """Move the environment clock to a trading-day index"""
+        self.current_step = step
+        self.current_date_idx = step
+        self.current_date = self.trading_dates[step]
+
     def _get_ml_candidates(self, as_of_date: date) -> pd.DataFrame:
         """Get top N candidates from ML model"""
         try:
-            # Get ML predictions for this date
-            features = self.ml_manager.get_latest_features(as_of_date=as_of_date)
-
-            if len(features) == 0:
-                logger.warning(f"No features available for {as_of_date}")
-                return pd.DataFrame()
-
-            predictions = self.ml_manager.generate_predictions(features)
+            if self.candidate_cache is not None:
+                # Precomputed scores, already sorted by predicted return
+                predictions = self.candidate_cache.lookup(as_of_date)
+                if len(predictions) == 0:
+                    logger.warning(f"No cached candidates for {as_of_date}")
+                    return pd.DataFrame()
+            else:
+                # Get ML predictions for this date (read through the prediction store)
+                predictions = self.ml_manager.get_predictions(as_of_date=as_of_date)
+
+                if len(predictions) == 0:
+                    logger.warning(f"No features available for {as_of_date}")
+                    return pd.DataFrame()
 
             # Filter by minimum score and select top N
             candidates = predictions[predictions["predicted_return"] >= self.min_ml_score].head(
@@ -188,15 +231,10 @@ class HybridPortfolioEnv(gym.Env):
         position_weights = np.zeros(self.rl_max_positions)
         if self.current_candidates is not None and len(self.current_positions) > 0:
             total_value = self.current_capital
-            for i, ticker in enumerate(
-                self.current_candidates["ticker"].values[: self.rl_max_positions]
-            ):
-                if ticker in self.current_positions:
-                    # Get current price
-                    price = self._get_price(ticker, self.current_date)
-                    if price > 0:
-                        position_value = self.current_positions[ticker] * price
-                        position_weights[i] = position_value / total_value
+            tickers = self.current_candidates["ticker"].values[: self.rl_max_positions]
+            shares = np.array([self.current_positions.get(t, 0) for t in tickers], dtype=np.float64)
+            prices = self._get_prices(tickers)
+            position_weights[: len(tickers)] = shares * prices / total_value
         obs.extend(position_weights)
 
         # 3. Portfolio metrics
@@ -223,18 +261,26 @@ class HybridPortfolioEnv(gym.Env):
 
     def _get_price(self, ticker: str, date: pd.Timestamp) -> float:
         """Get price for ticker on date"""
-        price_row = self.price_data[
-            (self.price_data["ticker"] == ticker) & (self.price_data["date"] == date)
-        ]
-        return price_row["close"].values[0] if len(price_row) > 0 else 0.0
+        date_idx = self.price_cube.date_index.get(date)
+        if date_idx is None:
+            return 0.0
+        return self.price_cube.price(date_idx, ticker)
+
+    def _get_prices(self, tickers) -> np.ndarray:
+        """Get current-date prices for many tickers (0.0 where missing)"""
+        return self.price_cube.prices(self.current_date_idx, tickers)
+
+    def _get_equity_value(self) -> float:
+        """Mark all held positions to market at the current date"""
+        if not self.current_positions:
+            return 0.0
+        tickers = list(self.current_positions.keys())
+        shares = np.fromiter(self.current_positions.values(), dtype=np.float64, count=len(tickers))
+        return float(np.dot(np.maximum(shares, 0), self._get_prices(tickers)))
 
     def _get_cash_percentage(self) -> float:
         """Calculate percentage of portfolio in cash"""
-        total_equity_value = 0
-        for ticker, shares in self.current_positions.items():
-            if shares > 0:
-                price = self._get_price(ticker, self.current_date)
-                total_equity_value += shares * price
+        total_equity_value = self._get_equity_value()
 
         cash = self.current_capital - total_equity_value
         return cash / self.current_capital if self.current_capital > 0 else 0.0
@@ -271,26 +317,21 @@ class HybridPortfolioEnv(gym.Env):
         # For now, use aggregate market stats
 
         try:
-            # Get recent market returns (using average of universe)
-            recent_dates = [d for d in self.trading_dates if d <= self.current_date][-20:]
-
-            if len(recent_dates) < 2:
+            # Get recent market returns (last 20 trading days of the precomputed proxy)
+            end = self.current_date_idx + 1
+            if end < 2:
                 return 0.0, 0.0, 0.0
 
-            # Sample 100 random tickers for market proxy
-            sample_tickers = self.price_data["ticker"].unique()[:100]
-            market_data = self.price_data[
-                (self.price_data["ticker"].isin(sample_tickers))
-                & (self.price_data["date"].isin(recent_dates))
-            ]
+            daily_avg = self.market_proxy[max(0, end - 20) : end]
+            daily_avg = daily_avg[~np.isnan(daily_avg)]
 
-            if len(market_data) == 0:
+            if len(daily_avg) == 0:
                 return 0.0, 0.0, 0.0
 
             # Calculate market metrics
-            daily_avg = market_data.groupby("date")["close"].mean()
-            market_return = (daily_avg.iloc[-1] - daily_avg.iloc[0]) / daily_avg.iloc[0]
-            market_vol = daily_avg.pct_change().std()
+            market_return = (daily_avg[-1] - daily_avg[0]) / daily_avg[0]
+            daily_returns = np.diff(daily_avg) / daily_avg[:-1]
+            market_vol = daily_returns.std(ddof=1) if len(daily_returns) > 1 else 0.0
             vix_proxy = market_vol * np.sqrt(252)  # Annualized vol as VIX proxy
 
             return market_return, market_vol, vix_proxy
@@ -302,11 +343,16 @@ class HybridPortfolioEnv(gym.Env):
     def reset(
         self, seed: Optional[int] = None, options: Optional[dict] = None
     ) -> Tuple[np.ndarray, dict]:
-        """Reset environment to initial state"""
+        """
+        Reset environment to initial state
+
+        options["start_step"] starts the episode at a later trading day (used to
+        stagger episodes when several copies run in lockstep).
+        """
         super().reset(seed=seed)
 
-        self.current_step = 0
-        self.current_date = self.trading_dates[self.current_step]
+        start_step = (options or {}).get("start_step", 0)
+        self._set_current_step(min(start_step, len(self.trading_dates) - 1))
         self.current_capital = self.initial_capital
         self.current_positions = {}
         self.portfolio_history = []
@@ -353,7 +399,7 @@ class HybridPortfolioEnv(gym.Env):
         done = self.current_step >= len(self.trading_dates)
 
         if not done:
-            self.current_date = self.trading_dates[self.current_step]
+            self._set_current_step(self.current_step)
 
             # Calculate portfolio value with new prices
             self._update_portfolio_value()
@@ -390,11 +436,12 @@ class HybridPortfolioEnv(gym.Env):
         target_positions = {}
         total_costs = 0.0
 
-        for ticker, weight in zip(target_tickers, target_weights):
+        target_prices = self._get_prices(target_tickers)
+
+        for ticker, weight, price in zip(target_tickers, target_weights, target_prices):
             if weight < self.position_limits[0]:  # Skip tiny positions
                 continue
 
-            price = self._get_price(ticker, self.current_date)
             if price <= 0:
                 continue
 
@@ -410,11 +457,12 @@ class HybridPortfolioEnv(gym.Env):
                 total_costs += shares_traded * price * self.transaction_cost
 
         # Liquidate positions not in target
-        for ticker in list(self.current_positions.keys()):
-            if ticker not in target_positions:
-                shares = self.current_positions[ticker]
-                price = self._get_price(ticker, self.current_date)
-                total_costs += shares * price * self.transaction_cost
+        exiting = [t for t in self.current_positions if t not in target_positions]
+        if exiting:
+            exit_shares = np.array([self.current_positions[t] for t in exiting], dtype=np.float64)
+            total_costs += (
+                float(np.dot(exit_shares, self._get_prices(exiting))) * self.transaction_cost
+            )
 
         # Update positions
         self.current_positions = target_positions
@@ -424,11 +472,7 @@ class HybridPortfolioEnv(gym.Env):
 
     def _update_portfolio_value(self):
         """Update portfolio value based on current prices"""
-        equity_value = 0.0
-
-        for ticker, shares in self.current_positions.items():
-            price = self._get_price(ticker, self.current_date)
-            equity_value += shares * price
+        equity_value = self._get_equity_value()
 
         # Track history
         self.portfolio_history.append(
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Dense Price Cube for RL Environments
+
+Holds daily closes as a dense date x ticker float32 array so that price,
+valuation and market-feature lookups are O(1) array indexing instead of
+boolean masks over a long (ticker, date, close) DataFrame.
+
+Layout:
+- closes[date_idx, ticker_idx] → close price (NaN when the ticker has no bar)
+- mask[date_idx, ticker_idx]   → True where a price exists
+- date_index / ticker_index    → label → integer position maps
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class PriceCube:
+    """Dense date x ticker close-price array with O(1) lookups"""
+
+    def __init__(self, dates: pd.DatetimeIndex, tickers: np.ndarray, closes: np.ndarray):
+        """
+        Args:
+            dates: Sorted trading dates (rows)
+            tickers: Ticker symbols (columns), in the order they first appear in the data
+            closes: float32 array of shape (len(dates), len(tickers)), NaN where missing
+        """
+        if closes.shape != (len(dates), len(tickers)):
+            raise ValueError(
+                f"closes shape {closes.shape} does not match "
+                f"({len(dates)} dates, {len(tickers)} tickers)"
+            )
+
+        self.dates = pd.DatetimeIndex(dates)
+        self.tickers = np.asarray(tickers, dtype=object)
+        self.closes = np.ascontiguousarray(closes, dtype=np.float32)
+        self.mask = ~np.isnan(self.closes)
+
+        self.date_index = {d: i for i, d in enumerate(self.dates)}
+        self.ticker_index = {t: j for j, t in enumerate(self.tickers)}
+
+    @classmethod
+    def from_frame(cls, price_data: pd.DataFrame) -> "PriceCube":
+        """
+        Build a cube from a long frame with ticker, date and close columns
+
+        Rows are the sorted unique dates; columns keep first-appearance order of
+        tickers so that "the first N tickers" means the same thing as
+        price_data["ticker"].unique()[:N].
+        """
+        dates = pd.DatetimeIndex(pd.to_datetime(price_data["date"]))
+        unique_dates = dates.unique().sort_values()
+        date_codes = unique_dates.get_indexer(dates)
+        ticker_codes, tickers = pd.factorize(price_data["ticker"], sort=False)
+
+        closes = np.full((len(unique_dates), len(tickers)), np.nan, dtype=np.float32)
+        closes[date_codes, ticker_codes] = price_data["close"].to_numpy(dtype=np.float32)
+
+        return cls(unique_dates, np.asarray(tickers), closes)
+
+    @property
+    def n_dates(self) -> int:
+        return self.closes.shape[0]
+
+    @property
+    def n_tickers(self) -> int:
+        return self.closes.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self.closes.nbytes + self.mask.nbytes
+
+    def column_indices(self, tickers: Iterable[str]) -> np.ndarray:
+        """Map tickers to column positions (-1 for tickers not in the cube)"""
+        get = self.ticker_index.get
+        return np.fromiter((get(t, -1) for t in tickers), dtype=np.int64)
+
+    def price(self, date_idx: int, ticker: str) -> float:
+        """Close for one ticker on one date (0.0 when missing)"""
+        col = self.ticker_index.get(ticker)
+        if col is None:
+            return 0.0
+        value = self.closes[date_idx, col]
+        return float(value) if self.mask[date_idx, col] else 0.0
+
+    def prices(self, date_idx: int, tickers: Iterable[str]) -> np.ndarray:
+        """Closes for many tickers on one date (0.0 where missing)"""
+        cols = self.column_indices(tickers)
+        out = np.zeros(len(cols), dtype=np.float64)
+        known = cols >= 0
+        row = self.closes[date_idx]
+        out[known] = np.nan_to_num(row[cols[known]], nan=0.0)
+        return out
+
+    def market_proxy(self, n_tickers: Optional[int] = 100) -> np.ndarray:
+        """
+        Equal-weighted average close of the first n tickers for every date
+
+        Dates where none of the sampled tickers traded are NaN.
+        """
+        block = self.closes if n_tickers is None else self.closes[:, :n_tickers]
+        counts = self.mask[:, : block.shape[1]].sum(axis=1)
+        sums = np.nansum(block, axis=1, dtype=np.float64)
+        proxy = np.full(self.n_dates, np.nan, dtype=np.float64)
+        np.divide(sums, counts, out=proxy, where=counts > 0)
+        return proxy
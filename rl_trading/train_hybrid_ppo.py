@@ -22,13 +22,19 @@ from stable_baselines3 import PPO
 from stable_baselines3.common.callbacks import CheckpointCallback, EvalCallback
 from stable_baselines3.common.vec_env import DummyVecEnv
 
+from rl_trading.candidate_cache import default_cache_dir
 from rl_trading.hybrid_portfolio_env import HybridPortfolioEnv
 from utils import get_logger
 
 logger = get_logger(__name__)
 
 
-def create_env(strategy: str, market_cap_segment: str, train_mode: bool = True):
+def create_env(
+    strategy: str,
+    market_cap_segment: str,
+    train_mode: bool = True,
+    use_candidate_cache: bool = False,
+):
     """Create environment instance"""
     # Now with historical market cap backfilled, use proper train/val split
     if train_mode:
@@ -51,6 +57,11 @@ def create_env(strategy: str, market_cap_segment: str, train_mode: bool = True):
         transaction_cost=0.001,
         position_limits=(0.01, 0.10),
         min_ml_score=0.01,
+        candidate_cache=(
+            default_cache_dir(strategy, market_cap_segment, start_date, end_date)
+            if use_candidate_cache
+            else None
+        ),
     )
 
     return env
@@ -102,6 +113,7 @@ def train(
     eval_freq: int = 10_000,
     save_freq: int = 50_000,
     device: str = "cuda",
+    use_candidate_cache: bool = False,
 ):
     """Train PPO agent"""
 
@@ -120,10 +132,14 @@ def train(
 
     # Create environments
     logger.info("Creating training environment...")
-    train_env = DummyVecEnv([lambda: create_env(strategy, market_cap_segment, train_mode=True)])
+    train_env = DummyVecEnv(
+        [lambda: create_env(strategy, market_cap_segment, True, use_candidate_cache)]
+    )
 
     logger.info("Creating evaluation environment...")
-    eval_env = DummyVecEnv([lambda: create_env(strategy, market_cap_segment, train_mode=False)])
+    eval_env = DummyVecEnv(
+        [lambda: create_env(strategy, market_cap_segment, False, use_candidate_cache)]
+    )
 
     # Get strategy-specific hyperparameters
     hyperparams = get_strategy_hyperparams(strategy)
@@ -237,6 +253,11 @@ def main():
     parser.add_argument("--timesteps", type=int, default=1_000_000, help="Total training timesteps")
     parser.add_argument("--eval-freq", type=int, default=10_000, help="Evaluation frequency")
     parser.add_argument("--save-freq", type=int, default=50_000, help="Checkpoint save frequency")
+    parser.add_argument(
+        "--candidate-cache",
+        action="store_true",
+        help="Read ML candidates from the precomputed cache (see rl_trading/candidate_cache.py)",
+    )
     parser.add_argument(
         "--device",
         type=str,
@@ -260,6 +281,7 @@ def main():
         eval_freq=args.eval_freq,
         save_freq=args.save_freq,
         device=args.device,
+        use_candidate_cache=args.candidate_cache,
     )
 
 
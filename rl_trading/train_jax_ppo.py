@@ -7,6 +7,9 @@ Architecture:
 1. ML Model (XGBoost) → Top N candidates
 2. JAX PPO Agent → Optimal portfolio weights (GPU-accelerated)
 
+Rollouts can run N environments in lockstep (--num-envs) with one jitted
+policy call per step for the whole batch.
+
 Strategies: growth, value, dividend
 Market Caps: small, mid, large
 """
@@ -28,6 +31,8 @@ import optax
 from flax.training import train_state
 from jax import jit, random, value_and_grad
 
+from rl_trading.batched_env import BatchedEnv
+from rl_trading.candidate_cache import default_cache_dir
 from rl_trading.hybrid_portfolio_env import HybridPortfolioEnv
 from utils import get_logger
 
@@ -81,6 +86,7 @@ class PPOTrainer:
         hidden_dim: int = 256,
     ):
         self.env = env
+        self.num_envs = getattr(env, "num_envs", 1)
         self.gamma = gamma
         self.gae_lambda = gae_lambda
         self.clip_epsilon = clip_epsilon
@@ -90,14 +96,20 @@ class PPOTrainer:
         self.n_epochs = n_epochs
         self.batch_size = batch_size
 
+        # Batched envs expose per-env spaces as single_*_space
+        if hasattr(env, "single_action_space"):
+            action_space = env.single_action_space
+            observation_space = env.single_observation_space
+        else:
+            action_space = env.action_space
+            observation_space = env.observation_space
+
         # Initialize network
         self.rng = random.PRNGKey(0)
-        self.network = ActorCriticNetwork(
-            action_dim=env.action_space.shape[0], hidden_dim=hidden_dim
-        )
+        self.network = ActorCriticNetwork(action_dim=action_space.shape[0], hidden_dim=hidden_dim)
 
         # Initialize network parameters
-        dummy_obs = jnp.ones((1, env.observation_space.shape[0]))
+        dummy_obs = jnp.ones((1, observation_space.shape[0]))
         self.rng, init_rng = random.split(self.rng)
         params = self.network.init(init_rng, dummy_obs)
 
@@ -107,6 +119,11 @@ class PPOTrainer:
             apply_fn=self.network.apply, params=params, tx=tx
         )
 
+        # Compiled once: batched policy evaluation and one PPO minibatch update
+        self._act = jit(self._policy_outputs)
+        self._update_step = jit(self._make_update_step())
+        self._vector_obs = None
+
         logger.info(f"✅ JAX PPO initialized on device: {jax.devices()[0]}")
         logger.info(f"Network parameters: {sum(x.size for x in jax.tree_util.tree_leaves(params))}")
 
@@ -119,21 +136,23 @@ class PPOTrainer:
         gamma: float,
         gae_lambda: float,
     ) -> Tuple[jnp.ndarray, jnp.ndarray]:
-        """Compute Generalized Advantage Estimation"""
-        advantages = []
-        gae = 0.0
-
-        for t in reversed(range(len(rewards))):
-            if t == len(rewards) - 1:
-                next_value = 0.0
-            else:
-                next_value = values[t + 1]
-
-            delta = rewards[t] + gamma * next_value * (1 - dones[t]) - values[t]
-            gae = delta + gamma * gae_lambda * (1 - dones[t]) * gae
-            advantages.insert(0, gae)
-
-        advantages = jnp.array(advantages)
+        """
+        Compute Generalized Advantage Estimation
+
+        Accepts (T,) single-env or (T, N) batched rollouts. The value after the
+        final step is taken as 0.
+        """
+        next_values = jnp.concatenate([values[1:], jnp.zeros_like(values[:1])], axis=0)
+        deltas = rewards + gamma * next_values * (1 - dones) - values
+
+        def backward(gae, step):
+            delta, done = step
+            gae = delta + gamma * gae_lambda * (1 - done) * gae
+            return gae, gae
+
+        _, advantages = jax.lax.scan(
+            backward, jnp.zeros_like(values[0]), (deltas, dones), reverse=True
+        )
         returns = advantages + values
 
         return advantages, returns
@@ -185,6 +204,45 @@ class PPOTrainer:
 
         return total_loss, info
 
+    def _policy_outputs(self, params: Any, obs: jnp.ndarray):
+        """Action weights, values and log probs for a batch of observations"""
+        action_probs, values = self.network.apply(params, obs)
+        # Actions are the probabilities themselves (continuous weights)
+        log_probs = jnp.log(jnp.sum(action_probs * action_probs, axis=-1) + 1e-8)
+        return action_probs, jnp.reshape(values, (-1,)), log_probs
+
+    def _make_update_step(self):
+        """Build the PPO minibatch update (loss, gradients, optimizer step)"""
+        ppo_loss = self.ppo_loss
+        clip_epsilon = self.clip_epsilon
+        value_coef = self.value_coef
+        entropy_coef = self.entropy_coef
+
+        def update_step(
+            state: train_state.TrainState,
+            obs_batch: jnp.ndarray,
+            action_batch: jnp.ndarray,
+            old_log_probs_batch: jnp.ndarray,
+            advantages_batch: jnp.ndarray,
+            returns_batch: jnp.ndarray,
+        ):
+            grad_fn = value_and_grad(ppo_loss, has_aux=True)
+            (loss, info), grads = grad_fn(
+                state.params,
+                state.apply_fn,
+                obs_batch,
+                action_batch,
+                old_log_probs_batch,
+                advantages_batch,
+                returns_batch,
+                clip_epsilon,
+                value_coef,
+                entropy_coef,
+            )
+            return state.apply_gradients(grads=grads), info
+
+        return update_step
+
     def collect_trajectory(self, n_steps: int) -> Dict:
         """Collect trajectory data from environment"""
         observations = []
@@ -237,6 +295,49 @@ class PPOTrainer:
             "log_probs": jnp.array(log_probs),
         }
 
+    def collect_vector_trajectory(self, n_steps: int) -> Dict:
+        """
+        Collect n_steps from every environment of a BatchedEnv in lockstep
+
+        Episodes continue across calls. Arrays are shaped (n_steps, num_envs, ...).
+        """
+        obs_dim = self.env.single_observation_space.shape[0]
+        action_dim = self.env.single_action_space.shape[0]
+
+        observations = np.zeros((n_steps, self.num_envs, obs_dim), dtype=np.float32)
+        actions = np.zeros((n_steps, self.num_envs, action_dim), dtype=np.float32)
+        rewards = np.zeros((n_steps, self.num_envs), dtype=np.float32)
+        dones = np.zeros((n_steps, self.num_envs), dtype=np.float32)
+        values = np.zeros((n_steps, self.num_envs), dtype=np.float32)
+        log_probs = np.zeros((n_steps, self.num_envs), dtype=np.float32)
+
+        if self._vector_obs is None:
+            self._vector_obs, _ = self.env.reset()
+        obs = self._vector_obs
+
+        params = self.train_state.params
+        for step in range(n_steps):
+            # One policy call and one device->host transfer for all environments
+            action_probs, value, log_prob = jax.device_get(self._act(params, obs))
+
+            observations[step] = obs
+            actions[step] = action_probs
+            values[step] = value
+            log_probs[step] = log_prob
+
+            obs, rewards[step], dones[step], _ = self.env.step(action_probs)
+
+        self._vector_obs = obs
+
+        return {
+            "observations": jnp.asarray(observations),
+            "actions": jnp.asarray(actions),
+            "rewards": jnp.asarray(rewards),
+            "dones": jnp.asarray(dones),
+            "values": jnp.asarray(values),
+            "log_probs": jnp.asarray(log_probs),
+        }
+
     def update(self, trajectory: Dict) -> Dict:
         """Update policy using PPO"""
         # Compute advantages and returns
@@ -251,8 +352,15 @@ class PPOTrainer:
         # Normalize advantages
         advantages = (advantages - jnp.mean(advantages)) / (jnp.std(advantages) + 1e-8)
 
+        # Flatten (n_steps, num_envs, ...) rollouts into one sample axis
+        observations = trajectory["observations"].reshape(-1, trajectory["observations"].shape[-1])
+        actions = trajectory["actions"].reshape(-1, trajectory["actions"].shape[-1])
+        old_log_probs = trajectory["log_probs"].reshape(-1)
+        advantages = advantages.reshape(-1)
+        returns = returns.reshape(-1)
+
         # Create batches
-        n_samples = len(trajectory["observations"])
+        n_samples = len(observations)
         indices = np.arange(n_samples)
 
         epoch_info = []
@@ -264,30 +372,15 @@ class PPOTrainer:
                 end = min(start + self.batch_size, n_samples)
                 batch_idx = indices[start:end]
 
-                # Get batch
-                obs_batch = trajectory["observations"][batch_idx]
-                action_batch = trajectory["actions"][batch_idx]
-                old_log_probs_batch = trajectory["log_probs"][batch_idx]
-                advantages_batch = advantages[batch_idx]
-                returns_batch = returns[batch_idx]
-
-                # Compute loss and gradients
-                grad_fn = value_and_grad(self.ppo_loss, has_aux=True)
-                (loss, info), grads = grad_fn(
-                    self.train_state.params,
-                    self.train_state.apply_fn,
-                    obs_batch,
-                    action_batch,
-                    old_log_probs_batch,
-                    advantages_batch,
-                    returns_batch,
-                    self.clip_epsilon,
-                    self.value_coef,
-                    self.entropy_coef,
+                # Compute loss and gradients, update parameters (jitted)
+                self.train_state, info = self._update_step(
+                    self.train_state,
+                    observations[batch_idx],
+                    actions[batch_idx],
+                    old_log_probs[batch_idx],
+                    advantages[batch_idx],
+                    returns[batch_idx],
                 )
-
-                # Update parameters
-                self.train_state = self.train_state.apply_gradients(grads=grads)
                 epoch_info.append(info)
 
         # Average info over all updates
@@ -310,7 +403,7 @@ class PPOTrainer:
         logger.info("=" * 80)
         logger.info("Starting JAX PPO Training")
         logger.info(f"Total timesteps: {total_timesteps:,}")
-        logger.info(f"Steps per update: {n_steps}")
+        logger.info(f"Steps per update: {n_steps} x {self.num_envs} env(s)")
         logger.info(f"Device: {jax.devices()[0]}")
         logger.info("=" * 80)
 
@@ -318,10 +411,15 @@ class PPOTrainer:
         episode = 0
         best_mean_reward = -float("inf")
 
+        steps_per_update = n_steps * self.num_envs
+
         while timesteps < total_timesteps:
             # Collect trajectory
-            trajectory = self.collect_trajectory(n_steps)
-            timesteps += n_steps
+            if self.num_envs > 1:
+                trajectory = self.collect_vector_trajectory(n_steps)
+            else:
+                trajectory = self.collect_trajectory(n_steps)
+            timesteps += steps_per_update
 
             # Update policy
             info = self.update(trajectory)
@@ -339,7 +437,7 @@ class PPOTrainer:
                 )
 
             # Save checkpoint
-            if output_dir and timesteps % save_freq < n_steps:
+            if output_dir and timesteps % save_freq < steps_per_update:
                 checkpoint_path = output_dir / "checkpoints" / f"model_{timesteps}.pkl"
                 checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -381,7 +479,12 @@ class PPOTrainer:
         return self.train_state
 
 
-def create_env(strategy: str, market_cap_segment: str, train_mode: bool = True):
+def create_env(
+    strategy: str,
+    market_cap_segment: str,
+    train_mode: bool = True,
+    use_candidate_cache: bool = False,
+):
     """Create environment instance"""
     if train_mode:
         start_date = "2015-01-01"
@@ -401,6 +504,11 @@ def create_env(strategy: str, market_cap_segment: str, train_mode: bool = True):
         transaction_cost=0.001,
         position_limits=(0.01, 0.10),
         min_ml_score=0.01,
+        candidate_cache=(
+            default_cache_dir(strategy, market_cap_segment, start_date, end_date)
+            if use_candidate_cache
+            else None
+        ),
     )
 
     return env
@@ -412,6 +520,8 @@ def train(
     total_timesteps: int = 1_000_000,
     eval_freq: int = 10_000,
     save_freq: int = 50_000,
+    use_candidate_cache: bool = False,
+    num_envs: int = 1,
 ):
     """Train JAX PPO agent"""
 
@@ -432,7 +542,12 @@ def train(
 
     # Create environment
     logger.info("Creating training environment...")
-    env = create_env(strategy, market_cap_segment, train_mode=True)
+    env = create_env(
+        strategy, market_cap_segment, train_mode=True, use_candidate_cache=use_candidate_cache
+    )
+    if num_envs > 1:
+        logger.info(f"Running {num_envs} environments in lockstep")
+        env = BatchedEnv(env, num_envs)
 
     # Get strategy-specific hyperparameters
     hyperparams = {
@@ -467,7 +582,7 @@ def train(
 
     trainer.train(
         total_timesteps=total_timesteps,
-        n_steps=2048,
+        n_steps=max(1, 2048 // num_envs),
         eval_freq=eval_freq,
         save_freq=save_freq,
         output_dir=output_dir,
@@ -512,6 +627,7 @@ def train(
         "rl_max_positions": 50,
         "trained_at": str(datetime.now()),
         "framework": "JAX",
+        "num_envs": num_envs,
         "device": str(jax.devices()[0]),
     }
 
@@ -540,6 +656,14 @@ def main():
     parser.add_argument("--timesteps", type=int, default=1_000_000, help="Total training timesteps")
     parser.add_argument("--eval-freq", type=int, default=10_000, help="Evaluation frequency")
     parser.add_argument("--save-freq", type=int, default=50_000, help="Checkpoint save frequency")
+    parser.add_argument(
+        "--candidate-cache",
+        action="store_true",
+        help="Read ML candidates from the precomputed cache (see rl_trading/candidate_cache.py)",
+    )
+    parser.add_argument(
+        "--num-envs", type=int, default=1, help="Environments stepped in lockstep per rollout"
+    )
 
     args = parser.parse_args()
 
@@ -555,6 +679,8 @@ def main():
         total_timesteps=args.timesteps,
         eval_freq=args.eval_freq,
         save_freq=args.save_freq,
+        use_candidate_cache=args.candidate_cache,
+        num_envs=args.num_envs,
     )
 
 
@@ -47,39 +47,30 @@ ML_MODEL_CONFIGS = [
 
 
 def refresh_ml_features():
-    """Refresh the ml_training_features materialized view"""
+    """Bring ml_feature_store (the ml_training_features view) up to date incrementally"""
     logger.info("=" * 80)
-    logger.info("REFRESHING ML TRAINING FEATURES")
+    logger.info("UPDATING ML FEATURE STORE")
     logger.info("=" * 80)
 
     try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        cursor = conn.cursor()
+        from ml_models.feature_store import FeatureStoreBuilder
 
         start_time = datetime.now()
-        logger.info("Starting REFRESH MATERIALIZED VIEW...")
-
-        cursor.execute("REFRESH MATERIALIZED VIEW ml_training_features")
-        conn.commit()
+        stats = FeatureStoreBuilder().update()
 
         duration = (datetime.now() - start_time).total_seconds()
-        logger.info(f"✅ Materialized view refreshed in {duration:.1f} seconds")
-
-        # Get row count
-        cursor.execute("SELECT COUNT(*) FROM ml_training_features")
-        count = cursor.fetchone()[0]
-        logger.info(f"Total feature rows: {count:,}")
+        logger.info(
+            f"✅ Feature store updated in {duration:.1f} seconds "
+            f"({stats.get('rows_written', 0):,} rows written, "
+            f"{stats.get('targets_backfilled', 0):,} targets back-filled)"
+        )
 
         return True
 
     except Exception as e:
-        logger.error(f"❌ Failed to refresh materialized view: {e}")
+        logger.error(f"❌ Failed to update feature store: {e}")
         return False
 
-    finally:
-        if conn:
-            conn.close()
-
 
 def train_ml_model(config: Dict, start_date: str, end_date: str, gpu: bool = True) -> Dict:
     """Train a single ML model"""
@@ -149,6 +140,49 @@ def train_ml_model(config: Dict, start_date: str, end_date: str, gpu: bool = Tru
         }
 
 
+def train_ml_models(
+    configs: List[Dict], start_date: str, end_date: str, gpu: bool = True
+) -> List[Dict]:
+    """Train several ML models from one shared data load (ml_models/train_strategy_models.py)"""
+    from ml_models.train_strategy_models import MultiModelTrainer
+
+    start_time = datetime.now()
+    try:
+        trainer = MultiModelTrainer(configs, gpu_id=0 if gpu else None)
+        report = trainer.run(date.fromisoformat(start_date), date.fromisoformat(end_date))
+    except Exception as e:
+        duration = (datetime.now() - start_time).total_seconds() / 60
+        logger.error(f"❌ Shared training failed after {duration:.1f} minutes: {e}")
+        return [
+            {
+                "model_name": config["name"],
+                "strategy": config["strategy"],
+                "market_cap": config["market_cap"],
+                "status": "failed",
+                "duration_minutes": duration,
+                "error": str(e),
+            }
+            for config in configs
+        ]
+
+    logger.info(
+        f"✅ {len(report['models'])} models trained from one data load in "
+        f"{report['total_seconds'] / 60:.1f} minutes ({report['fits']} fits)"
+    )
+    return [
+        {
+            "model_name": model["model_name"],
+            "strategy": model["strategy"],
+            "market_cap": model["market_cap"],
+            "status": model["status"],
+            "duration_minutes": model["seconds"] / 60,
+            "start_date": start_date,
+            "end_date": end_date,
+        }
+        for model in report["models"]
+    ]
+
+
 def log_training_run(results: List[Dict]):
     """Log training run results to database"""
     try:
@@ -195,11 +229,17 @@ def main():
         "--refresh-features",
         action="store_true",
         default=False,
-        help="Refresh ml_training_features before training",
+        help="Update the ml_training_features feature store before training",
     )
     parser.add_argument(
         "--models", nargs="+", default=None, help="Specific models to train (default: all)"
     )
+    parser.add_argument(
+        "--separate-processes",
+        action="store_true",
+        default=False,
+        help="Train each model in its own trainer process (re-loads the data per model)",
+    )
 
     args = parser.parse_args()
 
@@ -231,13 +271,18 @@ def main():
     else:
         logger.info(f"Training all {len(models_to_train)} models")
 
-    # Train each model
-    results = []
-    for config in models_to_train:
-        result = train_ml_model(
-            config, start_date=args.start_date, end_date=args.end_date, gpu=args.gpu
+    # Train the models from one shared data load, or one process per model
+    if args.separate_processes:
+        results = []
+        for config in models_to_train:
+            result = train_ml_model(
+                config, start_date=args.start_date, end_date=args.end_date, gpu=args.gpu
+            )
+            results.append(result)
+    else:
+        results = train_ml_models(
+            models_to_train, start_date=args.start_date, end_date=args.end_date, gpu=args.gpu
         )
-        results.append(result)
 
     # Summary
     logger.info("=" * 80)
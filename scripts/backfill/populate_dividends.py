@@ -18,6 +18,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from dotenv import load_dotenv
 
 from utils import get_logger, get_psycopg2_connection
+from utils.bulk_writer import copy_upsert
 
 load_dotenv()
 
@@ -184,7 +185,7 @@ def populate_table(tickers_data):
 
                     # Insert batch
                     if len(batch) >= batch_size:
-                        cur.executemany(insert_sql, batch)
+                        copy_upsert(cur, insert_sql, batch)
                         batch = []
 
                 processed += 1
@@ -201,7 +202,7 @@ def populate_table(tickers_data):
 
             # Insert remaining batch
             if batch:
-                cur.executemany(insert_sql, batch)
+                copy_upsert(cur, insert_sql, batch)
 
             logger.info(
                 f"Final: {processed} tickers processed, {total_dividends_inserted:,} dividends inserted"
@@ -17,7 +17,8 @@ from sqlalchemy import text
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from utils import get_logger
+from utils import get_logger, get_psycopg2_connection
+from utils.bulk_writer import copy_upsert
 from utils.db_config import engine
 
 logger = get_logger(__name__)
@@ -105,13 +106,9 @@ def insert_bars(df: pd.DataFrame) -> int:
     if df.empty:
         return 0
 
-    # Prepare data for insertion
-    records = df.to_dict("records")
-
-    insert_query = text(
-        """
+    insert_query = """
         INSERT INTO etf_bars (ticker, date, open, high, low, close, volume, vwap, transactions)
-        VALUES (:ticker, :date, :open, :high, :low, :close, :volume, :vwap, :transactions)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
         ON CONFLICT (ticker, date)
         DO UPDATE SET
             open = EXCLUDED.open,
@@ -122,10 +119,13 @@ def insert_bars(df: pd.DataFrame) -> int:
             vwap = EXCLUDED.vwap,
             transactions = EXCLUDED.transactions
     """
-    )
 
-    with engine.begin() as conn:
-        conn.execute(insert_query, records)
+    columns = ["ticker", "date", "open", "high", "low", "close", "volume", "vwap", "transactions"]
+    records = df[columns].astype(object).where(df[columns].notna(), None)
+
+    with get_psycopg2_connection() as conn:
+        with conn.cursor() as cur:
+            copy_upsert(cur, insert_query, list(records.itertuples(index=False, name=None)))
 
     logger.info(f"Inserted/updated {len(records):,} bars")
     return len(records)
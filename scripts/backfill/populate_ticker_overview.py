@@ -17,6 +17,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from dotenv import load_dotenv
 
 from utils import get_logger, get_psycopg2_connection
+from utils.bulk_writer import copy_upsert
 
 load_dotenv()
 
@@ -160,7 +161,7 @@ def populate_table(tickers):
 
                 # Insert batch
                 if len(batch) >= batch_size:
-                    cur.executemany(insert_sql, batch)
+                    copy_upsert(cur, insert_sql, batch)
                     logger.info(
                         f"  Progress: {processed}/{len(tickers)} processed, {inserted} inserted"
                     )
@@ -172,7 +173,7 @@ def populate_table(tickers):
 
             # Insert remaining batch
             if batch:
-                cur.executemany(insert_sql, batch)
+                copy_upsert(cur, insert_sql, batch)
 
             logger.info(f"Final: {processed} tickers processed, {inserted} overviews inserted")
 
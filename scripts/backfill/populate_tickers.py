@@ -16,6 +16,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from dotenv import load_dotenv
 
 from utils import get_logger, get_psycopg2_connection
+from utils.bulk_writer import copy_upsert
 
 load_dotenv()
 
@@ -129,7 +130,7 @@ def populate_table(tickers):
                     )
                     values_list.append(values)
 
-                cur.executemany(insert_sql, values_list)
+                copy_upsert(cur, insert_sql, values_list)
                 logger.info(f"  Inserted batch {i//batch_size + 1}: {len(values_list)} tickers")
 
             # Get final count
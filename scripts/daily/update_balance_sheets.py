@@ -6,11 +6,10 @@ Fetches recent quarters (last 4 quarters) for all active tickers
 """
 import os
 import sys
-import time
 from datetime import date, datetime, timedelta
 from pathlib import Path
 
-import requests
+import httpx
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -18,6 +17,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from dotenv import load_dotenv
 
 from utils import get_logger, get_psycopg2_connection
+from utils.bulk_writer import copy_upsert
+from utils.polygon_client import fetch_all
 
 load_dotenv()
 
@@ -44,7 +45,7 @@ def get_active_tickers():
             return tickers
 
 
-def fetch_balance_sheets(ticker, limit=4):
+async def fetch_balance_sheets(client, ticker, limit=4):
     """Fetch recent balance sheets for a ticker (both quarterly and annual)"""
     all_results = []
 
@@ -53,33 +54,13 @@ def fetch_balance_sheets(ticker, limit=4):
             "tickers": ticker,
             "timeframe": timeframe,
             "limit": limit,
-            "apiKey": POLYGON_API_KEY,
         }
 
         try:
-            response = requests.get(API_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            if data.get("status") == "OK" and "results" in data:
-                all_results.extend(data["results"])
-
-                # Handle pagination
-                while data.get("next_url"):
-                    next_url = data["next_url"] + f"&apiKey={POLYGON_API_KEY}"
-                    response = requests.get(next_url)
-                    response.raise_for_status()
-                    data = response.json()
-                    if data.get("status") == "OK" and "results" in data:
-                        all_results.extend(data["results"])
-                    else:
-                        break
-
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
-                logger.debug(f"No {timeframe} balance sheets for {ticker}")
-            else:
-                logger.error(f"HTTP error for {ticker} ({timeframe}): {e}")
+            all_results.extend(await client.get_paginated(API_URL, params))
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP error for {ticker} ({timeframe}): {e}")
         except Exception as e:
             logger.error(f"Error fetching {timeframe} balance sheets for {ticker}: {e}")
 
@@ -161,9 +142,14 @@ def upsert_balance_sheets(tickers_data):
             batch = []
             batch_size = 1000
 
-            for i, (ticker, list_date) in enumerate(tickers_data, 1):
-                balance_sheets = fetch_balance_sheets(ticker, limit=4)
+            # Fetch concurrently (pooled, rate-limited, retried), then upsert in order
+            fetched = fetch_all(
+                [ticker for ticker, _ in tickers_data],
+                lambda client, ticker: fetch_balance_sheets(client, ticker, limit=4),
+                api_key=POLYGON_API_KEY,
+            )
 
+            for (ticker, list_date), balance_sheets in zip(tickers_data, fetched):
                 if balance_sheets:
                     for bs in balance_sheets:
                         # Parse dates
@@ -233,7 +219,7 @@ def upsert_balance_sheets(tickers_data):
 
                     # Upsert batch
                     if len(batch) >= batch_size:
-                        cur.executemany(upsert_sql, batch)
+                        copy_upsert(cur, upsert_sql, batch)
                         batch = []
 
                 processed += 1
@@ -244,13 +230,9 @@ def upsert_balance_sheets(tickers_data):
                         f"  Progress: {processed}/{len(tickers_data)} tickers, {total_sheets_upserted:,} balance sheets upserted"
                     )
 
-                # Rate limiting: 100 requests per second
-                if i % 100 == 0:
-                    time.sleep(1)
-
             # Upsert remaining batch
             if batch:
-                cur.executemany(upsert_sql, batch)
+                copy_upsert(cur, upsert_sql, batch)
 
             # Get counts after update
             cur.execute("SELECT COUNT(*) FROM balance_sheets;")
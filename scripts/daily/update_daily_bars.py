@@ -2,15 +2,18 @@
 """
 Daily update for daily_bars table from Polygon.io API
 Incremental update: UPSERT only (safe to rerun)
-Fetches last 30 days of data for all active tickers
+Default mode pulls one grouped-daily (whole market) file per trading day and
+writes only rows that are new or changed; --mode ticker fetches the last 30 days
+of data per active ticker
 """
+import argparse
 import os
 import sys
-import time
 from datetime import date, datetime, timedelta
 from pathlib import Path
 
-import requests
+import httpx
+import pandas as pd
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -18,6 +21,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from dotenv import load_dotenv
 
 from utils import get_logger, get_psycopg2_connection
+from utils.bulk_writer import copy_upsert
+from utils.polygon_client import fetch_all
 
 load_dotenv()
 
@@ -25,6 +30,41 @@ logger = get_logger(__name__)
 
 POLYGON_API_KEY = os.getenv("POLYGON_API_KEY")
 API_URL = "https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/day/{from_date}/{to_date}"
+GROUPED_API_URL = "https://api.polygon.io/v2/aggs/grouped/locale/us/market/stocks/{date}"
+
+BAR_COLUMNS = ["open", "high", "low", "close", "volume", "vwap", "transactions"]
+
+UPSERT_SQL = """
+    INSERT INTO daily_bars (
+        ticker, date, open, high, low, close, volume, vwap, transactions, updated_at
+    ) VALUES (
+        %s, %s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP
+    )
+    ON CONFLICT (ticker, date) DO UPDATE SET
+        open = EXCLUDED.open,
+        high = EXCLUDED.high,
+        low = EXCLUDED.low,
+        close = EXCLUDED.close,
+        volume = EXCLUDED.volume,
+        vwap = EXCLUDED.vwap,
+        transactions = EXCLUDED.transactions,
+        updated_at = CURRENT_TIMESTAMP;
+"""
+
+
+def bar_values(ticker, bar_date, bar):
+    """UPSERT_SQL parameters for one Polygon aggregate bar"""
+    return (
+        ticker,
+        bar_date,
+        bar.get("o"),  # open
+        bar.get("h"),  # high
+        bar.get("l"),  # low
+        bar.get("c"),  # close
+        bar.get("v"),  # volume
+        bar.get("vw"),  # vwap
+        bar.get("n"),  # transactions
+    )
 
 
 def get_active_tickers():
@@ -44,30 +84,29 @@ def get_active_tickers():
             return tickers
 
 
-def fetch_daily_bars(ticker, from_date, to_date):
+async def fetch_daily_bars(client, ticker, from_date, to_date):
     """Fetch daily bars for a ticker between dates"""
     url = API_URL.format(
         ticker=ticker,
         from_date=from_date.strftime("%Y-%m-%d"),
         to_date=to_date.strftime("%Y-%m-%d"),
     )
-    params = {"apiKey": POLYGON_API_KEY, "adjusted": "true", "sort": "asc", "limit": 50000}
+    params = {"adjusted": "true", "sort": "asc", "limit": 50000}
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = await client.get_json(url, params)
+
+        if data is None:
+            logger.debug(f"No data for {ticker}")
+            return []
 
         if data.get("status") == "OK" and "results" in data:
             return data["results"]
         else:
             return []
 
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 404:
-            logger.debug(f"No data for {ticker}")
-        else:
-            logger.error(f"HTTP error for {ticker}: {e}")
+    except httpx.HTTPStatusError as e:
+        logger.error(f"HTTP error for {ticker}: {e}")
         return []
     except Exception as e:
         logger.error(f"Error fetching {ticker}: {e}")
@@ -76,23 +115,6 @@ def fetch_daily_bars(ticker, from_date, to_date):
 
 def upsert_daily_bars(tickers):
     """Fetch and upsert daily bars (INSERT ... ON CONFLICT DO UPDATE)"""
-    upsert_sql = """
-        INSERT INTO daily_bars (
-            ticker, date, open, high, low, close, volume, vwap, transactions, updated_at
-        ) VALUES (
-            %s, %s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP
-        )
-        ON CONFLICT (ticker, date) DO UPDATE SET
-            open = EXCLUDED.open,
-            high = EXCLUDED.high,
-            low = EXCLUDED.low,
-            close = EXCLUDED.close,
-            volume = EXCLUDED.volume,
-            vwap = EXCLUDED.vwap,
-            transactions = EXCLUDED.transactions,
-            updated_at = CURRENT_TIMESTAMP;
-    """
-
     # Fetch last 30 days of data
     today = date.today()
     from_date = today - timedelta(days=30)
@@ -110,31 +132,25 @@ def upsert_daily_bars(tickers):
             batch = []
             batch_size = 1000
 
-            for i, ticker in enumerate(tickers, 1):
-                bars = fetch_daily_bars(ticker, from_date, today)
+            # Fetch concurrently (pooled, rate-limited, retried), then upsert in order
+            fetched = fetch_all(
+                tickers,
+                lambda client, ticker: fetch_daily_bars(client, ticker, from_date, today),
+                api_key=POLYGON_API_KEY,
+            )
 
+            for ticker, bars in zip(tickers, fetched):
                 if bars:
                     for bar in bars:
                         # Convert timestamp to date
                         bar_date = datetime.fromtimestamp(bar["t"] / 1000).date()
 
-                        values = (
-                            ticker,
-                            bar_date,
-                            bar.get("o"),  # open
-                            bar.get("h"),  # high
-                            bar.get("l"),  # low
-                            bar.get("c"),  # close
-                            bar.get("v"),  # volume
-                            bar.get("vw"),  # vwap
-                            bar.get("n"),  # transactions
-                        )
-                        batch.append(values)
+                        batch.append(bar_values(ticker, bar_date, bar))
                         total_bars_upserted += 1
 
                     # Upsert batch
                     if len(batch) >= batch_size:
-                        cur.executemany(upsert_sql, batch)
+                        copy_upsert(cur, UPSERT_SQL, batch)
                         batch = []
 
                 processed += 1
@@ -145,13 +161,9 @@ def upsert_daily_bars(tickers):
                         f"  Progress: {processed}/{len(tickers)} tickers, {total_bars_upserted:,} bars upserted"
                     )
 
-                # Rate limiting: 100 requests per second
-                if i % 100 == 0:
-                    time.sleep(1)
-
             # Upsert remaining batch
             if batch:
-                cur.executemany(upsert_sql, batch)
+                copy_upsert(cur, UPSERT_SQL, batch)
 
             # Get counts after update
             cur.execute("SELECT COUNT(*) FROM daily_bars;")
@@ -195,8 +207,158 @@ def upsert_daily_bars(tickers):
                 logger.info(f"  {bar_date}: {count:,} tickers")
 
 
+async def fetch_grouped_daily(client, trade_date):
+    """Fetch the whole-market grouped daily bars for one trading date"""
+    url = GROUPED_API_URL.format(date=trade_date.strftime("%Y-%m-%d"))
+
+    try:
+        data = await client.get_json(url, {"adjusted": "true"})
+
+        if data and data.get("status") == "OK":
+            return data.get("results", [])
+        return []
+
+    except httpx.HTTPStatusError as e:
+        logger.error(f"HTTP error for grouped daily {trade_date}: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"Error fetching grouped daily {trade_date}: {e}")
+        return None
+
+
+def diff_bars(incoming, stored, tolerance=1e-4):
+    """
+    Split one day's incoming bars into inserts, updates and unchanged rows
+
+    Args:
+        incoming: DataFrame with ticker + BAR_COLUMNS from the API
+        stored: DataFrame with ticker + BAR_COLUMNS already in daily_bars for that date
+        tolerance: Absolute difference below which a value counts as unchanged
+                   (absorbs NUMERIC rounding of stored prices)
+
+    Returns:
+        (inserts, updates, unchanged_count) - inserts/updates are DataFrames of
+        incoming rows
+    """
+    merged = incoming.merge(
+        stored, on="ticker", how="left", suffixes=("", "_stored"), indicator=True
+    )
+    is_new = merged["_merge"] == "left_only"
+
+    changed = pd.Series(False, index=merged.index)
+    for column in BAR_COLUMNS:
+        new_value = pd.to_numeric(merged[column], errors="coerce")
+        old_value = pd.to_numeric(merged[f"{column}_stored"], errors="coerce")
+        both_null = new_value.isna() & old_value.isna()
+        differs = ~((new_value - old_value).abs() <= tolerance) & ~both_null
+        changed |= differs
+
+    inserts = merged.loc[is_new, incoming.columns]
+    updates = merged.loc[~is_new & changed, incoming.columns]
+    unchanged = int((~is_new & ~changed).sum())
+    return inserts, updates, unchanged
+
+
+def get_trading_dates(from_date, to_date):
+    """Weekdays in [from_date, to_date] that are not market holidays"""
+    dates = [d.date() for d in pd.bdate_range(from_date, to_date)]
+    try:
+        with get_psycopg2_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT date FROM market_holidays WHERE date BETWEEN %s AND %s AND status = 'closed'",
+                    (from_date, to_date),
+                )
+                holidays = {row[0] for row in cur.fetchall()}
+    except Exception as e:
+        logger.debug(f"market_holidays unavailable, using weekdays only: {e}")
+        holidays = set()
+    return [d for d in dates if d not in holidays]
+
+
+def upsert_grouped_daily(tickers, from_date, to_date):
+    """
+    Grouped-daily mode: one whole-market request per trading day, diffed against
+    daily_bars so only new or changed rows are written
+    """
+    trading_dates = get_trading_dates(from_date, to_date)
+    active = set(tickers)
+    logger.info(
+        f"Fetching grouped daily bars for {len(trading_dates)} trading days "
+        f"({from_date} to {to_date})..."
+    )
+
+    fetched = fetch_all(trading_dates, fetch_grouped_daily, api_key=POLYGON_API_KEY)
+
+    totals = {"inserted": 0, "updated": 0, "unchanged": 0, "days_failed": 0}
+    with get_psycopg2_connection() as conn:
+        with conn.cursor() as cur:
+            for trade_date, results in zip(trading_dates, fetched):
+                if results is None:
+                    totals["days_failed"] += 1
+                    continue
+                if not results:
+                    logger.info(f"  {trade_date}: no bars (market closed?)")
+                    continue
+
+                incoming = pd.DataFrame(
+                    [
+                        dict(
+                            zip(["ticker", "date"] + BAR_COLUMNS, bar_values(r["T"], trade_date, r))
+                        )
+                        for r in results
+                        if r.get("T") in active
+                    ]
+                )
+                if incoming.empty:
+                    continue
+
+                cur.execute(
+                    f"SELECT ticker, {', '.join(BAR_COLUMNS)} FROM daily_bars WHERE date = %s",
+                    (trade_date,),
+                )
+                stored = pd.DataFrame(cur.fetchall(), columns=["ticker"] + BAR_COLUMNS)
+
+                inserts, updates, unchanged = diff_bars(incoming, stored)
+                to_write = pd.concat([inserts, updates])
+                if not to_write.empty:
+                    rows = to_write[["ticker", "date"] + BAR_COLUMNS].astype(object)
+                    rows = rows.where(rows.notna(), None)
+                    copy_upsert(cur, UPSERT_SQL, list(rows.itertuples(index=False, name=None)))
+
+                totals["inserted"] += len(inserts)
+                totals["updated"] += len(updates)
+                totals["unchanged"] += unchanged
+                logger.info(
+                    f"  {trade_date}: {len(inserts):,} inserted, {len(updates):,} updated, "
+                    f"{unchanged:,} unchanged"
+                )
+
+    logger.info("\nGrouped daily summary:")
+    logger.info(f"  Inserted:  {totals['inserted']:,}")
+    logger.info(f"  Updated:   {totals['updated']:,}")
+    logger.info(f"  Unchanged: {totals['unchanged']:,}")
+    if totals["days_failed"]:
+        logger.warning(f"  Days failed: {totals['days_failed']}")
+    return totals
+
+
 def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description="Update daily_bars from Polygon.io")
+    parser.add_argument(
+        "--mode",
+        choices=["grouped", "ticker"],
+        default="grouped",
+        help="grouped: one whole-market request per day (default); ticker: per-ticker history",
+    )
+    parser.add_argument(
+        "--days", type=int, default=7, help="Calendar days to refresh in grouped mode"
+    )
+    parser.add_argument("--from-date", type=str, help="Grouped mode start date (backfill)")
+    parser.add_argument("--to-date", type=str, help="Grouped mode end date (default: today)")
+    args = parser.parse_args()
+
     try:
         if not POLYGON_API_KEY:
             raise ValueError("POLYGON_API_KEY not found in environment variables")
@@ -207,7 +369,16 @@ def main():
             logger.warning("No active tickers found")
             return
 
-        upsert_daily_bars(tickers)
+        if args.mode == "grouped":
+            to_date = date.fromisoformat(args.to_date) if args.to_date else date.today()
+            from_date = (
+                date.fromisoformat(args.from_date)
+                if args.from_date
+                else to_date - timedelta(days=args.days)
+            )
+            upsert_grouped_daily(tickers, from_date, to_date)
+        else:
+            upsert_daily_bars(tickers)
         logger.info("\nDaily update complete: Daily bars updated via UPSERT")
 
     except Exception as e:
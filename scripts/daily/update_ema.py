@@ -4,6 +4,7 @@ Daily update for ema table from Polygon.io API
 Incremental update: UPSERT only (safe to rerun)
 Fetches recent data (last 250 days) for all active tickers
 Updates common EMA windows: 12, 26, 50, 200 days
+Nightly runs use update_indicators.py, which computes this table from daily_bars
 """
 import os
 import sys
@@ -19,6 +20,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from dotenv import load_dotenv
 
 from utils import get_logger, get_psycopg2_connection
+from utils.bulk_writer import copy_upsert
 
 load_dotenv()
 
@@ -155,7 +157,7 @@ def upsert_ema(tickers_data):
 
                 # Upsert batch
                 if len(batch) >= batch_size:
-                    cur.executemany(upsert_sql, batch)
+                    copy_upsert(cur, upsert_sql, batch)
                     batch = []
 
                 processed += 1
@@ -172,7 +174,7 @@ def upsert_ema(tickers_data):
 
             # Upsert remaining batch
             if batch:
-                cur.executemany(upsert_sql, batch)
+                copy_upsert(cur, upsert_sql, batch)
 
             # Get counts after update
             cur.execute("SELECT COUNT(*) FROM ema;")
@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+"""
+Daily update for sma / ema / rsi / macd tables computed locally from daily_bars
+Replaces the per-ticker Polygon indicator calls in update_sma.py, update_ema.py,
+update_rsi.py and update_macd.py (one HTTP request per ticker per window).
+
+Incremental update: UPSERT only (safe to rerun)
+- Reads daily_bars in bulk: new bars after each table's latest date, plus a
+  warm-up of WARMUP_BARS prior bars per ticker
+- SMA / RSI / MACD are recomputed over the warm-up window (Wilder smoothing and
+  the MACD EMAs have converged well within it)
+- EMA continues from the last stored EMA value per ticker and window, so the
+  200-day EMA does not need years of history reloaded
+- Results are bulk-loaded with INSERT ... ON CONFLICT DO UPDATE
+
+Usage:
+    python scripts/daily/update_indicators.py                    # all indicators
+    python scripts/daily/update_indicators.py --indicators ema macd
+    python scripts/daily/update_indicators.py --verify-days 30   # parity vs stored rows
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import argparse
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils import get_logger, get_psycopg2_connection
+from utils.bulk_writer import copy_upsert
+
+logger = get_logger(__name__)
+
+# Same windows as the Polygon-backed update scripts
+SMA_WINDOWS = [20, 50, 200]
+EMA_WINDOWS = [12, 26, 50, 200]
+RSI_WINDOWS = [9, 14, 21]
+MACD_PARAMS = {"short_window": 12, "long_window": 26, "signal_window": 9}
+
+INDICATORS = ["sma", "ema", "rsi", "macd"]
+
+# Prior bars loaded per ticker: covers SMA-200 and lets RSI / MACD smoothing converge
+WARMUP_BARS = 260
+# Stored EMA values older than this are not used as a seed
+SEED_LOOKBACK_DAYS = 30
+
+
+def _grouped_ewm(
+    values: pd.Series, tickers: pd.Series, alpha: float, min_periods: int = 0
+) -> pd.Series:
+    """Per-ticker exponential moving average y_t = alpha * x_t + (1 - alpha) * y_{t-1}"""
+    smoothed = (
+        values.groupby(tickers, sort=False)
+        .ewm(alpha=alpha, adjust=False, min_periods=min_periods)
+        .mean()
+    )
+    return smoothed.droplevel(0).sort_index()
+
+
+def _long_frame(bars: pd.DataFrame, values: pd.Series, window: int) -> pd.DataFrame:
+    """(ticker, date, window_size, value) rows with NaN values dropped"""
+    frame = pd.DataFrame(
+        {"ticker": bars["ticker"], "date": bars["date"], "window_size": window, "value": values}
+    )
+    return frame.dropna(subset=["value"])
+
+
+def compute_sma(bars: pd.DataFrame, windows: List[int] = SMA_WINDOWS) -> pd.DataFrame:
+    """
+    Simple moving average of close over each window
+
+    Args:
+        bars: ticker, date, close sorted by ticker and date
+
+    Returns:
+        DataFrame with ticker, date, window_size, value
+    """
+    grouped = bars.groupby("ticker", sort=False)["close"]
+    frames = []
+    for window in windows:
+        sma = grouped.rolling(window, min_periods=window).mean().droplevel(0).sort_index()
+        frames.append(_long_frame(bars, sma, window))
+    return pd.concat(frames, ignore_index=True)
+
+
+def compute_ema(
+    bars: pd.DataFrame,
+    windows: List[int] = EMA_WINDOWS,
+    seeds: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """
+    Exponential moving average of close, alpha = 2 / (window + 1)
+
+    Args:
+        bars: ticker, date, close sorted by ticker and date
+        seeds: Optional ticker, window_size, date, value of the last stored EMA.
+               A seeded ticker continues from that value using only bars after
+               the seed date; unseeded tickers start from their first bar and
+               report values once `window` bars have been seen.
+
+    Returns:
+        DataFrame with ticker, date, window_size, value (seed rows excluded)
+    """
+    frames = []
+    for window in windows:
+        if seeds is not None:
+            window_seeds = seeds[seeds["window_size"] == window]
+        else:
+            window_seeds = pd.DataFrame(columns=["ticker", "date", "value"])
+        seed_dates = window_seeds[["ticker", "date"]].rename(columns={"date": "seed_date"})
+
+        # Drop bars already covered by the seed and put the seed in front as x_0
+        series = bars.merge(seed_dates, on="ticker", how="left")
+        series = series[series["seed_date"].isna() | (series["date"] > series["seed_date"])]
+        series = series[["ticker", "date", "close"]].assign(is_seed=False)
+        if not window_seeds.empty:
+            seed_rows = pd.DataFrame(
+                {
+                    "ticker": window_seeds["ticker"],
+                    "date": window_seeds["date"],
+                    "close": window_seeds["value"].astype(np.float64),
+                    "is_seed": True,
+                }
+            )
+            series = pd.concat([seed_rows, series], ignore_index=True)
+        series = series.sort_values(["ticker", "date"], kind="stable").reset_index(drop=True)
+
+        ema = _grouped_ewm(series["close"], series["ticker"], alpha=2 / (window + 1))
+
+        # Unseeded tickers need a full window before the average is reported
+        seeded = series["ticker"].isin(seed_dates["ticker"])
+        warming_up = ~seeded & (series.groupby("ticker", sort=False).cumcount() < window - 1)
+        ema[warming_up] = np.nan
+
+        keep = ~series["is_seed"]
+        frames.append(_long_frame(series[keep], ema[keep], window))
+    return pd.concat(frames, ignore_index=True)
+
+
+def compute_rsi(bars: pd.DataFrame, windows: List[int] = RSI_WINDOWS) -> pd.DataFrame:
+    """
+    Relative strength index with Wilder smoothing (alpha = 1 / window)
+
+    Args:
+        bars: ticker, date, close sorted by ticker and date
+
+    Returns:
+        DataFrame with ticker, date, window_size, value (0-100)
+    """
+    delta = bars.groupby("ticker", sort=False)["close"].diff()
+    gain = delta.clip(lower=0)
+    loss = -delta.clip(upper=0)
+
+    frames = []
+    for window in windows:
+        avg_gain = _grouped_ewm(gain, bars["ticker"], alpha=1 / window, min_periods=window)
+        avg_loss = _grouped_ewm(loss, bars["ticker"], alpha=1 / window, min_periods=window)
+        rs = avg_gain / avg_loss.where(avg_loss != 0)
+        rsi = (100 - 100 / (1 + rs)).where(avg_loss != 0, 100.0).where(avg_gain.notna())
+        frames.append(_long_frame(bars, rsi, window))
+    return pd.concat(frames, ignore_index=True)
+
+
+def compute_macd(
+    bars: pd.DataFrame,
+    short_window: int = MACD_PARAMS["short_window"],
+    long_window: int = MACD_PARAMS["long_window"],
+    signal_window: int = MACD_PARAMS["signal_window"],
+) -> pd.DataFrame:
+    """
+    MACD line (EMA short - EMA long), its signal EMA and the histogram
+
+    Args:
+        bars: ticker, date, close sorted by ticker and date
+
+    Returns:
+        DataFrame with ticker, date, macd_value, signal_value, histogram_value
+    """
+    tickers = bars["ticker"]
+    ema_short = _grouped_ewm(bars["close"], tickers, alpha=2 / (short_window + 1))
+    ema_long = _grouped_ewm(bars["close"], tickers, alpha=2 / (long_window + 1))
+    macd_line = ema_short - ema_long
+    signal = _grouped_ewm(macd_line, tickers, alpha=2 / (signal_window + 1))
+
+    position = bars.groupby("ticker", sort=False).cumcount()
+    valid = position >= long_window + signal_window - 2
+
+    frame = pd.DataFrame(
+        {
+            "ticker": tickers,
+            "date": bars["date"],
+            "macd_value": macd_line,
+            "signal_value": signal,
+            "histogram_value": macd_line - signal,
+        }
+    )
+    return frame[valid].reset_index(drop=True)
+
+
+def compare_indicator_rows(
+    indicator: str, computed: pd.DataFrame, stored: pd.DataFrame
+) -> List[Dict]:
+    """
+    Parity of computed rows against stored rows, per indicator column and window
+
+    Returns:
+        One dict per column and window: matched rows, max / median absolute
+        difference and share of rows within 1% of the stored value
+    """
+    if indicator == "macd":
+        keys, columns = ["ticker", "date"], ["macd_value", "signal_value"]
+    else:
+        keys, columns = ["ticker", "date", "window_size"], ["value"]
+    merged = computed.merge(stored, on=keys, suffixes=("", "_stored"))
+
+    summaries = []
+    groups = merged.groupby("window_size") if "window_size" in keys else [(None, merged)]
+    for window, group in groups:
+        for column in columns:
+            diff = (group[column] - group[f"{column}_stored"]).abs()
+            scale = group[f"{column}_stored"].abs().clip(lower=1e-6)
+            summaries.append(
+                {
+                    "indicator": indicator,
+                    "column": column,
+                    "window_size": window,
+                    "rows": len(group),
+                    "max_abs_diff": float(diff.max()) if len(group) else np.nan,
+                    "median_abs_diff": float(diff.median()) if len(group) else np.nan,
+                    "within_1pct": float((diff / scale <= 0.01).mean()) if len(group) else np.nan,
+                }
+            )
+    return summaries
+
+
+class IndicatorEngine:
+    """Computes indicators for new daily_bars dates and bulk-loads them"""
+
+    def __init__(self, warmup_bars: int = WARMUP_BARS):
+        self.warmup_bars = warmup_bars
+
+    def get_watermark(self, conn, indicator: str) -> Optional[date]:
+        """Latest date stored for an indicator table"""
+        with conn.cursor() as cur:
+            cur.execute(
+                f"SELECT MAX(date) FROM {indicator} WHERE series_type = 'close' AND timespan = 'day'"
+            )
+            return cur.fetchone()[0]
+
+    def load_bars(self, conn, since: date, through: date) -> pd.DataFrame:
+        """
+        Closes in (since, through] plus the last `warmup_bars` closes on or before
+        `since` for every ticker that has new bars
+        """
+        query = """
+            WITH active AS (
+                SELECT DISTINCT ticker
+                FROM daily_bars
+                WHERE date > %(since)s AND date <= %(through)s
+            ),
+            history AS (
+                SELECT b.ticker, b.date, b.close,
+                       ROW_NUMBER() OVER (PARTITION BY b.ticker ORDER BY b.date DESC) AS rn
+                FROM daily_bars b
+                JOIN active a ON a.ticker = b.ticker
+                WHERE b.date <= %(since)s AND b.date >= %(history_floor)s
+            )
+            SELECT ticker, date, close FROM history WHERE rn <= %(warmup)s
+            UNION ALL
+            SELECT ticker, date, close
+            FROM daily_bars
+            WHERE date > %(since)s AND date <= %(through)s
+        """
+        params = {
+            "since": since,
+            "through": through,
+            # ~1.6 calendar days per trading day, with headroom for halts
+            "history_floor": since - timedelta(days=int(self.warmup_bars * 1.6) + 30),
+            "warmup": self.warmup_bars,
+        }
+        with conn.cursor() as cur:
+            cur.execute(query, params)
+            rows = cur.fetchall()
+
+        bars = pd.DataFrame(rows, columns=["ticker", "date", "close"])
+        bars["date"] = pd.to_datetime(bars["date"])
+        bars["close"] = bars["close"].astype(np.float64)
+        return bars.sort_values(["ticker", "date"]).reset_index(drop=True)
+
+    def load_ema_seeds(self, conn, since: date) -> pd.DataFrame:
+        """Last stored EMA per ticker and window on or before `since`"""
+        query = """
+            SELECT DISTINCT ON (ticker, window_size) ticker, window_size, date, value
+            FROM ema
+            WHERE series_type = 'close' AND timespan = 'day'
+              AND window_size = ANY(%(windows)s)
+              AND date <= %(since)s AND date >= %(floor)s
+              AND value IS NOT NULL
+            ORDER BY ticker, window_size, date DESC
+        """
+        params = {
+            "windows": EMA_WINDOWS,
+            "since": since,
+            "floor": since - timedelta(days=SEED_LOOKBACK_DAYS),
+        }
+        with conn.cursor() as cur:
+            cur.execute(query, params)
+            rows = cur.fetchall()
+
+        seeds = pd.DataFrame(rows, columns=["ticker", "window_size", "date", "value"])
+        seeds["date"] = pd.to_datetime(seeds["date"])
+        return seeds
+
+    def compute(self, conn, indicator: str, since: date, through: date) -> pd.DataFrame:
+        """Indicator rows dated in (since, through]"""
+        bars = self.load_bars(conn, since, through)
+        if bars.empty:
+            return pd.DataFrame()
+
+        if indicator == "sma":
+            result = compute_sma(bars)
+        elif indicator == "ema":
+            result = compute_ema(bars, seeds=self.load_ema_seeds(conn, since))
+        elif indicator == "rsi":
+            result = compute_rsi(bars)
+        elif indicator == "macd":
+            result = compute_macd(bars)
+        else:
+            raise ValueError(f"Unknown indicator: {indicator}")
+
+        return result[result["date"] > pd.Timestamp(since)].reset_index(drop=True)
+
+    def write(self, conn, indicator: str, rows: pd.DataFrame) -> int:
+        """Bulk upsert computed rows into the indicator table"""
+        if rows.empty:
+            return 0
+
+        dates = rows["date"].dt.date
+        if indicator == "macd":
+            values = list(
+                zip(
+                    rows["ticker"],
+                    dates,
+                    [MACD_PARAMS["short_window"]] * len(rows),
+                    [MACD_PARAMS["long_window"]] * len(rows),
+                    [MACD_PARAMS["signal_window"]] * len(rows),
+                    rows["macd_value"].round(4),
+                    rows["signal_value"].round(4),
+                    rows["histogram_value"].round(4),
+                )
+            )
+            upsert_sql = """
+                INSERT INTO macd (
+                    ticker, date, short_window, long_window, signal_window,
+                    macd_value, signal_value, histogram_value,
+                    series_type, timespan, updated_at
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, 'close', 'day', CURRENT_TIMESTAMP)
+                ON CONFLICT (ticker, date, short_window, long_window, signal_window, series_type, timespan) DO UPDATE SET
+                    macd_value = EXCLUDED.macd_value,
+                    signal_value = EXCLUDED.signal_value,
+                    histogram_value = EXCLUDED.histogram_value,
+                    updated_at = CURRENT_TIMESTAMP
+            """
+        else:
+            values = list(
+                zip(rows["ticker"], dates, rows["window_size"].astype(int), rows["value"].round(4))
+            )
+            upsert_sql = f"""
+                INSERT INTO {indicator} (
+                    ticker, date, window_size, value, series_type, timespan, updated_at
+                ) VALUES (%s, %s, %s, %s, 'close', 'day', CURRENT_TIMESTAMP)
+                ON CONFLICT (ticker, date, window_size, series_type, timespan) DO UPDATE SET
+                    value = EXCLUDED.value,
+                    updated_at = CURRENT_TIMESTAMP
+            """
+
+        with conn.cursor() as cur:
+            return copy_upsert(cur, upsert_sql, values)
+
+    def update(
+        self,
+        indicators: List[str] = INDICATORS,
+        through: Optional[date] = None,
+        since: Optional[date] = None,
+    ) -> Dict[str, Dict]:
+        """
+        Compute and upsert every indicator for dates after its table's watermark
+
+        Args:
+            indicators: Subset of INDICATORS
+            through: Last date to compute (default: latest date in daily_bars)
+            since: Override the per-table watermark (rows after this date are rewritten)
+        """
+        results = {}
+        with get_psycopg2_connection() as conn:
+            if through is None:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT MAX(date) FROM daily_bars")
+                    through = cur.fetchone()[0]
+
+            for indicator in indicators:
+                start = time.time()
+                start_date = since or self.get_watermark(conn, indicator)
+                if start_date is None:
+                    raise ValueError(f"{indicator} table is empty - pass --since to backfill")
+                if start_date >= through:
+                    logger.info(f"{indicator.upper()} is up to date ({start_date})")
+                    results[indicator] = {"rows_upserted": 0, "tickers_updated": 0}
+                    continue
+
+                rows = self.compute(conn, indicator, start_date, through)
+                upserted = self.write(conn, indicator, rows)
+                conn.commit()
+
+                results[indicator] = {
+                    "since": str(start_date),
+                    "through": str(through),
+                    "rows_upserted": upserted,
+                    "tickers_updated": int(rows["ticker"].nunique()) if upserted else 0,
+                    "seconds": round(time.time() - start, 2),
+                }
+                logger.info(
+                    f"{indicator.upper()} ({start_date}, {through}]: {upserted:,} rows for "
+                    f"{results[indicator]['tickers_updated']:,} tickers "
+                    f"in {results[indicator]['seconds']}s"
+                )
+        return results
+
+    def verify(self, indicators: List[str] = INDICATORS, days: int = 30) -> pd.DataFrame:
+        """
+        Compare locally computed values with the rows already stored (parity check)
+
+        Returns:
+            One row per indicator column and window: matched rows, max / median
+            absolute difference and share of rows within 1% of the stored value
+        """
+        summaries = []
+        with get_psycopg2_connection() as conn:
+            for indicator in indicators:
+                through = self.get_watermark(conn, indicator)
+                if through is None:
+                    continue
+                since = through - timedelta(days=days)
+                computed = self.compute(conn, indicator, since, through)
+                stored = self._load_stored(conn, indicator, since, through)
+                summaries.extend(compare_indicator_rows(indicator, computed, stored))
+        return pd.DataFrame(summaries)
+
+    def _load_stored(self, conn, indicator: str, since: date, through: date) -> pd.DataFrame:
+        if indicator == "macd":
+            columns = ["ticker", "date", "macd_value", "signal_value"]
+            where = (
+                f"short_window = {MACD_PARAMS['short_window']} "
+                f"AND long_window = {MACD_PARAMS['long_window']} "
+                f"AND signal_window = {MACD_PARAMS['signal_window']}"
+            )
+        else:
+            columns = ["ticker", "date", "window_size", "value"]
+            where = "TRUE"
+        query = f"""
+            SELECT {", ".join(columns)}
+            FROM {indicator}
+            WHERE series_type = 'close' AND timespan = 'day'
+              AND date > %s AND date <= %s AND {where}
+        """
+        with conn.cursor() as cur:
+            cur.execute(query, (since, through))
+            stored = pd.DataFrame(cur.fetchall(), columns=columns)
+        stored["date"] = pd.to_datetime(stored["date"])
+        for column in columns[2:]:
+            stored[column] = stored[column].astype(np.float64)
+        return stored
+
+
+def update_indicators(
+    indicators: List[str] = INDICATORS, through: Optional[date] = None
+) -> Dict[str, Dict]:
+    """Entry point for orchestration: incremental update of the given indicator tables"""
+    return IndicatorEngine().update(indicators, through=through)
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Compute technical indicators from daily_bars")
+    parser.add_argument(
+        "--indicators", nargs="+", choices=INDICATORS, default=INDICATORS, help="Tables to update"
+    )
+    parser.add_argument("--since", type=str, help="Recompute rows after this date (YYYY-MM-DD)")
+    parser.add_argument("--through", type=str, help="Last date to compute (YYYY-MM-DD)")
+    parser.add_argument(
+        "--verify-days",
+        type=int,
+        help="Compare computed values with stored rows over the last N days instead of writing",
+    )
+    args = parser.parse_args()
+
+    engine = IndicatorEngine()
+    try:
+        if args.verify_days:
+            report = engine.verify(args.indicators, days=args.verify_days)
+            logger.info(f"\nIndicator parity vs stored rows:\n{report.to_string(index=False)}")
+            return
+
+        results = engine.update(
+            args.indicators,
+            through=date.fromisoformat(args.through) if args.through else None,
+            since=date.fromisoformat(args.since) if args.since else None,
+        )
+        logger.info(f"\nDaily update complete: indicators updated via UPSERT {results}")
+
+    except Exception as e:
+        logger.error(f"Error: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ Daily update for macd table from Polygon.io API
 Incremental update: UPSERT only (safe to rerun)
 Fetches recent data (last 100 days) for all active tickers
 Standard MACD parameters: 12/26/9 (short/long/signal)
+Nightly runs use update_indicators.py, which computes this table from daily_bars
 """
 import os
 import sys
@@ -19,6 +20,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from dotenv import load_dotenv
 
 from utils import get_logger, get_psycopg2_connection
+from utils.bulk_writer import copy_upsert
 
 load_dotenv()
 
@@ -168,7 +170,7 @@ def upsert_macd(tickers_data):
 
                 # Upsert batch
                 if len(batch) >= batch_size:
-                    cur.executemany(upsert_sql, batch)
+                    copy_upsert(cur, upsert_sql, batch)
                     batch = []
 
                 processed += 1
@@ -185,7 +187,7 @@ def upsert_macd(tickers_data):
 
             # Upsert remaining batch
             if batch:
-                cur.executemany(upsert_sql, batch)
+                copy_upsert(cur, upsert_sql, batch)
 
             # Get counts after update
             cur.execute("SELECT COUNT(*) FROM macd;")
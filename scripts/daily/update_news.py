@@ -6,18 +6,17 @@ Fetches recent news (last 7 days) to capture new articles
 """
 import os
 import sys
-import time
 from datetime import date, datetime, timedelta
 from pathlib import Path
 
-import requests
-
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from dotenv import load_dotenv
 
 from utils import get_logger, get_psycopg2_connection
+from utils.bulk_writer import copy_upsert
+from utils.polygon_client import fetch_all
 
 load_dotenv()
 
@@ -36,42 +35,15 @@ def fetch_recent_news(days=7):
         "limit": 1000,
         "order": "desc",
         "sort": "published_utc",
-        "apiKey": POLYGON_API_KEY,
     }
 
-    all_articles = []
-    page_count = 0
+    async def fetch_pages(client, _):
+        return await client.get_paginated(API_URL, params)
 
-    try:
-        logger.info(f"Fetching news articles from {from_date} onwards...")
-        response = requests.get(API_URL, params=params)
-        response.raise_for_status()
-        data = response.json()
-
-        if data.get("status") == "OK" and "results" in data:
-            all_articles.extend(data["results"])
-            page_count += 1
-
-            # Handle pagination
-            while data.get("next_url"):
-                time.sleep(0.1)  # Rate limiting
-                next_url = data["next_url"] + f"&apiKey={POLYGON_API_KEY}"
-                response = requests.get(next_url)
-                response.raise_for_status()
-                data = response.json()
-
-                if data.get("status") == "OK" and "results" in data:
-                    all_articles.extend(data["results"])
-                    page_count += 1
-                else:
-                    break
-
-        logger.info(f"Fetched {len(all_articles):,} news articles ({page_count} pages)")
-
-    except requests.exceptions.HTTPError as e:
-        logger.error(f"HTTP error: {e}")
-    except Exception as e:
-        logger.error(f"Error fetching news: {e}")
+    logger.info(f"Fetching news articles from {from_date} onwards...")
+    # Single cursor-paginated stream: the shared client adds keep-alive, pacing and retries
+    all_articles = fetch_all([from_date], fetch_pages, api_key=POLYGON_API_KEY)[0] or []
+    logger.info(f"Fetched {len(all_articles):,} news articles")
 
     return all_articles
 
@@ -172,7 +144,7 @@ def upsert_news(articles_data):
 
             # Upsert all records
             if batch:
-                cur.executemany(upsert_sql, batch)
+                copy_upsert(cur, upsert_sql, batch)
 
             # Get counts after update
             cur.execute("SELECT COUNT(*) FROM news;")
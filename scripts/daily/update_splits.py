@@ -6,11 +6,10 @@ Fetches last 90 days of split data for all active tickers
 """
 import os
 import sys
-import time
 from datetime import date, datetime, timedelta
 from pathlib import Path
 
-import requests
+import httpx
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -18,6 +17,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from dotenv import load_dotenv
 
 from utils import get_logger, get_psycopg2_connection
+from utils.bulk_writer import copy_upsert
+from utils.polygon_client import fetch_all
 
 load_dotenv()
 
@@ -44,46 +45,22 @@ def get_active_tickers():
             return tickers
 
 
-def fetch_splits(ticker, from_date, to_date):
+async def fetch_splits(client, ticker, from_date, to_date):
     """Fetch splits for a ticker between dates"""
     params = {
         "ticker": ticker,
         "execution_date.gte": from_date.strftime("%Y-%m-%d"),
         "execution_date.lte": to_date.strftime("%Y-%m-%d"),
-        "apiKey": POLYGON_API_KEY,
         "limit": 1000,
         "sort": "execution_date",
         "order": "asc",
     }
 
-    all_results = []
-
     try:
-        response = requests.get(API_URL, params=params)
-        response.raise_for_status()
-        data = response.json()
-
-        if data.get("status") == "OK" and "results" in data:
-            all_results.extend(data["results"])
-
-            # Handle pagination
-            while data.get("next_url"):
-                next_url = data["next_url"] + f"&apiKey={POLYGON_API_KEY}"
-                response = requests.get(next_url)
-                response.raise_for_status()
-                data = response.json()
-                if data.get("status") == "OK" and "results" in data:
-                    all_results.extend(data["results"])
-                else:
-                    break
-
-        return all_results
-
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 404:
-            logger.debug(f"No splits for {ticker}")
-        else:
-            logger.error(f"HTTP error for {ticker}: {e}")
+        return await client.get_paginated(API_URL, params)
+
+    except httpx.HTTPStatusError as e:
+        logger.error(f"HTTP error for {ticker}: {e}")
         return []
     except Exception as e:
         logger.error(f"Error fetching splits for {ticker}: {e}")
@@ -123,7 +100,20 @@ def upsert_splits(tickers_data):
             batch = []
             batch_size = 1000
 
-            for i, (ticker, list_date) in enumerate(tickers_data, 1):
+            # Fetch concurrently (pooled, rate-limited, retried), then upsert in order
+            fetch_items = [
+                (ticker, max(from_date, list_date) if list_date else from_date)
+                for ticker, list_date in tickers_data
+            ]
+            fetch_items = [item for item in fetch_items if item[1] <= today]
+            fetched = fetch_all(
+                fetch_items,
+                lambda client, item: fetch_splits(client, item[0], item[1], today),
+                api_key=POLYGON_API_KEY,
+            )
+            fetched_by_ticker = {item[0]: result for item, result in zip(fetch_items, fetched)}
+
+            for ticker, list_date in tickers_data:
                 # Don't fetch data before list_date
                 effective_from_date = from_date
                 if list_date and list_date > from_date:
@@ -134,7 +124,7 @@ def upsert_splits(tickers_data):
                     processed += 1
                     continue
 
-                splits = fetch_splits(ticker, effective_from_date, today)
+                splits = fetched_by_ticker.get(ticker)
 
                 if splits:
                     for split in splits:
@@ -160,7 +150,7 @@ def upsert_splits(tickers_data):
 
                     # Upsert batch
                     if len(batch) >= batch_size:
-                        cur.executemany(upsert_sql, batch)
+                        copy_upsert(cur, upsert_sql, batch)
                         batch = []
 
                 processed += 1
@@ -171,13 +161,9 @@ def upsert_splits(tickers_data):
                         f"  Progress: {processed}/{len(tickers_data)} tickers, {total_splits_upserted:,} splits upserted"
                     )
 
-                # Rate limiting: 100 requests per second
-                if i % 100 == 0:
-                    time.sleep(1)
-
             # Upsert remaining batch
             if batch:
-                cur.executemany(upsert_sql, batch)
+                copy_upsert(cur, upsert_sql, batch)
 
             # Get counts after update
             cur.execute("SELECT COUNT(*) FROM splits;")
@@ -18,6 +18,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from dotenv import load_dotenv
 
 from utils import get_logger, get_psycopg2_connection
+from utils.bulk_writer import copy_upsert
 
 load_dotenv()
 
@@ -146,7 +147,7 @@ def upsert_ticker_events(tickers_list):
 
                 # Upsert batch
                 if len(batch) >= batch_size:
-                    cur.executemany(upsert_sql, batch)
+                    copy_upsert(cur, upsert_sql, batch)
                     batch = []
 
                 processed += 1
@@ -163,7 +164,7 @@ def upsert_ticker_events(tickers_list):
 
             # Upsert remaining batch
             if batch:
-                cur.executemany(upsert_sql, batch)
+                copy_upsert(cur, upsert_sql, batch)
 
             # Get counts after update
             cur.execute("SELECT COUNT(*) FROM ticker_events;")
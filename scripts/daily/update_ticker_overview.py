@@ -5,11 +5,10 @@ Incremental update: UPSERT only (safe to rerun)
 """
 import os
 import sys
-import time
 from datetime import datetime
 from pathlib import Path
 
-import requests
+import httpx
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -17,6 +16,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from dotenv import load_dotenv
 
 from utils import get_logger, get_psycopg2_connection
+from utils.bulk_writer import copy_upsert
+from utils.polygon_client import fetch_all
 
 load_dotenv()
 
@@ -36,15 +37,16 @@ def get_all_tickers():
             return tickers
 
 
-def fetch_ticker_overview(ticker):
+async def fetch_ticker_overview(client, ticker):
     """Fetch overview for a single ticker"""
     url = API_URL.format(ticker=ticker)
-    params = {"apiKey": POLYGON_API_KEY}
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = await client.get_json(url)
+
+        if data is None:
+            logger.warning(f"Ticker {ticker} not found (404)")
+            return None
 
         if data.get("status") == "OK" and "results" in data:
             return data["results"]
@@ -52,11 +54,8 @@ def fetch_ticker_overview(ticker):
             logger.warning(f"No results for {ticker}: {data.get('status')}")
             return None
 
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 404:
-            logger.warning(f"Ticker {ticker} not found (404)")
-        else:
-            logger.error(f"HTTP error for {ticker}: {e}")
+    except httpx.HTTPStatusError as e:
+        logger.error(f"HTTP error for {ticker}: {e}")
         return None
     except Exception as e:
         logger.error(f"Error fetching {ticker}: {e}")
@@ -126,9 +125,10 @@ def upsert_ticker_overviews(tickers):
             batch = []
             batch_size = 100
 
-            for i, ticker in enumerate(tickers, 1):
-                overview = fetch_ticker_overview(ticker)
+            # Fetch concurrently (pooled, rate-limited, retried), then upsert in order
+            fetched = fetch_all(tickers, fetch_ticker_overview, api_key=POLYGON_API_KEY)
 
+            for ticker, overview in zip(tickers, fetched):
                 if overview:
                     # Parse dates
                     list_date = None
@@ -192,19 +192,15 @@ def upsert_ticker_overviews(tickers):
 
                 # Upsert batch
                 if len(batch) >= batch_size:
-                    cur.executemany(upsert_sql, batch)
+                    copy_upsert(cur, upsert_sql, batch)
                     logger.info(
                         f"  Progress: {processed}/{len(tickers)} processed, {upserted} upserted"
                     )
                     batch = []
 
-                # Rate limiting: 100 requests per second
-                if i % 100 == 0:
-                    time.sleep(1)
-
             # Upsert remaining batch
             if batch:
-                cur.executemany(upsert_sql, batch)
+                copy_upsert(cur, upsert_sql, batch)
 
             # Get counts after update
             cur.execute("SELECT COUNT(*) FROM ticker_overview;")
@@ -16,6 +16,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from dotenv import load_dotenv
 
 from utils import get_logger, get_psycopg2_connection
+from utils.bulk_writer import copy_upsert
 
 load_dotenv()
 
@@ -144,7 +145,7 @@ def upsert_tickers(tickers):
                     )
                     values_list.append(values)
 
-                cur.executemany(upsert_sql, values_list)
+                copy_upsert(cur, upsert_sql, values_list)
                 total_processed += len(values_list)
                 logger.info(f"  Batch {i//batch_size + 1}: {len(values_list)} tickers upserted")
 
@@ -2,7 +2,7 @@
 
 ##############################################################################
 # Daily Data Pipeline Script
-# Purpose: Refresh data and materialized views without ML/RL training
+# Purpose: Refresh data and the ML feature store without ML/RL training
 # Frequency: Run daily (automated via cron)
 # Duration: ~5 minutes
 ##############################################################################
@@ -90,24 +90,23 @@ RECENT_DATE=$(PGPASSWORD="${DB_PASSWORD}" psql -U postgres -d acis-ai -h localho
 log "Most recent data date: $RECENT_DATE"
 
 ##############################################################################
-# STEP 2: Refresh Materialized Views
+# STEP 2: Update ML Feature Store
 ##############################################################################
 
-CURRENT_STEP="Refresh Materialized Views"
+CURRENT_STEP="Update ML Feature Store"
 log ""
 log "════════════════════════════════════════════════════════════════"
-log "STEP 2: Refresh Materialized Views"
+log "STEP 2: Update ML Feature Store"
 log "════════════════════════════════════════════════════════════════"
 
 START_TIME=$(date +%s)
 
-log "Refreshing ml_training_features materialized view..."
-PGPASSWORD="${DB_PASSWORD}" psql -U postgres -d acis-ai -h localhost -c \
-    "REFRESH MATERIALIZED VIEW CONCURRENTLY ml_training_features" >> "$LOG_FILE" 2>&1
+log "Appending new dates to ml_feature_store..."
+python "$PROJECT_DIR/ml_models/feature_store.py" --recompute-days 3 >> "$LOG_FILE" 2>&1
 
 END_TIME=$(date +%s)
 DURATION=$((END_TIME - START_TIME))
-log_success "Materialized view refreshed in ${DURATION}s"
+log_success "Feature store updated in ${DURATION}s"
 
 # Get row count
 VIEW_COUNT=$(PGPASSWORD="${DB_PASSWORD}" psql -U postgres -d acis-ai -h localhost -t -c \
@@ -129,7 +128,7 @@ START_TIME=$(date +%s)
 log "Running VACUUM ANALYZE on critical tables..."
 
 # Vacuum analyze main tables
-TABLES=("daily_bars" "ml_training_features" "fundamentals" "ticker_overview" "paper_accounts" "paper_orders" "paper_positions")
+TABLES=("daily_bars" "ml_feature_store" "fundamentals" "ticker_overview" "paper_accounts" "paper_orders" "paper_positions")
 
 for TABLE in "${TABLES[@]}"; do
     log "  - Vacuuming $TABLE..."
@@ -5,7 +5,7 @@
 #
 # Tasks:
 # 1. Data validation
-# 2. Refresh materialized views
+# 2. Update ML feature store (incremental)
 # 3. Train all ML models (XGBoost)
 # 4. Train all RL models (PPO)
 # 5. Database maintenance
@@ -86,21 +86,18 @@ else
 fi
 
 # ============================================================================
-# STEP 2: Refresh Materialized Views
+# STEP 2: Update ML Feature Store
 # ============================================================================
 log_info ""
-log_info "STEP 2: Refreshing materialized views..."
-log_info "This may take 2-3 minutes..."
+log_info "STEP 2: Updating ML feature store (new dates only)..."
 
 START_TIME=$(date +%s)
 
-if PGPASSWORD="${DB_PASSWORD}" psql -U postgres -d acis-ai -h localhost -c "
-    REFRESH MATERIALIZED VIEW ml_training_features;
-" >> "$LOG_FILE" 2>&1; then
+if python ml_models/feature_store.py --recompute-days 3 >> "$LOG_FILE" 2>&1; then
     DURATION=$(($(date +%s) - START_TIME))
-    log_success "Materialized view refreshed in ${DURATION}s"
+    log_success "Feature store updated in ${DURATION}s"
 else
-    log_error "Failed to refresh materialized view"
+    log_error "Failed to update feature store"
     PIPELINE_SUCCESS=false
 fi
 
@@ -153,7 +150,7 @@ log_info ""
 log_info "STEP 5: Database maintenance..."
 
 if PGPASSWORD="${DB_PASSWORD}" psql -U postgres -d acis-ai -h localhost -c "
-    VACUUM ANALYZE ml_training_features;
+    VACUUM ANALYZE ml_feature_store;
     VACUUM ANALYZE auto_training_log;
 " >> "$LOG_FILE" 2>&1; then
     log_success "Database maintenance completed"
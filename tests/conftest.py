@@ -7,8 +7,11 @@ that can be used across all test files.
 
 import os
 import sys
-from typing import Generator
+from datetime import date
+from typing import Generator, Optional, Sequence, Union
 
+import numpy as np
+import pandas as pd
 import pytest
 from dotenv import load_dotenv
 from fastapi.testclient import TestClient
@@ -21,9 +24,6 @@ load_dotenv()
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Import after path is set
-from backend.api.main import app
-
 # ============================================================================
 # FastAPI Test Client Fixtures
 # ============================================================================
@@ -36,6 +36,9 @@ def test_client() -> TestClient:
 
     Scope: session (created once per test session)
     """
+    # Imported here so unit tests that don't use the API don't load the app
+    from backend.api.main import app
+
     return TestClient(app)
 
 
@@ -162,6 +165,120 @@ def sample_ticker_data() -> list[dict]:
     ]
 
 
+# ============================================================================
+# Synthetic Market Data
+# ============================================================================
+
+
+def make_bars(
+    n_days: int = 400,
+    tickers: Sequence[str] = ("AAA", "BBB", "CCC"),
+    seed: int = 3,
+    start: Union[str, date] = "2019-01-01",
+    end: Union[str, date, None] = None,
+    price: float = 50.0,
+    drift: float = 0.0,
+    volatility: Union[float, Sequence[float]] = 0.015,
+    ohlcv: bool = False,
+) -> pd.DataFrame:
+    """
+    Random-walk daily_bars rows (ticker, date, close), ordered by ticker, date
+
+    Args:
+        n_days: Business days per ticker, from start (or ending at end)
+        volatility: Daily return std, or one per ticker
+        ohlcv: Also add open / high / low / volume / vwap around close
+    """
+    if end is not None:
+        dates = pd.bdate_range(end=end, periods=n_days)
+    else:
+        dates = pd.bdate_range(start, periods=n_days)
+    scales = np.broadcast_to(volatility, len(tickers))
+
+    rng = np.random.default_rng(seed)
+    frames = []
+    for ticker, scale in zip(tickers, scales):
+        close = price * np.cumprod(1 + rng.normal(drift, scale, n_days))
+        frame = pd.DataFrame({"ticker": ticker, "date": dates, "close": close})
+        if ohlcv:
+            frame["open"] = close * 0.99
+            frame["high"] = close * 1.02
+            frame["low"] = close * 0.97
+            frame["volume"] = rng.integers(50_000, 2_000_000, n_days).astype(float)
+            frame["vwap"] = close
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def make_features(
+    start: date,
+    end: Optional[date] = None,
+    tickers: Union[int, Sequence[str]] = 20,
+    seed: int = 0,
+    signal: float = 0.05,
+    missing: float = 0.2,
+    extra_features: int = 0,
+) -> pd.DataFrame:
+    """
+    ml_training_features rows for every business day in [start, end], ordered by date, ticker
+
+    Columns: close, momentum, pe_ratio (`missing` share NaN), extra_features
+    normal columns f000... (same NaN share) and target_return = signal *
+    momentum + noise. Each day is generated from its own seed, so a date
+    window of a longer range holds the same rows.
+
+    Args:
+        tickers: Ticker names, or a count (T000, T001, ...)
+    """
+    names = [f"T{i:03d}" for i in range(tickers)] if isinstance(tickers, int) else list(tickers)
+    extra_columns = [f"f{i:03d}" for i in range(extra_features)]
+    n = len(names)
+
+    frames = []
+    for day in pd.bdate_range(start, end or start).date:
+        rng = np.random.default_rng([seed, day.toordinal()])
+        frame = pd.DataFrame(
+            {
+                "ticker": names,
+                "date": day,
+                "close": rng.uniform(1, 100, n),
+                "momentum": rng.normal(0, 1, n),
+                "pe_ratio": np.where(rng.random(n) < missing, np.nan, rng.uniform(5, 40, n)),
+            }
+        )
+        extra = rng.normal(0, 1, (n, extra_features))
+        extra[rng.random(extra.shape) < missing] = np.nan
+        frame = pd.concat([frame, pd.DataFrame(extra, columns=extra_columns)], axis=1)
+        frame["target_return"] = signal * frame["momentum"] + rng.normal(0, 0.05, n)
+        frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame(
+            columns=["ticker", "date", "close", "momentum", "pe_ratio"]
+            + extra_columns
+            + ["target_return"]
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.fixture
+def training_data_cache(tmp_path):
+    """
+    Factory for refreshed SyntheticTrainingDataCaches under tmp_path
+
+    Usage: cache = training_data_cache(start, end, tickers=30, seed=9)
+    """
+    # Imported here so tests that don't use the cache don't load ml_models / pyarrow
+    from tests.synthetic_training_data import SyntheticTrainingDataCache
+
+    def build(start: date, end: date, **rows) -> SyntheticTrainingDataCache:
+        cache = SyntheticTrainingDataCache(tmp_path / "cache", start, end, **rows)
+        cache.refresh()
+        return cache
+
+    return build
+
+
 # ============================================================================
 # Mock Fixtures
 # ============================================================================
@@ -0,0 +1,70 @@
+"""
+Bulk Writer Integration Tests
+
+Runs utils.bulk_writer.copy_upsert against the real etf_bars schema
+(NUMERIC prices, BIGINT volume, INTEGER transactions) so COPY input syntax is
+checked by Postgres itself, with rows shaped the way the ETF loaders build
+them (Polygon float volumes, None for missing values). Each test rolls back.
+"""
+
+from datetime import date
+
+import pytest
+
+from utils.bulk_writer import copy_upsert
+
+ETF_UPSERT_SQL = """
+    INSERT INTO etf_bars (ticker, date, open, high, low, close, volume, vwap, transactions)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT (ticker, date)
+    DO UPDATE SET
+        close = EXCLUDED.close,
+        volume = EXCLUDED.volume,
+        transactions = EXCLUDED.transactions
+"""
+
+
+@pytest.fixture
+def etf_cursor(integration_engine):
+    """psycopg2 cursor with etf_bars created inside a transaction that is rolled back"""
+    connection = integration_engine.raw_connection()
+    try:
+        cur = connection.cursor()
+        with open("database/create_etf_table.sql", "r") as f:
+            cur.execute(f.read())
+        yield cur
+    finally:
+        connection.rollback()
+        connection.close()
+
+
+class TestCopyUpsertColumnTypes:
+    """copy_upsert against BIGINT / INTEGER / NUMERIC target columns"""
+
+    def test_float_volumes_load_into_integer_columns(self, etf_cursor):
+        """Whole-number float volume and transactions are accepted by BIGINT and INTEGER"""
+        rows = [
+            ("ZZTEST", date(2024, 1, 2), 470.1, 472.5, 469.0, 471.25, 70790813.0, 470.9, 512345.0),
+            ("ZZTEST", date(2024, 1, 3), 471.0, 473.0, 468.5, 468.79, 81234567.0, 470.2, None),
+        ]
+
+        copy_upsert(etf_cursor, ETF_UPSERT_SQL, rows)
+        etf_cursor.execute(
+            "SELECT close, volume, transactions FROM etf_bars WHERE ticker = 'ZZTEST' ORDER BY date"
+        )
+        stored = etf_cursor.fetchall()
+
+        assert [(float(c), v, t) for c, v, t in stored] == [
+            (471.25, 70790813, 512345),
+            (468.79, 81234567, None),
+        ]
+
+    def test_upsert_updates_existing_rows(self, etf_cursor):
+        """The staging-table merge applies the ON CONFLICT update with float inputs"""
+        row = ("ZZTEST", date(2024, 1, 2), 470.1, 472.5, 469.0, 471.25, 1000.0, 470.9, 10.0)
+        copy_upsert(etf_cursor, ETF_UPSERT_SQL, [row])
+
+        copy_upsert(etf_cursor, ETF_UPSERT_SQL, [row[:6] + (2000.0, 470.9, 20.0)])
+        etf_cursor.execute("SELECT volume, transactions FROM etf_bars WHERE ticker = 'ZZTEST'")
+
+        assert etf_cursor.fetchall() == [(2000, 20)]
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Bulk upsert benchmark: executemany vs. execute_values vs. COPY staging merge
+
+Writes synthetic daily bars into a TEMP copy of the daily_bars schema on the
+configured Postgres (utils.db_config settings), first into an empty table
+(insert pass) and then again over the same keys (update pass). executemany is
+timed on a subset and extrapolated, since it is one round trip per row.
+Nothing is written to real tables; the TEMP table is dropped at the end.
+
+Run with: python tests/performance/bench_bulk_writer.py --rows 1000000
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import argparse
+import time
+from typing import Callable, List, Tuple
+
+import numpy as np
+import pandas as pd
+from psycopg2.extras import execute_values
+
+from utils import get_psycopg2_connection
+from utils.bulk_writer import copy_upsert
+
+INSERT_SQL = """
+    INSERT INTO bench_daily_bars (
+        ticker, date, open, high, low, close, volume, vwap, transactions, updated_at
+    ) VALUES {values}
+    ON CONFLICT (ticker, date) DO UPDATE SET
+        open = EXCLUDED.open,
+        high = EXCLUDED.high,
+        low = EXCLUDED.low,
+        close = EXCLUDED.close,
+        volume = EXCLUDED.volume,
+        vwap = EXCLUDED.vwap,
+        transactions = EXCLUDED.transactions,
+        updated_at = CURRENT_TIMESTAMP
+"""
+ROW_TEMPLATE = "(%s, %s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)"
+UPSERT_SQL = INSERT_SQL.format(values=ROW_TEMPLATE)
+VALUES_SQL = INSERT_SQL.format(values="%s")
+
+
+def make_bars(n_rows: int, seed: int = 0) -> List[Tuple]:
+    """Synthetic daily bars as executemany-style tuples (python scalars)"""
+    rng = np.random.default_rng(seed)
+    n_days = 2500
+    n_tickers = -(-n_rows // n_days)
+    dates = pd.bdate_range("2015-01-01", periods=n_days).date
+    close = 50 * np.exp(rng.normal(0, 0.3, n_rows))
+    tickers = [f"T{i:05d}" for i in range(n_tickers)]
+
+    return [
+        (
+            tickers[i // n_days],
+            dates[i % n_days],
+            round(float(close[i] * 0.99), 4),
+            round(float(close[i] * 1.01), 4),
+            round(float(close[i] * 0.98), 4),
+            round(float(close[i]), 4),
+            float(rng.integers(1_000, 5_000_000)),  # Polygon returns volume as a float
+            round(float(close[i]), 4),
+            int(rng.integers(10, 50_000)),
+        )
+        for i in range(n_rows)
+    ]
+
+
+def in_batches(write: Callable, rows: List[Tuple], batch_size: int):
+    for start in range(0, len(rows), batch_size):
+        write(rows[start : start + batch_size])
+
+
+def timed(label: str, conn, fn: Callable, n_rows: int, scale: float = 1.0) -> float:
+    start = time.perf_counter()
+    fn()
+    conn.commit()
+    elapsed = (time.perf_counter() - start) * scale
+    note = f" (extrapolated x{scale:.0f})" if scale > 1 else ""
+    print(f"  {label:<28} {elapsed:8.2f}s  {n_rows * scale / elapsed:>12,.0f} rows/s{note}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument(
+        "--executemany-rows", type=int, default=20_000, help="Subset timed for executemany"
+    )
+    args = parser.parse_args()
+
+    print(f"Generating {args.rows:,} synthetic bars...")
+    rows = make_bars(args.rows)
+    subset = rows[: args.executemany_rows]
+    scale = len(rows) / len(subset)
+
+    with get_psycopg2_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                CREATE TEMP TABLE bench_daily_bars (
+                    ticker VARCHAR(10), date DATE,
+                    open NUMERIC(12, 4), high NUMERIC(12, 4), low NUMERIC(12, 4),
+                    close NUMERIC(12, 4), volume BIGINT, vwap NUMERIC(12, 4),
+                    transactions INTEGER, updated_at TIMESTAMP,
+                    PRIMARY KEY (ticker, date)
+                )
+                """
+            )
+            conn.commit()
+
+            def reset():
+                cur.execute("TRUNCATE bench_daily_bars")
+                conn.commit()
+
+            methods = {
+                "executemany": (
+                    subset,
+                    lambda batch: cur.executemany(UPSERT_SQL, batch),
+                    scale,
+                ),
+                "execute_values": (
+                    rows,
+                    lambda batch: execute_values(
+                        cur, VALUES_SQL, batch, template=ROW_TEMPLATE, page_size=10_000
+                    ),
+                    1.0,
+                ),
+                "copy_upsert": (rows, lambda batch: copy_upsert(cur, UPSERT_SQL, batch), 1.0),
+            }
+
+            results = {}
+            for pass_name in ("insert", "update"):
+                print(f"\n{pass_name.title()} pass ({args.rows:,} rows):")
+                for name, (data, write, factor) in methods.items():
+                    reset()
+                    if pass_name == "update":
+                        in_batches(lambda b: copy_upsert(cur, UPSERT_SQL, b), data, args.batch_size)
+                        conn.commit()
+                    results[(pass_name, name)] = timed(
+                        name,
+                        conn,
+                        lambda: in_batches(write, data, args.batch_size),
+                        len(data),
+                        factor,
+                    )
+
+            print("\nSpeedup of copy_upsert:")
+            for pass_name in ("insert", "update"):
+                base = results[(pass_name, "copy_upsert")]
+                print(
+                    f"  {pass_name:<7} vs executemany {results[(pass_name, 'executemany')] / base:6.1f}x"
+                    f"   vs execute_values {results[(pass_name, 'execute_values')] / base:5.1f}x"
+                )
+
+            cur.execute("DROP TABLE bench_daily_bars")
+
+
+if __name__ == "__main__":
+    main()
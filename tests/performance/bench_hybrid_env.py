@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+HybridPortfolioEnv step-throughput benchmark
+
+Compares the dense price-cube lookups against the previous per-lookup
+DataFrame masks on a synthetic universe (no database or ML model required).
+
+Run with: python tests/performance/bench_hybrid_env.py --tickers 3000 --days 1250
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import argparse
+import time
+from typing import Tuple
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from rl_trading import hybrid_portfolio_env
+from rl_trading.hybrid_portfolio_env import HybridPortfolioEnv
+
+
+def make_price_frame(n_tickers: int, n_days: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic long-format daily closes with ~5% missing bars"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2020-01-01", periods=n_days)
+    tickers = np.array([f"T{i:05d}" for i in range(n_tickers)])
+
+    log_returns = rng.normal(0.0003, 0.02, size=(n_days, n_tickers))
+    closes = 50.0 * np.exp(np.cumsum(log_returns, axis=0))
+    present = rng.random((n_days, n_tickers)) > 0.05
+
+    date_idx, ticker_idx = np.nonzero(present)
+    return pd.DataFrame(
+        {
+            "ticker": tickers[ticker_idx],
+            "date": dates[date_idx],
+            "close": closes[date_idx, ticker_idx],
+        }
+    )
+
+
+class SyntheticHybridEnv(HybridPortfolioEnv):
+    """Env fed from an in-memory price frame with random ML candidates"""
+
+    def __init__(self, price_frame: pd.DataFrame, **kwargs):
+        self._price_frame = price_frame
+        self._rng = np.random.default_rng(1)
+        with mock.patch.object(hybrid_portfolio_env, "MLPortfolioManager"):
+            super().__init__(**kwargs)
+
+    def _load_historical_data(self):
+        self._index_price_data(self._price_frame)
+
+    def _get_ml_candidates(self, as_of_date) -> pd.DataFrame:
+        tickers = self._rng.choice(self.price_cube.tickers, size=self.ml_top_n, replace=False)
+        preds = np.sort(self._rng.uniform(0.01, 0.2, size=self.ml_top_n))[::-1]
+        return pd.DataFrame({"ticker": tickers, "predicted_return": preds})
+
+
+class LegacyLookupEnv(SyntheticHybridEnv):
+    """Same env with the original boolean-mask price and market-feature lookups"""
+
+    def _load_historical_data(self):
+        super()._load_historical_data()
+        self.price_data = self._price_frame.sort_values(["date", "ticker"]).reset_index(drop=True)
+
+    def _get_price(self, ticker: str, date: pd.Timestamp) -> float:
+        price_row = self.price_data[
+            (self.price_data["ticker"] == ticker) & (self.price_data["date"] == date)
+        ]
+        return price_row["close"].values[0] if len(price_row) > 0 else 0.0
+
+    def _get_prices(self, tickers) -> np.ndarray:
+        return np.array([self._get_price(t, self.current_date) for t in tickers])
+
+    def _get_market_features(self) -> Tuple[float, float, float]:
+        recent_dates = [d for d in self.trading_dates if d <= self.current_date][-20:]
+        if len(recent_dates) < 2:
+            return 0.0, 0.0, 0.0
+
+        sample_tickers = self.price_data["ticker"].unique()[:100]
+        market_data = self.price_data[
+            (self.price_data["ticker"].isin(sample_tickers))
+            & (self.price_data["date"].isin(recent_dates))
+        ]
+        daily_avg = market_data.groupby("date")["close"].mean()
+        market_return = (daily_avg.iloc[-1] - daily_avg.iloc[0]) / daily_avg.iloc[0]
+        market_vol = daily_avg.pct_change().std()
+        return market_return, market_vol, market_vol * np.sqrt(252)
+
+
+def run_steps(env: HybridPortfolioEnv, n_steps: int) -> float:
+    """Return environment steps per second over n_steps (resetting on episode end)"""
+    rng = np.random.default_rng(2)
+    env.reset()
+
+    start = time.perf_counter()
+    for _ in range(n_steps):
+        action = rng.random(env.action_space.shape[0]).astype(np.float32)
+        _, _, done, _, _ = env.step(action)
+        if done:
+            env.reset()
+    elapsed = time.perf_counter() - start
+
+    return n_steps / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HybridPortfolioEnv step throughput")
+    parser.add_argument("--tickers", type=int, default=3000, help="Universe size")
+    parser.add_argument("--days", type=int, default=1250, help="Trading days (~5 years)")
+    parser.add_argument("--steps", type=int, default=50, help="Env steps to time per variant")
+    args = parser.parse_args()
+
+    frame = make_price_frame(args.tickers, args.days)
+    env_kwargs = {"rebalance_frequency": 1, "start_date": "2020-01-01", "end_date": "2030-01-01"}
+
+    print(f"Universe: {args.tickers} tickers x {args.days} days ({len(frame):,} bars)")
+
+    results = {}
+    for name, env_cls in (("dataframe", LegacyLookupEnv), ("price_cube", SyntheticHybridEnv)):
+        env = env_cls(frame, **env_kwargs)
+        results[name] = run_steps(env, args.steps)
+        print(f"  {name:<10} {results[name]:10.1f} steps/sec")
+
+    print(f"  speedup    {results['price_cube'] / results['dataframe']:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
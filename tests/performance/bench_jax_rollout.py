@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+JAX PPO rollout and update throughput benchmark (CPU)
+
+Compares the single-environment collect_trajectory loop (batch-size-1 policy
+calls) with lockstep BatchedEnv rollouts evaluated in one jitted call, and the
+previous un-jitted minibatch update with the jitted update step. Uses the
+synthetic universe from bench_hybrid_env.py, so no database or ML model is needed.
+
+Run with: JAX_PLATFORMS=cpu python tests/performance/bench_jax_rollout.py --num-envs 1 4 16
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import argparse
+import time
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+from bench_hybrid_env import SyntheticHybridEnv, make_price_frame
+from jax import value_and_grad
+
+from rl_trading.batched_env import BatchedEnv
+from rl_trading.train_jax_ppo import PPOTrainer
+
+
+def legacy_update(trainer: PPOTrainer, trajectory: dict):
+    """The previous update: value_and_grad rebuilt per minibatch, no jit"""
+    advantages, returns = trainer.compute_gae(
+        trajectory["rewards"],
+        trajectory["values"],
+        trajectory["dones"],
+        trainer.gamma,
+        trainer.gae_lambda,
+    )
+    advantages = (advantages - jnp.mean(advantages)) / (jnp.std(advantages) + 1e-8)
+    indices = np.arange(len(trajectory["observations"]))
+
+    for _ in range(trainer.n_epochs):
+        np.random.shuffle(indices)
+        for start in range(0, len(indices), trainer.batch_size):
+            batch_idx = indices[start : start + trainer.batch_size]
+            grad_fn = value_and_grad(trainer.ppo_loss, has_aux=True)
+            (_, _), grads = grad_fn(
+                trainer.train_state.params,
+                trainer.train_state.apply_fn,
+                trajectory["observations"][batch_idx],
+                trajectory["actions"][batch_idx],
+                trajectory["log_probs"][batch_idx],
+                advantages[batch_idx],
+                returns[batch_idx],
+                trainer.clip_epsilon,
+                trainer.value_coef,
+                trainer.entropy_coef,
+            )
+            trainer.train_state = trainer.train_state.apply_gradients(grads=grads)
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    jax.block_until_ready(fn(*args))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JAX PPO rollouts and updates")
+    parser.add_argument("--tickers", type=int, default=3000, help="Universe size")
+    parser.add_argument("--days", type=int, default=1250, help="Trading days")
+    parser.add_argument("--steps", type=int, default=1024, help="Env steps per measurement")
+    parser.add_argument("--num-envs", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    frame = make_price_frame(args.tickers, args.days)
+    env = SyntheticHybridEnv(frame, start_date="2020-01-01", end_date="2030-01-01")
+
+    print(f"Device: {jax.devices()[0]}")
+    print(f"Universe: {args.tickers} tickers x {args.days} days, {args.steps} env steps each\n")
+
+    # Today's loop: one env, batch-size-1 policy call per step
+    trainer = PPOTrainer(env)
+    trainer.collect_trajectory(8)  # warm up
+    baseline = args.steps / timed(trainer.collect_trajectory, args.steps)
+    print(f"  {'single env loop':<24} {baseline:10.1f} env steps/sec")
+
+    for num_envs in args.num_envs:
+        batched = PPOTrainer(BatchedEnv(env, num_envs))
+        n_steps = max(1, args.steps // num_envs)
+        batched.collect_vector_trajectory(2)  # warm up / compile
+        rate = n_steps * num_envs / timed(batched.collect_vector_trajectory, n_steps)
+        print(
+            f"  {f'batched x{num_envs}':<24} {rate:10.1f} env steps/sec  ({rate / baseline:.1f}x)"
+        )
+
+    # Update throughput on the same trajectory
+    trajectory = trainer.collect_trajectory(args.steps)
+    trainer.n_epochs = 2
+    trainer.update(trajectory)  # compile
+    legacy = timed(legacy_update, trainer, trajectory)
+    jitted = timed(trainer.update, trajectory)
+    samples = args.steps * trainer.n_epochs
+    print(f"\n  {'update (no jit)':<24} {samples / legacy:10.1f} samples/sec")
+    print(
+        f"  {'update (jitted)':<24} {samples / jitted:10.1f} samples/sec  ({legacy / jitted:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+LSTM training-window benchmark
+
+Compares LSTMTrainer's materialized sequences (create_sequences +
+normalize_data + the float32 copy StockSequenceDataset makes) against the
+lazy windows of ml_models/sequence_windows.py on synthetic daily rows (no
+database, GPU or torch required). Reports build time, peak RSS and one
+epoch of shuffled batch assembly on CPU; the model's work per batch is the
+same for both. Each mode runs in a fresh process so its peak RSS is its own.
+
+Run with: python tests/performance/bench_lstm_windows.py --tickers 300 --days 750
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import argparse
+import json
+import resource
+import subprocess
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+from ml_models.sequence_windows import SequenceWindows
+
+MODES = ["materialized", "windowed"]
+FEATURES = [
+    "close",
+    "volume",
+    "hl_ratio",
+    "ret_1d",
+    "ret_5d",
+    "ret_20d",
+    "volume_ratio",
+    "rsi_14",
+    "macd_value",
+    "signal_value",
+    "sma20_ratio",
+    "sma50_ratio",
+    "ema_ratio",
+]
+TARGETS = ["target_5d", "target_20d", "target_63d"]
+
+
+def make_rows(n_tickers: int, n_days: int, seed: int = 0) -> pd.DataFrame:
+    """load_data-shaped rows ordered by ticker, date, ~5% missing indicator values"""
+    rng = np.random.default_rng(seed)
+    n = n_tickers * n_days
+    df = pd.DataFrame(
+        {
+            "ticker": np.repeat([f"T{i:05d}" for i in range(n_tickers)], n_days),
+            "date": np.tile(pd.bdate_range("2020-01-01", periods=n_days).date, n_tickers),
+        }
+    )
+    for column in FEATURES + TARGETS:
+        values = rng.normal(size=n)
+        values[rng.random(n) < 0.05] = np.nan
+        df[column] = values
+    return df
+
+
+def materialized(df: pd.DataFrame, sequence_length: int):
+    """LSTMTrainer.create_sequences + normalize_data + StockSequenceDataset's float32 copy"""
+    sequences_list, targets_list = [], []
+    for ticker in df["ticker"].unique():
+        ticker_df = df[df["ticker"] == ticker].sort_values("date")
+        if len(ticker_df) < sequence_length:
+            continue
+        X = np.nan_to_num(ticker_df[FEATURES].values, nan=0.0)
+        y = np.nan_to_num(ticker_df[TARGETS].values, nan=0.0)
+        for i in range(len(X) - sequence_length):
+            sequences_list.append(X[i : i + sequence_length])
+            targets_list.append(y[i + sequence_length - 1])
+    sequences, targets = np.array(sequences_list), np.array(targets_list)
+    del sequences_list, targets_list
+
+    split = int(len(sequences) * 0.8)
+    scaler = StandardScaler()
+    n_features = sequences.shape[2]
+    train = scaler.fit_transform(sequences[:split].reshape(-1, n_features))
+    train = train.reshape(split, sequence_length, n_features)
+    return np.asarray(train, dtype=np.float32), np.asarray(targets[:split], dtype=np.float32)
+
+
+def run_mode(mode: str, n_tickers: int, n_days: int, sequence_length: int, batch_size: int):
+    """Build the training windows and run one epoch of batches in this process"""
+    df = make_rows(n_tickers, n_days)
+    baseline_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    started = time.time()
+    if mode == "materialized":
+        sequences, targets = materialized(df, sequence_length)
+        n_windows = len(sequences)
+
+        def batch(rows):
+            return sequences[rows], targets[rows]
+
+    else:
+        windows = SequenceWindows(df, FEATURES, TARGETS, sequence_length)
+        split = int(len(windows) * 0.8)
+        windows.fit_normalization(np.arange(split))
+        n_windows = split
+
+        def batch(rows):
+            return windows.sequences(rows), windows.targets(rows)
+
+    build_seconds = time.time() - started
+
+    started = time.time()
+    checksum = 0.0
+    for rows in np.array_split(
+        np.random.default_rng(1).permutation(n_windows), max(1, n_windows // batch_size)
+    ):
+        X, y = batch(rows)
+        checksum += float(X[:, -1, 0].sum())
+    epoch_seconds = time.time() - started
+
+    # ru_maxrss is KiB on Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {
+        "mode": mode,
+        "windows": n_windows,
+        "build_seconds": build_seconds,
+        "epoch_seconds": epoch_seconds,
+        "peak_mb": peak_mb,
+        "above_rows_mb": peak_mb - baseline_mb,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RAM and epoch time of LSTM training windows")
+    parser.add_argument("--tickers", type=int, default=300)
+    parser.add_argument("--days", type=int, default=750)
+    parser.add_argument("--sequence-length", type=int, default=60)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES)
+    parser.add_argument("--run-mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sizes = [args.tickers, args.days, args.sequence_length, args.batch_size]
+    if args.run_mode:
+        print(json.dumps(run_mode(args.run_mode, *sizes)))
+        return
+
+    print(
+        f"{args.tickers} tickers x {args.days} days, {len(FEATURES)} features, "
+        f"sequence length {args.sequence_length}, batch size {args.batch_size}"
+    )
+    print(
+        f"{'mode':<14}{'train windows':>14}{'build s':>10}{'epoch s':>10}"
+        f"{'peak RSS MB':>14}{'over rows MB':>14}"
+    )
+    for mode in args.modes:
+        cmd = [
+            sys.executable,
+            __file__,
+            "--run-mode",
+            mode,
+            "--tickers",
+            str(args.tickers),
+            "--days",
+            str(args.days),
+            "--sequence-length",
+            str(args.sequence_length),
+            "--batch-size",
+            str(args.batch_size),
+        ]
+        output = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{mode:<14}{result['windows']:>14,}{result['build_seconds']:>10.1f}"
+            f"{result['epoch_seconds']:>10.1f}{result['peak_mb']:>14.0f}"
+            f"{result['above_rows_mb']:>14.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+XGBoost training peak-memory benchmark
+
+Compares peak RSS and wall time of the in-memory trainers' path (cache load
+-> DataFrame -> fillna(0) -> XGBRegressor.fit) against the streaming paths of
+ml_models/xgb_streaming.py (QuantileDMatrix, and ExtMemQuantileDMatrix on
+disk) on a synthetic training-data cache (no database required). Each mode
+runs in a fresh process so its peak RSS is its own.
+
+Run with: python tests/performance/bench_xgb_memory.py --rows 2000000 --features 120
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import argparse
+import json
+import resource
+import subprocess
+import tempfile
+import time
+from datetime import date
+
+import pandas as pd
+
+from ml_models.training_data import TrainingDataCache
+from tests.synthetic_training_data import SyntheticTrainingDataCache
+
+MODES = ["pandas", "streaming", "external"]
+START, END = date(2020, 1, 1), date(2024, 12, 31)
+PARAMS = {
+    "objective": "reg:squarederror",
+    "tree_method": "hist",
+    "max_depth": 6,
+    "learning_rate": 0.05,
+    "subsample": 0.8,
+    "colsample_bytree": 0.8,
+    "random_state": 42,
+}
+
+
+def run_mode(mode: str, cache_dir: str, rounds: int) -> dict:
+    """Train once in this process; returns rows, seconds and peak RSS"""
+    import xgboost as xgb
+
+    from ml_models.xgb_streaming import SERVING_FILL_VALUE, CacheChunkIter, train_streaming
+
+    cache = TrainingDataCache(Path(cache_dir))
+    params = dict(PARAMS, n_estimators=rounds)
+    started = time.time()
+
+    if mode == "pandas":
+        df = cache.load(START, END, min_price=5.0)
+        feature_cols = [c for c in df.columns if c not in ("ticker", "date", "target_return")]
+        X = df[feature_cols].fillna(0)
+        y = df["target_return"]
+        model = xgb.XGBRegressor(**params)
+        model.fit(X, y)
+        model.predict(X)
+        rows = len(X)
+    else:
+        prefix = str(Path(cache_dir) / "xgb_extmem") if mode == "external" else None
+        chunks = CacheChunkIter(
+            START,
+            END,
+            min_price=5.0,
+            cache=cache,
+            fill_value=SERVING_FILL_VALUE,
+            cache_prefix=prefix,
+        )
+        _, metrics, _ = train_streaming(chunks, params)
+        rows = metrics["rows"]
+
+    # ru_maxrss is KiB on Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {"mode": mode, "rows": rows, "seconds": time.time() - started, "peak_mb": peak_mb}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak RSS of XGBoost training paths")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--features", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES)
+    parser.add_argument("--run-mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--cache-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_mode:
+        print(json.dumps(run_mode(args.run_mode, args.cache_dir, args.rounds)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.time()
+        rows_per_day = max(1, args.rows // len(pd.bdate_range(START, END)))
+        cache = SyntheticTrainingDataCache(
+            Path(tmp), START, END, tickers=rows_per_day, missing=0.1, extra_features=args.features
+        )
+        cache.refresh()
+        print(
+            f"Synthetic cache: ~{args.rows:,} rows x {args.features + 3} features "
+            f"({time.time() - started:.1f}s to build)"
+        )
+
+        print(f"{'mode':<12}{'rows':>12}{'seconds':>10}{'peak RSS MB':>14}")
+        for mode in args.modes:
+            cmd = [
+                sys.executable,
+                __file__,
+                "--run-mode",
+                mode,
+                "--cache-dir",
+                tmp,
+                "--rounds",
+                str(args.rounds),
+            ]
+            output = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{mode:<12}{result['rows']:>12,}{result['seconds']:>10.1f}"
+                f"{result['peak_mb']:>14.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
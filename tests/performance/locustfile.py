@@ -142,6 +142,46 @@ class ACISBackgroundJobUser(HttpUser):
         self.client.post(f"/api/portfolio/rebalance/{client_id}")
 
 
+class ACISMixedLatencyUser(HttpUser):
+    """
+    Slow database-bound requests interleaved with fast ones
+
+    Before blocking database work was moved off the event loop, one slow
+    portfolio analysis stalled every concurrent request; the fast endpoints'
+    p99 should now stay flat while the slow ones are in flight.
+    """
+
+    wait_time = between(0.1, 0.5)
+
+    @task(1)
+    def slow_portfolio_analysis(self):
+        """Portfolio health analysis (DB queries + analyzer)"""
+        client_id = random.randint(1, 10)
+        self.client.get(
+            f"/api/portfolio-health/{client_id}/analysis",
+            name="/api/portfolio-health/[id]/analysis",
+        )
+
+    @task(1)
+    def slow_rebalance_recommendations(self):
+        """Rebalance recommendations (same analysis path)"""
+        client_id = random.randint(1, 10)
+        self.client.get(
+            f"/api/portfolio-health/{client_id}/rebalance-recommendations",
+            name="/api/portfolio-health/[id]/rebalance-recommendations",
+        )
+
+    @task(6)
+    def fast_health(self):
+        """Health check (no I/O)"""
+        self.client.get("/api/health")
+
+    @task(2)
+    def fast_thread_pool(self):
+        """Worker pool occupancy"""
+        self.client.get("/api/health/thread-pool")
+
+
 @events.test_start.add_listener
 def on_test_start(environment, **kwargs):
     """Called when the test starts"""
@@ -164,6 +204,14 @@ def on_test_stop(environment, **kwargs):
     print(f"99th percentile: {stats.total.get_response_time_percentile(0.99):.2f}ms")
     print(f"Requests per second: {stats.total.total_rps:.2f}")
 
+    print("\n📈 Per-endpoint latency (p50 / p99):")
+    for entry in sorted(stats.entries.values(), key=lambda e: e.name):
+        print(
+            f"  {entry.method:6} {entry.name:55} "
+            f"{entry.get_response_time_percentile(0.5):8.0f}ms "
+            f"{entry.get_response_time_percentile(0.99):8.0f}ms"
+        )
+
 
 # Custom failure criteria
 @events.quitting.add_listener
@@ -0,0 +1,55 @@
+"""
+Synthetic training-data cache for tests and benchmarks
+
+SyntheticTrainingDataCache is a TrainingDataCache (ml_models/training_data.py)
+whose ml_training_features rows come from tests.conftest.make_features instead
+of the database. Kept out of conftest so that only the tests that use it
+import ml_models and pyarrow; conftest's training_data_cache fixture builds
+refreshed instances.
+"""
+
+from datetime import date, timedelta
+from typing import Optional
+
+import pandas as pd
+
+from ml_models.training_data import TrainingDataCache
+from tests.conftest import make_features
+
+
+class SyntheticTrainingDataCache(TrainingDataCache):
+    """
+    TrainingDataCache over an in-memory ml_training_features (no database)
+
+    The table is `features` if given, otherwise make_features(start, end,
+    **rows) generated one fetched month at a time (so large benchmark caches
+    never sit in memory whole). fetched records the start of each read.
+    """
+
+    def __init__(
+        self,
+        cache_dir,
+        start: date = date(2024, 1, 1),
+        end: date = date(2024, 6, 30),
+        features: Optional[pd.DataFrame] = None,
+        **rows,
+    ):
+        super().__init__(cache_dir)
+        self.start, self.end = start, end
+        self.features = features
+        self.rows = rows
+        self.fetched = []
+
+    def db_bounds(self):
+        if self.features is not None:
+            return self.features["date"].min(), self.features["date"].max()
+        days = pd.bdate_range(self.start, self.end).date
+        return days[0], days[-1]
+
+    def fetch_rows(self, start, end):
+        self.fetched.append(start)
+        if self.features is None:
+            last = min(end - timedelta(days=1), self.end)
+            return make_features(max(start, self.start), last, **self.rows)
+        rows = self.features[(self.features["date"] >= start) & (self.features["date"] < end)]
+        return rows.sort_values(["date", "ticker"]).reset_index(drop=True).copy()
@@ -0,0 +1,142 @@
+"""
+Backtest Job Service Tests
+
+Tests for backend/api/services/backtest_jobs.py with stand-in runners in a
+real process pool: results keyed by config, model version and data
+watermark, deduplication of identical submissions, the on-disk result cache,
+failures and cancellation.
+"""
+
+import os
+import time
+
+import pytest
+
+from backend.api.services.backtest_jobs import BacktestJobService
+
+
+def fake_backtest(config):
+    """Stand-in for run_backtest_job: echoes the config with the worker pid"""
+    time.sleep(config.get("sleep", 0))
+    if config.get("fail"):
+        raise ValueError("No predictions for period")
+    return {
+        "performance_metrics": {"total_return": config["top_n"] / 100, "pid": os.getpid()},
+        "rebalance_history": [{"date": config["start_date"]}],
+        "config": config,
+    }
+
+
+def make_config(**overrides):
+    config = {"start_date": "2024-01-01", "end_date": "2024-06-30", "top_n": 50}
+    config.update(overrides)
+    return config
+
+
+@pytest.fixture
+def versions():
+    return {"model_version": "abc123", "data_watermark": "2024-06-28/2024-06-28"}
+
+
+@pytest.fixture
+def service(tmp_path, versions):
+    service = BacktestJobService(
+        max_workers=1,
+        cache_dir=tmp_path,
+        runner=fake_backtest,
+        version_fn=lambda: dict(versions),
+    )
+    yield service
+    service.shutdown()
+
+
+def wait_for(service, job, timeout=30.0):
+    """Wait until the job has left queued/running and return it"""
+    deadline = time.time() + timeout
+    while service.get(job.job_id).status in ("queued", "running") and time.time() < deadline:
+        time.sleep(0.01)
+    return service.get(job.job_id)
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+class TestBacktestJobs:
+    """Tests for submit / status / result / cancel"""
+
+    def test_result_cached_by_config(self, service, tmp_path):
+        """A finished backtest is served to the next identical submission without running"""
+        job = service.submit(make_config())
+        assert job.status == "queued" and not job.cached
+        assert wait_for(service, job).status == "completed"
+        result = service.result(job.job_id)
+        assert result["config"]["top_n"] == 50
+        assert result["performance_metrics"]["pid"] != os.getpid()
+        assert len(list(tmp_path.glob("*.json"))) == 1
+
+        again = service.submit(make_config())
+        assert again.job_id != job.job_id
+        assert again.status == "completed" and again.cached
+        assert service.result(again.job_id) == result
+
+        # Results persist for a new service (API restart / other worker)
+        fresh = BacktestJobService(
+            cache_dir=tmp_path, runner=fake_backtest, version_fn=service.version_fn
+        )
+        assert fresh.submit(make_config()).cached
+
+        other = service.submit(make_config(top_n=25))
+        assert not other.cached
+        assert service.result(wait_for(service, other).job_id)["config"]["top_n"] == 25
+
+    def test_key_includes_versions(self, service, versions):
+        """Retraining the model or loading new data invalidates cached results"""
+        key = service.job_key(make_config())
+        assert service.job_key(make_config()) == key
+
+        versions["model_version"] = "def456"
+        service._version = None
+        assert service.job_key(make_config()) != key
+
+    def test_identical_submissions_share_job(self, service):
+        """A config already queued or running joins that job"""
+        first = service.submit(make_config(sleep=0.5))
+        second = service.submit(make_config(sleep=0.5))
+
+        assert second is first
+        wait_for(service, first)
+        assert service.result(first.job_id)["config"]["sleep"] == 0.5
+
+    def test_failed_job(self, service):
+        """A runner error fails the job and is not cached"""
+        job = wait_for(service, service.submit(make_config(fail=True)))
+
+        assert job.status == "failed"
+        assert "No predictions" in job.error
+        assert service.result(job.job_id) is None
+        assert not service.submit(make_config(fail=True)).cached
+
+    def test_cancel(self, service):
+        """Queued jobs leave the pool; a running one is marked cancelled, joined by a resubmit"""
+        running = service.submit(make_config(sleep=1.0))
+        service.submit(make_config(top_n=20))  # handed to the pool's call queue
+        queued = service.submit(make_config(top_n=10))
+        while service.get(running.job_id).status != "running":
+            time.sleep(0.01)
+
+        assert service.cancel(queued.job_id).status == "cancelled"
+        assert queued.future.cancelled()
+        assert service.cancel(running.job_id).status == "cancelled"
+        assert service.cancel("missing") is None
+
+        rejoined = service.submit(make_config(sleep=1.0))
+        assert rejoined.job_id != running.job_id and not rejoined.cached
+        assert rejoined.future is running.future
+        assert service.submit(make_config(sleep=1.0)) is rejoined
+
+        assert wait_for(service, rejoined).status == "completed"
+        while service.get(running.job_id).finished_at is None:
+            time.sleep(0.01)
+        assert service.get(running.job_id).status == "cancelled"
+        assert service.result(running.job_id) is None
+        assert service.result(rejoined.job_id)["config"]["sleep"] == 1.0
+        assert service.submit(make_config(sleep=1.0)).cached
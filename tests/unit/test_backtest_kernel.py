@@ -0,0 +1,170 @@
+"""
+Backtest Kernel Tests
+
+Tests for the NumPy simulation kernel in ml_models/backtest_kernel.py against
+the per-day loop PortfolioBacktester.simulate_portfolio used before (kept
+below as the reference), on a fixed seed, and for the shared PricePanel.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml_models.backtest_kernel import (
+    PricePanel,
+    build_price_matrix,
+    random_selection_weights,
+    rebalance_mask,
+    simulate,
+)
+
+
+def make_prices(n_days: int = 400, n_tickers: int = 40, seed: int = 11) -> pd.DataFrame:
+    """Long price frame with listing gaps and random missing bars"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2020-01-01", periods=n_days)
+    closes = 30 * np.exp(np.cumsum(rng.normal(0, 0.01, (n_days, n_tickers)), axis=0))
+    present = rng.random((n_days, n_tickers)) > 0.03
+    present[:120, :5] = False  # late listings
+    day, col = np.nonzero(present)
+    return pd.DataFrame(
+        {"ticker": [f"T{c:03d}" for c in col], "date": dates[day], "close": closes[day, col]}
+    )
+
+
+def loop_reference(tickers, prices, rebalance_dates, position_count, cost_bps):
+    """The original simulate_portfolio loop"""
+    price_pivot = prices.pivot(index="date", columns="ticker", values="close")
+    weights = 1.0 / position_count
+    portfolio_value = 100000
+    portfolio_values = []
+    holdings = {}
+    total_costs = 0.0
+
+    for i, current_date in enumerate(price_pivot.index):
+        if str(current_date)[:10] in rebalance_dates or i == 0:
+            available_stocks = [
+                t
+                for t in tickers
+                if t in price_pivot.columns and not pd.isna(price_pivot.loc[current_date, t])
+            ]
+            selected_stocks = np.random.choice(
+                available_stocks, size=min(position_count, len(available_stocks)), replace=False
+            ).tolist()
+            trades = len(set(holdings.keys()).union(set(selected_stocks)))
+            if trades > 0:
+                cost = portfolio_value * cost_bps / 10000 * trades
+                total_costs += cost
+                portfolio_value -= cost
+            holdings = {ticker: portfolio_value * weights for ticker in selected_stocks}
+
+        if holdings:
+            portfolio_value = sum(
+                shares * price_pivot.loc[current_date, ticker]
+                for ticker, shares in holdings.items()
+                if ticker in price_pivot.columns
+                and not pd.isna(price_pivot.loc[current_date, ticker])
+            )
+        portfolio_values.append(portfolio_value)
+
+    return np.array(portfolio_values), total_costs
+
+
+def run_kernel(tickers, prices, rebalance_dates, position_count, cost_bps):
+    dates, _, matrix = build_price_matrix(prices, tickers)
+    rebalance = rebalance_mask(dates, rebalance_dates)
+    weights = random_selection_weights(matrix, np.flatnonzero(rebalance), position_count)
+    return simulate(matrix, rebalance, weights, cost_bps)
+
+
+@pytest.mark.unit
+class TestSimulationKernel:
+    """Kernel output matches the per-day loop"""
+
+    @pytest.mark.parametrize("position_count,freq", [(10, "MS"), (15, "QS"), (50, "MS")])
+    def test_matches_loop_on_fixed_seed(self, position_count, freq):
+        """Equity curve and total costs equal the loop's for the same seed"""
+        prices = make_prices()
+        tickers = [f"T{c:03d}" for c in range(45)]  # includes tickers with no prices
+        rebalance_dates = pd.date_range("2020-01-01", "2021-08-01", freq=freq).strftime("%Y-%m-%d")
+        rebalance_dates = rebalance_dates.tolist()
+
+        np.random.seed(7)
+        expected_values, expected_costs = loop_reference(
+            tickers, prices, rebalance_dates, position_count, 15.0
+        )
+        np.random.seed(7)
+        result = run_kernel(tickers, prices, rebalance_dates, position_count, 15.0)
+
+        np.testing.assert_allclose(result.values, expected_values, rtol=1e-10)
+        assert result.total_costs == pytest.approx(expected_costs, rel=1e-10)
+
+    def test_turnover_counts_old_and_new_positions(self):
+        """Trades per rebalance count the union of outgoing and incoming names"""
+        matrix = np.ones((6, 4))
+        rebalance = np.array([True, False, False, True, False, False])
+        weights = np.array([[0.5, 0.5, 0, 0], [0, 0.5, 0.5, 0]])
+
+        result = simulate(matrix, rebalance, weights, cost_bps=10)
+
+        assert result.trades.tolist() == [2, 3]
+        assert result.costs[0] == pytest.approx(100000 * 0.001 * 2)
+        assert result.costs[1] == pytest.approx(result.values[2] * 0.001 * 3)
+
+    def test_missing_bars_contribute_nothing(self):
+        """A held ticker without a bar that day is skipped in the daily value"""
+        matrix = np.array([[10.0, 20.0], [np.nan, 20.0]])
+        weights = np.array([[0.5, 0.5]])
+
+        result = simulate(matrix, np.array([True, False]), weights, cost_bps=0, initial_value=1)
+
+        assert result.values.tolist() == [15.0, 10.0]
+
+    def test_day_zero_must_rebalance(self):
+        """A schedule that does not start with a rebalance is rejected"""
+        with pytest.raises(ValueError):
+            simulate(np.ones((3, 2)), np.array([False, True, False]), np.ones((1, 2)), 0)
+
+
+@pytest.mark.unit
+class TestPricePanel:
+    """A shared panel reproduces per-config loads"""
+
+    def test_select_matches_per_config_load(self):
+        """Slicing the panel gives the matrix a per-config query would, and the same curve"""
+        prices = make_prices()
+        universes = {
+            "large_cap": [f"T{c:03d}" for c in range(0, 25)],
+            "mid_cap": [f"T{c:03d}" for c in range(25, 45)],
+        }
+        panel = PricePanel.from_prices(prices, universes)
+        start, end = "2020-03-02", "2020-11-30"
+        rebalance_dates = pd.date_range(start, end, freq="MS").strftime("%Y-%m-%d").tolist()
+
+        for name, tickers in universes.items():
+            window = prices[
+                prices["ticker"].isin(tickers) & (prices["date"] >= start) & (prices["date"] <= end)
+            ]
+            dates, columns, matrix = build_price_matrix(window, tickers)
+            p_dates, p_columns, p_matrix = panel.select(name, start, end)
+
+            assert p_columns == columns
+            assert list(p_dates) == list(dates)
+            np.testing.assert_array_equal(p_matrix, matrix)
+
+            np.random.seed(3)
+            direct = run_kernel(tickers, window, rebalance_dates, 10, 15.0)
+            np.random.seed(3)
+            rebalance = rebalance_mask(p_dates, rebalance_dates)
+            weights = random_selection_weights(p_matrix, np.flatnonzero(rebalance), 10)
+            shared = simulate(p_matrix, rebalance, weights, 15.0)
+            np.testing.assert_allclose(shared.values, direct.values, rtol=1e-12)
+
+    def test_arrays_are_plain_numpy(self):
+        """Panel fields are non-object arrays, so Ray can share them zero-copy"""
+        panel = PricePanel.from_prices(make_prices(), {"all": [f"T{c:03d}" for c in range(40)]})
+
+        for array in (panel.dates, panel.tickers, panel.closes, panel.universes["all"]):
+            assert isinstance(array, np.ndarray)
+            assert array.dtype != object
+        assert panel.closes.flags["C_CONTIGUOUS"]
@@ -0,0 +1,161 @@
+"""
+Batched Environment Tests
+
+Tests for rl_trading.batched_env.BatchedEnv, the lockstep wrapper used by the
+JAX PPO trainer's batched rollout mode.
+"""
+
+import json
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+from gymnasium import spaces
+
+from rl_trading.batched_env import BatchedEnv
+from rl_trading.candidate_cache import TICKER_DTYPE
+from rl_trading.hybrid_portfolio_env import HybridPortfolioEnv
+
+
+class CountdownEnv:
+    """Minimal env: observation is [step], episode ends after `length` steps"""
+
+    def __init__(self, length: int = 3, rebalance_frequency: int = 4):
+        self.length = length
+        self.rebalance_frequency = rebalance_frequency
+        self.observation_space = spaces.Box(low=0, high=100, shape=(1,), dtype=np.float32)
+        self.action_space = spaces.Box(low=0, high=1, shape=(2,), dtype=np.float32)
+        self.step_count = 0
+        self.start_step = 0
+
+    def reset(self, seed=None, options=None):
+        self.start_step = (options or {}).get("start_step", 0)
+        self.step_count = self.start_step
+        return np.array([self.step_count], dtype=np.float32), {}
+
+    def step(self, action):
+        self.step_count += 1
+        done = self.step_count - self.start_step >= self.length
+        reward = float(action.sum())
+        return np.array([self.step_count], dtype=np.float32), reward, done, False, {}
+
+
+@pytest.fixture
+def hybrid_env(tmp_path):
+    """HybridPortfolioEnv over a synthetic price cube and candidate cache (no database)"""
+    dates = pd.bdate_range("2024-01-02", periods=6)
+    tickers = ["AAPL", "MSFT", "NVDA"]
+    price_frame = pd.DataFrame(
+        {
+            "ticker": np.tile(tickers, len(dates)),
+            "date": np.repeat(dates, len(tickers)),
+            "close": np.linspace(100.0, 130.0, len(dates) * len(tickers)),
+        }
+    )
+
+    # Candidates for every second trading day, as precompute_candidates stores them
+    cached_dates = dates[::2]
+    np.save(tmp_path / "dates.npy", cached_dates.values.astype("datetime64[D]"))
+    np.save(tmp_path / "tickers.npy", np.array([tickers] * len(cached_dates), dtype=TICKER_DTYPE))
+    np.save(
+        tmp_path / "predicted_returns.npy",
+        np.array([[0.09, 0.05, 0.02]] * len(cached_dates), dtype=np.float32),
+    )
+    with open(tmp_path / "metadata.json", "w") as f:
+        json.dump({"top_n": 3, "model_path": str(tmp_path / "missing_model.json")}, f)
+
+    with mock.patch.object(
+        HybridPortfolioEnv,
+        "_load_historical_data",
+        lambda self: self._index_price_data(price_frame),
+    ):
+        return HybridPortfolioEnv(
+            ml_top_n=3,
+            rl_max_positions=3,
+            rebalance_frequency=2,
+            position_limits=(0.01, 0.5),
+            candidate_cache=str(tmp_path),
+        )
+
+
+@pytest.mark.unit
+@pytest.mark.rl
+class TestBatchedEnv:
+    """Tests for BatchedEnv lockstep stepping"""
+
+    def test_reset_staggers_start_steps(self):
+        """Copies start spread across the first rebalance window"""
+        batched = BatchedEnv(CountdownEnv(rebalance_frequency=4), num_envs=4)
+
+        obs, _ = batched.reset()
+
+        assert obs.shape == (4, 1)
+        np.testing.assert_array_equal(obs[:, 0], [0, 1, 2, 3])
+
+    def test_step_returns_stacked_arrays(self):
+        """Rewards come from each env's own action row"""
+        batched = BatchedEnv(CountdownEnv(), num_envs=2)
+        batched.reset()
+
+        obs, rewards, dones, infos = batched.step(np.array([[0.5, 0.5], [0.2, 0.1]]))
+
+        assert obs.shape == (2, 1)
+        np.testing.assert_allclose(rewards, [1.0, 0.3], rtol=1e-6)
+        np.testing.assert_array_equal(dones, [0.0, 0.0])
+        assert len(infos) == 2
+
+    def test_finished_envs_reset_same_step(self):
+        """A done env reports done=1 and returns its next episode's first observation"""
+        batched = BatchedEnv(CountdownEnv(length=1, rebalance_frequency=1), num_envs=1)
+        batched.reset()
+
+        obs, _, dones, _ = batched.step(np.zeros((1, 2)))
+
+        assert dones[0] == 1.0
+        assert obs[0, 0] == 0.0
+
+    def test_copies_have_independent_state(self):
+        """Stepping one copy does not move another"""
+        batched = BatchedEnv(CountdownEnv(length=10, rebalance_frequency=1), num_envs=3)
+        batched.reset()
+        batched.step(np.zeros((3, 2)))
+
+        assert [env.step_count for env in batched.envs] == [1, 1, 1]
+
+    def test_hybrid_env_copies_do_not_share_portfolio(self, hybrid_env):
+        """Trading in one HybridPortfolioEnv copy leaves the other's holdings and cash alone"""
+        batched = BatchedEnv(hybrid_env, num_envs=2)
+        batched.reset()
+        first, second = batched.envs
+
+        first.step(np.array([0.4, 0.3, 0.3], dtype=np.float32))
+        first.step(np.array([0.2, 0.3, 0.5], dtype=np.float32))
+
+        assert first.current_positions
+        assert first.current_capital < first.initial_capital
+        assert len(first.portfolio_history) == 2
+        assert second.current_positions == {}
+        assert second.current_capital == second.initial_capital
+        assert second.portfolio_history == []
+
+    def test_candidate_cache_copies_rebalance_on_cached_dates(self, hybrid_env):
+        """With a candidate cache, every copy looks up candidates scored for its own date"""
+        batched = BatchedEnv(hybrid_env, num_envs=2)
+        cache = hybrid_env.candidate_cache
+
+        def lookup_date(env):
+            key = np.datetime64(env.current_date.date(), "D")
+            return cache.dates[np.searchsorted(cache.dates, key, side="right") - 1]
+
+        batched.reset()
+        assert batched.start_steps == [0, 2]
+        for _ in range(2):
+            for env in batched.envs:
+                assert lookup_date(env) == np.datetime64(env.current_date.date(), "D")
+            batched.step(np.full((2, 3), 1 / 3, dtype=np.float32))
+
+    def test_rejects_zero_envs(self):
+        """num_envs must be positive"""
+        with pytest.raises(ValueError):
+            BatchedEnv(CountdownEnv(), num_envs=0)
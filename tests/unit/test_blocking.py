@@ -0,0 +1,114 @@
+"""
+Blocking Work Offload Tests
+
+Tests for backend/api/database/blocking.py: blocking calls awaited through the
+worker pool must not stall other coroutines on the event loop, and the pool
+statistics must reflect threads in use.
+"""
+
+import threading
+import time
+
+import anyio
+import pytest
+
+from backend.api.database.blocking import (
+    blocking,
+    configure_thread_pool,
+    execute,
+    fetch_one,
+    run_blocking,
+    thread_pool_stats,
+)
+
+
+class FakeSession:
+    """Session stand-in recording the thread each call ran on"""
+
+    def __init__(self):
+        self.threads = []
+        self.committed = False
+
+    def execute(self, statement, params):
+        self.threads.append(threading.get_ident())
+        return self
+
+    def fetchone(self):
+        return ("row",)
+
+    def commit(self):
+        self.committed = True
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestRunBlocking:
+    """Tests for run_blocking and the @blocking decorator"""
+
+    async def test_event_loop_stays_responsive(self):
+        """A fast coroutine finishes while a slow blocking call is still running"""
+        finished = []
+
+        async def slow():
+            await run_blocking(time.sleep, 0.3)
+            finished.append("slow")
+
+        async def fast():
+            await anyio.sleep(0.01)
+            finished.append("fast")
+
+        start = time.perf_counter()
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(slow)
+            tg.start_soon(fast)
+
+        assert finished == ["fast", "slow"]
+        assert time.perf_counter() - start < 0.6
+
+    async def test_blocking_decorator(self):
+        """Decorated functions are awaitable and keep a synchronous entry point"""
+
+        @blocking
+        def add(a, b=0):
+            return a + b, threading.get_ident()
+
+        result, thread = await add(1, b=2)
+
+        assert result == 3
+        assert thread != threading.get_ident()
+        assert add.sync(1, b=2)[0] == 3
+
+    async def test_stats_report_threads_in_use(self):
+        """Threads running blocking work are counted against the pool size"""
+        configure_thread_pool(8)
+        release = threading.Event()
+        seen = {}
+
+        async def hold():
+            await run_blocking(release.wait, 5)
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(3):
+                tg.start_soon(hold)
+            await anyio.sleep(0.05)
+            seen.update(thread_pool_stats())
+            release.set()
+
+        assert seen == {"size": 8, "in_use": 3, "waiting": 0}
+        assert thread_pool_stats()["in_use"] == 0
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestSessionHelpers:
+    """Tests for fetch_one / execute"""
+
+    async def test_session_calls_run_off_loop(self):
+        db = FakeSession()
+
+        row = await fetch_one(db, "SELECT 1", {"client_id": 1})
+        await execute(db, "UPDATE x", commit=True)
+
+        assert row == ("row",)
+        assert db.committed
+        assert threading.get_ident() not in db.threads
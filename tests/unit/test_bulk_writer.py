@@ -0,0 +1,164 @@
+"""
+Bulk Writer Tests
+
+Tests for utils.bulk_writer: parsing loader INSERT statements, COPY text
+serialization, in-batch conflict-key deduplication and the statements issued
+for the staging-table merge (against a recording cursor, no database needed).
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from utils.bulk_writer import BulkUpsert, copy_upsert, format_copy_row
+
+UPSERT_SQL = """
+    INSERT INTO daily_bars (
+        ticker, date, close, volume, updated_at
+    ) VALUES (
+        %s, %s, %s, %s, CURRENT_TIMESTAMP
+    )
+    ON CONFLICT (ticker, date) DO UPDATE SET
+        close = EXCLUDED.close,
+        volume = EXCLUDED.volume,
+        updated_at = CURRENT_TIMESTAMP;
+"""
+
+
+class RecordingCursor:
+    """Captures execute / copy_expert calls the way psycopg2 would receive them"""
+
+    def __init__(self):
+        self.statements = []
+        self.copies = []
+        self.rowcount = -1
+
+    def execute(self, sql, params=None):
+        self.statements.append(" ".join(sql.split()))
+        if sql.lstrip().upper().startswith("INSERT"):
+            self.rowcount = len(self.copies[-1][1].splitlines())
+
+    def copy_expert(self, sql, buffer):
+        self.copies.append((sql, buffer.read()))
+
+
+@pytest.mark.unit
+class TestInsertParsing:
+    """Tests for BulkUpsert.from_insert_sql"""
+
+    def test_placeholders_and_expressions(self):
+        """%s entries are staged; other VALUES entries stay as SQL expressions"""
+        writer = BulkUpsert.from_insert_sql(UPSERT_SQL)
+
+        assert writer.table == "daily_bars"
+        assert writer.columns == ["ticker", "date", "close", "volume", "updated_at"]
+        assert writer.staged_columns == ["ticker", "date", "close", "volume"]
+        assert writer.values[-1] == "CURRENT_TIMESTAMP"
+        assert writer.on_conflict.startswith("ON CONFLICT (ticker, date) DO UPDATE SET")
+        assert not writer.on_conflict.endswith(";")
+
+    def test_function_calls_and_literals_in_values(self):
+        """Commas inside calls and quoted literals do not split VALUES entries"""
+        writer = BulkUpsert.from_insert_sql(
+            "INSERT INTO rsi (ticker, value, series_type, updated_at) "
+            "VALUES (%s, %s, 'close,open', COALESCE(NULL, NOW()))"
+        )
+
+        assert writer.values == ["%s", "%s", "'close,open'", "COALESCE(NULL, NOW())"]
+        assert writer.on_conflict == ""
+
+    def test_rejects_non_insert(self):
+        """Statements that are not INSERT ... VALUES (...) are refused"""
+        with pytest.raises(ValueError):
+            BulkUpsert.from_insert_sql("UPDATE daily_bars SET close = %s")
+
+
+@pytest.mark.unit
+class TestCopyFormat:
+    """Tests for COPY text-format serialization"""
+
+    def test_nulls_and_escapes(self):
+        """None becomes \\N; tabs, newlines and backslashes are escaped"""
+        line = format_copy_row(["a\tb", None, "x\ny", "c:\\dir"])
+
+        assert line == "a\\tb\t\\N\tx\\ny\tc:\\\\dir\n"
+
+    def test_scalar_types(self):
+        """Dates, bools, decimals and floats use Postgres input syntax"""
+        line = format_copy_row(
+            [date(2024, 1, 2), datetime(2024, 1, 2, 9, 30), True, Decimal("1.50"), 2.5, 7]
+        )
+
+        assert line == "2024-01-02\t2024-01-02T09:30:00\tt\t1.50\t2.5\t7\n"
+
+    def test_whole_number_floats_written_as_ints(self):
+        """Float volumes like 70790813.0 are written in integer syntax for BIGINT columns"""
+        line = format_copy_row([70790813.0, np.float32(12.0), np.float64(3.0), 0.5, float("nan")])
+
+        assert line == "70790813\t12\t3\t0.5\tnan\n"
+
+    def test_arrays_and_json(self):
+        """Lists become array literals (quoted, NULL-aware); dicts become JSON"""
+        line = format_copy_row([["AAPL", 'x"y', None], {"k": 1}])
+
+        assert line == '{"AAPL","x\\\\"y",NULL}\t{"k": 1}\n'
+
+
+@pytest.mark.unit
+class TestBulkUpsertWrite:
+    """Tests for the statements a write issues"""
+
+    def test_staging_merge(self):
+        """Rows are COPYed into a staging table and merged with the loader's ON CONFLICT"""
+        cur = RecordingCursor()
+        rows = [("AAA", date(2024, 1, 2), 10.0, 100), ("BBB", date(2024, 1, 2), 20.0, None)]
+
+        written = copy_upsert(cur, UPSERT_SQL, rows)
+
+        create, truncate, merge = cur.statements
+        staging = BulkUpsert.from_insert_sql(UPSERT_SQL).staging_table
+        assert create.startswith(f"CREATE TEMP TABLE IF NOT EXISTS {staging}")
+        assert "SELECT ticker, date, close, volume FROM daily_bars WITH NO DATA" in create
+        assert truncate == f"TRUNCATE {staging}"
+        assert cur.copies[0][0] == f"COPY {staging} (ticker, date, close, volume) FROM STDIN"
+        assert cur.copies[0][1] == "AAA\t2024-01-02\t10\t100\nBBB\t2024-01-02\t20\t\\N\n"
+        assert merge.startswith(
+            "INSERT INTO daily_bars (ticker, date, close, volume, updated_at) "
+            f"SELECT ticker, date, close, volume, CURRENT_TIMESTAMP FROM {staging} "
+            "ON CONFLICT (ticker, date) DO UPDATE SET"
+        )
+        assert written == 2
+
+    def test_duplicate_keys_keep_last(self):
+        """A key repeated within a batch is collapsed to its last row"""
+        cur = RecordingCursor()
+        rows = [
+            ("AAA", date(2024, 1, 2), 10.0, 1),
+            ("BBB", date(2024, 1, 2), 20.0, 1),
+            ("AAA", date(2024, 1, 2), 11.0, 2),
+        ]
+
+        copy_upsert(cur, UPSERT_SQL, rows)
+
+        copied = cur.copies[0][1].splitlines()
+        assert copied == ["AAA\t2024-01-02\t11\t2", "BBB\t2024-01-02\t20\t1"]
+
+    def test_plain_insert_copies_directly(self):
+        """Without ON CONFLICT, rows are COPYed straight into the target table"""
+        cur = RecordingCursor()
+        sql = "INSERT INTO sma (ticker, date, value) VALUES (%s, %s, %s);"
+
+        written = copy_upsert(cur, sql, [("AAA", date(2024, 1, 2), 1.0)])
+
+        assert cur.statements == []
+        assert cur.copies[0][0] == "COPY sma (ticker, date, value) FROM STDIN"
+        assert written == 1
+
+    def test_empty_batch_is_noop(self):
+        """Nothing is sent for an empty batch"""
+        cur = RecordingCursor()
+
+        assert copy_upsert(cur, UPSERT_SQL, []) == 0
+        assert cur.statements == [] and cur.copies == []
@@ -0,0 +1,78 @@
+"""
+Candidate Cache Tests
+
+Tests for rl_trading.candidate_cache.CandidateCache, the memory-mapped top-N
+ML candidates that HybridPortfolioEnv reads instead of scoring live.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rl_trading.candidate_cache import TICKER_DTYPE, CandidateCache
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    """Two rebalance dates, the second with a padded (short) candidate list"""
+    np.save(tmp_path / "dates.npy", np.array(["2024-01-02", "2024-01-31"], dtype="datetime64[D]"))
+    np.save(
+        tmp_path / "tickers.npy",
+        np.array([["NVDA", "AAPL", "MSFT"], ["AMD", "TSLA", ""]], dtype=TICKER_DTYPE),
+    )
+    np.save(
+        tmp_path / "predicted_returns.npy",
+        np.array([[0.09, 0.05, 0.02], [0.07, 0.03, np.nan]], dtype=np.float32),
+    )
+    with open(tmp_path / "metadata.json", "w") as f:
+        json.dump({"top_n": 3, "model_path": str(tmp_path / "missing_model.json")}, f)
+    return tmp_path
+
+
+@pytest.mark.unit
+@pytest.mark.rl
+class TestCandidateCache:
+    """Tests for CandidateCache lookups"""
+
+    def test_arrays_are_memory_mapped(self, cache_dir):
+        """Ticker and prediction arrays are opened read-only via mmap"""
+        cache = CandidateCache(cache_dir)
+
+        assert isinstance(cache.tickers, np.memmap)
+        assert isinstance(cache.predicted_returns, np.memmap)
+        assert len(cache) == 2
+        assert cache.top_n == 3
+
+    def test_lookup_exact_date(self, cache_dir):
+        """Exact rebalance date returns its candidates in stored order"""
+        cache = CandidateCache(cache_dir)
+
+        candidates = cache.lookup(pd.Timestamp("2024-01-02"))
+
+        assert list(candidates["ticker"]) == ["NVDA", "AAPL", "MSFT"]
+        np.testing.assert_allclose(candidates["predicted_return"], [0.09, 0.05, 0.02], rtol=1e-6)
+
+    def test_lookup_uses_latest_prior_date_and_drops_padding(self, cache_dir):
+        """Dates between rebalances use the latest earlier entry; padding is removed"""
+        cache = CandidateCache(cache_dir)
+
+        candidates = cache.lookup(pd.Timestamp("2024-02-15").date())
+
+        assert list(candidates["ticker"]) == ["AMD", "TSLA"]
+
+    def test_lookup_before_first_date_is_empty(self, cache_dir):
+        """No candidates before the first cached date"""
+        cache = CandidateCache(cache_dir)
+
+        assert len(cache.lookup("2023-12-29")) == 0
+
+    def test_missing_cache_raises(self, tmp_path):
+        """Opening a directory without a cache raises FileNotFoundError"""
+        with pytest.raises(FileNotFoundError):
+            CandidateCache(tmp_path / "nope")
+
+    def test_is_stale_without_model_file(self, cache_dir):
+        """A missing model file never marks the cache stale"""
+        assert not CandidateCache(cache_dir).is_stale()
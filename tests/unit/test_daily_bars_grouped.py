@@ -0,0 +1,102 @@
+"""
+Grouped Daily Bars Tests
+
+Tests for the grouped-daily (whole market per day) mode of
+scripts/daily/update_daily_bars.py: classifying incoming bars against stored
+daily_bars rows into inserts, updates and unchanged rows.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.daily.update_daily_bars import BAR_COLUMNS, bar_values, diff_bars
+
+
+def make_day(tickers, close=100.0, volume=1_000_000) -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {
+                "ticker": t,
+                "open": close - 1,
+                "high": close + 1,
+                "low": close - 2,
+                "close": close,
+                "volume": volume,
+                "vwap": close - 0.5,
+                "transactions": 5000,
+            }
+            for t in tickers
+        ]
+    )
+
+
+@pytest.mark.unit
+class TestDiffBars:
+    """Tests for diff_bars"""
+
+    def test_identical_rows_are_unchanged(self):
+        """Re-pulling a day that is already stored writes nothing"""
+        day = make_day(["AAA", "BBB"])
+
+        inserts, updates, unchanged = diff_bars(day, day.copy())
+
+        assert inserts.empty and updates.empty
+        assert unchanged == 2
+
+    def test_new_and_changed_rows(self):
+        """Missing tickers are inserts; a corrected close is an update"""
+        stored = make_day(["AAA", "BBB"])
+        incoming = make_day(["AAA", "BBB", "CCC"])
+        incoming.loc[incoming["ticker"] == "BBB", "close"] = 101.25
+
+        inserts, updates, unchanged = diff_bars(incoming, stored)
+
+        assert list(inserts["ticker"]) == ["CCC"]
+        assert list(updates["ticker"]) == ["BBB"]
+        assert unchanged == 1
+        assert list(updates.columns) == list(incoming.columns)
+
+    def test_rounding_and_nulls_are_not_changes(self):
+        """NUMERIC rounding below tolerance and NULL-vs-NaN compare equal"""
+        stored = make_day(["AAA"])
+        stored["vwap"] = np.nan
+        incoming = make_day(["AAA"])
+        incoming["close"] += 1e-6
+        incoming["vwap"] = np.nan
+
+        _, updates, unchanged = diff_bars(incoming, stored.astype(object))
+
+        assert updates.empty
+        assert unchanged == 1
+
+    def test_null_becoming_value_is_update(self):
+        """A field that was NULL and is now populated counts as changed"""
+        stored = make_day(["AAA"])
+        stored["transactions"] = None
+
+        _, updates, _ = diff_bars(make_day(["AAA"]), stored)
+
+        assert len(updates) == 1
+
+    def test_empty_store_inserts_everything(self):
+        """Backfilling a missing day inserts every incoming row"""
+        stored = pd.DataFrame(columns=["ticker"] + BAR_COLUMNS)
+
+        inserts, updates, unchanged = diff_bars(make_day(["AAA", "BBB"]), stored)
+
+        assert len(inserts) == 2
+        assert updates.empty and unchanged == 0
+
+
+@pytest.mark.unit
+class TestBarValues:
+    """Tests for mapping Polygon bar fields to daily_bars columns"""
+
+    def test_grouped_result_maps_to_row(self):
+        """Polygon o/h/l/c/v/vw/n fields map onto the upsert tuple in column order"""
+        bar = {"T": "AAA", "o": 1.0, "h": 2.0, "l": 0.5, "c": 1.5, "v": 900, "vw": 1.2, "n": 7}
+
+        row = bar_values("AAA", "2024-01-02", bar)
+
+        assert row == ("AAA", "2024-01-02", 1.0, 2.0, 0.5, 1.5, 900, 1.2, 7)
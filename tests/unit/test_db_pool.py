@@ -0,0 +1,233 @@
+"""
+Connection Pool Tests
+
+Tests for utils/db_pool.py: connection reuse, waiting for and timing out on a
+full pool, keeping returned connections open, connection reset on return,
+dropping only broken connections, fork handling and the checkout metrics
+(against fake connections, no database needed).
+"""
+
+import threading
+import time
+
+import psycopg2
+import pytest
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+
+from utils import db_pool
+from utils.db_pool import ConnectionPool
+
+
+class FakeInfo:
+    transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+
+class FakeConnection:
+    """Just enough of a psycopg2 connection for the pool"""
+
+    def __init__(self):
+        self.closed = 0
+        self.info = FakeInfo()
+        self.autocommit = False
+        self.cursor_factory = None
+        self.commits = 0
+        self.rollbacks = 0
+
+    def begin(self):
+        self.info.transaction_status = extensions.TRANSACTION_STATUS_INTRANS
+
+    def commit(self):
+        self.commits += 1
+        self.info.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.info.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    """Every connection the pool opens"""
+    opened = []
+
+    def connect(*args, **kwargs):
+        opened.append(FakeConnection())
+        return opened[-1]
+
+    monkeypatch.setattr(db_pool.psycopg2, "connect", connect)
+    return opened
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestCheckout:
+    """Tests for checkout, reuse and waiting"""
+
+    def test_lazy_and_reused(self, connections):
+        """Nothing connects until first use; sequential checkouts share a connection"""
+        pool = ConnectionPool("dsn", min_size=1, max_size=4)
+        assert connections == []
+
+        for _ in range(5):
+            with pool.connection() as conn:
+                conn.begin()
+
+        assert len(connections) == 1
+        assert connections[0].commits == 5
+        stats = pool.stats()
+        assert stats["checkouts"] == 5
+        assert stats["in_use"] == 0
+        assert stats["idle"] == 1
+
+    def test_full_pool_times_out(self, connections):
+        """A checkout beyond max_size waits, then raises PoolError"""
+        pool = ConnectionPool("dsn", min_size=0, max_size=1, timeout=0.05)
+        held = pool.getconn()
+
+        with pytest.raises(PoolError):
+            pool.getconn()
+
+        pool.putconn(held)
+        assert pool.stats()["timeouts"] == 1
+        assert pool.getconn() is not None
+
+    def test_waiter_gets_released_connection(self, connections):
+        """A waiting checkout proceeds when another thread returns its connection"""
+        pool = ConnectionPool("dsn", min_size=1, max_size=1, timeout=5)
+        held = pool.getconn()
+
+        def release():
+            time.sleep(0.1)
+            pool.putconn(held)
+
+        threading.Thread(target=release).start()
+        conn = pool.getconn()
+
+        assert conn is held
+        stats = pool.stats()
+        assert stats["waited_checkouts"] == 1
+        assert stats["wait_time_max_ms"] >= 50
+
+    def test_concurrent_checkouts_keep_connections_open(self, connections):
+        """Connections above min_size stay idle after return and serve the next burst"""
+        pool = ConnectionPool("dsn", min_size=1, max_size=8)
+
+        for _ in range(3):
+            held = [pool.getconn() for _ in range(5)]
+            for conn in held:
+                pool.putconn(conn)
+
+        assert len(connections) == 5
+        assert not any(conn.closed for conn in connections)
+        assert pool.stats()["idle"] == 5
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestReturn:
+    """Tests for returning connections to the pool"""
+
+    def test_connection_reset_on_return(self, connections):
+        """Open transactions roll back; autocommit and cursor_factory are reset"""
+        pool = ConnectionPool("dsn", min_size=1, max_size=2)
+        conn = pool.getconn()
+        conn.begin()
+        conn.autocommit = True
+        conn.cursor_factory = object
+
+        pool.putconn(conn)
+
+        assert conn.rollbacks == 1
+        assert conn.autocommit is False
+        assert conn.cursor_factory is None
+        assert not conn.closed
+
+    def test_error_rolls_back(self, connections):
+        """An exception in the block rolls back and keeps the connection"""
+        pool = ConnectionPool("dsn", min_size=1, max_size=2)
+
+        with pytest.raises(ValueError):
+            with pool.connection() as conn:
+                conn.begin()
+                raise ValueError("bad row")
+
+        assert conn.rollbacks == 1
+        assert conn.commits == 0
+        assert pool.stats()["discarded"] == 0
+
+    def test_query_canceled_keeps_connection(self, connections):
+        """A statement timeout rolls back and returns the still-open connection"""
+        pool = ConnectionPool("dsn", min_size=1, max_size=2)
+
+        with pytest.raises(psycopg2.extensions.QueryCanceledError):
+            with pool.connection() as conn:
+                conn.begin()
+                raise psycopg2.extensions.QueryCanceledError("canceling statement due to timeout")
+
+        assert conn.rollbacks == 1
+        assert not conn.closed
+        with pool.connection() as reused:
+            assert reused is conn
+        assert pool.stats()["discarded"] == 0
+
+    def test_broken_connection_dropped(self, connections):
+        """A connection closed by the server is discarded; the next checkout reconnects"""
+        pool = ConnectionPool("dsn", min_size=1, max_size=2)
+
+        with pytest.raises(psycopg2.OperationalError):
+            with pool.connection() as conn:
+                conn.close()
+                raise psycopg2.OperationalError("server closed the connection")
+
+        assert conn.closed
+        with pool.connection() as fresh:
+            assert fresh is not conn
+        assert pool.stats()["discarded"] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestFork:
+    """Tests for use after fork()"""
+
+    def test_child_opens_its_own_connections(self, connections, monkeypatch):
+        """A new pid gets a new pool; the parent's connections are left untouched"""
+        pool = ConnectionPool("dsn", min_size=1, max_size=2)
+        with pool.connection() as parent_conn:
+            pass
+
+        monkeypatch.setattr(db_pool.os, "getpid", lambda: -1)
+        with pool.connection() as child_conn:
+            pass
+
+        assert child_conn is not parent_conn
+        assert not parent_conn.closed
+        assert pool.stats()["checkouts"] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestHeldCheckout:
+    """Tests for classes that hold a pooled connection across a with block"""
+
+    def test_screener_returns_connection(self, connections, monkeypatch):
+        """StockScreener (and PortfolioBuilder through it) give the connection back on exit"""
+        from portfolio.portfolio_builder import PortfolioBuilder
+        from utils import db_config
+
+        pool = ConnectionPool("dsn", min_size=1, max_size=1, timeout=0.05)
+        monkeypatch.setattr(db_config, "connection_pool", pool)
+
+        for _ in range(3):
+            with PortfolioBuilder() as builder:
+                assert pool.stats()["in_use"] == 1
+                builder.screener.conn.begin()
+
+        assert len(connections) == 1
+        assert connections[0].commits == 3
+        assert pool.stats()["in_use"] == 0
+        assert builder.screener.conn is None
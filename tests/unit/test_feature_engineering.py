@@ -0,0 +1,88 @@
+"""
+Feature Engineering Tests
+
+Tests for the batched as-of price / momentum features in
+ml_models/feature_engineering.py against a per-date reference that mirrors the
+original SQL (latest bar on or before the date, LAG(close, n) and a 253-row
+running max over the ticker's history).
+"""
+
+import pandas as pd
+import pytest
+
+from ml_models.feature_engineering import (
+    BAR_STALENESS_DAYS,
+    MOMENTUM_FEATURES,
+    price_momentum_features,
+)
+from tests.conftest import make_bars
+
+
+def ohlcv_bars(n_days: int = 600) -> pd.DataFrame:
+    return make_bars(n_days, seed=5, start="2021-01-01", price=40.0, volatility=0.02, ohlcv=True)
+
+
+def reference_row(bars: pd.DataFrame, ticker: str, as_of: pd.Timestamp) -> dict:
+    history = bars[(bars["ticker"] == ticker) & (bars["date"] <= as_of)].reset_index(drop=True)
+    close = history["close"].to_numpy()
+    last = history.iloc[-1]
+    return {
+        "close": last["close"],
+        "daily_range": (last["high"] - last["low"]) / last["close"],
+        "return_1mo": close[-1] / close[-22] - 1,
+        "return_12mo": close[-1] / close[-253] - 1,
+        "dist_from_52w_high": close[-1] / close[-253:].max() - 1,
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.ml
+class TestPriceMomentumFeatures:
+    """Batched as-of features match a per-date reference"""
+
+    def test_matches_per_date_reference(self):
+        """Every (date, ticker) row equals the single-date computation"""
+        bars = ohlcv_bars()
+        dates = [pd.Timestamp("2022-06-15"), pd.Timestamp("2022-09-30"), pd.Timestamp("2023-03-01")]
+
+        features = price_momentum_features(bars.copy(), dates, min_price=0, min_volume=0)
+
+        assert len(features) == len(dates) * 3
+        for _, row in features.iterrows():
+            expected = reference_row(bars, row["ticker"], row["as_of_date"])
+            for column, value in expected.items():
+                assert row[column] == pytest.approx(value), (row["ticker"], column)
+
+    def test_short_history_gives_nan_momentum(self):
+        """Lags beyond the available history are NaN, like LAG() past the first row"""
+        bars = ohlcv_bars(n_days=100)
+
+        features = price_momentum_features(
+            bars.copy(), [bars["date"].iloc[99]], min_price=0, min_volume=0
+        )
+
+        assert features["return_12mo"].isna().all()
+        assert features["return_1mo"].notna().all()
+
+    def test_filters_use_latest_bar(self):
+        """Price / volume filters apply to each date's latest bar"""
+        bars = ohlcv_bars()
+        as_of = pd.Timestamp("2022-06-15")
+        latest = bars[bars["date"] <= as_of].groupby("ticker").tail(1).set_index("ticker")
+        cutoff = latest["volume"].median()
+
+        features = price_momentum_features(bars.copy(), [as_of], min_price=0, min_volume=cutoff)
+
+        assert set(features["ticker"]) == set(latest.index[latest["volume"] >= cutoff])
+
+    def test_stale_tickers_excluded(self):
+        """A ticker whose last bar is older than BAR_STALENESS_DAYS is not eligible"""
+        bars = ohlcv_bars()
+        as_of = pd.Timestamp("2022-06-15")
+        stale_cutoff = as_of - pd.Timedelta(days=BAR_STALENESS_DAYS + 5)
+        bars = bars[~((bars["ticker"] == "BBB") & (bars["date"] > stale_cutoff))]
+
+        features = price_momentum_features(bars.copy(), [as_of], min_price=0, min_volume=0)
+
+        assert sorted(features["ticker"]) == ["AAA", "CCC"]
+        assert set(MOMENTUM_FEATURES) <= set(features.columns)
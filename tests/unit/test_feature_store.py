@@ -0,0 +1,93 @@
+"""
+Feature Store Tests
+
+Tests for the rolling-window computation in ml_models.feature_store, which must
+reproduce the window definitions of database/build_clean_ml_view.sql while only
+seeing a trailing slice of history.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml_models.feature_store import STATE_ROWS, WINDOW_FEATURE_COLUMNS, compute_window_features
+from tests.conftest import make_bars
+
+
+def ohlcv_bars(n_days: int = 120, tickers=("AAA", "BBB")) -> pd.DataFrame:
+    return make_bars(
+        n_days, tickers, seed=7, start="2020-01-01", price=20.0, volatility=0.02, ohlcv=True
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.ml
+class TestComputeWindowFeatures:
+    """Tests for compute_window_features"""
+
+    def test_matches_sql_window_definitions(self):
+        """Windows are row-based: 21 rows for SMA20/volatility, 51 rows for SMA50"""
+        bars = ohlcv_bars(tickers=("AAA",))
+        features = compute_window_features(bars)
+        close = bars["close"]
+        i = 80
+
+        expected_sma20 = close.iloc[i - 20 : i + 1].mean()
+        expected_sma50 = close.iloc[i - 50 : i + 1].mean()
+        expected_vol = close.iloc[i - 20 : i + 1].std() / expected_sma20
+        expected_range = (
+            bars["high"].iloc[i - 20 : i + 1].max() - bars["low"].iloc[i - 20 : i + 1].min()
+        ) / close.iloc[i]
+
+        row = features.iloc[i]
+        assert row["price_vs_sma20"] == pytest.approx(close.iloc[i] / expected_sma20 - 1)
+        assert row["price_vs_sma50"] == pytest.approx(close.iloc[i] / expected_sma50 - 1)
+        assert row["volatility_20d"] == pytest.approx(expected_vol)
+        assert row["range_20d"] == pytest.approx(expected_range)
+        assert row["return_5d"] == pytest.approx(close.iloc[i] / close.iloc[i - 5] - 1)
+
+    def test_first_row_has_no_lagged_features(self):
+        """LAG and single-row STDDEV are NULL on a ticker's first bar"""
+        features = compute_window_features(ohlcv_bars(tickers=("AAA",)))
+
+        assert np.isnan(features.loc[0, "return_1d"])
+        assert np.isnan(features.loc[0, "volatility_20d"])
+        assert features.loc[0, "price_vs_sma20"] == pytest.approx(0.0)
+
+    def test_extreme_moves_are_dropped_before_windows(self):
+        """A >200% single-day move removes that bar from the output and the windows"""
+        bars = ohlcv_bars(n_days=30, tickers=("AAA",))
+        spike_date = bars.loc[10, "date"]
+        bars.loc[10, "close"] = bars.loc[9, "close"] * 5
+
+        features = compute_window_features(bars)
+
+        assert spike_date not in set(features["date"])
+        assert len(features) == 29
+        next_row = features[features["date"] == bars.loc[11, "date"]].iloc[0]
+        assert next_row["return_1d"] == pytest.approx(
+            bars.loc[11, "close"] / bars.loc[9, "close"] - 1
+        )
+
+    def test_incremental_slice_matches_full_history(self):
+        """New rows computed from STATE_ROWS of history equal a full recompute"""
+        bars = ohlcv_bars(n_days=200)
+        since = bars["date"].sort_values().unique()[-5]
+
+        full = compute_window_features(bars, since=since)
+
+        history = bars[bars["date"] <= since].groupby("ticker").tail(STATE_ROWS)
+        sliced = pd.concat([history, bars[bars["date"] > since]])
+        incremental = compute_window_features(sliced, since=since)
+
+        assert len(incremental) == 2 * 4
+        pd.testing.assert_frame_equal(
+            full[WINDOW_FEATURE_COLUMNS], incremental[WINDOW_FEATURE_COLUMNS], rtol=1e-9
+        )
+
+    def test_empty_input(self):
+        """No bars yields an empty frame with the batch columns"""
+        features = compute_window_features(ohlcv_bars().iloc[0:0])
+
+        assert features.empty
+        assert set(WINDOW_FEATURE_COLUMNS) <= set(features.columns)
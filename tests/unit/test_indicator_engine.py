@@ -0,0 +1,251 @@
+"""
+Indicator Engine Tests
+
+Tests for the vectorized SMA / EMA / RSI / MACD computation in
+scripts/daily/update_indicators.py against straightforward per-ticker loops,
+for the incremental paths (EMA seeded from a stored value, RSI / MACD from
+a warm-up window) against a full-history recompute, and for the engine's
+nightly compute() path against full-history reference loops. Parity with the
+rows actually stored in the indicator tables is checked against the live
+database by `update_indicators.py --verify-days`, not here.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.daily.update_indicators import (
+    EMA_WINDOWS,
+    RSI_WINDOWS,
+    SEED_LOOKBACK_DAYS,
+    SMA_WINDOWS,
+    WARMUP_BARS,
+    IndicatorEngine,
+    compare_indicator_rows,
+    compute_ema,
+    compute_macd,
+    compute_rsi,
+    compute_sma,
+)
+from tests.conftest import make_bars
+
+
+def ema_loop(values: np.ndarray, alpha: float, start: float = None) -> np.ndarray:
+    out = np.empty(len(values))
+    prev = values[0] if start is None else start
+    for i, x in enumerate(values):
+        prev = x if (i == 0 and start is None) else alpha * x + (1 - alpha) * prev
+        out[i] = prev
+    return out
+
+
+def rsi_loop(close: np.ndarray, window: int) -> np.ndarray:
+    delta = np.diff(close)
+    avg_gain, avg_loss = max(delta[0], 0), max(-delta[0], 0)
+    out = [np.nan, np.nan]
+    for d in delta[1:]:
+        avg_gain = (avg_gain * (window - 1) + max(d, 0)) / window
+        avg_loss = (avg_loss * (window - 1) + max(-d, 0)) / window
+        out.append(100 - 100 / (1 + avg_gain / avg_loss))
+    return np.array(out)
+
+
+def values_for(result: pd.DataFrame, ticker: str, window: int) -> pd.Series:
+    rows = result[(result["ticker"] == ticker) & (result["window_size"] == window)]
+    return rows.set_index("date")["value"]
+
+
+def reference_rows(bars: pd.DataFrame, indicator: str) -> pd.DataFrame:
+    """
+    Indicator rows in the stored table layout, one series per ticker and window,
+    computed over full history with the per-ticker reference loops above
+    """
+    rows = []
+    for ticker, group in bars.groupby("ticker"):
+        closes = group["close"].to_numpy()
+        days = group["date"].to_numpy()
+        if indicator == "macd":
+            line = ema_loop(closes, 2 / 13) - ema_loop(closes, 2 / 27)
+            signal = ema_loop(line, 2 / 10)
+            series = {None: (line, signal)}
+        elif indicator == "sma":
+            series = {w: pd.Series(closes).rolling(w).mean().to_numpy() for w in SMA_WINDOWS}
+        elif indicator == "ema":
+            series = {w: ema_loop(closes, 2 / (w + 1)) for w in EMA_WINDOWS}
+        else:
+            series = {w: rsi_loop(closes, w) for w in RSI_WINDOWS}
+
+        for window, values in series.items():
+            for i, day in enumerate(days):
+                if indicator == "macd":
+                    rows.append((ticker, day, values[0][i], values[1][i]))
+                elif not np.isnan(values[i]):
+                    rows.append((ticker, day, window, values[i]))
+
+    columns = ["ticker", "date", "window_size", "value"]
+    if indicator == "macd":
+        columns = ["ticker", "date", "macd_value", "signal_value"]
+    stored = pd.DataFrame(rows, columns=columns)
+    stored["date"] = pd.to_datetime(stored["date"])
+    return stored
+
+
+class FixtureIndicatorEngine(IndicatorEngine):
+    """IndicatorEngine reading fixture bars and reference EMA rows instead of the database"""
+
+    def __init__(self, bars: pd.DataFrame, stored_ema: pd.DataFrame):
+        super().__init__()
+        self.bars = bars
+        self.stored_ema = stored_ema
+
+    def load_bars(self, conn, since, through):
+        since, through = pd.Timestamp(since), pd.Timestamp(through)
+        history = self.bars[self.bars["date"] <= since].groupby("ticker").tail(self.warmup_bars)
+        recent = self.bars[(self.bars["date"] > since) & (self.bars["date"] <= through)]
+        return pd.concat([history, recent]).sort_values(["ticker", "date"], ignore_index=True)
+
+    def load_ema_seeds(self, conn, since):
+        since = pd.Timestamp(since)
+        seeds = self.stored_ema[
+            (self.stored_ema["date"] <= since)
+            & (self.stored_ema["date"] >= since - timedelta(days=SEED_LOOKBACK_DAYS))
+        ]
+        return seeds.sort_values("date").groupby(["ticker", "window_size"]).tail(1)
+
+
+@pytest.mark.unit
+class TestIndicatorFormulas:
+    """Vectorized indicators match per-ticker reference loops"""
+
+    def test_sma_matches_rolling_mean(self):
+        """SMA-20 equals the mean of the last 20 closes and starts at bar 20"""
+        bars = make_bars()
+        sma = values_for(compute_sma(bars, [20]), "BBB", 20)
+        closes = bars[bars["ticker"] == "BBB"]["close"].to_numpy()
+
+        assert len(sma) == len(closes) - 19
+        assert sma.iloc[0] == pytest.approx(closes[:20].mean())
+        assert sma.iloc[-1] == pytest.approx(closes[-20:].mean())
+
+    def test_ema_matches_recursion(self):
+        """EMA follows y_t = a*x_t + (1-a)*y_(t-1) with a = 2/(n+1)"""
+        bars = make_bars()
+        ema = values_for(compute_ema(bars, [26]), "CCC", 26)
+        closes = bars[bars["ticker"] == "CCC"]["close"].to_numpy()
+
+        expected = ema_loop(closes, 2 / 27)[25:]
+        np.testing.assert_allclose(ema.to_numpy(), expected, rtol=1e-12)
+
+    def test_rsi_matches_wilder_loop(self):
+        """RSI uses Wilder smoothing of gains and losses"""
+        bars = make_bars()
+        rsi = values_for(compute_rsi(bars, [14]), "AAA", 14)
+        closes = bars[bars["ticker"] == "AAA"]["close"].to_numpy()
+
+        expected = rsi_loop(closes, 14)
+        np.testing.assert_allclose(rsi.iloc[-50:].to_numpy(), expected[-50:], rtol=1e-10)
+        assert ((rsi >= 0) & (rsi <= 100)).all()
+
+    def test_macd_line_signal_histogram(self):
+        """MACD = EMA12 - EMA26, signal = EMA9(MACD), histogram = MACD - signal"""
+        bars = make_bars()
+        macd = compute_macd(bars)
+        closes = bars[bars["ticker"] == "AAA"]["close"].to_numpy()
+
+        line = ema_loop(closes, 2 / 13) - ema_loop(closes, 2 / 27)
+        signal = ema_loop(line, 2 / 10)
+        result = macd[macd["ticker"] == "AAA"]
+
+        assert len(result) == len(closes) - 33
+        np.testing.assert_allclose(result["macd_value"], line[33:], rtol=1e-10)
+        np.testing.assert_allclose(result["signal_value"], signal[33:], rtol=1e-10)
+        np.testing.assert_allclose(
+            result["histogram_value"], line[33:] - signal[33:], rtol=1e-9, atol=1e-12
+        )
+
+
+@pytest.mark.unit
+class TestIncrementalParity:
+    """Incremental computation agrees with a full-history recompute"""
+
+    def test_seeded_ema_continues_stored_value(self):
+        """Seeding from the stored EMA reproduces the full-history values exactly"""
+        bars = make_bars()
+        full = compute_ema(bars, [200])
+        cutoff = bars["date"].unique()[-10]
+
+        seeds = full[full["date"] == cutoff].assign(window_size=200)
+        recent = bars[bars["date"] > cutoff]
+        incremental = compute_ema(recent, [200], seeds=seeds)
+
+        for ticker in ("AAA", "BBB", "CCC"):
+            expected = values_for(full, ticker, 200)
+            got = values_for(incremental, ticker, 200)
+            assert len(got) == 9
+            np.testing.assert_allclose(got.to_numpy(), expected.loc[got.index].to_numpy())
+
+    def test_unseeded_ticker_computed_alongside_seeded(self):
+        """A ticker without a seed is computed from its own bars"""
+        bars = make_bars()
+        full = compute_ema(bars, [12])
+        cutoff = bars["date"].unique()[-30]
+        seeds = full[(full["date"] == cutoff) & (full["ticker"] != "BBB")]
+
+        result = compute_ema(bars[(bars["date"] > cutoff) | (bars["ticker"] == "BBB")], [12], seeds)
+
+        assert len(values_for(result, "AAA", 12)) == 29
+        pd.testing.assert_series_equal(values_for(result, "BBB", 12), values_for(full, "BBB", 12))
+
+    def test_warmup_window_converges(self):
+        """RSI and MACD from WARMUP_BARS of history match the full-history values"""
+        bars = make_bars(n_days=900)
+        cutoff = bars["date"].unique()[-5]
+        window = bars.groupby("ticker").tail(WARMUP_BARS + 4)
+
+        full_rsi = compute_rsi(bars, [21])
+        warm_rsi = compute_rsi(window, [21])
+        full_macd = compute_macd(bars).set_index(["ticker", "date"])
+        warm_macd = compute_macd(window).set_index(["ticker", "date"])
+
+        for frame in (full_rsi, warm_rsi):
+            frame.drop(frame[frame["date"] <= cutoff].index, inplace=True)
+        np.testing.assert_allclose(
+            warm_rsi["value"].to_numpy(), full_rsi["value"].to_numpy(), atol=1e-3
+        )
+        recent = warm_macd.index.get_level_values("date") > cutoff
+        np.testing.assert_allclose(
+            warm_macd[recent]["macd_value"].to_numpy(),
+            full_macd.loc[warm_macd[recent].index]["macd_value"].to_numpy(),
+            atol=1e-4,
+        )
+
+
+@pytest.mark.unit
+class TestEngineCompute:
+    """IndicatorEngine.compute over a 30-day range agrees with full-history reference loops"""
+
+    @pytest.mark.parametrize("indicator", ["sma", "ema", "rsi", "macd"])
+    def test_incremental_compute_matches_full_history_reference(self, indicator):
+        """Warm-up and EMA-seeded rows for the last 30 days match the reference, window by window"""
+        bars = make_bars(n_days=600)
+        stored = {name: reference_rows(bars, name) for name in ("ema", indicator)}
+        through = bars["date"].max().date()
+        since = through - timedelta(days=30)
+        engine = FixtureIndicatorEngine(bars, stored["ema"])
+
+        computed = engine.compute(None, indicator, since, through)
+        expected = stored[indicator][
+            (stored[indicator]["date"] > pd.Timestamp(since))
+            & (stored[indicator]["date"] <= pd.Timestamp(through))
+        ]
+        summaries = compare_indicator_rows(indicator, computed, expected)
+
+        assert len(computed) == len(expected) > 0
+        assert sum(summary["rows"] for summary in summaries) == len(expected) * (
+            2 if indicator == "macd" else 1
+        )
+        for summary in summaries:
+            assert summary["within_1pct"] == 1.0, summary
+            assert summary["max_abs_diff"] < 1e-3, summary
@@ -0,0 +1,125 @@
+"""
+Market Data Context Tests
+
+Tests for backtesting/market_data.py: preloaded close lookups, on-demand
+loading of unseen tickers, and regimes from the precomputed rolling SPY series
+matching the per-rebalance trailing-200-row computation they replace.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting.market_data import MarketDataContext, classify_regime, regime_indicators
+from tests.conftest import make_bars
+
+
+def make_spy(n_days: int = 600, seed: int = 3) -> pd.DataFrame:
+    """SPY closes with a rally, a selloff and a volatile stretch"""
+    rng = np.random.default_rng(seed)
+    drift = np.concatenate([np.full(250, 0.001), np.full(200, -0.0015), np.zeros(n_days - 450)])
+    scale = np.concatenate([np.full(450, 0.006), np.full(n_days - 450, 0.025)])
+    closes = 300 * np.exp(np.cumsum(drift + rng.normal(0, 1, n_days) * scale))
+    return pd.DataFrame(
+        {"date": pd.bdate_range("2019-01-01", periods=n_days).date, "close": closes}
+    )
+
+
+def close_of(bars: pd.DataFrame, ticker: str, day) -> float:
+    return float(bars.loc[(bars["ticker"] == ticker) & (bars["date"] == day), "close"].iloc[0])
+
+
+@pytest.fixture
+def context(monkeypatch):
+    """Context over the last 100 SPY days (BBB every other day), read_sql served from frames"""
+    spy = make_spy()
+    days = list(spy["date"].iloc[-100:])
+    bars = make_bars(n_days=len(days), start=days[0])
+    bars["date"] = bars["date"].dt.date
+    bars = bars[(bars["ticker"] != "BBB") | bars["date"].isin(days[::2])].reset_index(drop=True)
+    calls = []
+
+    def read_sql(query, conn, params=None):
+        calls.append(params)
+        if "etf_bars" in query:
+            return spy[spy["date"] <= params[0]].reset_index(drop=True)
+        return bars[bars["ticker"].isin(params[0])].reset_index(drop=True)
+
+    monkeypatch.setattr(pd, "read_sql", read_sql)
+    ctx = MarketDataContext(conn=None, trading_days=days, tickers=["AAA", "BBB"])
+    ctx.calls = calls
+    ctx.spy = spy
+    ctx.bars = bars
+    return ctx
+
+
+@pytest.mark.unit
+class TestPriceLookups:
+    """Tests for MarketDataContext.get_prices"""
+
+    def test_preload_is_two_queries(self, context):
+        """Universe closes and SPY are loaded with one query each"""
+        assert context.queries == 2
+        assert context.tickers == ["AAA", "BBB"]
+        assert context.closes.shape == (100, 2)
+
+    def test_closes_and_missing_bars(self, context):
+        """Tickers without a bar that day are omitted, as with the per-day query"""
+        day, next_day = context.days[1].date(), context.days[2].date()
+        bars = context.bars
+
+        assert context.get_prices(day, ["AAA", "BBB"]) == {"AAA": close_of(bars, "AAA", day)}
+        assert context.get_prices(next_day, ["BBB"]) == {"BBB": close_of(bars, "BBB", next_day)}
+        assert context.queries == 2
+
+    def test_unseen_tickers_loaded_once(self, context):
+        """A ticker outside the preloaded universe costs one query for the whole period"""
+        day, later_day = context.days[0].date(), context.days[50].date()
+        first = context.get_prices(day, ["CCC", "AAA"])
+        later = context.get_prices(later_day, ["CCC"])
+
+        bars = context.bars
+        assert first == {"CCC": close_of(bars, "CCC", day), "AAA": close_of(bars, "AAA", day)}
+        assert later == {"CCC": close_of(bars, "CCC", later_day)}
+        assert context.queries == 3
+        assert context.calls[-1][0] == ["CCC"]
+
+    def test_date_outside_calendar(self, context):
+        """Dates that are not trading days have no prices"""
+        assert context.get_prices(pd.Timestamp("2000-01-03").date(), ["AAA"]) == {}
+
+
+@pytest.mark.unit
+class TestRegime:
+    """Tests for the precomputed SPY regime series"""
+
+    def test_matches_trailing_window(self, context):
+        """Every day's regime equals the one computed from the trailing 200 rows"""
+        spy = context.spy
+        for i in range(len(spy)):
+            trailing = spy.iloc[max(0, i - 199) : i + 1]
+            regime, vol = context.regime(spy["date"].iloc[i])
+            if len(trailing) < 50:
+                assert regime is None
+                continue
+            latest = regime_indicators(trailing).iloc[-1]
+            expected = classify_regime(
+                latest["close"], latest["sma_50"], latest["sma_200"], latest["volatility_20d"]
+            )
+            assert regime == expected
+            np.testing.assert_allclose(vol, latest["volatility_20d"], rtol=1e-9)
+
+    def test_as_of_previous_bar(self, context):
+        """A date between SPY bars uses the latest bar before it"""
+        dates = pd.to_datetime(context.spy["date"])
+        friday = dates[(dates.dt.dayofweek == 4) & (dates.index > 300)].iloc[0]
+        saturday = (friday + pd.Timedelta(days=1)).date()
+
+        assert context.regime(saturday) == context.regime(friday.date())
+
+    def test_classify_regime(self):
+        """Trend from close/SMA ordering, volatility bucketed with NaN as medium"""
+        assert classify_regime(110, 105, 100, 0.10) == "bull_low_vol"
+        assert classify_regime(90, 95, 100, 0.30) == "bear_extreme_vol"
+        assert classify_regime(100, 105, np.nan, np.nan) == "sideways_medium_vol"
+        assert classify_regime(110, 105, 100, 0.20) == "bull_high_vol"
@@ -0,0 +1,110 @@
+"""
+Model Registry Tests
+
+Tests for portfolio.model_registry.ModelRegistry: shared loading, mtime-based
+hot reload, LRU eviction and counters.
+"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+import xgboost as xgb
+
+from portfolio.model_registry import ModelRegistry
+
+
+class CountingLoader:
+    """Loader that records how often each path was loaded"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, path):
+        self.calls.append(path)
+        return {"path": str(path), "version": len(self.calls)}
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    path = tmp_path / "growth_midcap" / "model.json"
+    path.parent.mkdir()
+    path.write_text("{}")
+    return path
+
+
+@pytest.mark.unit
+@pytest.mark.ml
+class TestModelRegistry:
+    """Tests for ModelRegistry caching behaviour"""
+
+    def test_second_lookup_is_a_hit(self, model_file):
+        """Model is loaded once and then served from memory"""
+        registry, loader = ModelRegistry(), CountingLoader()
+
+        first = registry.get("xgboost", str(model_file), loader)
+        second = registry.get("xgboost", str(model_file), loader)
+
+        assert first is second
+        assert len(loader.calls) == 1
+        stats = registry.stats()
+        assert (stats["loads"], stats["hits"], stats["misses"]) == (1, 1, 1)
+
+    def test_changed_mtime_triggers_reload(self, model_file):
+        """Touching the model file swaps in a freshly loaded model"""
+        registry, loader = ModelRegistry(), CountingLoader()
+        first = registry.get("xgboost", str(model_file), loader)
+
+        mtime = model_file.stat().st_mtime
+        os.utime(model_file, (mtime + 10, mtime + 10))
+        second = registry.get("xgboost", str(model_file), loader)
+
+        assert second["version"] == first["version"] + 1
+        assert registry.stats()["reloads"] == 1
+
+    def test_sidecar_change_triggers_reload(self, model_file):
+        """Watched sidecar files (e.g. feature_names.json) also invalidate the entry"""
+        registry, loader = ModelRegistry(), CountingLoader()
+        registry.get("xgboost", str(model_file), loader, watch=["feature_names.json"])
+
+        (model_file.parent / "feature_names.json").write_text("[]")
+        registry.get("xgboost", str(model_file), loader, watch=["feature_names.json"])
+
+        assert len(loader.calls) == 2
+
+    def test_lru_eviction(self, tmp_path):
+        """Least recently used model is evicted beyond max_entries"""
+        registry, loader = ModelRegistry(max_entries=2), CountingLoader()
+        paths = []
+        for name in ["a", "b", "c"]:
+            path = tmp_path / f"{name}.json"
+            path.write_text("{}")
+            paths.append(str(path))
+
+        registry.get("ppo", paths[0], loader)
+        registry.get("ppo", paths[1], loader)
+        registry.get("ppo", paths[0], loader)  # a is now most recent
+        registry.get("ppo", paths[2], loader)  # evicts b
+
+        resident = {m["path"] for m in registry.stats()["models"]}
+        assert resident == {str(tmp_path.resolve() / "a.json"), str(tmp_path.resolve() / "c.json")}
+        assert registry.stats()["evictions"] == 1
+
+    def test_get_xgboost_loads_bundle(self, tmp_path):
+        """XGBoost bundle includes the model, feature names and metadata"""
+        model_dir = tmp_path / "value_largecap"
+        model_dir.mkdir()
+        model = xgb.XGBRegressor(n_estimators=2, max_depth=2)
+        model.fit(np.random.rand(20, 3), np.random.rand(20))
+        model.save_model(str(model_dir / "model.json"))
+        (model_dir / "feature_names.json").write_text(json.dumps(["f1", "f2", "f3"]))
+        (model_dir / "metadata.json").write_text(json.dumps({"strategy": "value"}))
+
+        registry = ModelRegistry()
+        bundle = registry.get_xgboost(str(model_dir / "model.json"))
+
+        assert bundle.feature_names == ["f1", "f2", "f3"]
+        assert bundle.metadata == {"strategy": "value"}
+        assert bundle.model.predict(np.random.rand(4, 3)).shape == (4,)
+        assert registry.get_xgboost(str(model_dir / "model.json")) is bundle
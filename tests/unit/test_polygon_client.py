@@ -0,0 +1,190 @@
+"""
+Polygon Client Tests
+
+Tests for utils.polygon_client against a local stub HTTP server: retries,
+404 handling, pagination, bounded concurrency, rate limiting and connection reuse.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+
+from utils.polygon_client import PolygonClient, TokenBucket, fetch_all
+
+
+class StubPolygon(ThreadingHTTPServer):
+    """Stub server: routes are keyed by path, responses are queued per path"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.lock = threading.Lock()
+        self.responses = {}
+        self.requests = []
+        self.delay = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.client_ports = set()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def queue(self, path: str, *responses):
+        self.responses.setdefault(path, []).extend(responses)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        parsed = urlparse(self.path)
+        with server.lock:
+            server.requests.append((parsed.path, parse_qs(parsed.query)))
+            server.client_ports.add(self.client_address[1])
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            queued = server.responses.get(parsed.path, [])
+            status, body = queued.pop(0) if len(queued) > 1 else (queued or [(200, {})])[0]
+
+        time.sleep(server.delay)
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+        with server.lock:
+            server.in_flight -= 1
+
+
+@pytest.fixture
+def stub():
+    server = StubPolygon()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def run_client(coro_fn, **kwargs):
+    async def _run():
+        async with PolygonClient(api_key="test-key", backoff=0.01, **kwargs) as client:
+            return await coro_fn(client)
+
+    return asyncio.run(_run())
+
+
+@pytest.mark.unit
+class TestPolygonClient:
+    """Tests for PolygonClient request handling"""
+
+    def test_retries_transient_errors(self, stub):
+        """429 and 503 responses are retried until a 200 arrives"""
+        stub.queue("/bars", (429, {}), (503, {}), (200, {"status": "OK", "results": [1]}))
+
+        data = run_client(lambda c: c.get_json(f"{stub.base_url}/bars"))
+
+        assert data["results"] == [1]
+        assert len(stub.requests) == 3
+
+    def test_gives_up_after_max_retries(self, stub):
+        """A persistent 5xx raises once retries are exhausted"""
+        stub.queue("/bars", (500, {}))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            run_client(lambda c: c.get_json(f"{stub.base_url}/bars"), max_retries=2)
+        assert len(stub.requests) == 3
+
+    def test_not_found_returns_none(self, stub):
+        """404 means no data and is not retried"""
+        stub.queue("/missing", (404, {"status": "NOT_FOUND"}))
+
+        assert run_client(lambda c: c.get_json(f"{stub.base_url}/missing")) is None
+        assert len(stub.requests) == 1
+
+    def test_pagination_follows_next_url(self, stub):
+        """next_url pages are fetched with the api key re-attached"""
+        stub.queue(
+            "/page1",
+            (200, {"status": "OK", "results": [1, 2], "next_url": f"{stub.base_url}/page2?c=x"}),
+        )
+        stub.queue("/page2", (200, {"status": "OK", "results": [3]}))
+
+        results = run_client(lambda c: c.get_paginated(f"{stub.base_url}/page1", {"limit": 2}))
+
+        assert results == [1, 2, 3]
+        page2_query = stub.requests[1][1]
+        assert page2_query["apiKey"] == ["test-key"]
+        assert page2_query["c"] == ["x"]
+
+
+@pytest.mark.unit
+class TestFetchAll:
+    """Tests for concurrent fetching"""
+
+    def test_bounded_concurrency_and_order(self, stub):
+        """Never more than max_concurrency requests in flight; results keep input order"""
+        stub.delay = 0.05
+
+        async def fetch(client, i):
+            await client.get_json(f"{stub.base_url}/item", {"i": i})
+            return i * 10
+
+        results = fetch_all(list(range(20)), fetch, api_key="k", max_concurrency=4)
+
+        assert results == [i * 10 for i in range(20)]
+        assert 1 < stub.max_in_flight <= 4
+
+    def test_connections_are_reused(self, stub):
+        """Keep-alive pool opens at most max_concurrency connections"""
+
+        async def fetch(client, i):
+            return await client.get_json(f"{stub.base_url}/item")
+
+        fetch_all(list(range(30)), fetch, api_key="k", max_concurrency=2)
+
+        assert len(stub.requests) == 30
+        assert len(stub.client_ports) <= 2
+
+    def test_failed_items_return_none(self, stub):
+        """An exception in one fetch does not abort the others"""
+
+        async def fetch(client, i):
+            if i == 1:
+                raise ValueError("bad item")
+            return i
+
+        assert fetch_all([0, 1, 2], fetch, api_key="k") == [0, None, 2]
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    """Tests for the rate limiter"""
+
+    def test_rate_is_enforced(self):
+        """After the burst is spent, tokens arrive at `rate` per second"""
+
+        async def take(n):
+            bucket = TokenBucket(rate=50, capacity=1)
+            start = time.monotonic()
+            for _ in range(n):
+                await bucket.acquire()
+            return time.monotonic() - start
+
+        elapsed = asyncio.run(take(11))
+
+        assert elapsed >= 0.18
@@ -0,0 +1,183 @@
+"""
+Prediction Store Tests
+
+Tests for portfolio/prediction_store.py and the read-through
+MLPortfolioManager.get_predictions(): model identity, whole-date regrouping of
+streamed chunks, and scoring each (model version, date) only once, until the
+date's features are rewritten (against an in-memory store, no database
+needed).
+"""
+
+import json
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+
+from portfolio.ml_portfolio_manager import MLPortfolioManager
+from portfolio.prediction_store import complete_dates, model_identity
+from tests.conftest import make_features
+
+FEATURE_DATE = date(2024, 3, 28)
+FEATURE_COLUMNS = ["close", "momentum", "pe_ratio"]
+
+
+class MemoryStore:
+    """PredictionStore stand-in holding scores in a dict"""
+
+    engine = None
+
+    def __init__(self):
+        self.scores = {}
+        self.coverage = {}
+        self.writes = 0
+        self.reads = []
+        # Feature watermark per date; a feature store rewrite bumps it
+        self.watermarks = {FEATURE_DATE: (30, pd.Timestamp("2024-03-28 18:00"))}
+
+    def feature_date(self, as_of_date=None):
+        return FEATURE_DATE if as_of_date is None or as_of_date >= FEATURE_DATE else None
+
+    def feature_watermarks(self, start_date=None, end_date=None):
+        return pd.DataFrame(
+            [(d, n, updated_at) for d, (n, updated_at) in self.watermarks.items()],
+            columns=["date", "feature_rows", "features_updated_at"],
+        )
+
+    def has_date(self, model_id, model_version, as_of):
+        covered = self.coverage.get((model_id, model_version, as_of))
+        return covered is not None and covered == self.watermarks.get(as_of)
+
+    def write(self, model_id, model_version, predictions, watermarks):
+        self.writes += 1
+        marks = watermarks.set_index("date")
+        for d, frame in predictions.groupby("date"):
+            key = (model_id, model_version, pd.Timestamp(d).date())
+            self.scores[key] = frame
+            self.coverage[key] = tuple(marks.loc[key[2], ["feature_rows", "features_updated_at"]])
+        return len(predictions)
+
+    def read(self, model_id, model_version, as_of, tickers=None, **filters):
+        self.reads.append(filters)
+        frame = self.scores[(model_id, model_version, as_of)]
+        if tickers:
+            frame = frame[frame["ticker"].isin(tickers)]
+        return frame.sort_values("ticker").reset_index(drop=True)
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    """Tiny XGBoost model with the sidecar files the registry expects"""
+    features = make_features(FEATURE_DATE, tickers=200, seed=1).fillna(0)
+    model = xgb.XGBRegressor(n_estimators=5, max_depth=2)
+    model.fit(features[FEATURE_COLUMNS], features["target_return"])
+
+    path = tmp_path / "growth_midcap" / "model.json"
+    path.parent.mkdir()
+    model.save_model(str(path))
+    (path.parent / "feature_names.json").write_text(json.dumps(FEATURE_COLUMNS))
+    return path
+
+
+@pytest.fixture
+def features(monkeypatch):
+    """Serve the per-date feature load from a frame"""
+    frame = make_features(FEATURE_DATE, tickers=30, seed=5)
+    monkeypatch.setattr(pd, "read_sql", lambda query, conn, params=None: frame.copy())
+    return frame
+
+
+@pytest.mark.unit
+@pytest.mark.ml
+class TestModelIdentity:
+    """Tests for model_identity"""
+
+    def test_id_is_model_directory(self, model_path):
+        """The model id is the directory name; the version is stable"""
+        model_id, version = model_identity(str(model_path))
+
+        assert model_id == "growth_midcap"
+        assert model_identity(str(model_path))[1] == version
+
+    def test_retrained_model_gets_new_version(self, model_path):
+        """Changing the model files changes the version"""
+        _, before = model_identity(str(model_path))
+        (model_path.parent / "feature_names.json").write_text(json.dumps(FEATURE_COLUMNS[::-1]))
+
+        assert model_identity(str(model_path))[1] != before
+
+
+@pytest.mark.unit
+class TestCompleteDates:
+    """Tests for regrouping streamed chunks into whole dates"""
+
+    def test_dates_split_across_chunks_are_rejoined(self):
+        """A date spanning a chunk boundary is yielded once, whole"""
+        rows = pd.DataFrame({"date": [1, 1, 2, 2, 2, 3, 3, 4], "ticker": list("abcdefgh")})
+        chunks = [rows.iloc[0:3], rows.iloc[3:4], rows.iloc[4:7], rows.iloc[7:8]]
+
+        frames = list(complete_dates(chunks))
+
+        assert [sorted(set(f["date"])) for f in frames] == [[1], [2], [3], [4]]
+        assert pd.concat(frames)["ticker"].tolist() == list("abcdefgh")
+
+    def test_empty_stream(self):
+        assert list(complete_dates([])) == []
+
+
+@pytest.mark.unit
+@pytest.mark.ml
+class TestReadThrough:
+    """Tests for MLPortfolioManager.get_predictions"""
+
+    def test_matches_direct_scoring(self, model_path, features):
+        """Stored predictions rank exactly like generate_predictions on the features"""
+        manager = MLPortfolioManager(model_path=str(model_path), prediction_store=MemoryStore())
+
+        cached = manager.get_predictions(as_of_date=date(2024, 3, 29))
+        direct = manager.generate_predictions(features)
+
+        assert cached["ticker"].tolist() == direct["ticker"].tolist()
+        np.testing.assert_allclose(cached["predicted_return"], direct["predicted_return"])
+        assert cached["rank"].tolist() == direct["rank"].tolist()
+
+    def test_date_scored_once(self, model_path, features):
+        """Later calls, with any filter, reuse the stored scores"""
+        store = MemoryStore()
+        manager = MLPortfolioManager(model_path=str(model_path), prediction_store=store)
+
+        manager.get_predictions(as_of_date=date(2024, 3, 29))
+        subset = manager.get_predictions(as_of_date=date(2024, 3, 30), tickers=["T001", "T002"])
+        again = MLPortfolioManager(model_path=str(model_path), prediction_store=store)
+        again.get_predictions(min_market_cap=10e9)
+
+        assert store.writes == 1
+        assert sorted(subset["ticker"]) == ["T001", "T002"]
+        assert store.reads[-1]["min_market_cap"] == 10e9
+
+    def test_rewritten_date_is_rescored(self, model_path, features):
+        """A feature store rewrite of the date (new watermark) invalidates its scores"""
+        store = MemoryStore()
+        manager = MLPortfolioManager(model_path=str(model_path), prediction_store=store)
+
+        manager.get_predictions()
+        manager.get_predictions()
+        store.watermarks[FEATURE_DATE] = (30, pd.Timestamp("2024-03-29 06:00"))
+        manager.get_predictions()
+        manager.get_predictions()
+
+        assert store.writes == 2
+        assert store.coverage[("growth_midcap", manager.model_version, FEATURE_DATE)] == (
+            store.watermarks[FEATURE_DATE]
+        )
+
+    def test_no_features_before_date(self, model_path, features):
+        """Dates before any features return an empty frame"""
+        manager = MLPortfolioManager(model_path=str(model_path), prediction_store=MemoryStore())
+
+        result = manager.get_predictions(as_of_date=date(2020, 1, 2))
+
+        assert result.empty
+        assert "predicted_return" in result.columns
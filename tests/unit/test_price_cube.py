@@ -0,0 +1,77 @@
+"""
+Price Cube Tests
+
+Tests for rl_trading.price_cube.PriceCube, the dense date x ticker close array
+behind HybridPortfolioEnv price lookups.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rl_trading.price_cube import PriceCube
+
+
+@pytest.fixture
+def price_frame() -> pd.DataFrame:
+    """Long-format closes with a missing bar for MSFT on the second day"""
+    return pd.DataFrame(
+        {
+            "ticker": ["AAPL", "MSFT", "AAPL", "GOOGL", "MSFT"],
+            "date": pd.to_datetime(
+                ["2024-01-02", "2024-01-02", "2024-01-03", "2024-01-03", "2024-01-04"]
+            ),
+            "close": [185.0, 370.0, 184.0, 139.0, 368.0],
+        }
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.rl
+class TestPriceCube:
+    """Tests for PriceCube construction and lookups"""
+
+    def test_from_frame_shape_and_order(self, price_frame):
+        """Rows are sorted dates, columns keep first-appearance ticker order"""
+        cube = PriceCube.from_frame(price_frame)
+
+        assert cube.closes.dtype == np.float32
+        assert cube.closes.shape == (3, 3)
+        assert list(cube.tickers) == ["AAPL", "MSFT", "GOOGL"]
+        assert cube.dates[0] == pd.Timestamp("2024-01-02")
+
+    def test_missing_bars_are_masked(self, price_frame):
+        """Cells without a bar are NaN and masked out"""
+        cube = PriceCube.from_frame(price_frame)
+        row = cube.date_index[pd.Timestamp("2024-01-03")]
+        col = cube.ticker_index["MSFT"]
+
+        assert np.isnan(cube.closes[row, col])
+        assert not cube.mask[row, col]
+        assert cube.price(row, "MSFT") == 0.0
+
+    def test_prices_vector_lookup(self, price_frame):
+        """Batch lookup returns 0.0 for missing bars and unknown tickers"""
+        cube = PriceCube.from_frame(price_frame)
+        row = cube.date_index[pd.Timestamp("2024-01-03")]
+
+        prices = cube.prices(row, ["GOOGL", "MSFT", "TSLA", "AAPL"])
+
+        np.testing.assert_allclose(prices, [139.0, 0.0, 0.0, 184.0])
+
+    def test_market_proxy_matches_groupby_mean(self, price_frame):
+        """Market proxy equals the per-date mean of the first n tickers"""
+        cube = PriceCube.from_frame(price_frame)
+        expected = (
+            price_frame[price_frame["ticker"].isin(["AAPL", "MSFT"])]
+            .groupby("date")["close"]
+            .mean()
+            .reindex(cube.dates)
+        )
+
+        np.testing.assert_allclose(cube.market_proxy(n_tickers=2), expected.values)
+
+    def test_shape_mismatch_raises(self):
+        """Constructor rejects arrays that do not match the labels"""
+        with pytest.raises(ValueError):
+            PriceCube(pd.DatetimeIndex(["2024-01-02"]), np.array(["AAPL"]), np.zeros((2, 1)))
@@ -0,0 +1,194 @@
+"""
+Risk Analytics Tests
+
+Tests for backend/api/services/risk_analytics.py and returns_matrix.py: the
+vectorized metrics against the per-series pandas formulas, batch vs single
+portfolio scoring, and the returns cache's incremental loading (against an
+in-memory daily_bars, no database needed).
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.api.services.returns_matrix import ReturnsMatrix
+from backend.api.services.risk_analytics import RiskAnalytics
+from tests.conftest import make_bars
+
+TICKERS = ["AAPL", "MSFT", "NVDA", "XOM", "SPY"]
+
+
+class FakeReturnsMatrix(ReturnsMatrix):
+    """ReturnsMatrix over an in-memory daily_bars frame"""
+
+    def __init__(self, bars):
+        super().__init__()
+        self.bars = bars
+
+    def load_closes(self, tickers, start, end=None):
+        self.queries += 1
+        rows = self.bars[self.bars["ticker"].isin(tickers) & (self.bars["date"] >= start)]
+        if end is not None:
+            rows = rows[rows["date"] <= end]
+        return rows.reset_index(drop=True)
+
+
+def positions(*holdings):
+    return [
+        {"symbol": symbol, "instrument_type": "EQUITY", "current_value": value}
+        for symbol, value in holdings
+    ]
+
+
+def reference_metrics(bars, holdings, lookback_days=252):
+    """The per-series pandas calculation the service used before vectorizing"""
+    closes = bars.pivot(index="date", columns="ticker", values="close")
+    returns = closes / closes.ffill().shift(1) - 1
+    returns = returns.where(closes.notna())
+    start = date.today() - timedelta(days=lookback_days + 30)
+    returns = returns[returns.index >= start]
+
+    total = sum(value for _, value in holdings)
+    weights = {symbol: value / total for symbol, value in holdings}
+    held = [s for s in sorted(weights) if s in returns.columns and returns[s].notna().any()]
+    returns_df = returns[held].dropna()
+    market = returns["SPY"].dropna()
+    port = sum(returns_df[s] * weights[s] for s in held)
+
+    annual = (1 + port.mean()) ** 252 - 1
+    vol = port.std() * np.sqrt(252)
+    downside = port[port < 0].std() * np.sqrt(252)
+    cumulative = (1 + port).cumprod()
+    aligned = pd.DataFrame({"p": port, "m": market}).dropna()
+    var_95 = np.percentile(port, 5)
+    corr = returns_df.corr()
+    mask = np.triu(np.ones_like(corr, dtype=bool), k=1)
+    herfindahl = sum(w**2 for w in weights.values())
+    score = (1 - abs(corr.where(mask).stack().mean())) * 50 + (1 - herfindahl) * 50
+    return {
+        "volatility": vol,
+        "sharpe_ratio": (annual - 0.045) / vol,
+        "sortino_ratio": (annual - 0.045) / downside,
+        "max_drawdown": (
+            (cumulative - cumulative.expanding().max()) / cumulative.expanding().max()
+        ).min(),
+        "beta": aligned["p"].cov(aligned["m"]) / aligned["m"].var(),
+        "var_95": var_95,
+        "var_99": np.percentile(port, 1),
+        "cvar_95": port[port <= var_95].mean(),
+        "correlation_matrix": corr.to_dict(),
+        "diversification_score": max(0, min(100, score)),
+    }
+
+
+@pytest.fixture
+def bars():
+    """Random-walk closes ending yesterday; XOM misses a few bars"""
+    bars = make_bars(
+        n_days=400,
+        tickers=TICKERS,
+        seed=7,
+        end=date.today() - timedelta(days=1),
+        price=100.0,
+        drift=0.0004,
+        volatility=[0.01 + 0.004 * i for i in range(len(TICKERS))],
+    )
+    bars["date"] = bars["date"].dt.date
+    xom = bars.index[bars["ticker"] == "XOM"]
+    return bars.drop(index=xom[[-30, -90, -91]]).reset_index(drop=True)
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestRiskMetrics:
+    """Tests for the vectorized metrics"""
+
+    def test_matches_pandas_reference(self, bars):
+        """Every metric matches the per-series pandas formulas"""
+        holdings = [("AAPL", 5000.0), ("MSFT", 3000.0), ("XOM", 2000.0), ("GONE", 500.0)]
+        service = RiskAnalytics(FakeReturnsMatrix(bars))
+
+        metrics = service.calculate_portfolio_risk(positions(*holdings))
+        expected = reference_metrics(bars, holdings)
+
+        for name, value in expected.items():
+            if name == "correlation_matrix":
+                assert list(metrics[name]) == list(value)
+                for col in value:
+                    for row in value[col]:
+                        assert metrics[name][col][row] == pytest.approx(value[col][row], rel=1e-4)
+            else:
+                assert metrics[name] == pytest.approx(value, rel=1e-4), name
+        assert metrics["lookback_days"] == 252
+
+    def test_batch_matches_single(self, bars):
+        """Scoring portfolios together gives the same metrics as one at a time"""
+        service = RiskAnalytics(FakeReturnsMatrix(bars))
+        portfolios = {
+            "a": positions(("AAPL", 1.0), ("NVDA", 2.0)),
+            "b": positions(("XOM", 1.0), ("MSFT", 1.0), ("SPY", 1.0)),
+            "c": positions(("MSFT", 10.0)),
+            "empty": [],
+        }
+
+        batch = service.calculate_batch_risk(portfolios)
+
+        assert list(batch) == list(portfolios)
+        assert batch["empty"]["error"] == "Insufficient data for risk analysis"
+        assert batch["c"]["correlation_matrix"] == {}
+        for key, holdings in portfolios.items():
+            single = service.calculate_portfolio_risk(holdings)
+            for name in ("volatility", "sharpe_ratio", "beta", "max_drawdown", "cvar_95"):
+                assert batch[key][name] == pytest.approx(single[name], rel=1e-9)
+
+    def test_no_equities(self, bars):
+        """Portfolios without equity value get the empty metrics"""
+        service = RiskAnalytics(FakeReturnsMatrix(bars))
+        cash_only = [{"symbol": "MMDA", "instrument_type": "CASH", "current_value": 100.0}]
+
+        metrics = service.calculate_portfolio_risk(cash_only)
+
+        assert metrics["beta"] == 1.0
+        assert "error" in metrics
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestReturnsMatrix:
+    """Tests for the shared returns cache"""
+
+    def test_loads_once_and_appends_tickers(self, bars):
+        """Repeat requests hit the cache; unseen tickers cost one query"""
+        matrix = FakeReturnsMatrix(bars)
+        start = date.today() - timedelta(days=200)
+
+        matrix.window(["AAPL"], start)
+        matrix.window(["AAPL"], start + timedelta(days=50))
+        assert matrix.queries == 1
+        assert matrix.values.dtype == np.float32
+        assert "SPY" in matrix.tickers
+
+        dates, returns, market = matrix.window(["NVDA", "AAPL"], start)
+        assert matrix.queries == 2
+        assert returns.shape == (len(dates), 2)
+        assert len(market) == len(dates)
+        assert not np.isnan(returns).any()
+
+    def test_daily_append_matches_reload(self, bars):
+        """A new day's bars are appended in one query, equal to a fresh load"""
+        last_day = bars["date"].max()
+        matrix = FakeReturnsMatrix(bars[bars["date"] < last_day])
+        start = date.today() - timedelta(days=200)
+        matrix.window(["AAPL", "XOM"], start)
+
+        matrix.bars = bars
+        matrix._refreshed = date.today() - timedelta(days=1)
+        dates, returns, _ = matrix.window(["AAPL", "XOM"], start)
+
+        assert matrix.queries == 2
+        assert dates[-1] == np.datetime64(last_day, "D")
+        fresh_dates, fresh, _ = FakeReturnsMatrix(bars).window(["AAPL", "XOM"], start)
+        np.testing.assert_array_equal(dates, fresh_dates)
+        np.testing.assert_allclose(returns, fresh, equal_nan=True)
@@ -0,0 +1,216 @@
+"""
+Schwab API Client Tests
+
+Tests for backend/api/services/schwab_api.py against a local mock Schwab
+server: connection reuse by the pooled client, batching and coalescing of
+concurrent quote lookups, and the quote cache TTL.
+"""
+
+import asyncio
+import socket
+import threading
+import time
+
+import pytest
+import uvicorn
+from fastapi import FastAPI, Request
+
+from backend.api.services import schwab_api
+from backend.api.services.schwab_api import QuoteCoalescer, SchwabAPIClient
+
+
+class MockSchwab:
+    """Minimal Schwab trader API recording each request and client connection"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.quote_calls = []
+        self.connections = set()
+        self.app = FastAPI()
+
+        @self.app.get("/trader/v1/marketdata/quotes")
+        async def quotes(request: Request, symbols: str):
+            self._record(request)
+            self.quote_calls.append(symbols.split(","))
+            await asyncio.sleep(self.delay)
+            return {
+                s: {"symbol": s, "lastPrice": 100.0 + len(s)}
+                for s in symbols.split(",")
+                if s != "NOPE"
+            }
+
+        @self.app.get("/trader/v1/accounts/{account_hash}")
+        async def account(request: Request, account_hash: str):
+            self._record(request)
+            return {"securitiesAccount": {"currentBalances": {"cashBalance": 1000.0}}}
+
+    def _record(self, request):
+        self.connections.add((request.client.host, request.client.port))
+
+
+@pytest.fixture(scope="module")
+def mock_schwab():
+    """MockSchwab served by uvicorn on a free local port"""
+    mock = MockSchwab()
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(mock.app, port=port, log_level="error"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+
+    mock.base_url = f"http://127.0.0.1:{port}/trader/v1"
+    yield mock
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+@pytest.fixture
+def client(mock_schwab):
+    mock_schwab.quote_calls.clear()
+    mock_schwab.connections.clear()
+    yield SchwabAPIClient("token", base_url=mock_schwab.base_url)
+
+
+@pytest.mark.unit
+@pytest.mark.brokerage
+class TestPooledClient:
+    """Tests for the shared HTTP client"""
+
+    async def test_connections_reused(self, client, mock_schwab):
+        """Sequential calls from different client objects share one connection"""
+        for _ in range(5):
+            other = SchwabAPIClient("other-token", base_url=mock_schwab.base_url)
+            balances = await other.get_balances("abc")
+            assert balances["cash"] == 1000.0
+
+        assert len(mock_schwab.connections) == 1
+        assert schwab_api.get_http_client() is schwab_api.get_http_client()
+        await schwab_api.close_http_client()
+
+
+@pytest.mark.unit
+@pytest.mark.brokerage
+class TestQuotes:
+    """Tests for quote batching, coalescing and caching"""
+
+    async def test_concurrent_single_lookups_batched(self, client, mock_schwab):
+        """Concurrent get_quote calls become one multi-symbol request"""
+        symbols = ["AAPL", "MSFT", "NVDA", "AAPL", "NOPE"]
+
+        quotes = await asyncio.gather(*(client.get_quote(s) for s in symbols))
+
+        assert [q.get("symbol") for q in quotes] == ["AAPL", "MSFT", "NVDA", "AAPL", None]
+        assert len(mock_schwab.quote_calls) == 1
+        assert sorted(mock_schwab.quote_calls[0]) == ["AAPL", "MSFT", "NOPE", "NVDA"]
+        await schwab_api.close_http_client()
+
+    async def test_in_flight_request_shared(self, client, mock_schwab):
+        """A lookup for a symbol already being fetched waits for that request"""
+        schwab_api.get_http_client()  # create the session up front: keeps the timing below
+        first = asyncio.ensure_future(client.get_quotes(["AMD", "INTC"]))
+        await asyncio.sleep(0.03)  # batch sent, response pending
+        second = await client.get_quotes(["INTC", "QCOM"])
+
+        assert set(await first) == {"AMD", "INTC"}
+        assert set(second) == {"INTC", "QCOM"}
+        assert sorted(map(sorted, mock_schwab.quote_calls)) == [["AMD", "INTC"], ["QCOM"]]
+        await schwab_api.close_http_client()
+
+    async def test_quote_cache_ttl(self):
+        """Cached quotes are served until they are older than the TTL"""
+        coalescer = QuoteCoalescer(ttl=0.2, window=0)
+        calls = []
+
+        async def fetch(symbols):
+            calls.append(symbols)
+            return {s: {"lastPrice": 1.0} for s in symbols}
+
+        await coalescer.get(["SPY"], fetch)
+        await coalescer.get(["SPY"], fetch)
+        assert len(calls) == 1
+
+        await asyncio.sleep(0.25)
+        await coalescer.get(["SPY"], fetch)
+        assert len(calls) == 2
+        assert coalescer.requests == 2
+
+    async def test_batch_size_and_errors(self):
+        """Large lookups are split into batch_size requests; a failure reaches its caller"""
+        coalescer = QuoteCoalescer(batch_size=2)
+        calls = []
+
+        async def fetch(symbols):
+            calls.append(symbols)
+            raise RuntimeError("Failed to get quotes: 401")
+
+        with pytest.raises(RuntimeError):
+            await coalescer.get(["A", "B", "C"], fetch)
+
+        assert calls == [["A", "B"], ["C"]]
+        assert coalescer._inflight == {}
+
+    async def test_failed_batch_retried_with_own_token(self):
+        """Waiters on another account's failed request retry with their own token"""
+        coalescer = QuoteCoalescer(window=0.02)
+        calls = []
+
+        def fetcher(token):
+            async def fetch(symbols):
+                calls.append((token, sorted(symbols)))
+                await asyncio.sleep(0.01)
+                if token == "expired":
+                    raise RuntimeError("Failed to get quotes: 401")
+                return {s: {"symbol": s} for s in symbols}
+
+            return fetch
+
+        valid = asyncio.ensure_future(coalescer.get(["AAPL", "MSFT"], fetcher("valid")))
+        expired = asyncio.ensure_future(coalescer.get(["MSFT", "NVDA"], fetcher("expired")))
+        results = await asyncio.gather(valid, expired, return_exceptions=True)
+
+        assert set(results[0]) == {"AAPL", "MSFT"}
+        assert isinstance(results[1], RuntimeError)
+        assert calls == [("expired", ["AAPL", "MSFT", "NVDA"]), ("valid", ["AAPL", "MSFT"])]
+        assert coalescer._inflight == {}
+        assert await coalescer.get(["AAPL"], fetcher("expired")) == {"AAPL": {"symbol": "AAPL"}}
+
+    async def test_cancelled_batch_releases_waiters(self):
+        """Cancelling a batch request cancels its waiters and clears it from in-flight"""
+        coalescer = QuoteCoalescer(window=0)
+        started = asyncio.Event()
+
+        async def fetch(symbols):
+            started.set()
+            await asyncio.sleep(10)
+
+        lookup = asyncio.ensure_future(coalescer.get(["SPY", "QQQ"], fetch))
+        await started.wait()
+        for task in list(coalescer._tasks):
+            task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await lookup
+        assert coalescer._inflight == {}
+
+
+@pytest.mark.unit
+@pytest.mark.brokerage
+class TestSessionLifecycle:
+    """Tests for the per-loop session"""
+
+    def test_client_closed_with_its_loop(self, mock_schwab):
+        """Each asyncio.run() gets its own client, closed when that loop shuts down"""
+
+        async def balances():
+            client = SchwabAPIClient("token", base_url=mock_schwab.base_url)
+            await client.get_balances("abc")
+            return schwab_api.get_http_client()
+
+        first = asyncio.run(balances())
+        second = asyncio.run(balances())
+
+        assert second is not first
+        assert first.is_closed and second.is_closed
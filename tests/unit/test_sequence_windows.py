@@ -0,0 +1,109 @@
+"""
+Lazy Sliding-Window Tests
+
+Tests for ml_models/sequence_windows.py against the materializing loop of
+LSTMTrainer.create_sequences / normalize_data: the same windows, targets
+and dates in the same order, and StandardScaler's statistics, without
+building the (n_windows, sequence_length, n_features) array.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+from ml_models.sequence_windows import SequenceWindows
+
+FEATURES = ["close", "volume", "ret_1d", "rsi_14"]
+TARGETS = ["target_5d", "target_20d", "target_63d"]
+
+
+def make_rows(seed=7):
+    """Shuffled rows for tickers of different lengths, some shorter than a window"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for ticker, n_days in (("MSFT", 40), ("AAPL", 25), ("TINY", 8), ("EXACT", 10), ("NVDA", 31)):
+        days = pd.bdate_range("2024-01-01", periods=n_days).date
+        frame = pd.DataFrame(
+            {
+                "ticker": ticker,
+                "date": days,
+                "close": rng.uniform(10, 500, n_days),
+                "volume": rng.uniform(1e5, 1e7, n_days),
+                "ret_1d": rng.normal(0, 0.02, n_days),
+                "rsi_14": np.where(rng.random(n_days) < 0.2, np.nan, rng.uniform(0, 100, n_days)),
+            }
+        )
+        for target in TARGETS:
+            frame[target] = np.where(rng.random(n_days) < 0.1, np.nan, rng.normal(0, 0.05, n_days))
+        frames.append(frame)
+    df = pd.concat(frames, ignore_index=True)
+    return df.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def materialize(df, sequence_length):
+    """LSTMTrainer.create_sequences' loop"""
+    sequences, targets, dates = [], [], []
+    for ticker in df["ticker"].unique():
+        ticker_df = df[df["ticker"] == ticker].sort_values("date")
+        if len(ticker_df) < sequence_length:
+            continue
+        X = np.nan_to_num(ticker_df[FEATURES].values, nan=0.0)
+        y = np.nan_to_num(ticker_df[TARGETS].values, nan=0.0)
+        for i in range(len(X) - sequence_length):
+            sequences.append(X[i : i + sequence_length])
+            targets.append(y[i + sequence_length - 1])
+            dates.append(ticker_df["date"].values[i + sequence_length - 1])
+    return np.array(sequences), np.array(targets), np.array(dates)
+
+
+@pytest.mark.unit
+@pytest.mark.ml
+class TestSequenceWindows:
+    """Tests for the lazy window index and on-the-fly normalization"""
+
+    def test_matches_create_sequences(self):
+        """Every window, target and date equals the materialized one, in order"""
+        df = make_rows()
+        sequences, targets, dates = materialize(df, 10)
+        windows = SequenceWindows(df, FEATURES, TARGETS, 10)
+
+        assert len(windows) == len(sequences) == 30 + 15 + 0 + 0 + 21
+        assert windows.X.dtype == np.float32 and windows.X.flags.c_contiguous
+        assert np.shares_memory(windows.views, windows.X)
+
+        everything = np.arange(len(windows))
+        np.testing.assert_allclose(windows.sequences(everything), sequences, rtol=1e-6)
+        np.testing.assert_allclose(windows.targets(everything), targets, rtol=1e-6)
+        assert list(windows.dates) == list(dates)
+        np.testing.assert_allclose(windows.sequences(17), sequences[17], rtol=1e-6)
+
+    def test_normalization_matches_scaler(self):
+        """Statistics fit on a split equal StandardScaler on the stacked split windows"""
+        df = make_rows()
+        sequences, _, _ = materialize(df, 10)
+        windows = SequenceWindows(df, FEATURES, TARGETS, 10)
+        split = int(len(windows) * 0.8)
+
+        scaler = StandardScaler().fit(sequences[:split].reshape(-1, len(FEATURES)))
+        windows.fit_normalization(np.arange(split))
+
+        np.testing.assert_allclose(windows.mean_, scaler.mean_, rtol=1e-5)
+        np.testing.assert_allclose(windows.scale_, scaler.scale_, rtol=1e-5)
+
+        val = np.arange(split, len(windows))
+        expected = scaler.transform(sequences[split:].reshape(-1, len(FEATURES)))
+        np.testing.assert_allclose(
+            windows.sequences(val).reshape(-1, len(FEATURES)), expected, rtol=1e-4, atol=1e-5
+        )
+
+    def test_reads_do_not_modify_rows(self):
+        """Normalized reads are copies; the row array is never written"""
+        windows = SequenceWindows(make_rows(), FEATURES, TARGETS, 10).fit_normalization()
+        before = windows.X.copy()
+
+        windows.sequences(3)
+        windows.sequences(np.arange(5))
+
+        np.testing.assert_array_equal(windows.X, before)
+        assert len(SequenceWindows(make_rows().head(5), FEATURES, TARGETS, 10)) == 0
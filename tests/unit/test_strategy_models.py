@@ -0,0 +1,111 @@
+"""
+Multi-Model Strategy Training Tests
+
+Tests for ml_models/train_strategy_models.py on synthetic training rows:
+models sharing a universe and parameters are trained once, universes are
+views of one matrix, and every model is saved where its trainer saves it.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+
+from ml_models.train_strategy_models import (
+    STRATEGY_MODELS,
+    MultiModelTrainer,
+    SharedTrainingData,
+    plan_fits,
+)
+
+
+def make_rows(n=3000, seed=11):
+    """Training rows with prices on both sides of the $5 small-cap filter"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "ticker": rng.choice(["AAPL", "MSFT", "TINY", "PENNY"], n),
+            "date": pd.Timestamp("2024-01-01").date(),
+            "close": rng.uniform(0.5, 50, n).astype(np.float32),
+            "return_20d": rng.normal(0, 0.1, n).astype(np.float32),
+            "pe_ratio": np.where(rng.random(n) < 0.3, np.nan, rng.uniform(5, 40, n)).astype(
+                np.float32
+            ),
+        }
+    )
+    df["target_return"] = (0.5 * df["return_20d"] + rng.normal(0, 0.02, n)).astype(np.float32)
+    return df
+
+
+class InMemoryTrainer(MultiModelTrainer):
+    """MultiModelTrainer over a fixed frame instead of the training-data cache"""
+
+    def __init__(self, df, **kwargs):
+        super().__init__(**kwargs)
+        self.df = df
+        self.loads = 0
+
+    def load(self, start_date, end_date):
+        self.loads += 1
+        min_price = min(fit.min_price for fit in self.fits)
+        return SharedTrainingData(self.df[self.df["close"] >= min_price])
+
+
+@pytest.mark.unit
+@pytest.mark.ml
+class TestSharedTraining:
+    """Tests for the shared-load driver"""
+
+    def test_plan_groups_identical_models(self):
+        """Models with the same universe and parameters share one fit"""
+        fits = plan_fits(STRATEGY_MODELS)
+
+        assert len(fits) == 5
+        assert [f.min_price for f in fits] == sorted(f.min_price for f in fits)
+        grouped = {tuple(fit.names) for fit in fits}
+        assert ("growth_midcap", "growth_largecap") in grouped
+        assert ("value_midcap", "value_largecap") in grouped
+        assert sum(len(fit.names) for fit in fits) == len(STRATEGY_MODELS)
+
+    def test_segments_are_views(self):
+        """Each min_price universe is a prefix view with the trainers' rows and fillna(0)"""
+        df = make_rows()
+        data = SharedTrainingData(df)
+
+        X, y = data.segment(5.0)
+        assert np.shares_memory(X, data.X) and np.shares_memory(y, data.y)
+        assert len(y) == (df["close"] >= 5.0).sum()
+        assert sorted(y) == sorted(df.loc[df["close"] >= 5.0, "target_return"])
+        assert data.X.dtype == np.float32 and not np.isnan(data.X).any()
+        assert data.feature_names == ["close", "return_20d", "pe_ratio"]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_trains_and_saves_every_model(self, tmp_path, monkeypatch, workers):
+        """One load; each model is saved like its trainer saves it and loads as XGBRegressor"""
+        monkeypatch.chdir(tmp_path)
+        df = make_rows()
+        trainer = InMemoryTrainer(df, workers=workers, rounds=5)
+
+        report = trainer.run(None, None)
+
+        assert trainer.loads == 1
+        assert report["fits"] == 5
+        assert {m["model_name"] for m in report["models"]} == {c["name"] for c in STRATEGY_MODELS}
+        for name in ("growth_smallcap", "value_largecap", "dividend_strategy"):
+            metadata = json.loads((tmp_path / "models" / name / "metadata.json").read_text())
+            assert metadata["n_features"] == 3
+        assert (tmp_path / "ml_models/feature_importance/feature_importance_dividend.csv").exists()
+
+        X = df[["close", "return_20d", "pe_ratio"]].fillna(0).to_numpy()
+        predictions = {}
+        for name in ("growth_midcap", "growth_largecap"):
+            model = xgb.XGBRegressor()
+            model.load_model(str(tmp_path / "models" / name / "model.json"))
+            predictions[name] = model.predict(X)
+        np.testing.assert_array_equal(predictions["growth_midcap"], predictions["growth_largecap"])
+
+        rows = {m["model_name"]: m["rows"] for m in report["models"]}
+        assert rows["growth_smallcap"] == (df["close"] >= 5.0).sum()
+        assert rows["growth_midcap"] == len(df)
@@ -0,0 +1,156 @@
+"""
+OAuth Token Cache Tests
+
+Tests for utils/token_cache.py and its use by SchwabOAuthService: cached
+tokens skip the database, refreshes are single-flight, tokens nearing expiry
+are refreshed in the background and only refreshes write to the database.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.api.services import schwab_oauth
+from backend.api.services.schwab_oauth import SchwabOAuthService
+from utils.token_cache import CachedToken, TokenCache
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.mark.unit
+@pytest.mark.brokerage
+class TestTokenCache:
+    """Tests for the thread-based cache"""
+
+    def test_single_flight_refresh(self):
+        """Concurrent refreshes of one key run the refresh function once"""
+        cache = TokenCache()
+        stale = cache.put("k", "old", "r1", time.time() + 10)
+        calls = []
+
+        def refresh(current):
+            calls.append(current)
+            time.sleep(0.1)
+            return CachedToken("new", "r2", time.time() + 1800)
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.refresh("k", refresh, stale)))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert calls == [stale]
+        assert {r.access_token for r in results} == {"new"}
+        assert cache.refreshes == 1
+
+    def test_background_refresh(self):
+        """A due token keeps being served while one background refresh replaces it"""
+        cache = TokenCache(refresh_margin=300, proactive_margin=900)
+        token = cache.put("k", "old", "r1", time.time() + 600)
+        release = threading.Event()
+
+        def refresh(current):
+            release.wait(2)
+            return CachedToken("new", "r1", time.time() + 1800)
+
+        assert not cache.needs_refresh(token) and cache.refresh_due(token)
+        assert cache.refresh_in_background("k", refresh, token)
+        assert not cache.refresh_in_background("k", refresh, token)
+        assert cache.get("k").access_token == "old"
+
+        release.set()
+        assert wait_for(lambda: cache.get("k").access_token == "new")
+
+    def test_failed_refresh_keeps_token(self):
+        """A refresh returning None leaves the cached token in place"""
+        cache = TokenCache()
+        stale = cache.put("k", "old", "r1", time.time() + 10)
+
+        assert cache.refresh("k", lambda current: None, stale) is None
+        assert cache.get("k") is stale
+
+
+class FakeSession:
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def oauth(monkeypatch):
+    """SchwabOAuthService with a fresh cache, a recording DB and a fake token endpoint"""
+    cache = TokenCache()
+    monkeypatch.setattr(schwab_oauth, "token_cache", cache)
+    monkeypatch.setattr(schwab_oauth, "SCHWAB_CLIENT_ID", "app")
+    monkeypatch.setattr(schwab_oauth, "SCHWAB_CLIENT_SECRET", "secret")
+    monkeypatch.setattr(schwab_oauth, "SessionLocal", FakeSession)
+
+    db = {"reads": 0, "writes": [], "refreshes": 0}
+
+    async def fetch_one(session, query, params):
+        db["reads"] += 1
+        return ("db-token", "refresh-1", schwab_oauth.datetime.utcnow())
+
+    async def execute(session, query, params, commit=False):
+        db["writes"].append(params["access_token"])
+
+    async def refresh_token(self, refresh_token):
+        db["refreshes"] += 1
+        await asyncio.sleep(0.05)
+        return {"access_token": f"fresh-{db['refreshes']}", "expires_in": 1800}
+
+    monkeypatch.setattr(schwab_oauth, "fetch_one", fetch_one)
+    monkeypatch.setattr(schwab_oauth, "execute", execute)
+    monkeypatch.setattr(SchwabOAuthService, "_refresh_token", refresh_token)
+
+    service = SchwabOAuthService(db_session=None)
+    service.cache = cache
+    service.calls = db
+    return service
+
+
+@pytest.mark.unit
+@pytest.mark.brokerage
+class TestSchwabOAuthService:
+    """Tests for get_valid_token on top of the cache"""
+
+    async def test_expired_token_refreshed_once(self, oauth):
+        """Concurrent requests with an expired DB token share one refresh and one write"""
+        tokens = await asyncio.gather(*(oauth.get_valid_token(7) for _ in range(5)))
+
+        assert set(tokens) == {"fresh-1"}
+        assert oauth.calls["refreshes"] == 1
+        assert oauth.calls["writes"] == ["fresh-1"]
+
+        # Later calls are served from memory
+        reads = oauth.calls["reads"]
+        assert await oauth.get_valid_token(7) == "fresh-1"
+        assert oauth.calls["reads"] == reads
+
+    async def test_cached_token_skips_database(self, oauth):
+        """A fresh cached token needs no database read or refresh"""
+        oauth.cache.put((7, 1), "cached", "refresh-1", time.time() + 3600)
+
+        assert await oauth.get_valid_token(7) == "cached"
+        assert oauth.calls == {"reads": 0, "writes": [], "refreshes": 0}
+
+    async def test_proactive_refresh_in_background(self, oauth):
+        """A token nearing expiry is returned immediately and replaced in the background"""
+        oauth.cache.put((7, 1), "soon", "refresh-1", time.time() + 600)
+
+        assert await oauth.get_valid_token(7) == "soon"
+        assert await oauth.get_valid_token(7) == "soon"
+        await asyncio.sleep(0.1)
+
+        assert oauth.calls["refreshes"] == 1
+        assert await oauth.get_valid_token(7) == "fresh-1"
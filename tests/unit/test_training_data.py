@@ -0,0 +1,113 @@
+"""
+Training-Data Cache Tests
+
+Tests for ml_models/training_data.py against an in-memory
+ml_training_features (no database needed): the loader returns the rows the
+trainers' SQL selected, as float32, and refreshes only re-read the trailing
+months.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.conftest import make_features
+from tests.synthetic_training_data import SyntheticTrainingDataCache
+
+
+def make_rows(start=date(2024, 1, 1), end=date(2024, 6, 30), seed=3):
+    """
+    Business-day rows for three tickers as psycopg2 returns them: NUMERIC columns
+    as Decimals, NULLs as None, a boolean flag; PENNY trades below $1 and the
+    last four weeks' targets have not matured
+    """
+    df = make_features(start, end, tickers=("AAPL", "MSFT", "PENNY"), seed=seed).astype(object)
+    df.loc[df["ticker"] == "PENNY", "close"] = 0.4
+    df.loc[df["ticker"] == "MSFT", "pe_ratio"] = np.nan
+    df["close"] = [Decimal(f"{close:.4f}") for close in df["close"]]
+    df["pe_ratio"] = [None if pd.isna(pe) else Decimal(f"{pe:.2f}") for pe in df["pe_ratio"]]
+    df["macd_positive"] = [momentum > 0 for momentum in df["momentum"]]
+    df.loc[df["date"] > end - timedelta(days=28), "target_return"] = None
+    return df
+
+
+def reference(features, start, end, min_price=None):
+    """What SELECT * ... WHERE date BETWEEN .. AND target_return IS NOT NULL returned"""
+    rows = features[(features["date"] >= start) & (features["date"] <= end)]
+    rows = rows[rows["target_return"].notna()]
+    if min_price is not None:
+        rows = rows[rows["close"].astype(float) >= min_price]
+    return rows.sort_values(["date", "ticker"]).reset_index(drop=True)
+
+
+@pytest.fixture
+def features():
+    return make_rows()
+
+
+@pytest.mark.unit
+@pytest.mark.ml
+class TestTrainingDataCache:
+    """Tests for refresh and load"""
+
+    def test_load_matches_query(self, tmp_path, features):
+        """Filtered loads return the query's rows and order, with float32 features"""
+        cache = SyntheticTrainingDataCache(tmp_path, features=features)
+        stats = cache.refresh()
+        assert stats["months"] == 6
+        assert sorted(p.name for p in tmp_path.glob("month=*.parquet"))[0] == (
+            "month=2024-01.parquet"
+        )
+
+        start, end = date(2024, 2, 10), date(2024, 5, 20)
+        df = cache.load(start, end, min_price=0.5)
+        expected = reference(features, start, end, min_price=0.5)
+
+        assert list(df.columns) == list(features.columns)
+        assert list(zip(df["date"], df["ticker"])) == list(
+            zip(expected["date"], expected["ticker"])
+        )
+        for column in ("close", "momentum", "pe_ratio", "target_return"):
+            assert df[column].dtype == np.float32
+            np.testing.assert_allclose(
+                df[column], expected[column].astype(float), rtol=1e-6, equal_nan=True
+            )
+        assert df["macd_positive"].isin([0.0, 1.0]).all()
+        assert "PENNY" not in set(df["ticker"])
+
+    def test_column_selection(self, tmp_path, features):
+        """Only the requested columns are read; filters may use others"""
+        cache = SyntheticTrainingDataCache(tmp_path, features=features)
+        cache.refresh()
+
+        df = cache.load(date(2024, 1, 1), date(2024, 6, 30), columns=["ticker", "momentum"])
+
+        assert list(df.columns) == ["ticker", "momentum"]
+        assert len(df) == len(reference(features, date(2024, 1, 1), date(2024, 6, 30)))
+        assert len(cache.load(date(2024, 6, 1), date(2024, 6, 30), require_target=False)) == len(
+            features[features["date"] >= date(2024, 6, 1)]
+        )
+        assert cache.load(date(2023, 1, 1), date(2023, 12, 31)).empty
+
+    def test_incremental_refresh(self, tmp_path):
+        """New dates re-read only the trailing months, matching a full rebuild"""
+        full = make_rows(end=date(2024, 9, 30))
+        cache = SyntheticTrainingDataCache(
+            tmp_path, features=full[full["date"] <= date(2024, 6, 30)]
+        )
+        cache.refresh()
+        assert cache.refresh()["months"] == 0  # up to date
+
+        cache.features = full
+        cache.fetched.clear()
+        cache.ensure_fresh()
+
+        assert cache.watermark() == full["date"].max()
+        assert cache.fetched == [date(2024, month, 1) for month in (5, 6, 7, 8, 9)]
+        rebuilt = SyntheticTrainingDataCache(tmp_path / "rebuilt", features=full)
+        rebuilt.refresh()
+        span = (date(2024, 1, 1), date(2024, 9, 30))
+        pd.testing.assert_frame_equal(cache.load(*span), rebuilt.load(*span))
@@ -0,0 +1,134 @@
+"""
+Walk-Forward Engine Tests
+
+Tests for ml_models/walk_forward.py on a synthetic training-data cache: folds
+never train on dates whose targets reach into the test window, the shared
+matrix holds the cache's rows in date order, and parallel and sequential runs
+write the same walk_forward_results.csv and feature importance files that
+ml_models/model_evaluation.py reads.
+"""
+
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml_models.walk_forward import WalkForwardEngine, evaluate_fold, make_folds, open_matrix
+
+START, END = date(2022, 1, 1), date(2023, 6, 30)
+
+# Columns load_walk_forward_results() consumers use
+EVALUATION_COLUMNS = [
+    "split",
+    "train_start",
+    "train_end",
+    "test_start",
+    "test_end",
+    "model_path",
+    "rmse",
+    "r2",
+    "information_coefficient",
+    "mean_monthly_ic",
+    "top_quintile_return",
+    "bottom_quintile_return",
+    "top_minus_bottom",
+]
+
+
+@pytest.fixture
+def cache(training_data_cache):
+    return training_data_cache(START, END, tickers=30, seed=9)
+
+
+def make_engine(cache, tmp_path, workers):
+    return WalkForwardEngine(
+        train_months=6,
+        test_months=1,
+        step_months=2,
+        workers=workers,
+        rounds=10,
+        cache=cache,
+        models_dir=tmp_path / f"models_{workers}",
+        importance_dir=tmp_path / f"importance_{workers}",
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.ml
+class TestWalkForward:
+    """Tests for fold construction, the shared matrix and the result files"""
+
+    def test_folds_purge_overlapping_targets(self):
+        """Training ends purge_days trading dates before each monthly test window"""
+        days = pd.bdate_range("2020-01-01", "2021-12-31").date
+        day_rows = np.arange(len(days) + 1) * 100
+
+        folds = make_folds(days, day_rows, train_months=12, test_months=1, purge_days=20)
+
+        assert len(folds) == 12
+        assert [f.test_start[:7] for f in folds] == [f"2021-{m:02d}" for m in range(1, 13)]
+        for fold in folds:
+            first_test = list(days).index(date.fromisoformat(fold.test_start))
+            last_train = list(days).index(date.fromisoformat(fold.train_end))
+            assert first_test - last_train - 1 == 20
+            assert fold.train_rows[1] == (last_train + 1) * 100
+            assert fold.test_rows[0] == first_test * 100
+            assert fold.test_end[:7] == fold.test_start[:7]
+
+    def test_matrix_matches_cache(self, cache, tmp_path):
+        """The memory-mapped matrix is the cache's rows in date order, fillna(0)"""
+        engine = make_engine(cache, tmp_path, workers=1)
+        matrix = engine.build_matrix(START, END, tmp_path / "matrix")
+        X, y, day_index = open_matrix(tmp_path / "matrix")
+        df = cache.load(START, END)
+
+        assert isinstance(X, np.memmap) and X.dtype == np.float32
+        assert matrix["feature_names"] == ["close", "momentum", "pe_ratio"]
+        np.testing.assert_array_equal(X, df[matrix["feature_names"]].fillna(0).to_numpy())
+        np.testing.assert_array_equal(y, df["target_return"].to_numpy(dtype=np.float32))
+        assert list(matrix["days"][day_index]) == list(pd.to_datetime(df["date"]).dt.date)
+        assert matrix["day_rows"][-1] == len(df)
+
+    def test_parallel_matches_sequential(self, cache, tmp_path):
+        """Worker processes write the same results and importance files as one process"""
+        # A previous, longer run's fold files are replaced, not mixed in
+        stale = [
+            tmp_path / "importance_2" / "feature_importance_2021-01-04.csv",
+            tmp_path / "models_2" / "walk_forward" / "xgboost_2021-01-04.json",
+        ]
+        for path in stale:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("stale")
+
+        sequential = make_engine(cache, tmp_path, workers=1).run(START, END)
+        parallel = make_engine(cache, tmp_path, workers=2).run(START, END)
+
+        assert len(sequential) == 6
+        written = pd.read_csv(tmp_path / "models_2" / "walk_forward_results.csv")
+        assert set(EVALUATION_COLUMNS) <= set(written.columns)
+        assert list(written["split"]) == list(range(1, 7))
+        pd.testing.assert_series_equal(
+            sequential["information_coefficient"], parallel["information_coefficient"], rtol=1e-4
+        )
+        assert (sequential["information_coefficient"] > 0.3).all()
+
+        files = sorted((tmp_path / "importance_2").glob("feature_importance_*.csv"))
+        assert [f.stem.split("_")[-1] for f in files] == list(written["test_start"])
+        assert pd.read_csv(files[0]).iloc[0]["feature"] == "momentum"
+        assert all(Path(path).exists() for path in written["model_path"])
+        assert not any(path.exists() for path in stale)
+        assert len(list((tmp_path / "models_2" / "walk_forward").iterdir())) == 6
+
+    def test_fold_metrics(self):
+        """Per-date quintile spread and IC of a perfect ranking"""
+        day_index = np.repeat([0, 1], 20)
+        y = np.tile(np.linspace(-0.1, 0.1, 20), 2)
+
+        metrics = evaluate_fold(y, y * 2, day_index)
+
+        assert metrics["information_coefficient"] == pytest.approx(1.0)
+        assert metrics["mean_monthly_ic"] == pytest.approx(1.0)
+        assert metrics["n_days"] == 2
+        assert metrics["top_minus_bottom"] == pytest.approx(y[16:20].mean() - y[:4].mean())
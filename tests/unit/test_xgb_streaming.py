@@ -0,0 +1,97 @@
+"""
+Streaming XGBoost Training Tests
+
+Tests for ml_models/xgb_streaming.py on a synthetic training-data cache:
+chunks carry the cache's rows as float32 with NaN intact, the quantized
+matrix holds every row, in-memory and external-memory training agree on the
+rows they score, and external memory is refused on xgboost without
+ExtMemQuantileDMatrix.
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+import xgboost as xgb
+
+from ml_models.xgb_streaming import CacheChunkIter, ChunkIter, native_params, train_streaming
+
+START, END = date(2024, 1, 1), date(2024, 4, 30)
+PARAMS = {
+    "objective": "reg:squarederror",
+    "tree_method": "hist",
+    "max_depth": 3,
+    "learning_rate": 0.1,
+    "n_estimators": 10,
+    "reg_alpha": 0.1,
+    "random_state": 42,
+}
+
+
+@pytest.fixture
+def cache(training_data_cache):
+    return training_data_cache(START, END, tickers=20, seed=5, missing=0.3)
+
+
+@pytest.mark.unit
+@pytest.mark.ml
+class TestStreamingTraining:
+    """Tests for the chunk iterators and train_streaming"""
+
+    def test_chunks_match_load(self, cache):
+        """One chunk per month; together they are load()'s rows, float32, NaN kept"""
+        chunks = CacheChunkIter(START, END, min_price=5.0, cache=cache)
+        df = cache.load(START, END, min_price=5.0)
+
+        parts = list(chunks.arrays())
+        X = np.concatenate([X for X, _ in parts])
+        y = np.concatenate([y for _, y in parts])
+
+        assert len(parts) == 4
+        assert chunks.feature_names == ["close", "momentum", "pe_ratio"]
+        assert X.dtype == np.float32 and X.flags.c_contiguous
+        assert np.isnan(X[:, 2]).any()
+        np.testing.assert_array_equal(X, df[chunks.feature_names].to_numpy(dtype=np.float32))
+        np.testing.assert_array_equal(y, df["target_return"].to_numpy(dtype=np.float32))
+
+        filled = CacheChunkIter(START, END, min_price=5.0, cache=cache, fill_value=0.0)
+        assert not any(np.isnan(X).any() for X, _ in filled.arrays())
+        with pytest.raises(TypeError):
+            ChunkIter(chunks.feature_names)  # chunks() is abstract
+
+    def test_quantile_dmatrix_rows(self, cache):
+        """The iterator feeds every row into the QuantileDMatrix"""
+        chunks = CacheChunkIter(START, END, cache=cache)
+        dtrain = xgb.QuantileDMatrix(chunks)
+
+        assert dtrain.num_row() == len(cache.load(START, END))
+        assert dtrain.num_col() == 3
+        assert dtrain.feature_names == chunks.feature_names
+
+    def test_train_streaming(self, cache, tmp_path):
+        """In-memory and external-memory training score the same rows and learn the signal"""
+        params, rounds = native_params(PARAMS)
+        assert params["alpha"] == 0.1 and params["seed"] == 42 and rounds == 10
+
+        booster, metrics, importance = train_streaming(
+            CacheChunkIter(START, END, min_price=5.0, cache=cache), PARAMS
+        )
+        assert metrics["rows"] == len(cache.load(START, END, min_price=5.0))
+        assert metrics["spearman_ic"] > 0.5
+        assert importance.iloc[0]["feature"] == "momentum"
+        assert booster.num_boosted_rounds() == 10
+
+        chunks = CacheChunkIter(
+            START, END, min_price=5.0, cache=cache, cache_prefix=str(tmp_path / "extmem")
+        )
+        _, external, _ = train_streaming(chunks, PARAMS, rounds=5)
+        assert external["rows"] == metrics["rows"]
+        assert external["spearman_ic"] > 0.5
+
+    def test_external_memory_requires_xgboost_3(self, cache, tmp_path, monkeypatch):
+        """Without ExtMemQuantileDMatrix (xgboost 2.x) only external memory is refused"""
+        monkeypatch.delattr(xgb, "ExtMemQuantileDMatrix", raising=False)
+
+        with pytest.raises(RuntimeError, match="xgboost>=3.0"):
+            CacheChunkIter(START, END, cache=cache, cache_prefix=str(tmp_path / "extmem"))
+        assert CacheChunkIter(START, END, cache=cache).cache_prefix is None
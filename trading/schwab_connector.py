@@ -11,6 +11,10 @@ Features:
 - Order placement (market, limit)
 - Position and balance queries
 - Paper trading mode support
+
+OAuth tokens live in the process-level token cache (utils/token_cache.py):
+authenticate() is an in-memory check, tokens nearing expiry are refreshed in
+the background (one refresh at a time) and only refreshes write the database.
 """
 import sys
 from pathlib import Path
@@ -18,13 +22,15 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import json
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
 import psycopg2
 import requests
 
-from utils import get_logger
+from utils import get_logger, get_psycopg2_connection
+from utils.token_cache import CachedToken, token_cache
 
 logger = get_logger(__name__)
 
@@ -35,6 +41,9 @@ DB_CONFIG = {
     "password": "$@nJose420",
 }
 
+# token_cache key for the Autonomous Fund's Schwab tokens
+TOKEN_KEY = ("Autonomous Fund", "Schwab")
+
 
 class SchwabConnector:
     """
@@ -75,6 +84,11 @@ class SchwabConnector:
         self.paper_trading = paper_trading
         self.conn = psycopg2.connect(**DB_CONFIG)
 
+        # Tokens (this connector's view of the cached token, see _use_token)
+        self.access_token = None
+        self.refresh_token = None
+        self.token_expires_at = None
+
         # Load credentials from database if not provided
         if client_id is None or client_secret is None or account_id is None:
             self._load_credentials_from_db()
@@ -87,11 +101,6 @@ class SchwabConnector:
         self.base_url = "https://api.schwabapi.com/trader/v1"
         self.auth_url = "https://api.schwabapi.com/v1/oauth"
 
-        # Tokens
-        self.access_token = None
-        self.refresh_token = None
-        self.token_expires_at = None
-
         logger.info(f"Schwab Connector initialized (Paper Trading: {paper_trading})")
 
     def _load_credentials_from_db(self):
@@ -106,27 +115,39 @@ class SchwabConnector:
             logger.info("Using paper trading credentials")
             return
 
-        # Load from brokerage_oauth_tokens table
-        cur.execute(
+        # Tokens come from the token cache once loaded by any connector
+        cached = token_cache.get(TOKEN_KEY)
+        if cached is not None:
+            self._use_token(cached)
+            logger.info("Using cached OAuth tokens")
+        else:
+            # Load from brokerage_oauth_tokens table
+            cur.execute(
+                """
+                SELECT access_token, refresh_token, expires_at, scope
+                FROM brokerage_oauth_tokens
+                WHERE brokerage_id = (SELECT id FROM brokerages WHERE name = 'Schwab')
+                  AND client_id = (SELECT client_id FROM clients WHERE client_name = 'Autonomous Fund' LIMIT 1)
+                ORDER BY updated_at DESC
+                LIMIT 1
             """
-            SELECT access_token, refresh_token, expires_at, scope
-            FROM brokerage_oauth_tokens
-            WHERE brokerage_id = (SELECT id FROM brokerages WHERE name = 'Schwab')
-              AND client_id = (SELECT client_id FROM clients WHERE client_name = 'Autonomous Fund' LIMIT 1)
-            ORDER BY updated_at DESC
-            LIMIT 1
-        """
-        )
+            )
 
-        row = cur.fetchone()
-        if row:
-            self.access_token, self.refresh_token, self.token_expires_at, scope = row
-            logger.info("Loaded existing OAuth tokens from database")
-        else:
-            self.access_token = None
-            self.refresh_token = None
-            self.token_expires_at = None
-            logger.warning("No existing OAuth tokens found in database")
+            row = cur.fetchone()
+            if row:
+                access_token, refresh_token, expires_at, scope = row
+                # expires_at is written in local time (see _save_tokens_to_db)
+                self._use_token(
+                    token_cache.put(
+                        TOKEN_KEY,
+                        access_token,
+                        refresh_token,
+                        expires_at.timestamp() if expires_at else 0.0,
+                    )
+                )
+                logger.info("Loaded existing OAuth tokens from database")
+            else:
+                logger.warning("No existing OAuth tokens found in database")
 
         # Load client credentials
         cur.execute(
@@ -149,37 +170,51 @@ class SchwabConnector:
             self.client_secret = None
             self.account_id = None
 
-    def _save_tokens_to_db(self):
-        """Save OAuth tokens to database"""
-        cur = self.conn.cursor()
+    def _use_token(self, token: CachedToken):
+        """Point this connector at a cached token"""
+        self.access_token = token.access_token
+        self.refresh_token = token.refresh_token
+        self.token_expires_at = datetime.fromtimestamp(token.expires_at)
 
-        cur.execute(
-            """
-            INSERT INTO brokerage_oauth_tokens (
-                client_id, brokerage_id, access_token, refresh_token,
-                expires_at, scope, updated_at
-            )
-            VALUES (
-                (SELECT client_id FROM clients WHERE client_name = 'Autonomous Fund' LIMIT 1),
-                (SELECT id FROM brokerages WHERE name = 'Schwab'),
-                %s, %s, %s, %s, NOW()
-            )
-            ON CONFLICT (client_id, brokerage_id) DO UPDATE SET
-                access_token = EXCLUDED.access_token,
-                refresh_token = EXCLUDED.refresh_token,
-                expires_at = EXCLUDED.expires_at,
-                updated_at = NOW()
-        """,
-            (self.access_token, self.refresh_token, self.token_expires_at, "trader"),  # scope
-        )
+    def _save_tokens_to_db(self, token: CachedToken):
+        """Save OAuth tokens to database"""
+        # Pooled connection: background refreshes run on their own thread
+        with get_psycopg2_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO brokerage_oauth_tokens (
+                        client_id, brokerage_id, access_token, refresh_token,
+                        expires_at, scope, updated_at
+                    )
+                    VALUES (
+                        (SELECT client_id FROM clients WHERE client_name = 'Autonomous Fund' LIMIT 1),
+                        (SELECT id FROM brokerages WHERE name = 'Schwab'),
+                        %s, %s, %s, %s, NOW()
+                    )
+                    ON CONFLICT (client_id, brokerage_id) DO UPDATE SET
+                        access_token = EXCLUDED.access_token,
+                        refresh_token = EXCLUDED.refresh_token,
+                        expires_at = EXCLUDED.expires_at,
+                        updated_at = NOW()
+                """,
+                    (
+                        token.access_token,
+                        token.refresh_token,
+                        datetime.fromtimestamp(token.expires_at),
+                        "trader",  # scope
+                    ),
+                )
 
-        self.conn.commit()
         logger.info("✅ OAuth tokens saved to database")
 
     def authenticate(self, auth_code: Optional[str] = None) -> bool:
         """
         Authenticate with Schwab API
 
+        Cheap to call before every request: the token is checked in memory and
+        only refreshed when it is about to expire.
+
         Args:
             auth_code: Authorization code from OAuth flow (required for first-time auth)
 
@@ -192,25 +227,26 @@ class SchwabConnector:
             return True
 
         # Check if we have valid access token
-        if self.access_token and self.token_expires_at:
-            if datetime.now() < self.token_expires_at:
-                logger.info("✅ Using existing valid access token")
-                return True
-            else:
+        token = token_cache.get(TOKEN_KEY)
+        if token is not None:
+            if token_cache.needs_refresh(token):
                 logger.info("Access token expired, refreshing...")
-                return self._refresh_access_token()
+                return self._refresh_access_token(token)
+
+            if token_cache.refresh_due(token):
+                # Still usable: refresh in the background, keep going
+                token_cache.refresh_in_background(TOKEN_KEY, self._request_token_refresh, token)
+
+            self._use_token(token)
+            return True
 
         # Need to get new tokens
         if auth_code:
             return self._get_initial_tokens(auth_code)
-        else:
-            # Try to refresh with existing refresh token
-            if self.refresh_token:
-                return self._refresh_access_token()
-            else:
-                logger.error("No auth code or refresh token available")
-                logger.error("Please provide auth_code parameter for initial authentication")
-                return False
+
+        logger.error("No auth code or refresh token available")
+        logger.error("Please provide auth_code parameter for initial authentication")
+        return False
 
     def _get_initial_tokens(self, auth_code: str) -> bool:
         """Get initial access and refresh tokens using authorization code"""
@@ -229,12 +265,17 @@ class SchwabConnector:
 
             if response.status_code == 200:
                 data = response.json()
-                self.access_token = data["access_token"]
-                self.refresh_token = data["refresh_token"]
                 expires_in = data.get("expires_in", 3600)
-                self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+                token = CachedToken(
+                    data["access_token"], data["refresh_token"], time.time() + expires_in
+                )
 
-                self._save_tokens_to_db()
+                self._save_tokens_to_db(token)
+                self._use_token(
+                    token_cache.put(
+                        TOKEN_KEY, token.access_token, token.refresh_token, token.expires_at
+                    )
+                )
                 logger.info("✅ Successfully authenticated with Schwab API")
                 return True
             else:
@@ -245,15 +286,25 @@ class SchwabConnector:
             logger.error(f"Error during authentication: {e}")
             return False
 
-    def _refresh_access_token(self) -> bool:
-        """Refresh access token using refresh token"""
+    def _refresh_access_token(self, stale: Optional[CachedToken] = None) -> bool:
+        """Refresh access token (single-flight across connectors and threads)"""
+        token = token_cache.refresh(TOKEN_KEY, self._request_token_refresh, stale)
+        if token is None:
+            return False
+
+        self._use_token(token)
+        return True
+
+    def _request_token_refresh(self, current: Optional[CachedToken]) -> Optional[CachedToken]:
+        """Request a new access token with the refresh token and save it"""
+        refresh_token = current.refresh_token if current else self.refresh_token
         try:
             response = requests.post(
                 f"{self.auth_url}/token",
                 headers={"Content-Type": "application/x-www-form-urlencoded"},
                 data={
                     "grant_type": "refresh_token",
-                    "refresh_token": self.refresh_token,
+                    "refresh_token": refresh_token,
                     "client_id": self.client_id,
                     "client_secret": self.client_secret,
                 },
@@ -261,24 +312,25 @@ class SchwabConnector:
 
             if response.status_code == 200:
                 data = response.json()
-                self.access_token = data["access_token"]
                 expires_in = data.get("expires_in", 3600)
-                self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
 
                 # Refresh token may also be updated
-                if "refresh_token" in data:
-                    self.refresh_token = data["refresh_token"]
+                token = CachedToken(
+                    data["access_token"],
+                    data.get("refresh_token", refresh_token),
+                    time.time() + expires_in,
+                )
 
-                self._save_tokens_to_db()
+                self._save_tokens_to_db(token)
                 logger.info("✅ Access token refreshed")
-                return True
+                return token
             else:
                 logger.error(f"Token refresh failed: {response.status_code} - {response.text}")
-                return False
+                return None
 
         except Exception as e:
             logger.error(f"Error refreshing token: {e}")
-            return False
+            return None
 
     def _make_api_request(
         self, method: str, endpoint: str, data: Optional[Dict] = None
@@ -17,42 +17,17 @@ echo "Training All Strategy Models"
 echo "========================================"
 echo ""
 
-# 1. Dividend Strategy (Mid/Large cap only)
-echo "1/7: Training Dividend Strategy (Mid/Large cap)"
+# Snapshot ml_training_features once; every trainer reads the local cache
+echo "Refreshing training-data cache"
 echo "----------------------------------------"
-python ml_models/train_dividend_strategy.py $GPU_FLAG
+python ml_models/training_data.py
 echo ""
 
-# 2. Growth Strategies (by market cap)
-echo "2/7: Training Growth Strategy - Small Cap"
+# All 7 models (dividend, growth x small/mid/large, value x small/mid/large)
+# from one data load; see ml_models/train_strategy_models.py
+echo "Training 7 strategy models"
 echo "----------------------------------------"
-python ml_models/train_growth_strategy.py --market-cap small $GPU_FLAG
-echo ""
-
-echo "3/7: Training Growth Strategy - Mid Cap"
-echo "----------------------------------------"
-python ml_models/train_growth_strategy.py --market-cap mid $GPU_FLAG
-echo ""
-
-echo "4/7: Training Growth Strategy - Large Cap"
-echo "----------------------------------------"
-python ml_models/train_growth_strategy.py --market-cap large $GPU_FLAG
-echo ""
-
-# 3. Value Strategies (by market cap)
-echo "5/7: Training Value Strategy - Small Cap"
-echo "----------------------------------------"
-python ml_models/train_value_strategy.py --market-cap small $GPU_FLAG
-echo ""
-
-echo "6/7: Training Value Strategy - Mid Cap"
-echo "----------------------------------------"
-python ml_models/train_value_strategy.py --market-cap mid $GPU_FLAG
-echo ""
-
-echo "7/7: Training Value Strategy - Large Cap"
-echo "----------------------------------------"
-python ml_models/train_value_strategy.py --market-cap large $GPU_FLAG
+python ml_models/train_strategy_models.py $GPU_FLAG
 echo ""
 
 echo "========================================"
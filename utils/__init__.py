@@ -1,11 +1,18 @@
 """Utility modules for ACIS AI Platform"""
 
-from .db_config import get_db_session, get_psycopg2_connection, get_psycopg2_cursor, test_connection
+from .db_config import (
+    get_db_session,
+    get_pool_stats,
+    get_psycopg2_connection,
+    get_psycopg2_cursor,
+    test_connection,
+)
 from .logger import get_logger
 
 __all__ = [
     "get_db_session",
     "get_psycopg2_connection",
+    "get_pool_stats",
     "get_psycopg2_cursor",
     "test_connection",
     "get_logger",
@@ -0,0 +1,234 @@
+"""
+COPY-based bulk writer shared by the scripts/backfill and scripts/daily loaders
+
+`cur.executemany(insert_sql, rows)` sends one INSERT per row. BulkUpsert
+instead streams the rows into a temporary staging table with
+COPY ... FROM STDIN (text format, from an in-memory buffer), then merges them
+with a single INSERT ... SELECT carrying the loader's own ON CONFLICT clause.
+Plain INSERTs with no ON CONFLICT clause (TRUNCATE + reload backfills) COPY
+straight into the target table.
+
+A writer is built from the statement the loader already has:
+
+    insert_sql = '''
+        INSERT INTO daily_bars (ticker, date, ..., updated_at)
+        VALUES (%s, %s, ..., CURRENT_TIMESTAMP)
+        ON CONFLICT (ticker, date) DO UPDATE SET close = EXCLUDED.close, ...
+    '''
+    copy_upsert(cur, insert_sql, batch)     # drop-in for cur.executemany
+
+Each `%s` placeholder becomes a staged column; any other VALUES entry
+(CURRENT_TIMESTAMP, 'close', ...) is kept as a SQL expression in the merge
+SELECT. Rows repeating a conflict key within one batch are collapsed to the
+last occurrence, matching what sequential executemany upserts would leave.
+"""
+
+import io
+import json
+import re
+import zlib
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Sequence
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+PLACEHOLDER = "%s"
+
+_INSERT_RE = re.compile(
+    r"^\s*INSERT\s+INTO\s+(?P<table>[\w.\"]+)\s*\((?P<columns>[^)]*)\)\s*VALUES\s*\(",
+    re.IGNORECASE | re.DOTALL,
+)
+_CONFLICT_TARGET_RE = re.compile(r"ON\s+CONFLICT\s*\((?P<columns>[^)]*)\)", re.IGNORECASE)
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\n": "\\n", "\r": "\\r", "\t": "\\t"})
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Split on commas that are not inside parentheses or quotes"""
+    parts, depth, quoted, current = [], 0, False, []
+    for ch in text:
+        if ch == "'":
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        if ch == "," and depth == 0 and not quoted:
+            parts.append("".join(current).strip())
+            current = []
+        else:
+            current.append(ch)
+    parts.append("".join(current).strip())
+    return [p for p in parts if p]
+
+
+def _array_literal(values: Sequence[Any]) -> str:
+    items = []
+    for v in values:
+        if v is None:
+            items.append("NULL")
+        else:
+            text = _format_value(v) if not isinstance(v, str) else v
+            items.append('"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"')
+    return "{" + ",".join(items) + "}"
+
+
+def _format_value(value: Any) -> str:
+    """Render one Python value the way COPY text format (before escaping) expects"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool) or type(value).__name__ == "bool_":
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return _array_literal(value)
+    if isinstance(value, dict):
+        return json.dumps(value)
+    if hasattr(value, "adapted"):  # psycopg2.extras.Json
+        return json.dumps(value.adapted)
+    if isinstance(value, float) or type(value).__name__ in ("float32", "float16"):
+        # Polygon volumes and NaN-widened count columns arrive as floats; "70790813.0"
+        # is rejected by COPY into BIGINT / INTEGER columns, so write whole numbers as ints
+        if value.is_integer():
+            return str(int(value))
+    return str(value)
+
+
+def format_copy_row(row: Sequence[Any]) -> str:
+    """One COPY text-format line: tab-separated, \\N for NULL, specials escaped"""
+    return (
+        "\t".join("\\N" if v is None else _format_value(v).translate(_COPY_ESCAPES) for v in row)
+        + "\n"
+    )
+
+
+def copy_rows(cur, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+    """COPY rows into `table` (columns in row order) from an in-memory buffer"""
+    buffer = io.StringIO()
+    count = 0
+    for row in rows:
+        buffer.write(format_copy_row(row))
+        count += 1
+    if not count:
+        return 0
+    buffer.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+    return count
+
+
+class BulkUpsert:
+    """
+    Staging-table COPY + INSERT ... SELECT writer for one target table
+
+    Args:
+        table: Target table
+        columns: Target columns, in INSERT order
+        values: Per-column value: "%s" for a staged (row-supplied) column, or a
+                SQL expression used verbatim (defaults to all "%s")
+        on_conflict: Tail of the statement, e.g. "ON CONFLICT (id) DO UPDATE SET ..."
+    """
+
+    def __init__(
+        self,
+        table: str,
+        columns: Sequence[str],
+        values: Optional[Sequence[str]] = None,
+        on_conflict: str = "",
+    ):
+        self.table = table
+        self.columns = list(columns)
+        self.values = list(values) if values is not None else [PLACEHOLDER] * len(self.columns)
+        if len(self.values) != len(self.columns):
+            raise ValueError(
+                f"{table}: {len(self.columns)} columns but {len(self.values)} VALUES entries"
+            )
+        self.on_conflict = on_conflict.strip().rstrip(";").strip()
+        self.staged_columns = [c for c, v in zip(self.columns, self.values) if v == PLACEHOLDER]
+
+        signature = zlib.crc32(",".join(self.staged_columns).encode())
+        safe_name = re.sub(r"\W", "_", table)
+        self.staging_table = f"_stage_{safe_name}_{signature:08x}"
+
+        # Conflict-key positions within a row, for collapsing in-batch duplicates
+        self._key_positions = None
+        target = _CONFLICT_TARGET_RE.search(self.on_conflict)
+        if target and "DO UPDATE" in self.on_conflict.upper():
+            keys = [c.strip() for c in target.group("columns").split(",")]
+            staged = {c: i for i, c in enumerate(self.staged_columns)}
+            self._key_positions = [staged[k] for k in keys if k in staged]
+
+    @classmethod
+    def from_insert_sql(cls, sql: str) -> "BulkUpsert":
+        """Build a writer from an `INSERT INTO t (...) VALUES (...) [ON CONFLICT ...]` statement"""
+        match = _INSERT_RE.match(sql)
+        if not match:
+            raise ValueError(f"Not an INSERT ... VALUES (...) statement: {sql.strip()[:80]}")
+
+        # Scan to the parenthesis closing VALUES (entries may contain calls like NOW())
+        depth, quoted, pos = 1, False, match.end()
+        while depth:
+            ch = sql[pos]
+            if ch == "'":
+                quoted = not quoted
+            elif not quoted:
+                depth += {"(": 1, ")": -1}.get(ch, 0)
+            pos += 1
+
+        return cls(
+            table=match.group("table"),
+            columns=_split_top_level(match.group("columns")),
+            values=_split_top_level(sql[match.end() : pos - 1]),
+            on_conflict=sql[pos:],
+        )
+
+    def _dedupe(self, rows: List[Sequence[Any]]) -> List[Sequence[Any]]:
+        if not self._key_positions:
+            return rows
+        latest = {}
+        for row in rows:
+            latest[tuple(row[i] for i in self._key_positions)] = row
+        return list(latest.values()) if len(latest) < len(rows) else rows
+
+    def write(self, cur, rows: Iterable[Sequence[Any]]) -> int:
+        """
+        Write rows (tuples in staged-column order, as for executemany)
+
+        Returns:
+            Number of rows inserted or updated
+        """
+        rows = rows if isinstance(rows, list) else list(rows)
+        if not rows:
+            return 0
+
+        if not self.on_conflict and len(self.staged_columns) == len(self.columns):
+            return copy_rows(cur, self.table, self.columns, rows)
+
+        cur.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {self.staging_table} AS "
+            f"SELECT {', '.join(self.staged_columns)} FROM {self.table} WITH NO DATA"
+        )
+        cur.execute(f"TRUNCATE {self.staging_table}")
+        copy_rows(cur, self.staging_table, self.staged_columns, self._dedupe(rows))
+
+        select_list = ", ".join(
+            column if value == PLACEHOLDER else value
+            for column, value in zip(self.columns, self.values)
+        )
+        cur.execute(
+            f"INSERT INTO {self.table} ({', '.join(self.columns)}) "
+            f"SELECT {select_list} FROM {self.staging_table} {self.on_conflict}"
+        )
+        return cur.rowcount
+
+
+@lru_cache(maxsize=128)
+def _writer_for(sql: str) -> BulkUpsert:
+    return BulkUpsert.from_insert_sql(sql)
+
+
+def copy_upsert(cur, insert_sql: str, rows: Iterable[Sequence[Any]]) -> int:
+    """Drop-in replacement for cur.executemany(insert_sql, rows) using COPY"""
+    return _writer_for(insert_sql).write(cur, rows)
@@ -5,13 +5,14 @@ Database configuration and connection utilities
 import os
 from contextlib import contextmanager
 
-import psycopg2
 from dotenv import load_dotenv
 from psycopg2.extras import RealDictCursor
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
 
+from .db_pool import ConnectionPool
+
 load_dotenv()
 
 # Database credentials
@@ -35,6 +36,11 @@ PSYCOPG2_CONN_STRING = (
     f"host={DB_HOST} port={DB_PORT} dbname={DB_NAME} user={DB_USER} password={DB_PASSWORD}"
 )
 
+# psycopg2 pool shared by get_psycopg2_connection() and the API services
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
 
 # SQLAlchemy engine with connection pooling
 engine = create_engine(
@@ -48,6 +54,14 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Process-wide psycopg2 pool (connects lazily, on first checkout)
+connection_pool = ConnectionPool(
+    PSYCOPG2_CONN_STRING,
+    min_size=DB_POOL_MIN_SIZE,
+    max_size=DB_POOL_MAX_SIZE,
+    timeout=DB_POOL_TIMEOUT,
+)
+
 
 @contextmanager
 def get_db_session():
@@ -65,16 +79,19 @@ def get_db_session():
 
 @contextmanager
 def get_psycopg2_connection():
-    """Context manager for raw psycopg2 connections"""
-    conn = psycopg2.connect(PSYCOPG2_CONN_STRING)
-    try:
+    """
+    Context manager for raw psycopg2 connections from the shared pool
+
+    Commits on success and rolls back on error; the connection goes back to
+    the pool afterwards, so don't close it.
+    """
+    with connection_pool.connection() as conn:
         yield conn
-        conn.commit()
-    except Exception as e:
-        conn.rollback()
-        raise e
-    finally:
-        conn.close()
+
+
+def get_pool_stats():
+    """Sizing, occupancy and checkout wait-time metrics of the psycopg2 pool"""
+    return connection_pool.stats()
 
 
 def get_psycopg2_cursor(conn, dict_cursor=True):
@@ -0,0 +1,215 @@
+"""
+Process-wide psycopg2 connection pool
+
+A bounded psycopg2 connection pool for shared use by the API services and
+scripts:
+
+- callers wait (up to a timeout) for a free connection instead of getting
+  PoolError("connection pool exhausted") the moment max_size are checked out
+- every returned connection stays open in the idle list (at most max_size
+  exist), so a burst of concurrent checkouts reuses connections instead of
+  reconnecting; psycopg2's ThreadedConnectionPool would close all but minconn
+- connections come back clean: open transactions are rolled back and
+  autocommit / cursor_factory are reset; only closed or broken connections
+  are dropped
+- a forked child (multiprocessing, Ray workers) opens its own connections
+  instead of sharing the parent's sockets
+- checkout metrics: counts, wait time, timeouts, connections in use / idle
+
+No connection is opened until the first checkout, which opens min_size at
+once. utils.db_config builds the shared instance from its settings.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+
+
+class ConnectionPool:
+    """Bounded, fork-aware psycopg2 connection pool with checkout metrics"""
+
+    def __init__(self, dsn: str, min_size: int = 2, max_size: int = 20, timeout: float = 30.0):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        # Idle connections of this process, most recently returned last
+        self._idle: List = []
+        self._pid: Optional[int] = None
+        # Idle lists inherited across fork(): kept referenced so that garbage
+        # collection never closes the parent's sockets from the child
+        self._inherited = []
+        self._reset_state()
+
+    def _reset_state(self):
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._in_use = 0
+        self._waiting = 0
+        self._checkouts = 0
+        self._waited = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+        self._discarded = 0
+
+    def _connect(self):
+        return psycopg2.connect(self.dsn)
+
+    def _ensure_process(self):
+        """Start this process's idle list (opening min_size connections) on first use"""
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._lock:
+                if self._pid != pid:
+                    if self._pid is not None:
+                        self._inherited.append(self._idle)
+                        self._reset_state()
+                    self._idle = [self._connect() for _ in range(self.min_size)]
+                    self._pid = pid
+
+    def _take_idle(self):
+        with self._lock:
+            return self._idle.pop() if self._idle else None
+
+    def getconn(self):
+        """
+        Check out a connection, waiting up to `timeout` seconds for a free one
+
+        Raises:
+            PoolError: No connection became free within the timeout
+        """
+        self._ensure_process()
+
+        start = time.perf_counter()
+        with self._lock:
+            self._waiting += 1
+        acquired = self._slots.acquire(timeout=self.timeout)
+        waited = time.perf_counter() - start
+        with self._lock:
+            self._waiting -= 1
+            if not acquired:
+                self._timeouts += 1
+
+        if not acquired:
+            raise PoolError(
+                f"No database connection free after {self.timeout:.0f}s "
+                f"(pool max_size={self.max_size})"
+            )
+
+        try:
+            conn = self._take_idle()
+            while conn is not None and conn.closed:
+                # Dropped while idle (server restart, idle timeout)
+                with self._lock:
+                    self._discarded += 1
+                conn = self._take_idle()
+            if conn is None:
+                conn = self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+            if waited > 0.001:
+                self._waited += 1
+        return conn
+
+    def putconn(self, conn, close: bool = False):
+        """Return a connection; close=True (or a closed or broken connection) drops it"""
+        try:
+            if not close and not conn.closed:
+                try:
+                    status = conn.info.transaction_status
+                    if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                        close = True
+                    else:
+                        if status != extensions.TRANSACTION_STATUS_IDLE:
+                            conn.rollback()
+                        conn.autocommit = False
+                        conn.cursor_factory = None
+                except psycopg2.Error:
+                    close = True
+            with self._lock:
+                if close or conn.closed:
+                    self._discarded += 1
+                elif self._pid == os.getpid():
+                    self._idle.append(conn)
+                    conn = None
+            if conn is not None and not conn.closed:
+                conn.close()
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    @contextmanager
+    def connection(self, cursor_factory=None):
+        """
+        Checked-out connection; commits on success, rolls back on error
+
+        The connection goes back to the pool after any error, including
+        statement timeouts and cancelled queries; it is only dropped when it
+        is closed or the rollback shows it is broken.
+
+        Args:
+            cursor_factory: Default cursor class for this checkout (e.g. RealDictCursor)
+        """
+        conn = self.getconn()
+        if cursor_factory is not None:
+            conn.cursor_factory = cursor_factory
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            if not conn.closed:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    pass  # Broken: putconn drops it
+            raise
+        finally:
+            self.putconn(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool sizing, occupancy and checkout wait-time metrics"""
+        with self._lock:
+            idle = len(self._idle) if self._pid == os.getpid() else 0
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "open": idle + self._in_use,
+                "in_use": self._in_use,
+                "idle": idle,
+                "waiting": self._waiting,
+                "checkouts": self._checkouts,
+                "waited_checkouts": self._waited,
+                "wait_time_avg_ms": (
+                    1000 * self._wait_total / self._checkouts if self._checkouts else 0.0
+                ),
+                "wait_time_max_ms": 1000 * self._wait_max,
+                "timeouts": self._timeouts,
+                "discarded": self._discarded,
+            }
+
+    def closeall(self):
+        """Close every idle connection of this process's pool (shutdown)"""
+        with self._lock:
+            if self._pid == os.getpid():
+                for conn in self._idle:
+                    if not conn.closed:
+                        conn.close()
+            self._idle = []
+            self._pid = None
+            self._reset_state()
@@ -0,0 +1,208 @@
+"""
+Async Polygon.io ingestion client shared by the scripts/daily updaters
+
+- One keep-alive httpx.AsyncClient per run (connection pool sized to the
+  concurrency limit) instead of a new connection per requests.get
+- Token-bucket rate limiter shared by every request, replacing the
+  `if i % 100 == 0: time.sleep(1)` pacing
+- Retry with exponential backoff on 429 / 5xx / transport errors (honours
+  Retry-After)
+- Bounded concurrency via a semaphore
+- 404 is treated as "no data" and returns None
+
+Typical use from a sync updater:
+
+    async def fetch_dividends(client, item):
+        ticker, from_date = item
+        return await client.get_paginated(API_URL, {"ticker": ticker, ...})
+
+    results = fetch_all(items, fetch_dividends)   # same order as items
+"""
+
+import asyncio
+import os
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import httpx
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CONCURRENCY = int(os.getenv("POLYGON_MAX_CONCURRENCY", "16"))
+DEFAULT_REQUESTS_PER_SECOND = float(os.getenv("POLYGON_REQUESTS_PER_SECOND", "100"))
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class PolygonClient:
+    """Rate-limited, retrying, concurrency-bounded async client for the Polygon REST API"""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_concurrency: int = DEFAULT_CONCURRENCY,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        max_retries: int = 4,
+        backoff: float = 0.5,
+        timeout: float = 30.0,
+    ):
+        self.api_key = api_key if api_key is not None else os.getenv("POLYGON_API_KEY")
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.stats = {"requests": 0, "retries": 0, "not_found": 0, "failures": 0}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "PolygonClient":
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._bucket = TokenBucket(self.requests_per_second)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+        self._client = None
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        delay = self.backoff * (2**attempt) * (1 + random.random() * 0.25)
+        if response is not None and response.headers.get("Retry-After"):
+            try:
+                delay = max(delay, float(response.headers["Retry-After"]))
+            except ValueError:
+                pass
+        return delay
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict]:
+        """
+        GET a JSON document
+
+        Returns:
+            Parsed JSON, or None on 404
+
+        Raises:
+            httpx.HTTPStatusError / httpx.TransportError once retries are exhausted
+        """
+        # Merge rather than replace, so next_url cursors keep their own query string
+        params = dict(params or {})
+        if self.api_key and "apiKey=" not in url:
+            params["apiKey"] = self.api_key
+        request_url = httpx.URL(url).copy_merge_params(params)
+
+        for attempt in range(self.max_retries + 1):
+            await self._bucket.acquire()
+            response = None
+            try:
+                async with self._semaphore:
+                    self.stats["requests"] += 1
+                    response = await self._client.get(request_url)
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    self.stats["failures"] += 1
+                    raise
+            else:
+                if response.status_code == 404:
+                    self.stats["not_found"] += 1
+                    return None
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    return response.json()
+                if attempt == self.max_retries:
+                    self.stats["failures"] += 1
+                    response.raise_for_status()
+
+            self.stats["retries"] += 1
+            await asyncio.sleep(self._retry_delay(attempt, response))
+
+    async def get_paginated(
+        self, url: str, params: Optional[Dict[str, Any]] = None, results_key: str = "results"
+    ) -> List[Dict]:
+        """GET every page of a list endpoint, following next_url"""
+        results = []
+        data = await self.get_json(url, params)
+        while data and data.get("status") == "OK" and results_key in data:
+            results.extend(data[results_key])
+            if not data.get("next_url"):
+                break
+            data = await self.get_json(data["next_url"])
+        return results
+
+    async def map(
+        self,
+        fetch: Callable[["PolygonClient", Any], Awaitable[Any]],
+        items: Sequence[Any],
+        progress_every: int = 500,
+    ) -> List[Any]:
+        """
+        Run fetch(client, item) for every item with bounded concurrency
+
+        Returns:
+            Results in the same order as items; None where fetch raised
+        """
+        done = 0
+
+        async def run(item):
+            nonlocal done
+            try:
+                return await fetch(self, item)
+            except Exception as e:
+                logger.error(f"Error fetching {item}: {e}")
+                return None
+            finally:
+                done += 1
+                if progress_every and done % progress_every == 0:
+                    logger.info(f"  Fetched {done}/{len(items)}")
+
+        return await asyncio.gather(*(run(item) for item in items))
+
+
+def fetch_all(
+    items: Sequence[Any],
+    fetch: Callable[[PolygonClient, Any], Awaitable[Any]],
+    **client_kwargs,
+) -> List[Any]:
+    """Synchronous entry point: fetch every item concurrently with one PolygonClient"""
+
+    async def _run():
+        start = time.time()
+        async with PolygonClient(**client_kwargs) as client:
+            results = await client.map(fetch, items)
+        logger.info(
+            f"Fetched {len(items)} items in {time.time() - start:.1f}s "
+            f"({client.stats['requests']} requests, {client.stats['retries']} retries, "
+            f"{client.stats['failures']} failures)"
+        )
+        return results
+
+    return asyncio.run(_run())
@@ -0,0 +1,154 @@
+"""
+Process-level OAuth token cache
+
+Brokerage access tokens are kept in memory per key (e.g. (client_id,
+brokerage_id)) until shortly before they expire, so API calls and orders no
+longer read brokerage_oauth_tokens - or refresh - on every request:
+
+- a token within `refresh_margin` seconds of expiry must be refreshed before
+  it is used (needs_refresh)
+- a token within `proactive_margin` seconds of expiry is still handed out
+  while a refresh runs in the background (refresh_due)
+- refreshes are single-flight per key: concurrent callers wait for the
+  refresh in progress and share its result
+
+The refresh function owns the token request and the database write, so the
+database is only written when a token actually changes. Expiry is kept as
+epoch seconds, independent of how each caller stores timestamps.
+
+Thread-based; async callers (SchwabOAuthService) run their own single-flight
+on the event loop and use the cache as the store.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+REFRESH_MARGIN = 300.0  # seconds before expiry a token is no longer used
+PROACTIVE_MARGIN = 900.0  # seconds before expiry a background refresh starts
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    """Access token with its refresh token and absolute expiry (epoch seconds)"""
+
+    access_token: str
+    refresh_token: Optional[str]
+    expires_at: float
+
+    def expires_in(self) -> float:
+        return self.expires_at - time.time()
+
+
+RefreshFn = Callable[[Optional[CachedToken]], Optional[CachedToken]]
+
+
+class TokenCache:
+    """Thread-safe token store with single-flight and background refresh"""
+
+    def __init__(
+        self, refresh_margin: float = REFRESH_MARGIN, proactive_margin: float = PROACTIVE_MARGIN
+    ):
+        self.refresh_margin = refresh_margin
+        self.proactive_margin = proactive_margin
+        self._lock = threading.Lock()
+        self._tokens: Dict[Hashable, CachedToken] = {}
+        self._refresh_locks: Dict[Hashable, threading.Lock] = {}
+        self._background: Dict[Hashable, threading.Thread] = {}
+        self.refreshes = 0
+
+    def get(self, key: Hashable) -> Optional[CachedToken]:
+        """Cached token for key (possibly close to expiry), or None"""
+        with self._lock:
+            return self._tokens.get(key)
+
+    def put(
+        self,
+        key: Hashable,
+        access_token: str,
+        refresh_token: Optional[str],
+        expires_at: float,
+    ) -> CachedToken:
+        """Store a token (after loading it from, or writing it to, the database)"""
+        token = CachedToken(access_token, refresh_token, expires_at)
+        with self._lock:
+            self._tokens[key] = token
+        return token
+
+    def invalidate(self, key: Hashable):
+        """Drop a key (token revoked)"""
+        with self._lock:
+            self._tokens.pop(key, None)
+
+    def needs_refresh(self, token: CachedToken) -> bool:
+        """True if the token is too close to expiry to use"""
+        return token.expires_in() <= self.refresh_margin
+
+    def refresh_due(self, token: CachedToken) -> bool:
+        """True if a background refresh should start"""
+        return token.expires_in() <= self.proactive_margin
+
+    def refresh(
+        self, key: Hashable, refresh_fn: RefreshFn, stale: Optional[CachedToken] = None
+    ) -> Optional[CachedToken]:
+        """
+        Refresh the token for key, at most one refresh per key at a time
+
+        Args:
+            key: Token key
+            refresh_fn: Called with the current token; requests and stores a new
+                one and returns it, or returns None if the refresh failed
+            stale: Token the caller saw; if another caller has replaced it with a
+                usable token in the meantime, that token is returned instead
+
+        Returns:
+            The new (or already refreshed) token, None if the refresh failed
+        """
+        with self._lock:
+            lock = self._refresh_locks.setdefault(key, threading.Lock())
+
+        with lock:
+            current = self.get(key)
+            if current is not None and current is not stale and not self.needs_refresh(current):
+                return current
+
+            token = refresh_fn(current)
+            if token is not None:
+                with self._lock:
+                    self._tokens[key] = token
+                    self.refreshes += 1
+            return token
+
+    def refresh_in_background(
+        self, key: Hashable, refresh_fn: RefreshFn, stale: Optional[CachedToken] = None
+    ) -> bool:
+        """Start refresh() in a daemon thread unless one is already running for key"""
+        with self._lock:
+            running = self._background.get(key)
+            if running is not None and running.is_alive():
+                return False
+            thread = threading.Thread(
+                target=self._refresh_quietly,
+                args=(key, refresh_fn, stale),
+                name=f"token-refresh-{key}",
+                daemon=True,
+            )
+            self._background[key] = thread
+        thread.start()
+        return True
+
+    def _refresh_quietly(self, key, refresh_fn, stale):
+        try:
+            if self.refresh(key, refresh_fn, stale) is None:
+                logger.warning(f"Background token refresh failed for {key}")
+        except Exception as e:
+            logger.warning(f"Background token refresh failed for {key}: {e}")
+
+
+# Shared by the API's SchwabOAuthService and the trading connectors
+token_cache = TokenCache()